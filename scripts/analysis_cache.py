@@ -0,0 +1,298 @@
+"""
+Content-addressed cache for document -> checklist analysis results.
+Results are stored in SQLite keyed on the SHA-256 of the extracted document
+text plus the checklist version from lib/phases.ts, so re-analysing an
+unchanged document is a lookup. A second table maps raw file hashes to
+content hashes so unchanged files skip extraction entirely.
+
+Documents with a generator evidence manifest (<document>.evidence.json,
+see evidence.py) for the current checklist and the file's current bytes
+are answered from it by the stub backend; --refresh and the api backend
+always analyse the document itself.
+
+The model backend is pluggable:
+    api   POST the packed summary (summarize.py) to the app's /api/analyze
+          route (P360_ANALYZE_URL); cached per summarizer version
+    stub  local keyword matcher against the checklist, no network
+
+Usage:
+    python analysis_cache.py [PATH ...] [--backend stub|api] [--refresh]
+    python analysis_cache.py --stats | --clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from extract import document_text, extract, file_format, list_documents
+from evidence import as_analysis, file_sha256, load_manifest
+from phases import checklist_version, load_phases
+from summarize import SUMMARY_VERSION, cached_summary, item_index, terms
+
+DB_PATH = os.path.join(CACHE_DIR, "analysis.sqlite3")
+ANALYZE_URL = os.environ.get("P360_ANALYZE_URL", "http://localhost:3000/api/analyze")
+API_TIMEOUT = 120
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    content_hash      TEXT NOT NULL,
+    checklist_version TEXT NOT NULL,
+    backend           TEXT NOT NULL,
+    document          TEXT NOT NULL,
+    result            TEXT NOT NULL,
+    created_at        TEXT NOT NULL,
+    PRIMARY KEY (content_hash, checklist_version, backend)
+);
+CREATE TABLE IF NOT EXISTS files (
+    file_hash    TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+# Each backend takes (path, text, phases) and returns the /api/analyze
+# analysis shape: {docType, summary, completedItems, keyFindings, warnings}.
+STUB_MIN_COVERAGE = 0.6
+
+
+def _doc_type(path):
+    name = os.path.basename(path)
+    for filename, doc_type, _ in DOCUMENTS:
+        if filename == name:
+            return doc_type
+    return file_format(path) or "unknown"
+
+
+def stub_backend(path, text, phases):
+    """Mark items whose terms are mostly present in the document.
+    Confidence scales with coverage into the route's 0.65-0.99 band.
+    """
+    items, idf = item_index(phases)
+    doc_terms = terms(text)
+    completed = []
+    for item in items:
+        hit = sum(idf[t] for t in item["terms"] if t in doc_terms)
+        coverage = hit / item["weight_total"]
+        if coverage >= STUB_MIN_COVERAGE:
+            completed.append({
+                "id": item["id"],
+                "confidence": round(min(0.99, 0.65 + 0.34 * coverage), 2),
+                "extractedValue": None,
+            })
+    return {
+        "docType": _doc_type(path),
+        "summary": f"{os.path.basename(path)}: {len(text):,} characters, "
+                   f"{len(completed)} checklist items matched by keyword.",
+        "completedItems": completed,
+        "keyFindings": [],
+        "warnings": [],
+    }
+
+
+def api_backend(path, text, phases):
+    """POST the budget-packed document text to the app's analyze route."""
+    content = cached_summary(path)["text"]
+    body = json.dumps({
+        "content": content,
+        "fileName": os.path.basename(path),
+        "fileType": file_format(path) or "txt",
+    }).encode("utf-8")
+    request = urllib.request.Request(
+        ANALYZE_URL, data=body, headers={"Content-Type": "application/json"}, method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=API_TIMEOUT) as response:
+            payload = json.load(response)
+    except urllib.error.HTTPError as e:
+        payload = json.loads(e.read() or b"{}")
+        raise RuntimeError(payload.get("error") or f"HTTP {e.code}") from None
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"{ANALYZE_URL} unreachable ({e.reason})") from None
+    if not payload.get("success"):
+        raise RuntimeError(payload.get("error") or "analysis failed")
+    return payload["analysis"]
+
+
+BACKENDS = {
+    "stub": stub_backend,
+    "api": api_backend,
+}
+
+# The api backend sends the packed summary rather than the extracted text,
+# so its results are also keyed on the summarizer version.
+BACKEND_KEYS = {
+    "api": f"api:summary-v{SUMMARY_VERSION}",
+}
+
+
+def backend_key(backend):
+    return BACKEND_KEYS.get(backend, backend)
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def connect(db_path=DB_PATH):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _content_for(conn, path, fhash=None):
+    """(file_hash, content_hash, text or None). Text is only extracted when
+    the file bytes have not been seen before; callers extract lazily on a
+    cache miss.
+    """
+    fhash = fhash or file_sha256(path)
+    row = conn.execute("SELECT content_hash FROM files WHERE file_hash = ?", (fhash,)).fetchone()
+    if row:
+        return fhash, row[0], None
+    text = document_text(extract(path))
+    chash = content_hash(text)
+    conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (fhash, chash))
+    return fhash, chash, text
+
+
+def analyze(path, backend="stub", conn=None, refresh=False, phases=None):
+    """Analysis for one document, from cache when possible.
+
+    Returns (analysis, hit) where hit is True when no backend call was made.
+    """
+    phases = phases if phases is not None else load_phases()
+    version = checklist_version(phases)
+    fhash = file_sha256(path)
+    manifest = None if refresh or backend != "stub" else load_manifest(path)
+    if (manifest is not None and manifest["checklist_version"] == version
+            and manifest.get("sha256") == fhash):
+        return as_analysis(manifest), True
+
+    own = conn is None
+    conn = conn or connect()
+    try:
+        _, chash, text = _content_for(conn, path, fhash)
+        if not refresh:
+            row = conn.execute(
+                "SELECT result FROM analyses WHERE content_hash = ? AND checklist_version = ? "
+                "AND backend = ?", (chash, version, backend_key(backend)),
+            ).fetchone()
+            if row:
+                conn.commit()
+                return json.loads(row[0]), True
+
+        if text is None:
+            text = document_text(extract(path))
+        analysis = BACKENDS[backend](path, text, phases)
+        conn.execute(
+            "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?)",
+            (chash, version, backend_key(backend), os.path.basename(path), json.dumps(analysis),
+             datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        )
+        conn.commit()
+        return analysis, False
+    finally:
+        if own:
+            conn.close()
+
+
+def analyze_many(paths, backend="stub", refresh=False, db_path=DB_PATH):
+    """Analyse documents with one connection.
+    Returns a list of {"document", "hit", "analysis"} or {"document", "error"}.
+    """
+    phases = load_phases()
+    conn = connect(db_path)
+    results = []
+    try:
+        for path in paths:
+            name = os.path.basename(path)
+            try:
+                analysis, hit = analyze(path, backend, conn, refresh, phases)
+                results.append({"document": name, "hit": hit, "analysis": analysis})
+            except Exception as e:
+                results.append({"document": name, "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+    return results
+
+
+def analyze_folder(folder, backend="stub", refresh=False, db_path=DB_PATH):
+    """analyze_many() over every document under folder."""
+    return analyze_many(list_documents(folder), backend, refresh, db_path)
+
+
+def stats(db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT backend, checklist_version, COUNT(*) FROM analyses "
+            "GROUP BY backend, checklist_version ORDER BY backend"
+        ).fetchall()
+        files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    finally:
+        conn.close()
+    return {"analyses": [{"backend": b, "checklist_version": v, "count": n} for b, v, n in rows],
+            "files": files}
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Cached document-to-checklist analysis.")
+    parser.add_argument("paths", nargs="*", default=[OUTPUT_DIR])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="stub")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached results")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--stats", action="store_true", help="show cache contents")
+    parser.add_argument("--clear", action="store_true", help="delete the cache database")
+    args = parser.parse_args()
+
+    if args.clear:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(DB_PATH + suffix):
+                os.remove(DB_PATH + suffix)
+        print(f"Removed {DB_PATH}")
+        return
+    if args.stats:
+        print(json.dumps(stats(), indent=2))
+        return
+
+    paths = []
+    for p in args.paths:
+        paths.extend(list_documents(p) if os.path.isdir(p) else [p])
+    start = time.perf_counter()
+    results = analyze_many(paths, args.backend, args.refresh)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    for r in results:
+        if "error" in r:
+            print(f"{r['document']:<34} ERROR {r['error']}")
+            continue
+        ids = [i["id"] for i in r["analysis"].get("completedItems", [])]
+        print(f"{r['document']:<34} {'hit ' if r['hit'] else 'miss'} {len(ids):>2} items "
+              f"{', '.join(ids)}")
+    hits = sum(1 for r in results if r.get("hit"))
+    print(f"{len(results)} documents, {hits} cache hits, {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark OM table rendering: the per-cell python-pptx styling gen_07 used
+to do (set_cell_text + style_table_header/body/total_row) against
+om_template.write_table, which emits the a:tbl XML in one pass.
+
+Usage:
+    python bench_tables.py [--rows 200] [--repeat 3]
+"""
+import argparse
+import io
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from om_template import (
+    CLR_NAVY, CLR_WHITE, CLR_LIGHT_GRAY, CLR_MED_GRAY, CLR_DARK_TEXT, FONT_NAME,
+    new_deck, add_content_slide, write_table,
+)
+
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+
+
+# ---------------------------------------------------------------------------
+# Baseline: per-cell helpers as previously used in gen_07_om.py
+# ---------------------------------------------------------------------------
+def style_table_header(table, col_count, font_size=11):
+    for col_idx in range(col_count):
+        cell = table.cell(0, col_idx)
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = CLR_NAVY
+        for paragraph in cell.text_frame.paragraphs:
+            paragraph.font.size = Pt(font_size)
+            paragraph.font.bold = True
+            paragraph.font.color.rgb = CLR_WHITE
+            paragraph.font.name = FONT_NAME
+            paragraph.alignment = PP_ALIGN.CENTER
+        cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+
+def style_table_body(table, row_count, col_count, font_size=10):
+    for row_idx in range(1, row_count):
+        for col_idx in range(col_count):
+            cell = table.cell(row_idx, col_idx)
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = CLR_LIGHT_GRAY if row_idx % 2 == 0 else CLR_WHITE
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = Pt(font_size)
+                paragraph.font.color.rgb = CLR_DARK_TEXT
+                paragraph.font.name = FONT_NAME
+            cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+
+def style_total_row(table, row_idx, col_count, font_size=10):
+    for col_idx in range(col_count):
+        cell = table.cell(row_idx, col_idx)
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = CLR_MED_GRAY
+        for paragraph in cell.text_frame.paragraphs:
+            paragraph.font.size = Pt(font_size)
+            paragraph.font.bold = True
+            paragraph.font.color.rgb = CLR_NAVY
+            paragraph.font.name = FONT_NAME
+        cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+
+def set_cell_text(table, row, col, text, alignment=PP_ALIGN.CENTER):
+    cell = table.cell(row, col)
+    cell.text_frame.clear()
+    p = cell.text_frame.paragraphs[0]
+    p.text = str(text)
+    p.alignment = alignment
+    return cell
+
+
+def legacy_table(slide, rows, left, top, height, col_widths, total=False):
+    num_rows, num_cols = len(rows), len(col_widths)
+    table = slide.shapes.add_table(num_rows, num_cols, left, top,
+                                   Inches(sum(col_widths)), height).table
+    for i, w in enumerate(col_widths):
+        table.columns[i].width = Inches(w)
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            set_cell_text(table, r, c, value)
+    style_table_header(table, num_cols, font_size=12)
+    style_table_body(table, num_rows, num_cols, font_size=12)
+    if total:
+        style_total_row(table, num_rows - 1, num_cols, font_size=12)
+
+
+# ---------------------------------------------------------------------------
+# Sample tables
+# ---------------------------------------------------------------------------
+def unit_mix_rows(n):
+    rows = [["Unit", "Type", "SF", "Rent", "Market", "Upside"]]
+    for i in range(n):
+        u = UNITS[i % len(UNITS)]
+        rows.append([f"{i // len(UNITS) + 1}-{u[U_NUM]}", u[U_TYPE], f"{u[U_SF]:,}",
+                     f"${u[U_RENT]:,}", f"${u[U_MARKET]:,}", f"${u[U_MARKET] - u[U_RENT]:,}"])
+    rows.append(["Total", "", "", "", "", ""])
+    return rows
+
+
+def rent_comp_rows(n):
+    rows = [["#", "Address", "Units", "Date", "Price", "$/Unit", "Cap", "GRM"]]
+    for i in range(n):
+        num, address, units, sale_date, price, ppu, cap, grm, *_ = COMPS[i % len(COMPS)]
+        rows.append([str(i + 1), address, str(units), sale_date, f"${price:,}",
+                     f"${ppu:,}", f"{cap:.2%}", f"{grm:.1f}"])
+    return rows
+
+
+TABLES = [
+    ("unit mix", unit_mix_rows, [1.2, 1.4, 1.0, 1.4, 1.4, 1.4], True),
+    ("rent comps", rent_comp_rows, [0.5, 3.5, 0.8, 1.2, 1.6, 1.4, 1.0, 1.0], False),
+]
+
+
+def _time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(n_rows, repeat):
+    print(f"{'Table':<12} {'Cells':>7} {'Per-cell (ms)':>14} {'Bulk XML (ms)':>14} {'Speedup':>8}")
+    for name, make_rows, widths, total in TABLES:
+        rows = make_rows(n_rows)
+
+        def legacy():
+            prs = new_deck(1)
+            slide = add_content_slide(prs, name)
+            legacy_table(slide, rows, Inches(0.5), Inches(1.3), Inches(5.5), widths, total)
+            prs.save(io.BytesIO())
+
+        def bulk():
+            prs = new_deck(1)
+            slide = add_content_slide(prs, name)
+            write_table(slide, rows, Inches(0.5), Inches(1.3), Inches(5.5), widths, total=total)
+            prs.save(io.BytesIO())
+
+        t_legacy = _time(legacy, repeat)
+        t_bulk = _time(bulk, repeat)
+        cells = len(rows) * len(widths)
+        print(f"{name:<12} {cells:>7,} {t_legacy * 1000:>14.1f} {t_bulk * 1000:>14.1f} "
+              f"{t_legacy / t_bulk:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OM table rendering.")
+    parser.add_argument("--rows", type=int, default=200, help="body rows per table")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+"""
+Comparable-sales engine. Loads a comp set (data.COMPS, or thousands of
+county sales from a CSV or SQLite file), answers nearest-N and radius
+queries through a fixed-cell spatial grid, selects by size and sale date
+through sorted column indexes, applies an adjustment grid
+(time, size, age) and fits least-squares price-per-unit and cap-rate
+models that give an indicated value with 95% prediction bands.
+
+Comp records are tuples laid out like data.COMPS (C_NUM .. C_LON) with
+year_built appended (None when unknown).
+
+Usage:
+    python comps.py [--file sales.csv|sales.db] [--radius 5] [--nearest N]
+                    [--min-units 8] [--max-units 40] [--since 2025-01] [--json]
+    python comps.py --bench [--rows 20000]
+"""
+import argparse
+import csv
+import heapq
+import json
+import math
+import random
+import sqlite3
+import sys
+import os
+import time
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+COMP_FIELDS = ("num", "address", "units", "sale_date", "price", "price_per_unit",
+               "cap_rate", "grm", "lat", "lon", "year_built")
+C_YEAR_BUILT = 10
+
+# Header spellings accepted by the loaders -> COMP_FIELDS name
+ALIASES = {
+    "id": "num", "sale_price": "price", "ppu": "price_per_unit",
+    "price_unit": "price_per_unit", "cap": "cap_rate", "date": "sale_date",
+    "latitude": "lat", "longitude": "lon", "lng": "lon", "built": "year_built",
+}
+NUMERIC = {"units", "price", "price_per_unit", "cap_rate", "grm", "lat", "lon", "year_built"}
+
+SUBJECT = {
+    "units": TOTAL_UNITS,
+    "lat": PROPERTY["lat"],
+    "lon": PROPERTY["lon"],
+    "year_built": PROPERTY["year_built"],
+    "noi": NOI_ACTUAL,
+    "as_of": AS_OF[:7],
+}
+
+# Adjustment grid: % of comp price per unit, per unit of difference
+ADJUSTMENTS = {
+    "time": 0.003,    # per month since sale (market appreciation)
+    "size": 0.0025,   # per unit the comp is larger than the subject (scale discount)
+    "age": 0.005,     # per year the comp is older than the subject
+}
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.05
+MILES_PER_DEGREE_LON = 69.17   # at the equator; scales with cos(latitude)
+GRID_CELL_MILES = 1.0
+
+# Two-sided 95% Student t critical values, df = 1..30
+T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+       2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+       2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def t95(dof):
+    if dof < 1:
+        raise ValueError("need at least one residual degree of freedom")
+    return T95[dof - 1] if dof <= len(T95) else 1.96 + 2.5 / dof
+
+
+def months_between(earlier, later):
+    """'2025-09' (or an ISO date) to '2026-03' -> 6."""
+    return (int(later[:4]) - int(earlier[:4])) * 12 + int(later[5:7]) - int(earlier[5:7])
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+def _number(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).replace("$", "").replace(",", "").strip()
+    pct = text.endswith("%")
+    num = float(text.rstrip("%"))
+    return num / 100 if pct else num
+
+
+def normalize(record):
+    """Mapping of field name -> value (any header spelling in ALIASES) to a
+    comp tuple. Price per unit is derived when missing.
+    """
+    row = dict.fromkeys(COMP_FIELDS)
+    for key, value in record.items():
+        name = str(key).strip().lower().replace(" ", "_").replace("/", "_")
+        name = ALIASES.get(name, name)
+        if name in row:
+            row[name] = _number(value) if name in NUMERIC else value
+    if row["units"]:
+        row["units"] = int(row["units"])
+        if row["price_per_unit"] is None and row["price"]:
+            row["price_per_unit"] = round(row["price"] / row["units"])
+    if row["year_built"]:
+        row["year_built"] = int(row["year_built"])
+    if isinstance(row["num"], str) and row["num"].strip().isdigit():
+        row["num"] = int(row["num"])
+    row["sale_date"] = str(row["sale_date"] or "")[:7]
+    return tuple(row[f] for f in COMP_FIELDS)
+
+
+def from_data(comps=COMPS):
+    """data.COMPS rows padded to the full record layout."""
+    pad = (None,) * (len(COMP_FIELDS) - len(comps[0])) if comps else ()
+    return [tuple(c) + pad for c in comps]
+
+
+def load_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [normalize(r) for r in csv.DictReader(f)]
+
+
+def load_sqlite(path, table="sales"):
+    conn = sqlite3.connect(path)
+    try:
+        conn.row_factory = sqlite3.Row
+        return [normalize(dict(r)) for r in conn.execute(f'SELECT * FROM "{table}"')]
+    finally:
+        conn.close()
+
+
+def load_comps(path=None, table="sales"):
+    """Comps from a .csv or SQLite file; data.COMPS when path is None."""
+    if path is None:
+        return from_data()
+    if path.lower().endswith(".csv"):
+        return load_csv(path)
+    return load_sqlite(path, table)
+
+
+# ---------------------------------------------------------------------------
+# Spatial index
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=8)
+def build_grid(comps, cell_miles=GRID_CELL_MILES):
+    """Bucket comps with coordinates into fixed lat/lon cells (a geohash-
+    style grid): {"cells": {(row, col): [positions]}, ...}. Longitude
+    cells are sized at the set's highest latitude, so every cell is at
+    least cell_miles across. comps must be a tuple; cached per comp set.
+    """
+    located = [(i, c[C_LAT], c[C_LON]) for i, c in enumerate(comps)
+               if c[C_LAT] is not None and c[C_LON] is not None]
+    max_lat = max((abs(lat) for _, lat, _ in located), default=0.0)
+    dlat = cell_miles / MILES_PER_DEGREE_LAT
+    dlon = cell_miles / (MILES_PER_DEGREE_LON * math.cos(math.radians(min(max_lat, 89.0))))
+    cells = {}
+    for i, lat, lon in located:
+        cells.setdefault((math.floor(lat / dlat), math.floor(lon / dlon)), []).append(i)
+    return {"cells": cells, "dlat": dlat, "dlon": dlon, "cell_miles": cell_miles}
+
+
+def _ring(row, col, r):
+    """Cells at Chebyshev distance r from (row, col)."""
+    if r == 0:
+        yield row, col
+        return
+    for dc in range(-r, r + 1):
+        yield row - r, col + dc
+        yield row + r, col + dc
+    for dr in range(-r + 1, r):
+        yield row + dr, col - r
+        yield row + dr, col + r
+
+
+def _ring_search(comps, subject, keep, done):
+    """Scan grid rings outward from the subject. keep(position, miles) is
+    called for every comp seen; done(covered_miles) stops the scan, where
+    every comp not yet seen is at least covered_miles away.
+    """
+    grid = build_grid(comps)
+    cells = grid["cells"]
+    if not cells:
+        return
+    row = math.floor(subject["lat"] / grid["dlat"])
+    col = math.floor(subject["lon"] / grid["dlon"])
+    last = max(max(abs(r - row), abs(c - col)) for r, c in cells)
+    for r in range(last + 1):
+        for key in _ring(row, col, r):
+            for i in cells.get(key, ()):
+                comp = comps[i]
+                keep(i, haversine_miles(subject["lat"], subject["lon"],
+                                        comp[C_LAT], comp[C_LON]))
+        # Cells r + 1 rings out are separated from the subject's cell by r
+        # whole cells
+        if done(r * grid["cell_miles"]):
+            return
+
+
+def within(comps, radius_miles, subject=SUBJECT):
+    """{position: miles} for comps within radius_miles of the subject."""
+    found = {}
+
+    def keep(i, miles):
+        if miles <= radius_miles:
+            found[i] = miles
+
+    _ring_search(tuple(comps), subject, keep, lambda covered: covered >= radius_miles)
+    return found
+
+
+def nearest(comps, n=5, subject=SUBJECT, max_miles=None, **filters):
+    """The n comps closest to the subject as [(comp, miles)], nearest first.
+    filters are select()'s min_units / max_units / since / until.
+    """
+    comps = tuple(comps)
+    match = _matcher(**filters)
+    found = []
+
+    def keep(i, miles):
+        if (max_miles is None or miles <= max_miles) and match(comps[i]):
+            found.append((miles, i))
+
+    def done(covered):
+        if max_miles is not None and covered >= max_miles:
+            return True
+        return len(found) >= n and heapq.nsmallest(n, found)[-1][0] <= covered
+
+    _ring_search(comps, subject, keep, done)
+    return [(comps[i], miles) for miles, i in heapq.nsmallest(n, found)]
+
+
+# ---------------------------------------------------------------------------
+# Attribute index and selection
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=8)
+def build_index(comps):
+    """Sorted (keys, positions) per indexed column. comps must be a tuple;
+    the index is cached per comp set.
+    """
+    index = {}
+    for name, col in (("sale_date", C_SALE_DATE), ("units", C_UNITS)):
+        pairs = sorted((c[col], i) for i, c in enumerate(comps) if c[col] is not None)
+        index[name] = ([k for k, _ in pairs], [i for _, i in pairs])
+    return index
+
+
+def _range(index, name, low, high):
+    keys, positions = index[name]
+    lo = 0 if low is None else bisect_left(keys, low)
+    hi = len(keys) if high is None else bisect_right(keys, high)
+    return positions[lo:hi]
+
+
+def _matcher(min_units=None, max_units=None, since=None, until=None):
+    def match(comp):
+        units, sold = comp[C_UNITS], comp[C_SALE_DATE]
+        return ((min_units is None or units >= min_units)
+                and (max_units is None or units <= max_units)
+                and (since is None or sold >= since)
+                and (until is None or sold <= until))
+    return match
+
+
+def select(comps, subject=SUBJECT, radius_miles=None, min_units=None, max_units=None,
+           since=None, until=None):
+    """Comps matching every given filter, as [(comp, distance_miles)] sorted
+    by distance (None when the comp has no coordinates). Date and size are
+    bisect ranges on their indexes, radius a grid query; the narrowest
+    candidate set is scanned and checked against the rest.
+    """
+    comps = tuple(comps)
+    index = build_index(comps)
+    ranges = []
+    if since or until:
+        ranges.append(_range(index, "sale_date", since, until))
+    if min_units is not None or max_units is not None:
+        ranges.append(_range(index, "units", min_units, max_units))
+    nearby = None
+    if radius_miles is not None:
+        nearby = within(comps, radius_miles, subject)
+        ranges.append(list(nearby))
+
+    if ranges:
+        ranges.sort(key=len)
+        candidates = set(ranges[0])
+        for other in ranges[1:]:
+            candidates.intersection_update(other)
+    else:
+        candidates = range(len(comps))
+
+    selected = []
+    for i in candidates:
+        comp = comps[i]
+        if nearby is not None:
+            dist = nearby[i]
+        elif comp[C_LAT] is not None and comp[C_LON] is not None:
+            dist = haversine_miles(subject["lat"], subject["lon"], comp[C_LAT], comp[C_LON])
+        else:
+            dist = None
+        selected.append((comp, dist))
+    selected.sort(key=lambda pair: (pair[1] is None, pair[1] or 0, pair[0][C_SALE_DATE]))
+    return selected
+
+
+# ---------------------------------------------------------------------------
+# Adjustment grid
+# ---------------------------------------------------------------------------
+def adjust(comp, subject=SUBJECT, grid=ADJUSTMENTS):
+    """Adjustment grid for one comp: {"time", "size", "age"} as fractions of
+    its price per unit (age is 0 when either year built is unknown), the
+    net adjustment and the adjusted price per unit.
+    """
+    months = months_between(comp[C_SALE_DATE], subject["as_of"])
+    row = {
+        "months_ago": months,
+        "time": months * grid["time"],
+        "size": (comp[C_UNITS] - subject["units"]) * grid["size"],
+        "age": 0.0,
+    }
+    if comp[C_YEAR_BUILT] and subject.get("year_built"):
+        # An older comp is inferior: adjust it up toward the subject
+        row["age"] = (subject["year_built"] - comp[C_YEAR_BUILT]) * grid["age"]
+    row["net"] = row["time"] + row["size"] + row["age"]
+    row["adjusted_ppu"] = comp[C_PPU] * (1 + row["net"])
+    return row
+
+
+def adjustment_grid(comps, subject=SUBJECT, grid=ADJUSTMENTS):
+    """adjust() for each comp plus the mean and range of adjusted $/unit."""
+    rows = [dict(adjust(c, subject, grid), num=c[C_NUM]) for c in comps]
+    adjusted = [r["adjusted_ppu"] for r in rows]
+    return {
+        "rows": rows,
+        "mean_ppu": sum(adjusted) / len(adjusted) if adjusted else None,
+        "low_ppu": min(adjusted, default=None),
+        "high_ppu": max(adjusted, default=None),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Regression
+# ---------------------------------------------------------------------------
+def _invert(matrix):
+    """Gauss-Jordan inverse of a small square matrix."""
+    n = len(matrix)
+    aug = [list(row) + [float(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(aug[r][col]))
+        if abs(aug[pivot][col]) < 1e-12:
+            raise ValueError("singular design matrix")
+        aug[col], aug[pivot] = aug[pivot], aug[col]
+        scale = aug[col][col]
+        aug[col] = [v / scale for v in aug[col]]
+        for r in range(n):
+            if r != col and aug[r][col]:
+                factor = aug[r][col]
+                aug[r] = [a - factor * b for a, b in zip(aug[r], aug[col])]
+    return [row[n:] for row in aug]
+
+
+def ols(columns, y):
+    """Least squares of y on an intercept plus the given feature columns.
+    Accumulates X'X and X'y column-wise, so cost is one pass per feature
+    pair regardless of how the rows are stored.
+    """
+    n = len(y)
+    X = [[1.0] * n] + [list(map(float, col)) for col in columns]
+    p = len(X)
+    xtx = [[sum(a * b for a, b in zip(X[i], X[j])) for j in range(p)] for i in range(p)]
+    xty = [sum(a * b for a, b in zip(X[i], y)) for i in range(p)]
+    inv = _invert(xtx)
+    coef = [sum(inv[i][j] * xty[j] for j in range(p)) for i in range(p)]
+    fitted = [sum(coef[i] * X[i][k] for i in range(p)) for k in range(n)]
+    sse = sum((a - b) ** 2 for a, b in zip(y, fitted))
+    mean = sum(y) / n
+    sst = sum((v - mean) ** 2 for v in y)
+    dof = n - p
+    return {
+        "coef": coef,
+        "inv_xtx": inv,
+        "dof": dof,
+        "se": math.sqrt(sse / dof) if dof > 0 else None,
+        "r2": 1 - sse / sst if sst else 0.0,
+    }
+
+
+def _predict(model, x):
+    """Estimate and 95% prediction band at feature vector x (no intercept)."""
+    x = [1.0] + list(x)
+    p = len(x)
+    estimate = sum(c * v for c, v in zip(model["coef"], x))
+    leverage = sum(x[i] * model["inv_xtx"][i][j] * x[j] for i in range(p) for j in range(p))
+    half = t95(model["dof"]) * model["se"] * math.sqrt(1 + leverage)
+    return estimate, estimate - half, estimate + half
+
+
+def fit(comps, target, subject=SUBJECT, features=("months_ago", "units")):
+    """Regress a comp column (C_PPU or C_CAP) on features and predict for
+    the subject. Features without variation are dropped, then trailing
+    features until at least one residual degree of freedom remains.
+    """
+    comps = [c for c in comps if c[target] is not None]
+    values = {
+        "months_ago": [months_between(c[C_SALE_DATE], subject["as_of"]) for c in comps],
+        "units": [c[C_UNITS] for c in comps],
+        "year_built": [c[C_YEAR_BUILT] for c in comps],
+    }
+    at_subject = {"months_ago": 0, "units": subject["units"],
+                  "year_built": subject.get("year_built")}
+    used = [f for f in features
+            if None not in values[f] and len(set(values[f])) > 1 and at_subject[f] is not None]
+    while used and len(comps) - len(used) - 1 < 1:
+        used.pop()
+    if len(comps) < 2:
+        raise ValueError("need at least two comps to fit")
+
+    y = [float(c[target]) for c in comps]
+    model = ols([values[f] for f in used], y)
+    estimate, low, high = _predict(model, [at_subject[f] for f in used])
+    return {
+        "features": used,
+        "coef": dict(zip(["intercept"] + used, model["coef"])),
+        "n": len(comps),
+        "r2": model["r2"],
+        "se": model["se"],
+        "estimate": estimate,
+        "low": low,
+        "high": high,
+    }
+
+
+def indicated_value(comps, subject=SUBJECT, features=("months_ago", "units")):
+    """Value from the price-per-unit model (x subject units) and from the
+    cap-rate model (subject NOI / cap; the high cap gives the low value).
+    The price-per-unit low is floored at 0; the cap-rate value has no high
+    when the cap-rate low is not positive.
+    """
+    ppu = fit(comps, C_PPU, subject, features)
+    ppu["low"] = max(0.0, ppu["low"])
+    cap = fit(comps, C_CAP, subject, features)
+    units, noi = subject["units"], subject["noi"]
+    return {
+        "price_per_unit": ppu,
+        "cap_rate": cap,
+        "value_ppu": {k: ppu[k] * units for k in ("estimate", "low", "high")},
+        "value_cap": {"estimate": noi / cap["estimate"], "low": noi / cap["high"],
+                      "high": noi / cap["low"] if cap["low"] > 0 else None},
+    }
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def synthetic_sales(rows, seed=11):
+    """Brevard-sized random sale set around the subject, for benchmarks."""
+    rng = random.Random(seed)
+    sales = []
+    for i in range(rows):
+        units = rng.randint(4, 60)
+        months = rng.randint(0, 36)
+        idx = int(AS_OF[:4]) * 12 + int(AS_OF[5:7]) - 1 - months
+        ppu = round(rng.gauss(112000, 9000) * (1 - 0.003 * months) * (1 - 0.002 * (units - 18)))
+        cap = round(rng.gauss(0.071, 0.004) + 0.0002 * months, 4)
+        sales.append((i + 1, f"Sale {i + 1}", units, f"{idx // 12}-{idx % 12 + 1:02d}",
+                      ppu * units, ppu, cap, round(rng.uniform(7.5, 9.5), 1),
+                      round(rng.uniform(27.83, 28.55), 5), round(rng.uniform(-80.95, -80.45), 5),
+                      rng.randint(1960, 2015)))
+    return sales
+
+
+def benchmark(rows):
+    sales = tuple(synthetic_sales(rows))
+    start = time.perf_counter()
+    build_index(sales)
+    build_grid(sales)
+    t_index = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closest = nearest(sales, 10)
+    t_nearest = time.perf_counter() - start
+
+    start = time.perf_counter()
+    picked = select(sales, radius_miles=5, min_units=10, max_units=30, since="2024-09")
+    t_select = time.perf_counter() - start
+
+    start = time.perf_counter()
+    value = indicated_value([c for c, _ in picked],
+                            features=("months_ago", "units", "year_built"))
+    t_fit = time.perf_counter() - start
+
+    print(f"{rows:,} sales: {len(picked):,} within 5 mi, 10-30 units, since 2024-09")
+    print(f"  index       {t_index * 1000:8.1f} ms")
+    print(f"  nearest 10  {t_nearest * 1000:8.1f} ms  (farthest {closest[-1][1]:.2f} mi)")
+    print(f"  select      {t_select * 1000:8.1f} ms")
+    print(f"  fit         {t_fit * 1000:8.1f} ms  "
+          f"(${value['price_per_unit']['estimate']:,.0f}/unit, r2 {value['price_per_unit']['r2']:.2f})")
+
+
+def money(value):
+    if value is None:
+        return "n/a"
+    return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparable-sales selection and valuation.")
+    parser.add_argument("--file", help="CSV or SQLite sales file (default: data.COMPS)")
+    parser.add_argument("--table", default="sales", help="SQLite table name")
+    parser.add_argument("--radius", type=float, help="miles from the subject")
+    parser.add_argument("--nearest", type=int, help="keep the N closest matching comps")
+    parser.add_argument("--min-units", type=int)
+    parser.add_argument("--max-units", type=int)
+    parser.add_argument("--since", help="earliest sale month, YYYY-MM")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--bench", action="store_true")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.rows)
+        return
+
+    comps = load_comps(args.file, args.table)
+    filters = {"min_units": args.min_units, "max_units": args.max_units, "since": args.since}
+    if args.nearest:
+        matches = nearest(comps, args.nearest, max_miles=args.radius, **filters)
+    else:
+        matches = select(comps, radius_miles=args.radius, **filters)
+    picked = [c for c, _ in matches]
+    miles = [m for _, m in matches]
+    grid = adjustment_grid(picked)
+    value = indicated_value(picked)
+    if args.json:
+        print(json.dumps({"comps": [dict(zip(COMP_FIELDS, c), miles=m) for c, m in matches],
+                          "adjustments": grid, "indicated_value": value}, indent=2))
+        return
+
+    print(f"{'#':>4} {'Miles':>6} {'Units':>5} {'Sold':>8} {'$/Unit':>9} {'Time':>6} {'Size':>6} "
+          f"{'Age':>6} {'Adj $/Unit':>11}")
+    for comp, dist, row in zip(picked, miles, grid["rows"]):
+        dist = f"{dist:.1f}" if dist is not None else "-"
+        print(f"{comp[C_NUM]:>4} {dist:>6} {comp[C_UNITS]:>5} {comp[C_SALE_DATE]:>8} "
+              f"{comp[C_PPU]:>9,.0f} "
+              f"{row['time']:>6.1%} {row['size']:>6.1%} {row['age']:>6.1%} "
+              f"{row['adjusted_ppu']:>11,.0f}")
+    print(f"Adjusted $/unit: mean ${grid['mean_ppu']:,.0f} "
+          f"(${grid['low_ppu']:,.0f} - ${grid['high_ppu']:,.0f})")
+    for label, key in (("$/unit model", "value_ppu"), ("Cap rate model", "value_cap")):
+        v = value[key]
+        print(f"{label:<15} {money(v['estimate'])}  (95%: {money(v['low'])} - {money(v['high'])})")
+
+
+if __name__ == "__main__":
+    main()
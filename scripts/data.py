@@ -11,6 +11,8 @@ PROPERTY = {
     "city": "Palm Bay",
     "state": "FL",
     "zip": "32907",
+    "lat": 27.9979,
+    "lon": -80.6595,
     "parcel_id": "29-37-05-00-00142.0-0000",
     "property_type": "Multi-family (18 units)",
     "year_built": 1986,
@@ -144,14 +146,20 @@ CAPEX = [
 TOTAL_CAPEX = sum(c[2] for c in CAPEX)  # $87,300
 
 # -- Comparable Sales --------------------------------------------------------
+# (num, address, units, sale_date, price, price_per_unit, cap_rate, grm,
+#  lat, lon)
 COMPS = [
-    (1, "1520 Emerson Dr NE, Palm Bay",  12, "2025-09", 1380000, 115000, 0.072, 8.4),
-    (2, "890 Americana Blvd, Melbourne",  20, "2025-11", 2450000, 122500, 0.069, 8.8),
-    (3, "3200 Dixie Hwy NE, Palm Bay",   16, "2025-06", 1680000, 105000, 0.075, 7.9),
-    (4, "445 Sarno Rd, Melbourne",        24, "2025-08", 3120000, 130000, 0.065, 9.2),
-    (5, "2100 Palm Bay Rd NE",            14, "2025-04", 1540000, 110000, 0.078, 8.1),
+    (1, "1520 Emerson Dr NE, Palm Bay",  12, "2025-09", 1380000, 115000, 0.072, 8.4, 28.0345, -80.6468),
+    (2, "890 Americana Blvd, Melbourne",  20, "2025-11", 2450000, 122500, 0.069, 8.8, 28.0893, -80.6487),
+    (3, "3200 Dixie Hwy NE, Palm Bay",   16, "2025-06", 1680000, 105000, 0.075, 7.9, 28.0329, -80.5876),
+    (4, "445 Sarno Rd, Melbourne",        24, "2025-08", 3120000, 130000, 0.065, 9.2, 28.1249, -80.6451),
+    (5, "2100 Palm Bay Rd NE",            14, "2025-04", 1540000, 110000, 0.078, 8.1, 28.0281, -80.6129),
 ]
 
+# Column indices
+C_NUM, C_ADDRESS, C_UNITS, C_SALE_DATE, C_PRICE, C_PPU, C_CAP, C_GRM = range(8)
+C_LAT, C_LON = 8, 9
+
 # -- Security Deposits -------------------------------------------------------
 TOTAL_SECURITY_DEPOSITS = sum(u[U_DEPOSIT] for u in UNITS if u[U_STATUS] == "Occupied")
 
@@ -168,68 +176,93 @@ MONTHS = [
     "Sep 2025", "Oct 2025", "Nov 2025", "Dec 2025", "Jan 2026", "Feb 2026",
 ]
 
+# Rent roll date: first day after the trailing-12 collection period
+AS_OF = "2026-03-01"
+
+
+# Tenancies that ended during the trailing 12 months:
+# (unit_num, monthly rent, first vacant month)
+PRIOR_TENANCIES = [
+    ("105", 1050, "2026-01"),   # moved out end of Dec 2025
+    ("206", 1300, "2025-12"),   # moved out end of Nov 2025
+]
+
+# Rent charged but not received: (unit_num, month)
+ARREARS = [
+    ("103", "2026-01"),
+    ("103", "2026-02"),
+    ("207", "2026-02"),
+]
+
 
 def get_monthly_collections():
-    """Return dict of unit_num -> [12 monthly amounts].
-    Vacancies=$0 for vacant months. Delinquent=partial/zero for recent months.
+    """Return dict of unit_num -> [12 monthly amounts] received, from the
+    collections ledger (ledger.py). Vacant months and unpaid rent are $0.
     """
-    collections = {}
-    for u in UNITS:
-        num, rent, status, delinq = u[U_NUM], u[U_RENT], u[U_STATUS], u[U_DELINQ]
-
-        if status == "Vacant":
-            if num == "105":
-                # Had tenant at $1,050 until Jan 2026 (index 10)
-                collections[num] = [1050] * 10 + [0, 0]
-            elif num == "206":
-                # Had tenant at $1,300 until Dec 2025 (index 9)
-                collections[num] = [1300] * 9 + [0, 0, 0]
-            continue
-
-        months_data = [rent] * 12
-        if "60 days" in delinq:
-            # Unit 103: missed Jan + Feb 2026
-            months_data[10] = 0
-            months_data[11] = 0
-        elif "30 days" in delinq:
-            # Unit 207: missed Feb 2026
-            months_data[11] = 0
-        collections[num] = months_data
-    return collections
+    from ledger import monthly_collections
+    return monthly_collections()
 
 
 # -- Due Diligence Items -----------------------------------------------------
+# (item, category, status, responsible, critical, date_requested, date_received)
+# Dates are ISO strings; None until the item is requested / received.
 DD_ITEMS = [
-    ("Trailing 12-Month P&L",           "Financial",      "Received",  "Seller",    True),
-    ("Current Rent Roll",               "Financial",      "Received",  "Seller",    True),
-    ("Tax Returns (2 years)",           "Financial",      "Requested", "Seller",    True),
-    ("Insurance Policy (current)",      "Financial",      "Received",  "Seller",    True),
-    ("All Lease Agreements (16)",       "Legal",          "Received",  "Seller",    True),
-    ("Security Deposit Ledger",         "Financial",      "Received",  "Seller",    True),
-    ("Utility Bills (12 months)",       "Financial",      "Requested", "Seller",    False),
-    ("Vendor Contracts",                "Operational",    "Pending",   "Seller",    False),
-    ("Property Tax Bills (3 years)",    "Financial",      "Received",  "Seller",    False),
-    ("Survey",                          "Legal",          "Requested", "Title Co",  True),
-    ("Phase I Environmental",           "Environmental",  "Pending",   "Buyer",     True),
-    ("Title Commitment",                "Legal",          "Received",  "Title Co",  True),
-    ("Zoning Verification Letter",      "Legal",          "Requested", "Seller",    False),
-    ("Certificate of Occupancy",        "Legal",          "Pending",   "Seller",    True),
-    ("Building Permits (history)",      "Legal",          "Pending",   "Seller",    False),
-    ("HOA Documents",                   "Legal",          "Cleared",   "Seller",    False),
-    ("Estoppel Letters (16 tenants)",   "Legal",          "Requested", "Seller",    True),
-    ("Inspection Report",               "Physical",       "Received",  "Inspector", True),
-    ("Appraisal",                       "Financial",      "Pending",   "Buyer",     True),
-    ("Bank Statements (6 months)",      "Financial",      "Requested", "Seller",    False),
-    ("Loan Payoff Letter",              "Financial",      "Requested", "Seller",    True),
-    ("LLC Operating Agreement",         "Legal",          "Received",  "Seller",    True),
-    ("Articles of Organization",        "Legal",          "Received",  "Seller",    False),
-    ("Property Management Agreement",   "Operational",    "Received",  "Seller",    False),
-    ("Roof Warranty",                   "Physical",       "Requested", "Seller",    False),
-    ("HVAC Service Records",            "Physical",       "Requested", "Seller",    False),
-    ("Fire Inspection Report",          "Physical",       "Pending",   "Seller",    True),
-    ("ADA Compliance Documentation",    "Legal",          "Pending",   "Seller",    False),
-    ("Flood Zone Certification",        "Environmental",  "Received",  "Title Co",  False),
-    ("Lead Paint Disclosure",           "Environmental",  "Cleared",   "Seller",    False),
+    ("Trailing 12-Month P&L",           "Financial",      "Received",  "Seller",    True,  "2026-02-02", "2026-02-05"),
+    ("Current Rent Roll",               "Financial",      "Received",  "Seller",    True,  "2026-02-02", "2026-02-05"),
+    ("Tax Returns (2 years)",           "Financial",      "Requested", "Seller",    True,  "2026-02-02", None),
+    ("Insurance Policy (current)",      "Financial",      "Received",  "Seller",    True,  "2026-02-02", "2026-02-06"),
+    ("All Lease Agreements (16)",       "Legal",          "Received",  "Seller",    True,  "2026-02-02", "2026-02-09"),
+    ("Security Deposit Ledger",         "Financial",      "Received",  "Seller",    True,  "2026-02-02", "2026-02-09"),
+    ("Utility Bills (12 months)",       "Financial",      "Requested", "Seller",    False, "2026-02-04", None),
+    ("Vendor Contracts",                "Operational",    "Pending",   "Seller",    False, None,         None),
+    ("Property Tax Bills (3 years)",    "Financial",      "Received",  "Seller",    False, "2026-02-02", "2026-02-10"),
+    ("Survey",                          "Legal",          "Requested", "Title Co",  True,  "2026-02-09", None),
+    ("Phase I Environmental",           "Environmental",  "Pending",   "Buyer",     True,  None,         None),
+    ("Title Commitment",                "Legal",          "Received",  "Title Co",  True,  "2026-02-03", "2026-02-12"),
+    ("Zoning Verification Letter",      "Legal",          "Requested", "Seller",    False, "2026-02-11", None),
+    ("Certificate of Occupancy",        "Legal",          "Pending",   "Seller",    True,  None,         None),
+    ("Building Permits (history)",      "Legal",          "Pending",   "Seller",    False, None,         None),
+    ("HOA Documents",                   "Legal",          "Cleared",   "Seller",    False, "2026-02-02", "2026-02-03"),
+    ("Estoppel Letters (16 tenants)",   "Legal",          "Requested", "Seller",    True,  "2026-02-13", None),
+    ("Inspection Report",               "Physical",       "Received",  "Inspector", True,  "2026-02-03", "2026-02-11"),
+    ("Appraisal",                       "Financial",      "Pending",   "Buyer",     True,  None,         None),
+    ("Bank Statements (6 months)",      "Financial",      "Requested", "Seller",    False, "2026-02-04", None),
+    ("Loan Payoff Letter",              "Financial",      "Requested", "Seller",    True,  "2026-02-06", None),
+    ("LLC Operating Agreement",         "Legal",          "Received",  "Seller",    True,  "2026-02-02", "2026-02-06"),
+    ("Articles of Organization",        "Legal",          "Received",  "Seller",    False, "2026-02-02", "2026-02-04"),
+    ("Property Management Agreement",   "Operational",    "Received",  "Seller",    False, "2026-02-02", "2026-02-10"),
+    ("Roof Warranty",                   "Physical",       "Requested", "Seller",    False, "2026-02-10", None),
+    ("HVAC Service Records",            "Physical",       "Requested", "Seller",    False, "2026-02-10", None),
+    ("Fire Inspection Report",          "Physical",       "Pending",   "Seller",    True,  None,         None),
+    ("ADA Compliance Documentation",    "Legal",          "Pending",   "Seller",    False, None,         None),
+    ("Flood Zone Certification",        "Environmental",  "Received",  "Title Co",  False, "2026-02-03", "2026-02-04"),
+    ("Lead Paint Disclosure",           "Environmental",  "Cleared",   "Seller",    False, "2026-02-02", "2026-02-04"),
+]
+
+# Column indices
+D_ITEM, D_CATEGORY, D_STATUS, D_RESPONSIBLE, D_CRITICAL, D_REQUESTED, D_RECEIVED = range(7)
+
+# Tracker snapshot date and response windows (days from request) after
+# which an open item is overdue
+DD_AS_OF = "2026-02-20"
+DD_RESPONSE_DAYS = 14
+DD_CRITICAL_RESPONSE_DAYS = 10
+
+# -- Document Registry -------------------------------------------------------
+# (filename, doc_type, phases) -- doc_type matches p360_documents.doc_type
+DOCUMENTS = [
+    ("01_rent_roll_2025.xlsx",        "rent_roll",    [3]),
+    ("02_profit_loss_T12.pdf",        "pnl",          [1, 4]),
+    ("03_inspection_report.pdf",      "inspection",   [2]),
+    ("04_sample_lease_unit201.docx",  "lease",        [3, 5]),
+    ("05_title_search.pdf",           "title_search", [5]),
+    ("06_valuation_comps.xlsx",       "appraisal",    [6]),
+    ("07_offering_memorandum.pptx",   "om",           [7]),
+    ("08_loi_template.docx",          "loi",          [8]),
+    ("09_due_diligence_tracker.xlsx", "dd_tracker",   [9]),
+    ("10_closing_worksheet.xlsx",     "closing",      [10]),
+    ("11_proforma_3yr.xlsx",          "proforma",     [4, 7]),
+    ("12_entity_summary.docx",        "entity_docs",  [5]),
 ]
 
 # -- Output path helper ------------------------------------------------------
@@ -237,6 +270,7 @@ import os
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_DIR = os.path.join(REPO_ROOT, "case-study", "palm-bay-18-unit")
+CACHE_DIR = os.path.join(REPO_ROOT, ".cache")
 
 
 def output_path(filename):
@@ -0,0 +1,193 @@
+"""
+Due-diligence tracking model. Computes aging for every tracker item from
+its request/receive dates against a snapshot date (DD_AS_OF), so the
+tracker workbook can carry plain values instead of TODAY() formulas, and
+rolls items up by category and responsible party with overdue and
+critical counts.
+
+Items are DD_ITEMS tuples from data.py (D_ITEM .. D_RECEIVED). A tracker
+is transposed into columns once; aging is one pass over the columns, and
+portfolio() runs the same pass over several properties' trackers.
+
+Usage:
+    python dd.py [--as-of 2026-02-20] [--by category|responsible|status] [--json]
+"""
+import argparse
+import json
+import sys
+import os
+from datetime import date
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+OPEN_STATUSES = ("Requested", "Pending")
+DONE_STATUSES = ("Received", "Reviewed", "Cleared")
+ROLLUP_KEYS = {"category": D_CATEGORY, "responsible": D_RESPONSIBLE, "status": D_STATUS}
+
+
+def _ordinal(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def response_days(critical):
+    return DD_CRITICAL_RESPONSE_DAYS if critical else DD_RESPONSE_DAYS
+
+
+# ---------------------------------------------------------------------------
+# Aging
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=32)
+def columns(items):
+    """The tracker as column tuples, dates as day ordinals. items must be a
+    tuple of item tuples (cached per tracker).
+    """
+    return {
+        "status": tuple(i[D_STATUS] for i in items),
+        "critical": tuple(bool(i[D_CRITICAL]) for i in items),
+        "requested": tuple(_ordinal(i[D_REQUESTED]) for i in items),
+        "received": tuple(_ordinal(i[D_RECEIVED]) for i in items),
+    }
+
+
+def aging(items=DD_ITEMS, as_of=DD_AS_OF):
+    """Per-item aging as of the snapshot date, in tracker order:
+    {"item", "category", "status", "responsible", "critical", "requested",
+    "received", "days_outstanding", "open", "not_requested", "due",
+    "overdue", "days_overdue"}.
+
+    days_outstanding is request -> receipt for received items, request ->
+    as_of for open ones, None before the item is requested. An open item is
+    overdue once it has been outstanding longer than its response window.
+    """
+    items = tuple(items)
+    cols = columns(items)
+    today = _ordinal(as_of)
+    rows = []
+    for item, status, critical, req, rec in zip(items, cols["status"], cols["critical"],
+                                                 cols["requested"], cols["received"]):
+        is_open = rec is None and status not in DONE_STATUSES
+        if req is None:
+            outstanding = None
+        else:
+            outstanding = (rec if rec is not None else today) - req
+        window = response_days(critical)
+        late = outstanding - window if is_open and outstanding is not None else 0
+        rows.append({
+            "item": item[D_ITEM],
+            "category": item[D_CATEGORY],
+            "status": status,
+            "responsible": item[D_RESPONSIBLE],
+            "critical": critical,
+            "requested": item[D_REQUESTED],
+            "received": item[D_RECEIVED],
+            "days_outstanding": outstanding,
+            "open": is_open,
+            "not_requested": req is None,
+            "due": date.fromordinal(req + window).isoformat() if req is not None else None,
+            "overdue": late > 0,
+            "days_overdue": max(late, 0),
+        })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+def _rollup(rows):
+    open_days = [r["days_outstanding"] for r in rows
+                 if r["open"] and r["days_outstanding"] is not None]
+    turnaround = [r["days_outstanding"] for r in rows
+                  if not r["open"] and r["days_outstanding"] is not None]
+    return {
+        "items": len(rows),
+        "open": sum(r["open"] for r in rows),
+        "not_requested": sum(r["not_requested"] and r["open"] for r in rows),
+        "overdue": sum(r["overdue"] for r in rows),
+        "critical_open": sum(r["critical"] and r["open"] for r in rows),
+        "critical_overdue": sum(r["critical"] and r["overdue"] for r in rows),
+        "avg_days_open": sum(open_days) / len(open_days) if open_days else 0.0,
+        "max_days_open": max(open_days, default=0),
+        "avg_turnaround": sum(turnaround) / len(turnaround) if turnaround else 0.0,
+        "pct_complete": 1 - sum(r["open"] for r in rows) / len(rows) if rows else 0.0,
+    }
+
+
+def totals(rows):
+    """The rollup metrics over all of rows as one group."""
+    return _rollup(rows)
+
+
+def rollup(rows, by="category"):
+    """{group: metrics} over aging() rows, groups sorted by name. Metrics:
+    items, open, not_requested, overdue, critical_open, critical_overdue,
+    avg_days_open, max_days_open, avg_turnaround, pct_complete.
+    """
+    if by not in ROLLUP_KEYS:
+        raise ValueError(f"Unknown rollup key {by!r}; expected one of {', '.join(ROLLUP_KEYS)}")
+    groups = {}
+    for r in rows:
+        groups.setdefault(r[by], []).append(r)
+    return {g: _rollup(groups[g]) for g in sorted(groups)}
+
+
+def summary(items=DD_ITEMS, as_of=DD_AS_OF):
+    """Headline figures for one tracker."""
+    rows = aging(items, as_of)
+    return dict(_rollup(rows), as_of=as_of,
+                overdue_items=[r["item"] for r in rows if r["overdue"]],
+                critical_outstanding=[r["item"] for r in rows if r["critical"] and r["open"]])
+
+
+def portfolio(trackers, as_of=DD_AS_OF, by="category"):
+    """Aging and rollups for several properties at one snapshot date.
+
+    trackers maps property name -> item rows. Returns {"properties":
+    {name: totals}, "by": {group: totals across properties}, "total": ...}.
+    """
+    all_rows, properties = [], {}
+    for name, items in trackers.items():
+        rows = aging(items, as_of)
+        properties[name] = _rollup(rows)
+        all_rows.extend(rows)
+    return {"properties": properties, "by": rollup(all_rows, by), "total": _rollup(all_rows)}
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Due-diligence aging and rollups.")
+    parser.add_argument("--as-of", default=DD_AS_OF, help="snapshot date, YYYY-MM-DD")
+    parser.add_argument("--by", choices=sorted(ROLLUP_KEYS), default="category")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = aging(as_of=args.as_of)
+    groups = rollup(rows, args.by)
+    if args.json:
+        print(json.dumps({"summary": summary(as_of=args.as_of), "by": groups, "items": rows},
+                         indent=2))
+        return
+
+    print(f"Due diligence as of {args.as_of}")
+    print(f"{args.by:<14} {'Items':>5} {'Open':>5} {'Overdue':>8} {'Crit Open':>10} "
+          f"{'Avg Days':>9} {'Max Days':>9}")
+    for g, m in list(groups.items()) + [("Total", _rollup(rows))]:
+        print(f"{g:<14} {m['items']:>5} {m['open']:>5} {m['overdue']:>8} "
+              f"{m['critical_open']:>10} {m['avg_days_open']:>9.1f} {m['max_days_open']:>9}")
+    late = [r for r in rows if r["overdue"]]
+    if late:
+        print("Overdue:")
+        for r in sorted(late, key=lambda r: -r["days_overdue"]):
+            flag = " (critical)" if r["critical"] else ""
+            print(f"  {r['item']:<32} {r['responsible']:<10} {r['days_overdue']:>3} days late{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Portfolio-wide due-diligence dashboard. Streams the DD tracker of every
+active deal through dd.aging() and writes one workbook:
+
+    Summary             headline counts and a category x status pivot
+    Deals               one row of rollup metrics per deal
+    Status Pivot        deal x category rows, item counts by status
+    Critical Blockers   every open critical item, oldest first per deal
+    Oldest Outstanding  the N longest-open items across the portfolio
+
+The workbook is write-only (rows go straight to disk) and deals are
+consumed one at a time, so only the portfolio counters and the top-N heap
+are held in memory however many deals are rolled up.
+
+Deals come from the case-study tracker (DD_ITEMS), any 09 tracker
+workbooks passed with --tracker, and --demo N synthetic deals for sizing.
+
+Usage:
+    python dd_portfolio.py [--tracker PATH ...] [--demo 500] [--as-of 2026-02-20]
+                           [--top 50] [--out PATH]
+"""
+import argparse
+import heapq
+import random
+import resource
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from dd import DONE_STATUSES, OPEN_STATUSES, aging, totals
+from extract import iter_sheet_rows
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+
+STATUSES = OPEN_STATUSES + DONE_STATUSES
+TRACKER_SHEET = "Due Diligence Tracker"
+TRACKER_HEADERS = {
+    "DD Item": D_ITEM,
+    "Category": D_CATEGORY,
+    "Status": D_STATUS,
+    "Responsible Party": D_RESPONSIBLE,
+    "Critical?": D_CRITICAL,
+    "Date Requested": D_REQUESTED,
+    "Date Received": D_RECEIVED,
+}
+COUNT_KEYS = ("items", "open", "not_requested", "overdue", "critical_open", "critical_overdue")
+
+HEADER_FONT = Font(name="Arial", size=10, bold=True, color=WHITE)
+HEADER_FILL = PatternFill(start_color=NAVY, end_color=NAVY, fill_type="solid")
+TITLE_FONT = Font(name="Arial", size=12, bold=True, color=NAVY)
+BOLD_FONT = Font(name="Arial", size=10, bold=True)
+RED_FONT = Font(name="Arial", size=10, bold=True, color="FF0000")
+DATE_FMT = "YYYY-MM-DD"
+PCT_FMT = "0.0%"
+
+
+# ---------------------------------------------------------------------------
+# Deal sources
+# ---------------------------------------------------------------------------
+def tracker_items(path):
+    """DD item tuples streamed from a gen_09 tracker workbook."""
+    rows = iter_sheet_rows(path, TRACKER_SHEET)
+    header = next(rows, [])
+    cols = {TRACKER_HEADERS[h]: i for i, h in enumerate(header) if h in TRACKER_HEADERS}
+    missing = [h for h, f in TRACKER_HEADERS.items() if f not in cols]
+    if missing:
+        raise ValueError(f"{path}: tracker sheet is missing {', '.join(missing)}")
+    items = []
+    for row in rows:
+        if not row or not row[cols[D_ITEM]]:
+            continue
+        item = [row[cols[f]] if cols[f] < len(row) else None for f in range(len(TRACKER_HEADERS))]
+        item[D_CRITICAL] = str(item[D_CRITICAL]).strip().lower() in ("yes", "true", "1")
+        item[D_REQUESTED] = item[D_REQUESTED] or None
+        item[D_RECEIVED] = item[D_RECEIVED] or None
+        items.append(tuple(item))
+    return items
+
+
+def demo_deals(n, as_of=DD_AS_OF, seed=42):
+    """n synthetic deals shaped like the case-study tracker: each deal
+    opened 0-75 days before as_of, items requested over its first week and
+    most of them answered within a few weeks. Deterministic per seed.
+    """
+    today = date.fromisoformat(as_of)
+    for d in range(n):
+        rng = random.Random(seed * 100003 + d)
+        opened = today - timedelta(days=rng.randint(0, 75))
+        items = []
+        for name, category, _, responsible, critical, *_ in DD_ITEMS:
+            requested = received = None
+            if rng.random() < 0.9:
+                requested = opened + timedelta(days=rng.randint(0, 7))
+            if requested is not None and requested > today:
+                requested = None
+            if requested is not None and rng.random() < 0.7:
+                received = requested + timedelta(days=rng.randint(1, 30))
+                if received > today:
+                    received = None
+            if received is not None:
+                status = rng.choice(DONE_STATUSES)
+            else:
+                status = "Requested" if requested is not None else "Pending"
+            items.append((name, category, status, responsible, critical,
+                          requested and requested.isoformat(),
+                          received and received.isoformat()))
+        yield f"Demo Deal {d + 1:04d}", items
+
+
+def deals(trackers=(), demo=0, as_of=DD_AS_OF, case_study=True):
+    """(deal name, items) pairs, one deal at a time."""
+    if case_study:
+        yield PROPERTY["name"], DD_ITEMS
+    for path in trackers:
+        name = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        yield name, tracker_items(path)
+    yield from demo_deals(demo, as_of)
+
+
+# ---------------------------------------------------------------------------
+# Write-only helpers
+# ---------------------------------------------------------------------------
+def _header(ws, labels):
+    cells = []
+    for label in labels:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cells.append(cell)
+    ws.append(cells)
+
+
+def _cell(ws, value, number_format=None, font=None):
+    cell = WriteOnlyCell(ws, value=value)
+    if number_format:
+        cell.number_format = number_format
+    if font:
+        cell.font = font
+    return cell
+
+
+def _date(ws, value):
+    if not value:
+        return None
+    if not isinstance(value, date):
+        value = date.fromisoformat(str(value)[:10])
+    return _cell(ws, value, DATE_FMT)
+
+
+def _setup(ws, widths, freeze="A2"):
+    # Column widths and panes must be set before the first row is written.
+    for i, w in enumerate(widths):
+        ws.column_dimensions[chr(ord("A") + i)].width = w
+    if freeze:
+        ws.freeze_panes = freeze
+
+
+# ---------------------------------------------------------------------------
+# Dashboard
+# ---------------------------------------------------------------------------
+def write_dashboard(path, deal_iter, as_of=DD_AS_OF, top=50):
+    """Stream deal_iter into the dashboard workbook at path. Returns the
+    portfolio totals: {"deals", "items", "open", ..., "pct_complete",
+    "pivot": {(category, status): n}, "oldest": [...]}.
+    """
+    wb = Workbook(write_only=True)
+    ws_summary = wb.create_sheet("Summary")
+    ws_deals = wb.create_sheet("Deals")
+    ws_pivot = wb.create_sheet("Status Pivot")
+    ws_block = wb.create_sheet("Critical Blockers")
+    ws_old = wb.create_sheet("Oldest Outstanding")
+
+    _setup(ws_summary, [28, 12, 12, 12, 12, 12, 12, 12], freeze=None)
+    _setup(ws_deals, [30, 8, 8, 12, 9, 12, 14, 12, 12, 11])
+    _setup(ws_pivot, [30, 16] + [11] * len(STATUSES) + [8, 8, 9])
+    _setup(ws_block, [30, 32, 14, 16, 11, 13, 13, 12, 12])
+    _setup(ws_old, [30, 32, 14, 16, 11, 9, 13, 12, 12])
+
+    _header(ws_deals, ["Deal", "Items", "Open", "Not Requested", "Overdue", "Critical Open",
+                       "Critical Overdue", "Avg Days Open", "Max Days Open", "% Complete"])
+    _header(ws_pivot, ["Deal", "Category"] + list(STATUSES) + ["Total", "Open", "Overdue"])
+    _header(ws_block, ["Deal", "DD Item", "Category", "Responsible Party", "Status",
+                       "Date Requested", "Due Date", "Days Open", "Days Overdue"])
+
+    counts = dict.fromkeys(COUNT_KEYS, 0)
+    pivot = {}
+    blockers_by_party = {}
+    oldest = []  # min-heap of (days, seq, row) holding the top N open items
+    seq = 0
+    n_deals = 0
+
+    for name, items in deal_iter:
+        rows = aging(items, as_of)
+        n_deals += 1
+        m = totals(rows)
+        for key in COUNT_KEYS:
+            counts[key] += m[key]
+        ws_deals.append([
+            name, m["items"], m["open"], m["not_requested"],
+            _cell(ws_deals, m["overdue"], font=RED_FONT if m["overdue"] else None),
+            m["critical_open"], m["critical_overdue"],
+            _cell(ws_deals, round(m["avg_days_open"], 1), "0.0"), m["max_days_open"],
+            _cell(ws_deals, m["pct_complete"], PCT_FMT),
+        ])
+
+        by_category = {}
+        for r in rows:
+            key = (r["category"], r["status"])
+            pivot[key] = pivot.get(key, 0) + 1
+            cat = by_category.setdefault(r["category"], [dict.fromkeys(STATUSES, 0), 0, 0])
+            cat[0][r["status"]] = cat[0].get(r["status"], 0) + 1
+            cat[1] += r["open"]
+            cat[2] += r["overdue"]
+
+            if r["open"] and r["days_outstanding"] is not None:
+                seq += 1
+                entry = (r["days_outstanding"], -seq, name, r)
+                if len(oldest) < top:
+                    heapq.heappush(oldest, entry)
+                elif entry[:2] > oldest[0][:2]:
+                    heapq.heapreplace(oldest, entry)
+
+        for category in sorted(by_category):
+            by_status, n_open, n_late = by_category[category]
+            ws_pivot.append([name, category] + [by_status.get(s, 0) for s in STATUSES]
+                            + [sum(by_status.values()), n_open, n_late])
+
+        critical = [r for r in rows if r["critical"] and r["open"]]
+        critical.sort(key=lambda r: -(r["days_outstanding"] or 0))
+        for r in critical:
+            party = r["responsible"]
+            blockers_by_party[party] = blockers_by_party.get(party, 0) + 1
+            ws_block.append([
+                name, r["item"], r["category"], party,
+                _cell(ws_block, r["status"], font=RED_FONT if r["overdue"] else None),
+                _date(ws_block, r["requested"]), _date(ws_block, r["due"]),
+                r["days_outstanding"], r["days_overdue"] or None,
+            ])
+
+    # -- Oldest outstanding (heap drained longest-open first) -----------------
+    oldest = [(name, r) for _, _, name, r in sorted(oldest, reverse=True)]
+    _header(ws_old, ["Deal", "DD Item", "Category", "Responsible Party", "Status",
+                     "Critical?", "Date Requested", "Days Open", "Days Overdue"])
+    for name, r in oldest:
+        ws_old.append([
+            name, r["item"], r["category"], r["responsible"], r["status"],
+            "Yes" if r["critical"] else "No", _date(ws_old, r["requested"]),
+            r["days_outstanding"],
+            _cell(ws_old, r["days_overdue"], font=RED_FONT) if r["overdue"] else None,
+        ])
+
+    # -- Summary (first sheet; written last once the totals are known) --------
+    result = dict(counts, deals=n_deals, as_of=as_of,
+                  pct_complete=1 - counts["open"] / counts["items"] if counts["items"] else 0.0)
+    ws = ws_summary
+    ws.append([_cell(ws, "Due Diligence Portfolio Dashboard", font=TITLE_FONT)])
+    ws.append(["As Of", _date(ws, as_of)])
+    ws.append([])
+    for label, key in (("Active Deals", "deals"), ("DD Items", "items"), ("Open Items", "open"),
+                       ("Not Yet Requested", "not_requested"), ("Overdue Items", "overdue"),
+                       ("Critical Items Open", "critical_open"),
+                       ("Critical Items Overdue", "critical_overdue")):
+        ws.append([label, result[key]])
+    ws.append(["% Complete", _cell(ws, result["pct_complete"], PCT_FMT)])
+    ws.append([])
+
+    ws.append([_cell(ws, "Items by Category and Status", font=BOLD_FONT)])
+    _header(ws, ["Category"] + list(STATUSES) + ["Total"])
+    categories = sorted({c for c, _ in pivot})
+    for category in categories:
+        row = [pivot.get((category, s), 0) for s in STATUSES]
+        ws.append([category] + row + [sum(row)])
+    col_totals = [sum(pivot.get((c, s), 0) for c in categories) for s in STATUSES]
+    ws.append([_cell(ws, "Total", font=BOLD_FONT)]
+              + [_cell(ws, v, font=BOLD_FONT) for v in col_totals + [sum(col_totals)]])
+    ws.append([])
+
+    ws.append([_cell(ws, "Critical Blockers by Responsible Party", font=BOLD_FONT)])
+    _header(ws, ["Responsible Party", "Open Critical"])
+    for party in sorted(blockers_by_party, key=lambda p: (-blockers_by_party[p], p)):
+        ws.append([party, blockers_by_party[party]])
+
+    wb.save(path)
+    result["pivot"] = pivot
+    result["oldest"] = [(name, r["item"], r["days_outstanding"]) for name, r in oldest]
+    return result
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Roll DD trackers up into a portfolio dashboard.")
+    parser.add_argument("--tracker", action="append", default=[],
+                        help="09 tracker workbook to include (repeatable)")
+    parser.add_argument("--demo", type=int, default=0, help="add N synthetic deals")
+    parser.add_argument("--no-case-study", action="store_true",
+                        help="leave out the case-study tracker")
+    parser.add_argument("--as-of", default=DD_AS_OF, help="snapshot date, YYYY-MM-DD")
+    parser.add_argument("--top", type=int, default=50, help="rows on Oldest Outstanding")
+    parser.add_argument("--out", default=os.path.join(CACHE_DIR, "09_dd_portfolio.xlsx"),
+                        help="dashboard workbook (default: .cache/, outside the case-study folder)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    start = time.perf_counter()
+    result = write_dashboard(
+        args.out, deals(args.tracker, args.demo, args.as_of, not args.no_case_study),
+        args.as_of, args.top)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Created {os.path.basename(args.out)} at {args.out}")
+    print(f"{result['deals']:,} deals, {result['items']:,} items as of {args.as_of}: "
+          f"{result['open']:,} open, {result['overdue']:,} overdue, "
+          f"{result['critical_open']:,} critical open ({result['pct_complete']:.1%} complete)")
+    for name, item, days in result["oldest"][:5]:
+        print(f"  {days:>4} days  {name}: {item}")
+    print(f"Wrote in {elapsed:.2f}s, peak RSS {rss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
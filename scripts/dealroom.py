@@ -0,0 +1,238 @@
+"""
+Package each property's generated documents into one deal-room zip: every
+registry document, its sidecars (.json, .md, .evidence.json) and a
+manifest.json index, streamed straight from the output folder into the
+archive without temp copies.
+
+Documents that are already compressed (OOXML packages, PDFs) are stored;
+text sidecars and the manifest are deflated. The manifest lists every
+entry with its sha256, sizes, compression and the byte offset of its data
+in the zip, so a reader holding the manifest can range-read a single file
+(read_entry) without touching the rest of the archive. Bundles for many
+properties are built in parallel, each written to <name>.part and renamed
+into place when complete.
+
+In deterministic mode (reproducible.py) entry timestamps and the manifest
+date are pinned, so a regenerated case study bundles byte-identically.
+
+Usage:
+    python dealroom.py [--out DIR] [--demo 50] [--workers 8]
+    python dealroom.py --list BUNDLE.zip
+    python dealroom.py --extract BUNDLE.zip FILENAME > file
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from phases import checklist_version
+from reproducible import ZIP_EPOCH, enabled, epoch
+from seed import CASE_STUDY_PROPERTY_ID, derived_id
+
+DEALROOM_DIR = os.path.join(CACHE_DIR, "dealrooms")
+MANIFEST_NAME = "manifest.json"
+SIDECAR_SUFFIXES = (".json", ".md", ".evidence.json")
+STORED_EXTENSIONS = (".xlsx", ".docx", ".pptx", ".pdf")
+WORKERS = 4
+CHUNK = 1 << 20
+
+_DOC_TYPES = {filename: (doc_type, phases) for filename, doc_type, phases in DOCUMENTS}
+
+
+def compression_for(name):
+    return zipfile.ZIP_STORED if name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+
+
+# ---------------------------------------------------------------------------
+# Properties
+# ---------------------------------------------------------------------------
+def bundle_files(folder=OUTPUT_DIR):
+    """(archive name, path, role) for each registry document in folder and
+    its sidecars, in document order.
+    """
+    files = []
+    for filename, _, _ in DOCUMENTS:
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            continue
+        files.append((filename, path, "document"))
+        for suffix in SIDECAR_SUFFIXES:
+            if os.path.exists(path + suffix):
+                role = "evidence" if suffix == ".evidence.json" else "sidecar"
+                files.append((filename + suffix, path + suffix, role))
+    return files
+
+
+def properties(folder=OUTPUT_DIR, demo=0):
+    """The case study plus demo copies of it, with the ids seed.py and
+    upload.py give them: [{"id", "name", "address", "folder"}].
+    """
+    props = [{"id": CASE_STUDY_PROPERTY_ID, "name": PROPERTY["name"],
+              "address": PROPERTY["address"], "folder": folder}]
+    for i in range(demo):
+        props.append({"id": derived_id("demo", i), "name": f"Demo property {i + 1}",
+                      "address": f"{100 + i} Demo Way", "folder": folder})
+    return props
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+def _entry_info(name, mtime=None):
+    date_time = ZIP_EPOCH if enabled() else time.localtime(mtime)[:6]
+    info = zipfile.ZipInfo(name, date_time=date_time)
+    info.compress_type = compression_for(name)
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _write_entry(zf, info, src):
+    """Stream src into the archive; returns (sha256, data offset)."""
+    h = hashlib.sha256()
+    with zf.open(info, "w") as dest:
+        # The local header has just been written; the data starts here.
+        data_offset = zf.fp.tell()
+        for block in iter(lambda: src.read(CHUNK), b""):
+            h.update(block)
+            dest.write(block)
+    return h.hexdigest(), data_offset
+
+
+def _index_entry(info, role, sha256, data_offset):
+    entry = {
+        "name": info.filename,
+        "role": role,
+        "size": info.file_size,
+        "compressed_size": info.compress_size,
+        "compression": "stored" if info.compress_type == zipfile.ZIP_STORED else "deflate",
+        "crc32": info.CRC,
+        "sha256": sha256,
+        "header_offset": info.header_offset,
+        "data_offset": data_offset,
+    }
+    doc_type, phases = _DOC_TYPES.get(info.filename, (None, None))
+    if doc_type:
+        entry["doc_type"] = doc_type
+        entry["phases"] = phases
+    return entry
+
+
+def write_bundle(path, prop, files=None):
+    """Write one property's deal room to path; returns the manifest."""
+    files = files if files is not None else bundle_files(prop["folder"])
+    stamp = datetime.fromtimestamp(epoch(), timezone.utc) if enabled() else datetime.now(timezone.utc)
+    entries = []
+    part = path + ".part"
+    with zipfile.ZipFile(part, "w") as zf:
+        for name, src_path, role in files:
+            info = _entry_info(name, os.path.getmtime(src_path))
+            with open(src_path, "rb") as src:
+                sha256, data_offset = _write_entry(zf, info, src)
+            entries.append(_index_entry(info, role, sha256, data_offset))
+
+        manifest = {
+            "property": {k: prop[k] for k in ("id", "name", "address")},
+            "checklist_version": checklist_version(),
+            "created": stamp.isoformat(timespec="seconds"),
+            "files": entries,
+        }
+        info = _entry_info(MANIFEST_NAME)
+        zf.writestr(info, json.dumps(manifest, indent=2, ensure_ascii=False))
+    os.replace(part, path)
+    return manifest
+
+
+def build_all(props, out_dir=DEALROOM_DIR, workers=WORKERS):
+    """Bundle every property into out_dir/<property id>.zip in parallel
+    (zlib and file I/O release the GIL). Returns [(path, manifest)].
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    # Properties sharing a folder share its file list
+    listings = {}
+    for prop in props:
+        if prop["folder"] not in listings:
+            listings[prop["folder"]] = bundle_files(prop["folder"])
+
+    def build(prop):
+        path = os.path.join(out_dir, f"{prop['id']}.zip")
+        return path, write_bundle(path, prop, listings[prop["folder"]])
+
+    if workers <= 1:
+        return [build(p) for p in props]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build, props))
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+def load_bundle_manifest(path):
+    with zipfile.ZipFile(path) as zf:
+        return json.loads(zf.read(MANIFEST_NAME))
+
+
+def read_entry(f, entry):
+    """Contents of one manifest entry from a seekable bundle file, reading
+    only that entry's bytes (a ranged GET works the same way).
+    """
+    f.seek(entry["data_offset"])
+    data = f.read(entry["compressed_size"])
+    if entry["compression"] == "deflate":
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    if zlib.crc32(data) != entry["crc32"]:
+        raise ValueError(f"{entry['name']}: CRC mismatch")
+    return data
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Bundle generated documents into deal-room zips.")
+    parser.add_argument("--folder", default=OUTPUT_DIR, help="generated documents to bundle")
+    parser.add_argument("--out", default=DEALROOM_DIR, help="directory for the bundles")
+    parser.add_argument("--demo", type=int, default=0,
+                        help="also bundle N demo properties (as seed.py --demo)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="bundles built in parallel")
+    parser.add_argument("--list", metavar="BUNDLE", help="print a bundle's manifest index")
+    parser.add_argument("--extract", nargs=2, metavar=("BUNDLE", "NAME"),
+                        help="write one file from a bundle to stdout")
+    args = parser.parse_args()
+
+    if args.list:
+        manifest = load_bundle_manifest(args.list)
+        print(f"{manifest['property']['name']} ({manifest['property']['id']}), {manifest['created']}")
+        for e in manifest["files"]:
+            print(f"{e['name']:<44} {e['role']:<9} {e['compression']:<8} "
+                  f"{e['size']:>9,} {e['compressed_size']:>9,}  @{e['data_offset']}")
+        return
+    if args.extract:
+        bundle, name = args.extract
+        entries = {e["name"]: e for e in load_bundle_manifest(bundle)["files"]}
+        if name not in entries:
+            sys.exit(f"{name} is not in {bundle}")
+        with open(bundle, "rb") as f:
+            sys.stdout.buffer.write(read_entry(f, entries[name]))
+        return
+
+    props = properties(args.folder, args.demo)
+    start = time.perf_counter()
+    built = build_all(props, args.out, args.workers)
+    elapsed = time.perf_counter() - start
+
+    total = sum(os.path.getsize(path) for path, _ in built)
+    path, manifest = built[0]
+    print(f"Created {os.path.basename(path)} at {path} ({len(manifest['files'])} files)")
+    print(f"{len(built):,} deal rooms ({total / 1024 / 1024:.1f} MB) in {elapsed:.2f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Checklist evidence from the generators. Each generator that proves
+checklist items writes <document>.evidence.json (see sidecar.py): the item
+ids, the value it rendered for each, and confidence 1.0. This module turns
+those manifests into p360_checklists rows, and into the /api/analyze
+result shape so analysis_cache.py can skip the model for our own
+documents.
+
+Usage:
+    python evidence.py [FOLDER] [--json | --csv | --sql] [--user-id UUID] [--property-id UUID]
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+MANIFEST_SUFFIX = ".evidence.json"
+ROW_FIELDS = ("item_id", "phase_id", "checked", "checked_at", "notes",
+              "ai_confidence", "ai_extracted_value")
+
+
+# ---------------------------------------------------------------------------
+# Manifests
+# ---------------------------------------------------------------------------
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def manifest_path(path):
+    return path if path.endswith(MANIFEST_SUFFIX) else path + MANIFEST_SUFFIX
+
+
+def load_manifest(path):
+    """The evidence manifest for a document path (or the manifest itself),
+    or None when the document has none.
+    """
+    path = manifest_path(path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_manifests(folder=OUTPUT_DIR):
+    """Every manifest under folder, in document order."""
+    paths = sorted(glob.glob(os.path.join(folder, "*" + MANIFEST_SUFFIX)))
+    return [load_manifest(p) for p in paths]
+
+
+# ---------------------------------------------------------------------------
+# p360_checklists rows
+# ---------------------------------------------------------------------------
+def checklist_rows(manifests, checked_at=None):
+    """One p360_checklists row per item, merged across documents: values
+    are joined and the notes name every document that proved the item.
+    user_id / property_id are left to the loader.
+    """
+    checked_at = checked_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    rows = {}
+    for manifest in manifests:
+        for item in manifest["items"]:
+            row = rows.get(item["id"])
+            if row is None:
+                rows[item["id"]] = {
+                    "item_id": item["id"],
+                    "phase_id": item["phase"],
+                    "checked": True,
+                    "checked_at": checked_at,
+                    "notes": f"Evidence: {manifest['document']}",
+                    "ai_confidence": item["confidence"],
+                    "ai_extracted_value": item["value"],
+                }
+            else:
+                row["notes"] += f", {manifest['document']}"
+                row["ai_extracted_value"] += f"; {item['value']}"
+                row["ai_confidence"] = max(row["ai_confidence"], item["confidence"])
+    return list(rows.values())
+
+
+def _sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def upsert_sql(rows, user_id, property_id):
+    """A single INSERT ... ON CONFLICT statement for rows, keyed on the
+    table's (user_id, property_id, item_id) unique constraint.
+    """
+    columns = ("user_id", "property_id") + ROW_FIELDS
+    values = ",\n".join(
+        "  (" + ", ".join(_sql_literal(v) for v in
+                          (user_id, property_id) + tuple(r[f] for f in ROW_FIELDS)) + ")"
+        for r in rows
+    )
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in ROW_FIELDS if c != "item_id")
+    return (f"INSERT INTO p360_checklists ({', '.join(columns)}) VALUES\n{values}\n"
+            f"ON CONFLICT (user_id, property_id, item_id) DO UPDATE SET {updates};\n")
+
+
+# ---------------------------------------------------------------------------
+# /api/analyze shape
+# ---------------------------------------------------------------------------
+def as_analysis(manifest):
+    """The manifest as an /api/analyze result, like the analysis_cache backends."""
+    return {
+        "docType": manifest["doc_type"] or "unknown",
+        "summary": f"{manifest['document']}: {len(manifest['items'])} checklist items "
+                   f"from generator evidence.",
+        "completedItems": [
+            {"id": item["id"], "confidence": item["confidence"], "extractedValue": item["value"]}
+            for item in manifest["items"]
+        ],
+        "keyFindings": [],
+        "warnings": [],
+    }
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Load generator evidence as checklist rows.")
+    parser.add_argument("folder", nargs="?", default=OUTPUT_DIR)
+    fmt = parser.add_mutually_exclusive_group()
+    fmt.add_argument("--json", action="store_true", help="print rows as JSON")
+    fmt.add_argument("--csv", action="store_true", help="print rows as CSV (for COPY)")
+    fmt.add_argument("--sql", action="store_true", help="print an upsert statement")
+    parser.add_argument("--user-id", help="p360_checklists.user_id (required with --sql)")
+    parser.add_argument("--property-id", help="p360_checklists.property_id (required with --sql)")
+    parser.add_argument("--checked-at", default=None, help="timestamp for checked_at (default now)")
+    args = parser.parse_args()
+    if args.sql and not (args.user_id and args.property_id):
+        # NULL never matches the unique key, so the upsert would duplicate rows
+        parser.error("--sql needs --user-id and --property-id")
+
+    manifests = load_manifests(args.folder)
+    rows = checklist_rows(manifests, args.checked_at)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    elif args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=ROW_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    elif args.sql:
+        sys.stdout.write(upsert_sql(rows, args.user_id, args.property_id))
+    else:
+        for r in rows:
+            print(f"{r['item_id']:<5} {r['ai_extracted_value'][:60]:<60} {r['notes'][10:]}")
+        print(f"{len(rows)} checklist items from {len(manifests)} documents")
+
+
+if __name__ == "__main__":
+    main()
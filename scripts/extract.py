@@ -0,0 +1,897 @@
+"""
+Extract text and tables from PDF, DOCX, XLSX and PPTX documents.
+Stdlib only: OOXML parts are streamed out of the zip with iterparse (no full
+DOM) and PDFs go through a small text-layer reader, so generated case-study
+files and seller-provided documents can be re-ingested server-side.
+
+Usage:
+    python extract.py FILE_OR_FOLDER [--workers N] [--json]
+    python extract.py --bench [FOLDER] [--repeat N]
+"""
+import argparse
+import base64
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import OUTPUT_DIR
+
+
+FORMATS = ("pdf", "docx", "xlsx", "pptx")
+_LOCAL_NAMES = {}
+
+
+def _local(tag):
+    """Tag name without its namespace ('{ns}t' -> 't')."""
+    name = _LOCAL_NAMES.get(tag)
+    if name is None:
+        name = _LOCAL_NAMES[tag] = tag.rsplit("}", 1)[-1]
+    return name
+
+
+def _rel_id(elem):
+    """The r:id attribute of a sheet/sldId element (namespace-agnostic)."""
+    for key, value in elem.attrib.items():
+        if key.startswith("{") and _local(key) == "id":
+            return value
+    return None
+
+
+def _new_section(title):
+    return {"title": title, "paragraphs": [], "tables": []}
+
+
+# ===========================================================================
+# OOXML helpers
+# ===========================================================================
+def _read_xml(zf, name):
+    """Parse a small part (workbook, rels, styles) in one go."""
+    with zf.open(name) as f:
+        return ET.parse(f).getroot()
+
+
+def _rels(zf, part):
+    """Map relationship Id -> target part path for a given part."""
+    folder, base = os.path.split(part)
+    rels_name = f"{folder}/_rels/{base}.rels"
+    if rels_name not in zf.namelist():
+        return {}
+    targets = {}
+    for rel in _read_xml(zf, rels_name):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = os.path.normpath(os.path.join(folder, target)).replace(os.sep, "/")
+        targets[rel.get("Id")] = path
+    return targets
+
+
+def _iter_blocks(stream, para_tag, table_tag, row_tag, cell_tag, text_tags, break_tags=()):
+    """Stream paragraphs and tables out of a DOCX/PPTX part.
+
+    Yields ("p", text, heading) for top-level paragraphs and ("table",
+    rows, False) for tables; paragraphs inside table cells become cell
+    text. heading is True for Heading/Title styled paragraphs and for
+    paragraphs whose text runs are all bold.
+    """
+    tables = []  # stack of tables being built (nested tables are flattened)
+    row, cell, parts = None, None, []
+    styled = run_bold = False
+    runs = bold_runs = 0
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == table_tag:
+                tables.append([])
+            elif tag == row_tag and tables:
+                row = []
+            elif tag == cell_tag and tables:
+                cell = []
+            elif tag == "r":
+                run_bold = False
+            continue
+
+        if tag in text_tags:
+            parts.append(elem.text or "")
+        elif tag in break_tags:
+            parts.append("\t" if tag == "tab" else "\n")
+        elif tag == "b":
+            run_bold = _val(elem) not in ("0", "false")
+        elif tag == "pStyle":
+            styled = styled or (_val(elem) or "").startswith(("Heading", "Title"))
+        elif tag == "r":
+            if "".join(t.text or "" for t in elem.iter() if _local(t.tag) in text_tags).strip():
+                runs += 1
+                bold_runs += run_bold
+        elif tag == para_tag:
+            text = "".join(parts).strip()
+            heading = styled or (runs > 0 and bold_runs == runs and len(text) <= 80)
+            parts = []
+            styled = run_bold = False
+            runs = bold_runs = 0
+            if cell is not None:
+                if text:
+                    cell.append(text)
+            elif text and not tables:
+                yield "p", text, heading
+            elem.clear()
+        elif tag == cell_tag and cell is not None:
+            if row is not None:
+                row.append("\n".join(cell))
+            cell = None
+        elif tag == row_tag and row is not None:
+            if tables:
+                tables[-1].append(row)
+            row = None
+        elif tag == table_tag and tables:
+            table = tables.pop()
+            if not tables:
+                yield "table", [r for r in table if any(r)], False
+            elem.clear()
+
+
+def _val(elem):
+    for key, value in elem.attrib.items():
+        if _local(key) == "val":
+            return value
+    return None
+
+
+# ===========================================================================
+# DOCX
+# ===========================================================================
+def extract_docx(path):
+    """Paragraphs and tables of word/document.xml in body order, split into
+    sections at heading paragraphs (Heading styles or all-bold lines).
+    """
+    sections = [_new_section("")]
+    with zipfile.ZipFile(path) as zf:
+        with zf.open("word/document.xml") as f:
+            for kind, value, heading in _iter_blocks(
+                    f, "p", "tbl", "tr", "tc", {"t"}, ("tab", "br", "cr")):
+                if heading:
+                    sections.append(_new_section(value))
+                elif kind == "p":
+                    sections[-1]["paragraphs"].append(value)
+                else:
+                    sections[-1]["tables"].append(value)
+    return [s for s in sections if s["title"] or s["paragraphs"] or s["tables"]]
+
+
+# ===========================================================================
+# PPTX
+# ===========================================================================
+def extract_pptx(path):
+    """One section per slide, in presentation order."""
+    sections = []
+    with zipfile.ZipFile(path) as zf:
+        rels = _rels(zf, "ppt/presentation.xml")
+        root = _read_xml(zf, "ppt/presentation.xml")
+        slide_parts = [
+            rels[_rel_id(sld)]
+            for sld in root.iter() if _local(sld.tag) == "sldId"
+        ]
+        for num, part in enumerate(slide_parts, 1):
+            section = _new_section(f"Slide {num}")
+            with zf.open(part) as f:
+                for kind, value, _ in _iter_blocks(
+                        f, "p", "tbl", "tr", "tc", {"t"}, ("br",)):
+                    key = "paragraphs" if kind == "p" else "tables"
+                    section[key].append(value)
+            if section["paragraphs"]:
+                section["title"] = section["paragraphs"].pop(0)
+            sections.append(section)
+    return sections
+
+
+# ===========================================================================
+# XLSX
+# ===========================================================================
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+DATE_CODE_RE = re.compile(r"[dmyhs]")
+EXCEL_EPOCH = datetime(1899, 12, 30)
+CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(ref):
+    """'C12' -> 2 (zero-based)."""
+    letters = CELL_REF_RE.match(ref).group(1)
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def _shared_strings(zf):
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings = []
+    parts = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, elem in ET.iterparse(f):
+            tag = _local(elem.tag)
+            if tag == "t":
+                parts.append(elem.text or "")
+            elif tag == "si":
+                strings.append("".join(parts))
+                parts = []
+                elem.clear()
+    return strings
+
+
+def _date_styles(zf):
+    """Indices into cellXfs whose number format is a date."""
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    root = _read_xml(zf, "xl/styles.xml")
+    custom = {}
+    for elem in root.iter():
+        if _local(elem.tag) == "numFmt":
+            code = re.sub(r'"[^"]*"|\[[^\]]*\]', "", elem.get("formatCode", ""))
+            custom[int(elem.get("numFmtId"))] = bool(DATE_CODE_RE.search(code.lower()))
+    styles = set()
+    for elem in root.iter():
+        if _local(elem.tag) == "cellXfs":
+            for index, xf in enumerate(elem):
+                fmt = int(xf.get("numFmtId", 0))
+                if fmt in BUILTIN_DATE_FORMATS or custom.get(fmt):
+                    styles.add(index)
+    return styles
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "E" not in text.upper() else value
+
+
+def _excel_date(serial):
+    moment = EXCEL_EPOCH + timedelta(days=serial)
+    if moment.hour == moment.minute == moment.second == 0:
+        return moment.date().isoformat()
+    return moment.isoformat()
+
+
+def sheet_names(path):
+    """[(sheet name, part path)] in workbook order."""
+    with zipfile.ZipFile(path) as zf:
+        return _sheet_parts(zf)
+
+
+def _sheet_parts(zf):
+    rels = _rels(zf, "xl/workbook.xml")
+    root = _read_xml(zf, "xl/workbook.xml")
+    return [
+        (sheet.get("name"), rels[_rel_id(sheet)])
+        for sheet in root.iter() if _local(sheet.tag) == "sheet"
+    ]
+
+
+def iter_sheet_rows(path, sheet=None):
+    """Stream the rows of one worksheet as lists of Python values.
+
+    sheet is a sheet name or zero-based index (default: first sheet).
+    Shared strings and date styles are resolved; a formula cell without a
+    cached value is returned as its formula text ("=H2-G2"). Only one row
+    is held in memory at a time.
+    """
+    with zipfile.ZipFile(path) as zf:
+        parts = _sheet_parts(zf)
+        if sheet is None:
+            part = parts[0][1]
+        elif isinstance(sheet, int):
+            part = parts[sheet][1]
+        else:
+            part = dict(parts)[sheet]
+        shared = _shared_strings(zf)
+        date_styles = _date_styles(zf)
+        yield from _iter_rows(zf, part, shared, date_styles)
+
+
+def _iter_rows(zf, part, shared, date_styles):
+    sheet_data = None
+    values = {}
+    value = formula = None
+    expected_row = 1
+    # Compare full tag names once the sheet namespace is known; calling
+    # _local() per event dominates the cost on large sheets.
+    ns = None
+    c_tag = v_tag = f_tag = row_tag = data_tag = None
+
+    with zf.open(part) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if ns is None:
+                ns = tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+                c_tag, v_tag, f_tag = ns + "c", ns + "v", ns + "f"
+                row_tag, data_tag = ns + "row", ns + "sheetData"
+            if event == "start":
+                if tag == c_tag:
+                    value = formula = None
+                elif tag == data_tag:
+                    sheet_data = elem
+                continue
+
+            if tag == v_tag:
+                value = elem.text
+            elif tag == f_tag:
+                formula = elem.text
+            elif tag == c_tag:
+                kind = elem.get("t", "n")
+                if kind == "s" and value is not None:
+                    cell = shared[int(value)]
+                elif kind == "inlineStr":
+                    cell = "".join(t.text or "" for t in elem.iter() if _local(t.tag) == "t")
+                elif kind == "b" and value is not None:
+                    cell = value == "1"
+                elif kind in ("str", "e"):
+                    cell = value
+                elif value is not None:
+                    cell = _number(value)
+                    if int(elem.get("s", 0)) in date_styles:
+                        cell = _excel_date(cell)
+                else:
+                    cell = None
+                if cell is None and formula:
+                    cell = "=" + formula
+                ref = elem.get("r")
+                col = _column_index(ref) if ref else len(values)
+                if cell is not None and cell != "":
+                    values[col] = cell
+            elif tag == row_tag:
+                row_num = int(elem.get("r", expected_row))
+                while expected_row < row_num:
+                    yield []
+                    expected_row += 1
+                row = [None] * (max(values) + 1) if values else []
+                for col, cell in values.items():
+                    row[col] = cell
+                yield row
+                expected_row = row_num + 1
+                values = {}
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+
+
+def extract_xlsx(path):
+    """One section per worksheet with its used range as a single table."""
+    sections = []
+    with zipfile.ZipFile(path) as zf:
+        shared = _shared_strings(zf)
+        date_styles = _date_styles(zf)
+        for name, part in _sheet_parts(zf):
+            section = _new_section(name)
+            rows = [r for r in _iter_rows(zf, part, shared, date_styles) if r]
+            if rows:
+                section["tables"].append(rows)
+            sections.append(section)
+    return sections
+
+
+# ===========================================================================
+# PDF text layer
+# ===========================================================================
+OBJ_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+REF_RE = re.compile(rb"(\d+)\s+\d+\s+R")
+STREAM_RE = re.compile(rb"stream\r?\n")
+HEX_RE = re.compile(rb"<([0-9A-Fa-f\s]*)>")
+
+
+def _pdf_objects(data):
+    """Map object number -> (dictionary bytes, raw stream bytes or None)."""
+    objects = {}
+    matches = list(OBJ_RE.finditer(data))
+    for i, match in enumerate(matches):
+        start = match.end()
+        end = data.find(b"endobj", start)
+        if end < 0:
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(data)
+        body = data[start:end]
+        stream = None
+        sm = STREAM_RE.search(body)
+        if sm:
+            header = body[:sm.start()]
+            length = re.search(rb"/Length\s+(\d+)(?!\s+\d+\s+R)", header)
+            if length:
+                stream = body[sm.end():sm.end() + int(length.group(1))]
+                if b"endstream" not in body[sm.end() + int(length.group(1)):]:
+                    stream = None
+            if stream is None:
+                stream = body[sm.end():body.rfind(b"endstream")].rstrip(b"\r\n")
+            body = header
+        objects[int(match.group(1))] = (body, stream)
+
+    # Objects packed into compressed object streams (PDF 1.5+)
+    for body, stream in list(objects.values()):
+        if stream is None or not re.search(rb"/Type\s*/ObjStm", body):
+            continue
+        raw = _decode_stream(body, stream)
+        first = int(re.search(rb"/First\s+(\d+)", body).group(1))
+        nums = [int(n) for n in raw[:first].split()]
+        offsets = list(zip(nums[::2], nums[1::2]))
+        for j, (num, off) in enumerate(offsets):
+            stop = offsets[j + 1][1] if j + 1 < len(offsets) else len(raw) - first
+            objects.setdefault(num, (raw[first + off:first + stop], None))
+    return objects
+
+
+def _decode_stream(body, stream):
+    """Apply the stream's /Filter chain (ASCII85, ASCIIHex, Flate)."""
+    match = re.search(rb"/Filter\s*(\[[^\]]*\]|/\w+)", body)
+    filters = re.findall(rb"/(\w+)", match.group(1)) if match else []
+    for name in filters:
+        if name in (b"ASCII85Decode", b"A85"):
+            stream = stream.strip()
+            if stream.startswith(b"<~"):
+                stream = stream[2:]
+            if not stream.endswith(b"~>"):
+                stream = stream + b"~>"
+            stream = base64.a85decode(b"<~" + stream, adobe=True)
+        elif name in (b"ASCIIHexDecode", b"AHx"):
+            hexdata = re.sub(rb"\s", b"", stream.rstrip(b">"))
+            stream = bytes.fromhex((hexdata + b"0" * (len(hexdata) % 2)).decode())
+        elif name in (b"FlateDecode", b"Fl"):
+            stream = zlib.decompressobj().decompress(stream)
+        else:
+            return b""  # image filters (DCT, CCITT, JBIG2): no text
+    return stream
+
+
+def _dict_value(body, key):
+    """Raw value for /key in a dictionary: a ref, nested dict or array."""
+    match = re.search(rb"/" + key + rb"(?![A-Za-z0-9])\s*", body)
+    if not match:
+        return None
+    rest = body[match.end():]
+    if rest.startswith(b"<<"):
+        depth, i = 0, 0
+        while i < len(rest):
+            if rest.startswith(b"<<", i):
+                depth += 1
+                i += 2
+            elif rest.startswith(b">>", i):
+                depth -= 1
+                i += 2
+                if depth == 0:
+                    return rest[:i]
+            else:
+                i += 1
+        return rest
+    if rest.startswith(b"["):
+        return rest[:rest.find(b"]") + 1]
+    ref = re.match(rb"\d+\s+\d+\s+R", rest)
+    if ref:
+        return ref.group(0)
+    return re.match(rb"[^\s/<>\[\]]*", rest).group(0)
+
+
+def _resolve(objects, value):
+    """Follow an indirect reference to the referenced object's dictionary."""
+    if value is None:
+        return None
+    ref = re.fullmatch(rb"\s*(\d+)\s+\d+\s+R\s*", value)
+    if ref:
+        return objects.get(int(ref.group(1)), (b"", None))[0]
+    return value
+
+
+def _page_order(data, objects):
+    """Page object numbers in document order via /Root -> /Pages -> /Kids."""
+    roots = re.findall(rb"/Root\s+(\d+)\s+\d+\s+R", data)
+    pages = []
+
+    def walk(num, depth=0):
+        body = objects.get(num, (b"", None))[0]
+        if depth > 50:
+            return
+        if re.search(rb"/Type\s*/Pages\b", body):
+            kids = _dict_value(body, b"Kids") or b""
+            for kid in REF_RE.findall(kids):
+                walk(int(kid), depth + 1)
+        elif re.search(rb"/Type\s*/Page\b", body):
+            pages.append(num)
+
+    if roots:
+        catalog = objects.get(int(roots[-1]), (b"", None))[0]
+        ref = REF_RE.match(_dict_value(catalog, b"Pages") or b"")
+        if ref:
+            walk(int(ref.group(1)))
+    if not pages:
+        pages = sorted(
+            num for num, (body, _) in objects.items()
+            if re.search(rb"/Type\s*/Page\b", body)
+        )
+    return pages
+
+
+def _parse_cmap(raw):
+    """ToUnicode CMap -> (code byte width, {code: text})."""
+    mapping = {}
+    width = 1
+
+    def hex_text(h):
+        h = re.sub(rb"\s", b"", h)
+        try:
+            return bytes.fromhex(h.decode()).decode("utf-16-be", "replace")
+        except ValueError:
+            return ""
+
+    for block in re.findall(rb"beginbfchar(.*?)endbfchar", raw, re.S):
+        pairs = HEX_RE.findall(block)
+        for src, dst in zip(pairs[::2], pairs[1::2]):
+            width = max(width, len(src.strip()) // 2)
+            mapping[int(src, 16)] = hex_text(dst)
+    for block in re.findall(rb"beginbfrange(.*?)endbfrange", raw, re.S):
+        for lo, hi, dst in re.findall(
+                rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]+>|\[[^\]]*\])", block):
+            width = max(width, len(lo) // 2)
+            lo, hi = int(lo, 16), int(hi, 16)
+            if dst.startswith(b"["):
+                for k, item in enumerate(HEX_RE.findall(dst)):
+                    mapping[lo + k] = hex_text(item)
+            else:
+                base = bytes.fromhex(dst[1:-1].decode())
+                start = int.from_bytes(base, "big")
+                for code in range(lo, min(hi, lo + 0xFFFF) + 1):
+                    value = (start + code - lo).to_bytes(len(base), "big")
+                    mapping[code] = value.decode("utf-16-be", "replace")
+    return width, mapping
+
+
+def _page_fonts(objects, page_body):
+    """Map font resource name -> decoder(bytes) -> str for one page."""
+    resources = _resolve(objects, _dict_value(page_body, b"Resources")) or b""
+    font_dict = _resolve(objects, _dict_value(resources, b"Font")) or b""
+    fonts = {}
+    for name, num in re.findall(rb"/([^\s/<>\[\]]+)\s+(\d+)\s+\d+\s+R", font_dict):
+        body = objects.get(int(num), (b"", None))[0]
+        to_unicode = REF_RE.match(_dict_value(body, b"ToUnicode") or b"")
+        if to_unicode:
+            cmap_body, cmap_stream = objects.get(int(to_unicode.group(1)), (b"", None))
+            if cmap_stream is not None:
+                fonts[name.decode("latin-1")] = _parse_cmap(
+                    _decode_stream(cmap_body, cmap_stream))
+    return fonts
+
+
+def _decode_pdf_string(raw, cmap):
+    if cmap is None:
+        return raw.decode("cp1252", "replace")
+    width, mapping = cmap
+    chars = []
+    for i in range(0, len(raw) - width + 1, width):
+        code = int.from_bytes(raw[i:i + width], "big")
+        chars.append(mapping.get(code, ""))
+    return "".join(chars)
+
+
+PDF_ESCAPES = {ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t",
+               ord("b"): b"\b", ord("f"): b"\f"}
+TOKEN_RE = re.compile(
+    rb"\((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\)"  # literal string, one nesting level
+    rb"|<[0-9A-Fa-f \t\r\n]*>"                      # hex string
+    rb"|\[|\]"
+    rb"|/[^ \t\r\n\f\x00()<>\[\]{}/%]*"             # name
+    rb"|[^ \t\r\n\f\x00()<>\[\]{}/%]+",             # number or operator
+    re.S,
+)
+INLINE_IMAGE_RE = re.compile(rb"\bBI\b.*?\bID\b.*?\bEI\b", re.S)
+ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|\r\n|.)", re.S)
+NUMBER_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+
+
+def _unescape(m):
+    seq = m.group(1)
+    if seq[:1].isdigit():
+        return bytes([int(seq, 8) & 0xFF])
+    if seq in (b"\r\n", b"\r", b"\n"):
+        return b""
+    return PDF_ESCAPES.get(seq[0], seq)
+
+
+def _tokens(content):
+    """Tokenize a content stream into (kind, value) pairs."""
+    content = INLINE_IMAGE_RE.sub(b" ", content)
+    for token in TOKEN_RE.findall(content):
+        first = token[0]
+        if first == 0x28:  # (
+            raw = token[1:-1]
+            yield "str", ESCAPE_RE.sub(_unescape, raw) if b"\\" in raw else raw
+        elif first == 0x3C:  # <
+            hexdata = re.sub(rb"\s", b"", token[1:-1])
+            hexdata += b"0" * (len(hexdata) % 2)
+            yield "str", bytes.fromhex(hexdata.decode())
+        elif first == 0x5B or first == 0x5D:  # [ ]
+            yield chr(first), None
+        elif first == 0x2F:  # /
+            yield "name", token[1:].decode("latin-1")
+        elif NUMBER_RE.fullmatch(token):
+            yield "num", float(token)
+        else:
+            yield "op", token.decode("latin-1")
+
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _mult(m1, m2):
+    """Multiply two PDF matrices [a b c d e f] (m1 applied first)."""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (a1 * a2 + b1 * c2, a1 * b2 + b1 * d2,
+            c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+            e1 * a2 + f1 * c2 + e2, e1 * b2 + f1 * d2 + f2)
+
+
+def _page_text(content, fonts):
+    """Reconstruct text lines from a page content stream.
+
+    Each shown string is placed through the text and graphics matrices,
+    then strings are grouped into lines by baseline and ordered left to
+    right, so table cells drawn one at a time come back as one row.
+    """
+    chunks = []  # (y, x, seq, text)
+    stack, array = [], None
+    ctm, saved = IDENTITY, []
+    tm = tlm = IDENTITY
+    leading = 0.0
+    cmap = None
+
+    def show(text):
+        if text.strip():
+            x, y = tm[4], tm[5]
+            ax = x * ctm[0] + y * ctm[2] + ctm[4]
+            ay = x * ctm[1] + y * ctm[3] + ctm[5]
+            chunks.append((ay, ax, len(chunks), text))
+
+    def move(tx, ty):
+        nonlocal tm, tlm
+        tlm = _mult((1.0, 0.0, 0.0, 1.0, tx, ty), tlm)
+        tm = tlm
+
+    for kind, value in _tokens(content):
+        if kind == "[":
+            array = []
+        elif kind == "]":
+            stack.append(array or [])
+            array = None
+        elif array is not None:
+            array.append((kind, value))
+        elif kind != "op":
+            stack.append(value)
+        else:
+            nums = [v for v in stack if isinstance(v, float)]
+            if value == "q":
+                saved.append(ctm)
+            elif value == "Q" and saved:
+                ctm = saved.pop()
+            elif value == "cm" and len(nums) >= 6:
+                ctm = _mult(tuple(nums[-6:]), ctm)
+            elif value == "BT":
+                tm = tlm = IDENTITY
+            elif value == "Tm" and len(nums) >= 6:
+                tm = tlm = tuple(nums[-6:])
+            elif value in ("Td", "TD") and len(nums) >= 2:
+                if value == "TD":
+                    leading = -nums[-1]
+                move(nums[-2], nums[-1])
+            elif value == "TL" and nums:
+                leading = nums[-1]
+            elif value == "T*":
+                move(0.0, -leading)
+            elif value == "Tf" and len(stack) >= 2:
+                cmap = fonts.get(stack[-2])
+            elif value == "Tj" and stack and isinstance(stack[-1], bytes):
+                show(_decode_pdf_string(stack[-1], cmap))
+            elif value in ("'", '"') and stack and isinstance(stack[-1], bytes):
+                move(0.0, -leading)
+                show(_decode_pdf_string(stack[-1], cmap))
+            elif value == "TJ" and stack and isinstance(stack[-1], list):
+                parts = []
+                for item_kind, item in stack[-1]:
+                    if item_kind == "str":
+                        parts.append(_decode_pdf_string(item, cmap))
+                    elif item_kind == "num" and item < -200:
+                        parts.append(" ")
+                show("".join(parts))
+            stack = []
+
+    def join(line):
+        # strings shown back to back without repositioning share an origin
+        out, last_x = "", None
+        for x, _, text in sorted(line):
+            if last_x is not None and abs(x - last_x) > 0.01:
+                out += " "
+            out += text
+            last_x = x
+        return out.strip()
+
+    lines, line, line_y = [], [], None
+    for y, x, seq, text in sorted(chunks, key=lambda c: (-c[0], c[1], c[2])):
+        if line_y is not None and abs(y - line_y) > 2.0:
+            lines.append(join(line))
+            line = []
+        if not line:
+            line_y = y
+        line.append((x, seq, text))
+    if line:
+        lines.append(join(line))
+    return lines
+
+
+def extract_pdf(path):
+    """One section per page with the page's text lines as paragraphs."""
+    with open(path, "rb") as f:
+        data = f.read()
+    objects = _pdf_objects(data)
+    sections = []
+    for num, page in enumerate(_page_order(data, objects), 1):
+        body = objects[page][0]
+        contents = _dict_value(body, b"Contents") or b""
+        content = b""
+        for ref in REF_RE.findall(contents):
+            obj_body, stream = objects.get(int(ref), (b"", None))
+            if stream is not None:
+                content += _decode_stream(obj_body, stream) + b"\n"
+        section = _new_section(f"Page {num}")
+        section["paragraphs"] = _page_text(content, _page_fonts(objects, body))
+        sections.append(section)
+    return sections
+
+
+# ===========================================================================
+# Public API
+# ===========================================================================
+EXTRACTORS = {
+    "pdf": extract_pdf,
+    "docx": extract_docx,
+    "xlsx": extract_xlsx,
+    "pptx": extract_pptx,
+}
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in FORMATS else None
+
+
+def extract(path):
+    """Extract one document.
+
+    Returns {"path", "format", "sections": [{"title", "paragraphs",
+    "tables"}]} where tables are lists of rows.
+    """
+    fmt = file_format(path)
+    if fmt is None:
+        raise ValueError(f"Unsupported document type: {path}")
+    return {"path": path, "format": fmt, "sections": EXTRACTORS[fmt](path)}
+
+
+def document_text(result):
+    """Flatten an extract() result to plain text (tables tab-separated)."""
+    out = []
+    for section in result["sections"]:
+        if section["title"]:
+            out.append(section["title"])
+        out.extend(section["paragraphs"])
+        for table in section["tables"]:
+            for row in table:
+                out.append("\t".join("" if v is None else str(v) for v in row))
+        out.append("")
+    return "\n".join(out).strip() + "\n"
+
+
+def list_documents(folder):
+    """All supported documents under folder, sorted."""
+    found = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if file_format(name) and not name.startswith("~$"):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+def _safe_extract(path):
+    try:
+        return extract(path)
+    except Exception as exc:  # keep a batch going past one bad file
+        return {"path": path, "format": file_format(path), "sections": [],
+                "error": f"{type(exc).__name__}: {exc}"}
+
+
+def extract_folder(folder, workers=None):
+    """Extract every document under folder across worker processes.
+
+    Results come back in list_documents() order; a file that fails to
+    parse gets an "error" key instead of aborting the batch.
+    """
+    paths = list_documents(folder)
+    if workers == 1 or len(paths) < 2:
+        return [_safe_extract(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_safe_extract, paths, chunksize=chunksize))
+
+
+# ===========================================================================
+# Benchmark
+# ===========================================================================
+def benchmark(folder=OUTPUT_DIR, repeat=20, workers=None):
+    """Time per-file extraction and a serial vs parallel folder pass."""
+    paths = list_documents(folder)
+    print(f"{'File':<36} {'Format':<6} {'Size KB':>8} {'ms/file':>9} {'Chars':>8}")
+    total = 0.0
+    for path in paths:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = extract(path)
+        elapsed = (time.perf_counter() - start) / repeat
+        total += elapsed
+        print(f"{os.path.basename(path):<36} {result['format']:<6} "
+              f"{os.path.getsize(path) / 1024:>8.1f} {elapsed * 1000:>9.2f} "
+              f"{len(document_text(result)):>8,}")
+    print(f"{'Total (serial, per pass)':<52} {total * 1000:>9.2f}")
+
+    batch = paths * repeat
+    start = time.perf_counter()
+    for path in batch:
+        _safe_extract(path)
+    serial = time.perf_counter() - start
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_safe_extract, batch, chunksize=max(1, len(batch) // (workers * 4))))
+    parallel = time.perf_counter() - start
+    print(f"{len(batch)} documents: serial {serial:.2f}s, "
+          f"{workers} workers {parallel:.2f}s ({len(batch) / parallel:,.0f} docs/s)")
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Extract text and tables from documents.")
+    parser.add_argument("path", nargs="?", default=OUTPUT_DIR,
+                        help="document or folder (default: case-study output folder)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for folders (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    parser.add_argument("--bench", action="store_true", help="run the extraction benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="benchmark repetitions")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.path, args.repeat, args.workers)
+        return
+
+    if os.path.isdir(args.path):
+        results = extract_folder(args.path, args.workers)
+    else:
+        results = [extract(args.path)]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False, default=str)
+        print()
+        return
+    for result in results:
+        print(f"===== {result['path']} =====")
+        if result.get("error"):
+            print(f"ERROR: {result['error']}")
+            continue
+        print(document_text(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Font registry for the PDF generators (gen_02, gen_03, gen_05). They take
+their font names from here instead of hard-coding Helvetica, so a branded
+TrueType family can be swapped in with P360_FONT.
+
+    helvetica, times   PDF base fonts, nothing embedded (default: helvetica)
+    vera               Bitstream Vera, shipped with reportlab
+    <Name>             <Name>-Regular/-Bold/-Italic/-BoldItalic.ttf from
+                       P360_FONT_DIR or fonts/ at the repo root
+
+Each TTF is parsed and registered once per process, along with its
+bold/italic family mapping so <b>/<i> markup resolves. reportlab embeds
+only the glyphs a document uses; the subset programs are cached here by
+glyph set, so documents in a batch that use the same characters share the
+work of building them.
+
+Usage:
+    P360_FONT=vera python gen_03_inspection.py
+    [P360_FONT=vera] python fonts.py [--repeat 10]    # batch timing and sizes
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+import reportlab
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+STYLES = ("regular", "bold", "italic", "bold_italic")
+BUILTIN_FAMILIES = {
+    "helvetica": ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique"),
+    "times": ("Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic"),
+}
+TTF_FAMILIES = {
+    "vera": ("Vera", ("Vera.ttf", "VeraBd.ttf", "VeraIt.ttf", "VeraBI.ttf")),
+}
+TTF_SUFFIXES = ("Regular", "Bold", "Italic", "BoldItalic")
+FONT_DIRS = [d for d in (
+    os.environ.get("P360_FONT_DIR"),
+    os.path.join(REPO_ROOT, "fonts"),
+    os.path.join(os.path.dirname(reportlab.__file__), "fonts"),
+) if d]
+DEFAULT_FAMILY = os.environ.get("P360_FONT") or "helvetica"
+PDF_GENERATORS = ("gen_02_pnl", "gen_03_inspection", "gen_05_title")
+
+_FAMILIES = {}
+_SUBSETS = {}
+SUBSET_STATS = {"hits": 0, "misses": 0}
+
+
+# ---------------------------------------------------------------------------
+# Subset cache
+# ---------------------------------------------------------------------------
+def _cache_subsets(face):
+    """Route face.makeSubset through the process-wide cache."""
+    make_subset = face.makeSubset
+
+    def cached(subset):
+        key = (face.filename, tuple(subset))
+        data = _SUBSETS.get(key)
+        if data is None:
+            SUBSET_STATS["misses"] += 1
+            data = _SUBSETS[key] = make_subset(subset)
+        else:
+            SUBSET_STATS["hits"] += 1
+        return data
+
+    face.makeSubset = cached
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+def find_font(filename):
+    for folder in FONT_DIRS:
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"font {filename} not found in {', '.join(FONT_DIRS)}")
+
+
+def _ttf_files(family):
+    if family.lower() in TTF_FAMILIES:
+        return TTF_FAMILIES[family.lower()]
+    return family, tuple(f"{family}-{suffix}.ttf" for suffix in TTF_SUFFIXES)
+
+
+def family(name=None):
+    """{style: registered font name} for a family, registering its TTFs
+    on first use.
+    """
+    name = name or DEFAULT_FAMILY
+    if name in _FAMILIES:
+        return _FAMILIES[name]
+    if name.lower() in BUILTIN_FAMILIES:
+        fonts = dict(zip(STYLES, BUILTIN_FAMILIES[name.lower()]))
+    else:
+        base, files = _ttf_files(name)
+        names = (base, f"{base}-Bold", f"{base}-Italic", f"{base}-BoldItalic")
+        registered = set(pdfmetrics.getRegisteredFontNames())
+        for font_name, filename in zip(names, files):
+            if font_name not in registered:
+                font = TTFont(font_name, find_font(filename))
+                _cache_subsets(font.face)
+                pdfmetrics.registerFont(font)
+        for (bold, italic), font_name in zip(((0, 0), (1, 0), (0, 1), (1, 1)), names):
+            addMapping(base, bold, italic, font_name)
+        fonts = dict(zip(STYLES, names))
+    _FAMILIES[name] = fonts
+    return fonts
+
+
+_fonts = family()
+FONT = _fonts["regular"]
+FONT_BOLD = _fonts["bold"]
+FONT_ITALIC = _fonts["italic"]
+FONT_BOLD_ITALIC = _fonts["bold_italic"]
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    """Build the PDFs repeatedly in one process, as a batch would."""
+    parser = argparse.ArgumentParser(description="Time the PDF generators with P360_FONT.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    modules = [importlib.import_module(name) for name in PDF_GENERATORS]
+    registered = time.perf_counter() - start
+
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for module in modules:
+                module.main()
+        times.append(time.perf_counter() - start)
+
+    sizes = {name: os.path.getsize(output_path(filename)) for name, filename in zip(
+        PDF_GENERATORS, ("02_profit_loss_T12.pdf", "03_inspection_report.pdf", "05_title_search.pdf"))}
+    print(f"Family {DEFAULT_FAMILY}: {FONT}, {FONT_BOLD}, {FONT_ITALIC}, {FONT_BOLD_ITALIC}")
+    for name, size in sizes.items():
+        print(f"  {name:<20} {size / 1024:>7.1f} KB")
+    print(f"Import and registration {registered * 1000:.0f} ms; first batch {times[0] * 1000:.0f} ms, "
+          f"later batches {min(times[1:] or times) * 1000:.0f} ms")
+    print(f"Subsets built {SUBSET_STATS['misses']}, reused {SUBSET_STATS['hits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,551 @@
+"""
+Evaluate the Excel formulas in an openpyxl workbook, so the sidecars can
+hold the figures a generated workbook shows instead of its formula text.
+
+Covers what the generators write: arithmetic, comparison and & operators,
+percent, cross-sheet references and ranges (with array arithmetic inside
+SUMPRODUCT), and SUM, AVERAGE, MIN, MAX, ROUND, ABS, COUNT, COUNTIF, SUMIF,
+AVERAGEIF, SUMPRODUCT, IF, AND, OR, NOT, INDEX, PMT, FV, NPV, IRR. Dates
+subtract to a day count as in Excel. Each formula cell's dependencies are
+evaluated first with an explicit stack, so long chains (a monthly loan
+schedule) need no deep recursion. Errors come back as Excel error strings
+("#DIV/0!", "#NUM!", ...).
+
+Usage:
+    python formula_eval.py WORKBOOK.xlsx [SHEET!A1 ...]
+"""
+import operator
+import sys
+import os
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from returns import irr, npv
+
+from openpyxl.formula.tokenizer import Token, Tokenizer
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string, range_boundaries
+
+
+class XLError(str):
+    """An Excel error value such as #DIV/0!."""
+
+
+DIV0 = XLError("#DIV/0!")
+VALUE = XLError("#VALUE!")
+NUM = XLError("#NUM!")
+REF = XLError("#REF!")
+NAME = XLError("#NAME?")
+
+COMPARISONS = {"=": operator.eq, "<>": operator.ne, "<": operator.lt,
+               ">": operator.gt, "<=": operator.le, ">=": operator.ge}
+# Infix operator binding power, lowest first (Excel precedence)
+PRECEDENCE = {op: 1 for op in COMPARISONS}
+PRECEDENCE.update({"&": 2, "+": 3, "-": 3, "*": 4, "/": 4, "^": 5})
+
+
+class Cells(list):
+    """Values of a multi-cell range, row-major, with its width for INDEX."""
+
+    def __init__(self, values, width):
+        super().__init__(values)
+        self.width = width
+
+
+# ---------------------------------------------------------------------------
+# Parsing: tokens -> expression tree
+# ---------------------------------------------------------------------------
+def _split_ref(text, sheet):
+    if "!" in text:
+        sheet, text = text.rsplit("!", 1)
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    return sheet, text.replace("$", "")
+
+
+def _operand(token, sheet):
+    if token.subtype == Token.NUMBER:
+        return ("value", float(token.value) if any(c in token.value for c in ".eE")
+                else int(token.value))
+    if token.subtype == Token.TEXT:
+        return ("value", token.value[1:-1].replace('""', '"'))
+    if token.subtype == Token.LOGICAL:
+        return ("value", token.value.upper() == "TRUE")
+    if token.subtype == Token.ERROR:
+        return ("value", XLError(token.value))
+    ref_sheet, ref = _split_ref(token.value, sheet)
+    if ":" in ref:
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        return ("range", ref_sheet, min_row, min_col, max_row, max_col)
+    col, row = coordinate_from_string(ref)
+    return ("cell", ref_sheet, row, column_index_from_string(col))
+
+
+class _Parser:
+    """Precedence-climbing parser over openpyxl's formula tokens."""
+
+    def __init__(self, formula, sheet):
+        self.tokens = [t for t in Tokenizer(formula).items if t.type != Token.WSPACE]
+        self.pos = 0
+        self.sheet = sheet
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        tree = self.expression(1)
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek().value!r}")
+        return tree
+
+    def expression(self, min_power):
+        left = self.unary()
+        while True:
+            token = self.peek()
+            if token is None or token.type != Token.OP_IN or PRECEDENCE[token.value] < min_power:
+                return left
+            self.take()
+            power = PRECEDENCE[token.value]
+            left = ("op", token.value, left, self.expression(power + 1))
+
+    def unary(self):
+        token = self.peek()
+        if token is not None and token.type == Token.OP_PRE:
+            self.take()
+            operand = self.unary()
+            return ("neg", operand) if token.value == "-" else operand
+        return self.postfix()
+
+    def postfix(self):
+        tree = self.primary()
+        while self.peek() is not None and self.peek().type == Token.OP_POST:
+            self.take()
+            tree = ("percent", tree)
+        return tree
+
+    def primary(self):
+        token = self.take()
+        if token is None:
+            raise ValueError("formula ends early")
+        if token.type == Token.OPERAND:
+            return _operand(token, self.sheet)
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            tree = self.expression(1)
+            self.take()   # closing paren
+            return tree
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name, args = token.value[:-1].upper(), []
+            if not (self.peek().type == Token.FUNC and self.peek().subtype == Token.CLOSE):
+                while True:
+                    args.append(self.expression(1))
+                    if self.take().type != Token.SEP:
+                        break
+            else:
+                self.take()
+            return ("call", name, args)
+        raise ValueError(f"unexpected {token.value!r}")
+
+
+def _references(tree, found):
+    """Collect (sheet, row, col) of every cell the tree reads."""
+    kind = tree[0]
+    if kind == "cell":
+        found.append(tree[1:])
+    elif kind == "range":
+        _, sheet, r1, c1, r2, c2 = tree
+        found.extend((sheet, r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1))
+    elif kind in ("neg", "percent"):
+        _references(tree[1], found)
+    elif kind == "op":
+        _references(tree[2], found)
+        _references(tree[3], found)
+    elif kind == "call":
+        for arg in tree[2]:
+            _references(arg, found)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+def _is_error(value):
+    return isinstance(value, XLError)
+
+
+def _day(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _number(value):
+    if value is None or value == "":
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float, XLError)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return VALUE
+    return value   # dates stay dates for date arithmetic
+
+
+def _arith(op, a, b):
+    a, b = _number(a), _number(b)
+    for v in (a, b):
+        if _is_error(v):
+            return v
+    a, b = _day(a), _day(b)
+    try:
+        if op == "+":
+            result = a + (timedelta(days=b) if isinstance(a, date) else b)
+        elif op == "-":
+            if isinstance(a, date) and isinstance(b, date):
+                return (a - b).days
+            result = a - (timedelta(days=b) if isinstance(a, date) else b)
+        elif op == "*":
+            result = a * b
+        elif op == "/":
+            result = a / b
+        else:
+            result = a ** b
+    except ZeroDivisionError:
+        return DIV0
+    except (TypeError, OverflowError, ValueError):
+        return NUM if op == "^" else VALUE
+    return NUM if isinstance(result, complex) else result
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _compare(op, a, b):
+    if a is None:
+        a = "" if isinstance(b, str) else 0
+    if b is None:
+        b = "" if isinstance(a, str) else 0
+    a, b = _day(a), _day(b)
+    if isinstance(a, str) and isinstance(b, str):
+        a, b = a.lower(), b.lower()
+    elif isinstance(a, str) != isinstance(b, str):
+        # Excel orders every number before any text
+        a, b = (isinstance(a, str), 0), (isinstance(b, str), 0)
+    return COMPARISONS[op](a, b)
+
+
+def _binary(op, a, b):
+    if isinstance(a, list) or isinstance(b, list):
+        n = len(a) if isinstance(a, list) else len(b)
+        a = a if isinstance(a, list) else [a] * n
+        b = b if isinstance(b, list) else [b] * n
+        return [_binary(op, x, y) for x, y in zip(a, b)]
+    if _is_error(a):
+        return a
+    if _is_error(b):
+        return b
+    if op in COMPARISONS:
+        return _compare(op, a, b)
+    if op == "&":
+        return _text(a) + _text(b)
+    return _arith(op, a, b)
+
+
+def _flatten(args):
+    for arg in args:
+        if isinstance(arg, list):
+            yield from arg
+        else:
+            yield arg
+
+
+def _numbers(args):
+    """Numeric values among args: range cells must be numbers; scalar
+    arguments are coerced as Excel does.
+    """
+    out = []
+    for arg in args:
+        if isinstance(arg, list):
+            out.extend(v for v in arg if isinstance(v, (int, float)) and not isinstance(v, bool))
+        else:
+            out.append(_number(arg))
+    return out
+
+
+def _criterion(criteria):
+    """Predicate for COUNTIF-style criteria ("Occupied", ">0", 5)."""
+    op, operand = "=", criteria
+    if isinstance(criteria, str):
+        for candidate in ("<=", ">=", "<>", "<", ">", "="):
+            if criteria.startswith(candidate):
+                op, operand = candidate, criteria[len(candidate):]
+                break
+        try:
+            operand = float(operand)
+        except ValueError:
+            pass
+    if isinstance(operand, str):
+        return lambda v: isinstance(v, str) and _compare(op, v, operand)
+    return lambda v: (isinstance(v, (int, float)) and not isinstance(v, bool)
+                      and _compare(op, v, operand))
+
+
+# ---------------------------------------------------------------------------
+# Functions
+# ---------------------------------------------------------------------------
+def _sum(*args):
+    values = _numbers(args)
+    return next((v for v in values if _is_error(v)), None) or sum(values)
+
+
+def _average(*args):
+    values = _numbers(args)
+    return sum(values) / len(values) if values else DIV0
+
+
+def _countif(cells, criteria):
+    match = _criterion(criteria)
+    return sum(1 for v in cells if match(v))
+
+
+def _sumif(cells, criteria, sum_cells=None):
+    match = _criterion(criteria)
+    sum_cells = cells if sum_cells is None else sum_cells
+    return sum(_number(s) for v, s in zip(cells, sum_cells) if match(v))
+
+
+def _averageif(cells, criteria, avg_cells=None):
+    match = _criterion(criteria)
+    avg_cells = cells if avg_cells is None else avg_cells
+    values = [_number(s) for v, s in zip(cells, avg_cells) if match(v)]
+    return sum(values) / len(values) if values else DIV0
+
+
+def _sumproduct(*arrays):
+    arrays = [a if isinstance(a, list) else [a] for a in arrays]
+    total = 0
+    for values in zip(*arrays):
+        product = 1
+        for v in values:
+            if _is_error(v):
+                return v
+            product *= _number(v) if not isinstance(v, str) else 0
+        total += product
+    return total
+
+
+def _index(cells, row, col=None):
+    if not isinstance(cells, list):
+        return cells
+    row, col = int(_number(row)), None if col is None else int(_number(col))
+    width = getattr(cells, "width", 1)
+    if col is None:
+        i = row - 1   # one-dimensional range: row or column
+    else:
+        i = (row - 1) * width + col - 1
+    return cells[i] if 0 <= i < len(cells) else REF
+
+
+def _pmt(rate, nper, pv, fv=0, when=0):
+    rate, nper, pv, fv, when = map(_number, (rate, nper, pv, fv, when))
+    if nper == 0:
+        return NUM
+    if rate == 0:
+        return -(pv + fv) / nper
+    growth = (1 + rate) ** nper
+    return -(pv * growth + fv) * rate / ((1 + rate * when) * (growth - 1))
+
+
+def _fv(rate, nper, pmt, pv=0, when=0):
+    rate, nper, pmt, pv, when = map(_number, (rate, nper, pmt, pv, when))
+    if rate == 0:
+        return -(pv + pmt * nper)
+    growth = (1 + rate) ** nper
+    return -(pv * growth + pmt * (1 + rate * when) * (growth - 1) / rate)
+
+
+def _npv(rate, *values):
+    return npv(_number(rate), [0] + _numbers(values))
+
+
+def _irr(values, guess=0.1):
+    rate = irr(_numbers([values]), _number(guess))
+    return NUM if rate is None else rate
+
+
+def _round(value, digits=0):
+    return round(_number(value), int(_number(digits)))
+
+
+FUNCTIONS = {
+    "SUM": _sum,
+    "AVERAGE": _average,
+    "MIN": lambda *a: min(_numbers(a), default=0),
+    "MAX": lambda *a: max(_numbers(a), default=0),
+    "ROUND": _round,
+    "ABS": lambda v: abs(_number(v)),
+    "COUNT": lambda *a: len(_numbers([x if isinstance(x, list) else [x] for x in a])),
+    "COUNTIF": _countif,
+    "SUMIF": _sumif,
+    "AVERAGEIF": _averageif,
+    "SUMPRODUCT": _sumproduct,
+    "AND": lambda *a: all(bool(_number(v)) for v in _flatten(a)),
+    "OR": lambda *a: any(bool(_number(v)) for v in _flatten(a)),
+    "NOT": lambda v: not bool(_number(v)),
+    "INDEX": _index,
+    "PMT": _pmt,
+    "FV": _fv,
+    "NPV": _npv,
+    "IRR": _irr,
+}
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+class WorkbookEvaluator:
+    """Values of a workbook's cells, formulas evaluated on demand and cached."""
+
+    def __init__(self, wb):
+        self.raw = {}
+        self.titles = [ws.title for ws in wb.worksheets]
+        for ws in wb.worksheets:
+            for row in ws.iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        self.raw[(ws.title, cell.row, cell.column)] = cell.value
+        self.trees = {}
+        self.values = {}
+
+    def _tree(self, key):
+        if key not in self.trees:
+            try:
+                self.trees[key] = _Parser(self.raw[key], key[0]).parse()
+            except (ValueError, IndexError, AttributeError, KeyError):
+                self.trees[key] = ("value", NAME)
+        return self.trees[key]
+
+    def _is_formula(self, key):
+        value = self.raw.get(key)
+        return isinstance(value, str) and value.startswith("=") and len(value) > 1
+
+    def value(self, sheet, row, col):
+        key = (sheet, row, col)
+        if not self._is_formula(key):
+            return self.raw.get(key)
+        if key in self.values:
+            return self.values[key]
+        # Evaluate dependencies first, deepest last-pushed, so the tree walk
+        # below only ever reads cached values
+        stack, visiting = [key], set()
+        while stack:
+            current = stack[-1]
+            if current in self.values:
+                stack.pop()
+                continue
+            pending = [ref for ref in _references(self._tree(current), [])
+                       if self._is_formula(ref) and ref not in self.values]
+            if current in visiting or not pending:
+                if pending:   # circular reference
+                    self.values[current] = REF
+                else:
+                    self.values[current] = self._eval(self._tree(current))
+                visiting.discard(current)
+                stack.pop()
+                continue
+            visiting.add(current)
+            stack.extend(ref for ref in pending if ref not in visiting)
+        return self.values[key]
+
+    def _cached(self, sheet, row, col):
+        key = (sheet, row, col)
+        if sheet not in self.titles:
+            return REF
+        return self.values.get(key, REF) if self._is_formula(key) else self.raw.get(key)
+
+    def _eval(self, tree):
+        kind = tree[0]
+        if kind == "value":
+            return tree[1]
+        if kind == "cell":
+            return self._cached(*tree[1:])
+        if kind == "range":
+            _, sheet, r1, c1, r2, c2 = tree
+            return Cells([self._cached(sheet, r, c) for r in range(r1, r2 + 1)
+                          for c in range(c1, c2 + 1)], c2 - c1 + 1)
+        if kind == "neg":
+            value = self._eval(tree[1])
+            if isinstance(value, list):
+                return [_arith("-", 0, v) for v in value]
+            return _arith("-", 0, value)
+        if kind == "percent":
+            return _arith("/", self._eval(tree[1]), 100)
+        if kind == "op":
+            return _binary(tree[1], self._eval(tree[2]), self._eval(tree[3]))
+        name, args = tree[1], tree[2]
+        if name == "IF":
+            test = self._eval(args[0])
+            if _is_error(test):
+                return test
+            branch = 1 if bool(_number(test)) else 2
+            if branch >= len(args):
+                return False
+            return self._eval(args[branch])
+        if name not in FUNCTIONS:
+            return NAME
+        values = [self._eval(a) for a in args]
+        try:
+            return FUNCTIONS[name](*values)
+        except ZeroDivisionError:
+            return DIV0
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return VALUE
+
+
+def workbook_values(wb):
+    """{sheet title: rows of values}, like ws.iter_rows(values_only=True)
+    with every formula replaced by its result.
+    """
+    evaluator = WorkbookEvaluator(wb)
+    grid = {}
+    for ws in wb.worksheets:
+        grid[ws.title] = [
+            tuple(evaluator.value(ws.title, cell.row, cell.column) for cell in row)
+            for row in ws.iter_rows()
+        ]
+    return grid
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    from openpyxl import load_workbook
+
+    if len(sys.argv) < 2:
+        sys.exit(__doc__.strip().splitlines()[-1].strip())
+    wb = load_workbook(sys.argv[1])
+    evaluator = WorkbookEvaluator(wb)
+    refs = sys.argv[2:] or [
+        f"{ws.title}!{cell.coordinate}" for ws in wb.worksheets for row in ws.iter_rows()
+        for cell in row if evaluator._is_formula((ws.title, cell.row, cell.column))
+    ]
+    for ref in refs:
+        sheet, coord = ref.rsplit("!", 1)
+        col, row = coordinate_from_string(coord)
+        print(f"{ref:<32} {evaluator.value(sheet, row, column_index_from_string(col))!r}")
+
+
+if __name__ == "__main__":
+    main()
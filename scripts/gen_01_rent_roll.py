@@ -1,14 +1,22 @@
 """
 Generate 01_rent_roll_2025.xlsx for Palm Bay Palms Apartments case study.
-Three sheets: Rent Roll, Monthly Collections, Summary.
+Four sheets: Rent Roll, Monthly Collections, Summary (metrics + unit mix),
+Lease Expirations.
 """
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_workbook
+from reproducible import normalize
+from ledger import (AGING_BUCKETS, aging, build_ledger, collection_rate,
+                    collections_summary, delinquency_loss, monthly_collections)
+from rollover import ladder, rollover_risk
+from unit_mix import group_by, totals
 
 from openpyxl import Workbook
+from openpyxl.chart import BarChart, LineChart, Reference
 from openpyxl.styles import Font, PatternFill, numbers, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
@@ -118,6 +126,25 @@ def create_rent_roll_sheet(wb):
     ws.freeze_panes = "A2"
     ws.auto_filter.ref = f"A1:M{len(UNITS) + 1}"
 
+    # Rent vs market by unit, straight from columns G and H
+    last_row = len(UNITS) + 1
+    chart = BarChart()
+    chart.type = "col"
+    chart.grouping = "clustered"
+    chart.title = "Monthly Rent vs. Market Rent"
+    chart.y_axis.numFmt = CURRENCY_FMT
+    chart.x_axis.title = "Unit"
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    chart.add_data(Reference(ws, min_col=7, max_col=8, min_row=1, max_row=last_row),
+                   titles_from_data=True)
+    chart.set_categories(Reference(ws, min_col=1, min_row=2, max_row=last_row))
+    for series, color in zip(chart.series, (NAVY, "C59A2C")):
+        series.graphicalProperties.solidFill = color
+    chart.legend.position = "b"
+    chart.width, chart.height = 24, 9
+    ws.add_chart(chart, f"A{last_row + 3}")
+
     return ws
 
 
@@ -134,7 +161,8 @@ def create_monthly_collections_sheet(wb):
 
     style_header_row(ws, len(headers))
 
-    collections = get_monthly_collections()
+    ledger = build_ledger()
+    collections = monthly_collections(ledger)
 
     # Data rows (rows 2-19)
     for i, u in enumerate(UNITS):
@@ -198,25 +226,8 @@ def create_monthly_collections_sheet(wb):
     style_body_cell(ws.cell(row=delinq_row, column=1))
     ws.cell(row=delinq_row, column=1).font = Font(name="Arial", size=10, bold=True)
 
-    # Calculate delinquency losses per month from data
-    # Unit 103 (row index 2 = row 4): rent $950, missed months 10,11 (Jan 2026, Feb 2026)
-    # Unit 207 (row index 12 = row 14): rent $1200, missed month 11 (Feb 2026)
-    delinq_units = {}
-    for i, u in enumerate(UNITS):
-        if u[U_DELINQ] != "No" and u[U_DELINQ] != "":
-            delinq_units[u[U_NUM]] = {
-                "row": i + 2,
-                "rent": u[U_RENT],
-                "delinq": u[U_DELINQ],
-            }
-
-    # Build per-month delinquency loss from the collections data
-    delinq_monthly = [0] * 12
-    for unit_num, info in delinq_units.items():
-        month_data = collections.get(unit_num, [0] * 12)
-        for m in range(12):
-            if month_data[m] == 0:
-                delinq_monthly[m] += info["rent"]
+    # Rent charged but not received, per month, from the ledger
+    delinq_monthly = delinquency_loss(ledger)
 
     for m in range(12):
         cell = ws.cell(row=delinq_row, column=m + 2, value=delinq_monthly[m])
@@ -224,6 +235,68 @@ def create_monthly_collections_sheet(wb):
         apply_currency(cell)
         cell.font = Font(name="Arial", size=10, bold=True)
 
+    # -- Summary Row: Economic Occupancy (collected / GPR) --
+    occ_row = summary_start + 3
+    ws.cell(row=occ_row, column=1, value="Economic Occupancy")
+    style_body_cell(ws.cell(row=occ_row, column=1))
+    ws.cell(row=occ_row, column=1).font = Font(name="Arial", size=10, bold=True)
+    for m in range(12):
+        col_letter = get_column_letter(m + 2)
+        cell = ws.cell(row=occ_row, column=m + 2,
+                       value=f"={col_letter}{total_row}/{gpr_monthly}")
+        style_body_cell(cell)
+        cell.number_format = PCT_FMT
+        cell.font = Font(name="Arial", size=10, bold=True)
+
+    # -- Summary Row: Collection Rate (received / charged) --
+    rate_row = summary_start + 4
+    ws.cell(row=rate_row, column=1, value="Collection Rate")
+    style_body_cell(ws.cell(row=rate_row, column=1))
+    ws.cell(row=rate_row, column=1).font = Font(name="Arial", size=10, bold=True)
+    monthly_rates, _ = collection_rate(ledger)
+    for m in range(12):
+        cell = ws.cell(row=rate_row, column=m + 2, value=round(monthly_rates[m], 4))
+        style_body_cell(cell)
+        cell.number_format = PCT_FMT
+        cell.font = Font(name="Arial", size=10, bold=True)
+
+    # -- Chart: collected + vacancy loss stacked to GPR, occupancy line --
+    months = Reference(ws, min_col=2, max_col=13, min_row=1)
+    chart = BarChart()
+    chart.type = "col"
+    chart.grouping = "stacked"
+    chart.overlap = 100
+    chart.title = "Collections vs. Gross Potential Rent"
+    chart.y_axis.title = "Monthly $"
+    chart.y_axis.numFmt = CURRENCY_FMT
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    for r in (total_row, vacancy_row):
+        chart.add_data(Reference(ws, min_col=1, max_col=13, min_row=r),
+                       titles_from_data=True, from_rows=True)
+    chart.set_categories(months)
+    for series, color in zip(chart.series, (NAVY, "C0504D")):
+        series.graphicalProperties.solidFill = color
+
+    occupancy = LineChart()
+    occupancy.add_data(Reference(ws, min_col=1, max_col=13, min_row=occ_row),
+                       titles_from_data=True, from_rows=True)
+    occupancy.y_axis.axId = 200
+    occupancy.y_axis.title = "Economic Occupancy"
+    occupancy.y_axis.numFmt = '0%'
+    occupancy.y_axis.scaling.min = 0
+    occupancy.y_axis.scaling.max = 1
+    occupancy.y_axis.crosses = "max"
+    occupancy.y_axis.majorGridlines = None
+    occupancy.y_axis.delete = False
+    occupancy.series[0].graphicalProperties.line.solidFill = "C59A2C"
+    occupancy.series[0].graphicalProperties.line.width = 28575  # 2.25pt
+    chart += occupancy
+
+    chart.legend.position = "b"
+    chart.width, chart.height = 24, 10
+    ws.add_chart(chart, f"A{rate_row + 3}")
+
     # Column widths
     ws.column_dimensions["A"].width = 8
     for m in range(12):
@@ -298,9 +371,58 @@ def create_summary_sheet(wb):
         style_body_cell(val_cell)
         val_cell.number_format = fmt
 
+    # -- Unit mix by type (from the shared unit-mix engine) --
+    mix_start = len(metrics) + 3
+    mix_headers = ["Unit Type", "Units", "Occupied", "Avg SF", "Avg Rent (Occupied)",
+                   "Market Rent", "Monthly Upside"]
+    for c, header in enumerate(mix_headers, 1):
+        cell = ws.cell(row=mix_start, column=c, value=header)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = THIN_BORDER
+
+    mix_rows = list(group_by("type").items()) + [("Total", totals())]
+    for i, (utype, mix) in enumerate(mix_rows):
+        row = mix_start + 1 + i
+        values = [utype, mix["count"], mix["occupied"], round(mix["avg_sf"]),
+                  round(mix["avg_rent"]), round(mix["avg_market"]), mix["upside"]]
+        for c, value in enumerate(values, 1):
+            cell = ws.cell(row=row, column=c, value=value)
+            style_body_cell(cell)
+            if c >= 5:
+                apply_currency(cell)
+            if utype == "Total" or c == 1:
+                cell.font = Font(name="Arial", size=10, bold=True)
+
+    # -- Arrears aging as of the rent roll date (from the collections ledger) --
+    aging_start = mix_start + len(mix_rows) + 2
+    aging_headers = ["Unit / Tenant", "Days Past Due"] + [f"{b} Days" for b in AGING_BUCKETS] \
+        + ["Total Owed"]
+    for c, header in enumerate(aging_headers, 1):
+        cell = ws.cell(row=aging_start, column=c, value=header)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = THIN_BORDER
+
+    receivables = aging()
+    for i, (num, row_data) in enumerate(receivables.items()):
+        row = aging_start + 1 + i
+        values = [f"{num} - {row_data['tenant']}", row_data["days_past_due"]] \
+            + [row_data[b] for b in AGING_BUCKETS] + [row_data["total"]]
+        for c, value in enumerate(values, 1):
+            cell = ws.cell(row=row, column=c, value=value)
+            style_body_cell(cell)
+            if c >= 3:
+                apply_currency(cell)
+        ws.cell(row=row, column=1).font = Font(name="Arial", size=10, bold=True)
+
     # Column widths
     ws.column_dimensions["A"].width = 35
     ws.column_dimensions["B"].width = 18
+    for letter in "CDEFG":
+        ws.column_dimensions[letter].width = 14
 
     # Freeze pane
     ws.freeze_panes = "A2"
@@ -309,6 +431,89 @@ def create_summary_sheet(wb):
     return ws
 
 
+# ===========================================================================
+# Sheet 4: Lease Expirations
+# ===========================================================================
+def create_lease_expirations_sheet(wb):
+    ws = wb.create_sheet("Lease Expirations")
+
+    headers = ["Period", "Leases Expiring", "Units", "Rent at Risk (Monthly)",
+               "% of In-Place Rent", "Cumulative %", "Market Rent", "Mark-to-Market Upside"]
+    for c, header in enumerate(headers, 1):
+        ws.cell(row=1, column=c, value=header)
+    style_header_row(ws, len(headers))
+
+    buckets = ladder(UNITS, AS_OF)
+    first, last = 2, len(buckets) + 1
+    total_row = last + 1
+    for i, b in enumerate(buckets):
+        row = first + i
+        values = [b["label"], b["leases"], ", ".join(b["units"]), b["rent_at_risk"],
+                  f"=IF($D${total_row}=0,0,D{row}/$D${total_row})",
+                  f"=IF($D${total_row}=0,0,SUM($D${first}:D{row})/$D${total_row})",
+                  b["market_rent"], b["mark_to_market"]]
+        for c, value in enumerate(values, 1):
+            cell = ws.cell(row=row, column=c, value=value)
+            style_body_cell(cell)
+        for c in (4, 7, 8):
+            apply_currency(ws.cell(row=row, column=c))
+        for c in (5, 6):
+            ws.cell(row=row, column=c).number_format = PCT_FMT
+        # Month-to-month leases can roll on 30 days' notice
+        if i == 0 and b["leases"]:
+            for c in range(1, len(headers) + 1):
+                ws.cell(row=row, column=c).fill = BELOW_MARKET_FILL
+
+    ws.cell(row=total_row, column=1, value="Total")
+    ws.cell(row=total_row, column=2, value=f"=SUM(B{first}:B{last})")
+    for c in (4, 7, 8):
+        letter = get_column_letter(c)
+        ws.cell(row=total_row, column=c, value=f"=SUM({letter}{first}:{letter}{last})")
+        apply_currency(ws.cell(row=total_row, column=c))
+    for c in range(1, len(headers) + 1):
+        style_body_cell(ws.cell(row=total_row, column=c))
+        ws.cell(row=total_row, column=c).font = Font(name="Arial", size=10, bold=True)
+
+    # Headline rollover figures
+    risk = rollover_risk(UNITS, AS_OF)
+    notes_row = total_row + 2
+    notes = [
+        ("Rent Roll Date", AS_OF, None),
+        ("Weighted Avg. Remaining Term (months)", risk["walt_months"], '0.0'),
+        ("Rent Rolling Within 12 Months", risk["pct_of_rent"], PCT_FMT),
+        ("Peak Expiration Month", risk["peak_month"], None),
+    ]
+    for i, (label, value, fmt) in enumerate(notes):
+        label_cell = ws.cell(row=notes_row + i, column=1, value=label)
+        style_body_cell(label_cell)
+        label_cell.font = Font(name="Arial", size=10, bold=True)
+        value_cell = ws.cell(row=notes_row + i, column=2, value=value)
+        style_body_cell(value_cell)
+        if fmt:
+            value_cell.number_format = fmt
+
+    # Rent at risk by period
+    chart = BarChart()
+    chart.type = "col"
+    chart.title = "Monthly Rent at Risk by Expiration Period"
+    chart.y_axis.numFmt = CURRENCY_FMT
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    chart.add_data(Reference(ws, min_col=4, min_row=1, max_row=last), titles_from_data=True)
+    chart.set_categories(Reference(ws, min_col=1, min_row=first, max_row=last))
+    chart.series[0].graphicalProperties.solidFill = NAVY
+    chart.legend = None
+    chart.width, chart.height = 24, 9
+    ws.add_chart(chart, f"A{notes_row + len(notes) + 2}")
+
+    col_widths = [38, 10, 26, 14, 12, 12, 12, 14]
+    for c, w in enumerate(col_widths, 1):
+        ws.column_dimensions[get_column_letter(c)].width = w
+
+    ws.freeze_panes = "A2"
+    return ws
+
+
 # ===========================================================================
 # Main
 # ===========================================================================
@@ -318,11 +523,37 @@ def main():
     create_rent_roll_sheet(wb)
     create_monthly_collections_sheet(wb)
     create_summary_sheet(wb)
+    create_lease_expirations_sheet(wb)
 
     filepath = output_path("01_rent_roll_2025.xlsx")
     wb.save(filepath)
+    normalize(filepath)
     print(f"Created 01_rent_roll_2025.xlsx at {filepath}")
 
+    month_to_month = sum(1 for u in UNITS if u[U_STATUS] == "Occupied" and u[U_LEASE_END] == "MTM")
+    write_sidecar(
+        "01_rent_roll_2025.xlsx", "Rent Roll 2025",
+        sections_from_workbook(wb),
+        key_figures={
+            "total_units": TOTAL_UNITS,
+            "occupied_units": OCCUPIED_UNITS,
+            "vacant_units": VACANT_UNITS,
+            "occupancy_rate": round(OCCUPIED_UNITS / TOTAL_UNITS, 4),
+            "monthly_rent_actual": ACTUAL_MONTHLY_RENT,
+            "monthly_market_rent": GROSS_POTENTIAL_RENT_MONTHLY,
+            "security_deposits_held": TOTAL_SECURITY_DEPOSITS,
+            "delinquent_units": [u[U_NUM] for u in UNITS if u[U_DELINQ].startswith("Yes")],
+            "lease_rollover": rollover_risk(UNITS, AS_OF),
+            "collections": collections_summary(),
+        },
+        evidence={
+            "3-1": f"{OCCUPIED_UNITS} current leases with expiration dates",
+            "3-2": f"${ACTUAL_MONTHLY_RENT:,}/mo actual vs ${GROSS_POTENTIAL_RENT_MONTHLY:,}/mo market",
+            "3-3": f"{month_to_month} month-to-month, {OCCUPIED_UNITS - month_to_month} fixed-term",
+            "3-6": f"{TOTAL_UNITS}-unit rent roll (XLSX)",
+        },
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -7,6 +7,10 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from ledger import economic_loss
+from sidecar import write_sidecar, sections_from_story
+from reproducible import normalize
+from fonts import FONT, FONT_BOLD, FONT_ITALIC
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER, landscape
@@ -37,7 +41,7 @@ styles = getSampleStyleSheet()
 STYLE_TITLE = ParagraphStyle(
     "PNLTitle",
     parent=styles["Title"],
-    fontName="Helvetica-Bold",
+    fontName=FONT_BOLD,
     fontSize=16,
     textColor=WHITE_COLOR,
     alignment=TA_LEFT,
@@ -49,7 +53,7 @@ STYLE_TITLE = ParagraphStyle(
 STYLE_SUBTITLE = ParagraphStyle(
     "PNLSubtitle",
     parent=styles["Normal"],
-    fontName="Helvetica",
+    fontName=FONT,
     fontSize=10,
     textColor=colors.HexColor("#B0BEC5"),
     alignment=TA_LEFT,
@@ -61,7 +65,7 @@ STYLE_SUBTITLE = ParagraphStyle(
 STYLE_FOOTER = ParagraphStyle(
     "PNLFooter",
     parent=styles["Normal"],
-    fontName="Helvetica",
+    fontName=FONT,
     fontSize=8,
     textColor=colors.HexColor("#888888"),
     alignment=TA_CENTER,
@@ -71,7 +75,7 @@ STYLE_FOOTER = ParagraphStyle(
 STYLE_SECTION = ParagraphStyle(
     "PNLSection",
     parent=styles["Normal"],
-    fontName="Helvetica-Bold",
+    fontName=FONT_BOLD,
     fontSize=9,
     textColor=WHITE_COLOR,
     alignment=TA_LEFT,
@@ -79,31 +83,31 @@ STYLE_SECTION = ParagraphStyle(
 
 # Cell text styles
 STYLE_LABEL = ParagraphStyle(
-    "CellLabel", fontName="Helvetica", fontSize=7.5, leading=9,
+    "CellLabel", fontName=FONT, fontSize=7.5, leading=9,
     textColor=BLACK_COLOR, alignment=TA_LEFT,
 )
 STYLE_LABEL_BOLD = ParagraphStyle(
-    "CellLabelBold", fontName="Helvetica-Bold", fontSize=7.5, leading=9,
+    "CellLabelBold", fontName=FONT_BOLD, fontSize=7.5, leading=9,
     textColor=BLACK_COLOR, alignment=TA_LEFT,
 )
 STYLE_LABEL_INDENT = ParagraphStyle(
-    "CellLabelIndent", fontName="Helvetica", fontSize=7.5, leading=9,
+    "CellLabelIndent", fontName=FONT, fontSize=7.5, leading=9,
     textColor=BLACK_COLOR, alignment=TA_LEFT, leftIndent=10,
 )
 STYLE_NUM = ParagraphStyle(
-    "CellNum", fontName="Helvetica", fontSize=7.5, leading=9,
+    "CellNum", fontName=FONT, fontSize=7.5, leading=9,
     textColor=BLACK_COLOR, alignment=TA_RIGHT,
 )
 STYLE_NUM_BOLD = ParagraphStyle(
-    "CellNumBold", fontName="Helvetica-Bold", fontSize=7.5, leading=9,
+    "CellNumBold", fontName=FONT_BOLD, fontSize=7.5, leading=9,
     textColor=BLACK_COLOR, alignment=TA_RIGHT,
 )
 STYLE_NUM_RED = ParagraphStyle(
-    "CellNumRed", fontName="Helvetica", fontSize=7.5, leading=9,
+    "CellNumRed", fontName=FONT, fontSize=7.5, leading=9,
     textColor=RED_COLOR, alignment=TA_RIGHT,
 )
 STYLE_NUM_RED_BOLD = ParagraphStyle(
-    "CellNumRedBold", fontName="Helvetica-Bold", fontSize=7.5, leading=9,
+    "CellNumRedBold", fontName=FONT_BOLD, fontSize=7.5, leading=9,
     textColor=RED_COLOR, alignment=TA_RIGHT,
 )
 
@@ -199,20 +203,16 @@ def build_monthly_gpr():
 
 
 def build_monthly_vacancy():
-    """Vacancy loss: heavier in later months (units went vacant Dec 2025 and Jan 2026).
-    Unit 206 vacant from Dec 2025 (index 9): market $1,450/mo
-    Unit 105 vacant from Jan 2026 (index 10): market $1,200/mo
-    Also account for delinquency-related effective vacancy.
+    """Vacancy loss, shaped by the collections ledger: each month's weight is
+    market rent on all units less rent received (vacancy, delinquency and
+    loss-to-lease), so Dec 2025 (unit 206 vacant) and Jan-Feb 2026 (unit 105
+    vacant, units 103/207 unpaid) carry the most.
     Distribute so annual sums to -31,200."""
-    # Base: mild vacancy across all months, heavier in Dec-Feb
-    # Months 0-8 (Mar-Nov): about $1,500/mo baseline vacancy (partial occupancy issues)
-    # Month 9 (Dec): unit 206 goes vacant = jump
-    # Month 10-11 (Jan-Feb): both units vacant = largest
-    base_monthly = [1800] * 9 + [3200, 4800, 4800]
+    weights = economic_loss()
     # Scale to match annual total
-    raw_total = sum(base_monthly)
-    target = 31200
-    scaled = [round(v * target / raw_total, 2) for v in base_monthly]
+    raw_total = sum(weights)
+    target = -VACANCY_ANNUAL
+    scaled = [round(v * target / raw_total, 2) for v in weights]
     # Fix rounding
     diff = round(target - sum(scaled), 2)
     scaled[-1] = round(scaled[-1] + diff, 2)
@@ -446,7 +446,7 @@ def build_pdf():
             STYLE_TITLE,
         ),
         Paragraph("Property360", ParagraphStyle(
-            "LogoText", fontName="Helvetica-Bold", fontSize=11,
+            "LogoText", fontName=FONT_BOLD, fontSize=11,
             textColor=WHITE_COLOR, alignment=TA_RIGHT,
         )),
     ]]
@@ -467,7 +467,7 @@ def build_pdf():
         Paragraph(
             f"{PROPERTY['address']}",
             ParagraphStyle(
-                "AddrText", fontName="Helvetica", fontSize=8,
+                "AddrText", fontName=FONT, fontSize=8,
                 textColor=colors.HexColor("#B0BEC5"), alignment=TA_RIGHT,
             ),
         ),
@@ -503,7 +503,7 @@ def build_pdf():
     # Build table style commands
     style_cmds = [
         # Global defaults
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTNAME", (0, 0), (-1, -1), FONT),
         ("FONTSIZE", (0, 0), (-1, -1), 7.5),
         ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
         ("TOPPADDING", (0, 0), (-1, -1), 3),
@@ -514,7 +514,7 @@ def build_pdf():
         # Column header row (row 0) styling
         ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#37474F")),
         ("TEXTCOLOR", (0, 0), (-1, 0), WHITE_COLOR),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTNAME", (0, 0), (-1, 0), FONT_BOLD),
         ("LINEBELOW", (0, 0), (-1, 0), 1, NAVY_COLOR),
 
         # Grid lines
@@ -577,14 +577,35 @@ def build_pdf():
     elements.append(Paragraph(
         "Confidential &mdash; For Authorized Use Only",
         ParagraphStyle(
-            "ConfFooter", fontName="Helvetica-Oblique", fontSize=7,
+            "ConfFooter", fontName=FONT_ITALIC, fontSize=7,
             textColor=colors.HexColor("#AAAAAA"), alignment=TA_CENTER,
             spaceBefore=2,
         ),
     ))
 
-    # Build
+    # Build (doc.build consumes the list, so capture the sidecar sections first)
+    sections = sections_from_story(elements, {}, title="Trailing 12-Month P&L")
     doc.build(elements)
+    normalize(filepath)
+
+    write_sidecar(
+        "02_profit_loss_T12.pdf", "Trailing 12-Month P&L",
+        sections,
+        key_figures={
+            "period": "March 2025 - February 2026",
+            "gross_potential_rent": GPR_ACTUAL,
+            "vacancy_loss": VACANCY_LOSS_ACTUAL_PRD,
+            "effective_gross_income": EGI_ACTUAL,
+            "total_revenue": TOTAL_REVENUE_ACTUAL,
+            "total_expenses": TOTAL_EXPENSES_ACTUAL,
+            "net_operating_income": NOI_ACTUAL,
+            "debt_service": ANNUAL_DEBT_SERVICE,
+            "cash_flow_after_debt_service": CASH_FLOW_AFTER_DS,
+        },
+        evidence={
+            "4-5": f"Laundry ${LAUNDRY_INCOME_ACTUAL:,}, late fees ${LATE_FEES_ACTUAL:,} (T12)",
+        },
+    )
     return filepath
 
 
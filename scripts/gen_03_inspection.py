@@ -11,6 +11,9 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_story
+from reproducible import normalize
+from fonts import FONT, FONT_BOLD
 
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
@@ -52,7 +55,7 @@ def build_styles():
     custom["cover_title"] = ParagraphStyle(
         "CoverTitle",
         parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=22,
         leading=28,
         textColor=NAVY_COLOR,
@@ -62,7 +65,7 @@ def build_styles():
     custom["cover_subtitle"] = ParagraphStyle(
         "CoverSubtitle",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=13,
         leading=18,
         textColor=DARK_GRAY,
@@ -72,7 +75,7 @@ def build_styles():
     custom["cover_detail"] = ParagraphStyle(
         "CoverDetail",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=11,
         leading=16,
         textColor=DARK_GRAY,
@@ -82,7 +85,7 @@ def build_styles():
     custom["page_title"] = ParagraphStyle(
         "PageTitle",
         parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=16,
         leading=22,
         textColor=NAVY_COLOR,
@@ -92,7 +95,7 @@ def build_styles():
     custom["section_header"] = ParagraphStyle(
         "SectionHeader",
         parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=12,
         leading=16,
         textColor=NAVY_COLOR,
@@ -102,7 +105,7 @@ def build_styles():
     custom["body"] = ParagraphStyle(
         "BodyText2",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -111,7 +114,7 @@ def build_styles():
     custom["body_bold"] = ParagraphStyle(
         "BodyBold",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -120,7 +123,7 @@ def build_styles():
     custom["bullet"] = ParagraphStyle(
         "BulletItem",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -131,7 +134,7 @@ def build_styles():
     custom["table_header"] = ParagraphStyle(
         "TableHeader",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=9,
         leading=12,
         textColor=WHITE_COLOR,
@@ -140,7 +143,7 @@ def build_styles():
     custom["table_cell"] = ParagraphStyle(
         "TableCell",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -148,7 +151,7 @@ def build_styles():
     custom["table_cell_center"] = ParagraphStyle(
         "TableCellCenter",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -157,7 +160,7 @@ def build_styles():
     custom["table_cell_right"] = ParagraphStyle(
         "TableCellRight",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -166,7 +169,7 @@ def build_styles():
     custom["table_cell_bold"] = ParagraphStyle(
         "TableCellBold",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -174,7 +177,7 @@ def build_styles():
     custom["table_cell_bold_right"] = ParagraphStyle(
         "TableCellBoldRight",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -183,7 +186,7 @@ def build_styles():
     custom["footer"] = ParagraphStyle(
         "Footer",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=8,
         leading=10,
         textColor=HexColor("#888888"),
@@ -198,7 +201,7 @@ def build_styles():
 # ---------------------------------------------------------------------------
 def _footer(canvas, doc):
     canvas.saveState()
-    canvas.setFont("Helvetica", 8)
+    canvas.setFont(FONT, 8)
     canvas.setFillColor(HexColor("#888888"))
     page_num = canvas.getPageNumber()
     text = f"Pre-Listing Inspection Report  |  Palm Bay Palms Apartments  |  Page {page_num}"
@@ -964,8 +967,27 @@ def main():
     story += page_unit_interiors(st)
     story += page_capex_summary(st)
 
+    # doc.build consumes the story, so capture the sidecar sections first
+    sections = sections_from_story(
+        story, {"CoverTitle": 1, "PageTitle": 1, "SectionHeader": 2})
+
     doc.build(story, onFirstPage=_footer, onLaterPages=_footer)
 
+    normalize(filepath)
+
+    write_sidecar(
+        "03_inspection_report.pdf", "Pre-Listing Property Inspection Report",
+        sections,
+        key_figures={
+            "inspector": "John Martinez, HI-3847",
+            "total_capex": TOTAL_CAPEX,
+            "capex_by_item": {name: cost for name, _, cost, _ in CAPEX},
+        },
+        evidence={
+            "2-1": f"John Martinez, HI-3847; ${TOTAL_CAPEX:,} capital needs identified",
+        },
+    )
+
     # Verify
     size = os.path.getsize(filepath)
     print(f"Created 03_inspection_report.pdf at {filepath}")
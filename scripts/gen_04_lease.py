@@ -7,6 +7,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_docx
+from reproducible import normalize
 
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
@@ -687,8 +689,23 @@ def main():
     doc = build_lease()
     filepath = output_path("04_sample_lease_unit201.docx")
     doc.save(filepath)
+    normalize(filepath)
     size_kb = os.path.getsize(filepath) / 1024
     print(f"Created 04_sample_lease_unit201.docx at {filepath}")
+
+    unit = next(u for u in UNITS if u[U_NUM] == "201")
+    write_sidecar(
+        "04_sample_lease_unit201.docx", "Florida Residential Lease Agreement - Unit 201",
+        sections_from_docx(doc, r"\d+\. [A-Z]"),
+        key_figures={
+            "unit": unit[U_NUM],
+            "tenant": unit[U_TENANT],
+            "lease_start": unit[U_LEASE_START],
+            "lease_end": unit[U_LEASE_END],
+            "monthly_rent": unit[U_RENT],
+            "security_deposit": unit[U_DEPOSIT],
+        },
+    )
     print(f"File size: {size_kb:.1f} KB")
 
 
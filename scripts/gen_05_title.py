@@ -10,6 +10,9 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_story
+from reproducible import normalize
+from fonts import FONT, FONT_BOLD, FONT_ITALIC
 
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
@@ -50,7 +53,7 @@ def build_styles():
     custom["report_title"] = ParagraphStyle(
         "ReportTitle",
         parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=18,
         leading=24,
         textColor=WHITE_COLOR,
@@ -61,7 +64,7 @@ def build_styles():
     custom["company_name"] = ParagraphStyle(
         "CompanyName",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=11,
         leading=14,
         textColor=WHITE_COLOR,
@@ -71,7 +74,7 @@ def build_styles():
     custom["section_header"] = ParagraphStyle(
         "SectionHeader",
         parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=12,
         leading=16,
         textColor=NAVY_COLOR,
@@ -81,7 +84,7 @@ def build_styles():
     custom["body"] = ParagraphStyle(
         "BodyText2",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -90,7 +93,7 @@ def build_styles():
     custom["body_bold"] = ParagraphStyle(
         "BodyBold",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -99,7 +102,7 @@ def build_styles():
     custom["body_indent"] = ParagraphStyle(
         "BodyIndent",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -109,7 +112,7 @@ def build_styles():
     custom["bullet"] = ParagraphStyle(
         "BulletItem",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=10,
         leading=14,
         textColor=DARK_GRAY,
@@ -120,7 +123,7 @@ def build_styles():
     custom["red_body"] = ParagraphStyle(
         "RedBody",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=10,
         leading=14,
         textColor=RED_TEXT,
@@ -130,7 +133,7 @@ def build_styles():
     custom["table_header"] = ParagraphStyle(
         "TableHeader",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=9,
         leading=12,
         textColor=WHITE_COLOR,
@@ -139,7 +142,7 @@ def build_styles():
     custom["table_cell"] = ParagraphStyle(
         "TableCell",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -147,7 +150,7 @@ def build_styles():
     custom["table_cell_center"] = ParagraphStyle(
         "TableCellCenter",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -156,7 +159,7 @@ def build_styles():
     custom["table_cell_bold"] = ParagraphStyle(
         "TableCellBold",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=9,
         leading=12,
         textColor=DARK_GRAY,
@@ -164,7 +167,7 @@ def build_styles():
     custom["label"] = ParagraphStyle(
         "Label",
         parent=styles["Normal"],
-        fontName="Helvetica-Bold",
+        fontName=FONT_BOLD,
         fontSize=10,
         leading=14,
         textColor=NAVY_COLOR,
@@ -173,7 +176,7 @@ def build_styles():
     custom["certification"] = ParagraphStyle(
         "Certification",
         parent=styles["Normal"],
-        fontName="Helvetica-Oblique",
+        fontName=FONT_ITALIC,
         fontSize=9,
         leading=13,
         textColor=DARK_GRAY,
@@ -184,7 +187,7 @@ def build_styles():
     custom["footer"] = ParagraphStyle(
         "Footer",
         parent=styles["Normal"],
-        fontName="Helvetica",
+        fontName=FONT,
         fontSize=8,
         leading=10,
         textColor=HexColor("#888888"),
@@ -199,7 +202,7 @@ def build_styles():
 # ---------------------------------------------------------------------------
 def _footer(canvas, doc):
     canvas.saveState()
-    canvas.setFont("Helvetica", 8)
+    canvas.setFont(FONT, 8)
     canvas.setFillColor(HexColor("#888888"))
     page_num = canvas.getPageNumber()
     text = f"Title Search Summary Report  |  Brevard Title & Abstract Co.  |  Page {page_num}"
@@ -405,7 +408,7 @@ def liens_section(st):
         [Paragraph("<b>Status</b>", st["table_cell_bold"]),
          Paragraph("<b>MUST BE RESOLVED PRIOR TO CLOSING</b>", ParagraphStyle(
              "RedCell",
-             fontName="Helvetica-Bold",
+             fontName=FONT_BOLD,
              fontSize=9,
              leading=12,
              textColor=RED_TEXT,
@@ -578,8 +581,27 @@ def main():
     story += recommendation_section(st)
     story += certification_section(st)
 
+    # doc.build consumes the story, so capture the sidecar sections first
+    sections = sections_from_story(story, {"ReportTitle": 1, "SectionHeader": 1})
+
     doc.build(story, onFirstPage=_footer, onLaterPages=_footer)
 
+    normalize(filepath)
+
+    write_sidecar(
+        "05_title_search.pdf", "Title Search Summary Report",
+        sections,
+        key_figures={
+            "owner_entity": PROPERTY["owner_entity"],
+            "parcel_id": PROPERTY["parcel_id"],
+            "mortgage_balance": PROPERTY["current_mortgage"],
+            "municipal_lien": 1850,
+        },
+        evidence={
+            "5-1": f"Parcel {PROPERTY['parcel_id']}, vested in {PROPERTY['owner_entity']}",
+        },
+    )
+
     # Verify
     size = os.path.getsize(filepath)
     print(f"Created 05_title_search.pdf at {filepath}")
@@ -7,8 +7,13 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_workbook
+from reproducible import normalize
+from returns import irr_many
+from comps import ADJUSTMENTS, SUBJECT, adjust, from_data, indicated_value, nearest
 
 from openpyxl import Workbook
+from openpyxl.chart import BarChart, LineChart, Reference
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, numbers
 from openpyxl.utils import get_column_letter
 
@@ -71,18 +76,29 @@ def create_comparable_sales_sheet(wb):
     ws.title = "Comparable Sales"
 
     headers = ["#", "Address", "Units", "Sale Date", "Sale Price",
-               "Price/Unit", "Cap Rate", "GRM"]
-    col_widths = [5, 35, 8, 12, 15, 14, 12, 8]
+               "Price/Unit", "Cap Rate", "GRM", "Months Since Sale",
+               "Time Adj", "Size Adj", "Adj. Price/Unit", "Distance (mi)"]
+    col_widths = [5, 35, 8, 12, 15, 14, 12, 8, 12, 11, 11, 15, 12]
+
+    # Adjustment grid inputs sit below the averages row; the adjustment
+    # columns reference them
+    avg_row = len(COMPS) + 2
+    grid_row = avg_row + 3
+    time_cell, size_cell, units_cell = (f"$C${grid_row + 1}", f"$C${grid_row + 2}",
+                                        f"$C${grid_row + 3}")
+    comps = from_data()
+    # Closest sale first (spatial grid lookup from the subject)
+    by_distance = nearest(comps, len(comps))
 
     # Write headers in row 1
     for c, header in enumerate(headers, 1):
         ws.cell(row=1, column=c, value=header)
     style_header_row(ws, 1, len(headers))
 
-    # Write comp data (rows 2-6)
-    for i, comp in enumerate(COMPS):
+    # Write comp data (rows 2-6), nearest first
+    for i, (comp, miles) in enumerate(by_distance):
         row = i + 2
-        num, address, units, date, price, ppu, cap_rate, grm = comp
+        num, address, units, date, price, ppu, cap_rate, grm = comp[:C_LAT]
 
         ws.cell(row=row, column=1, value=num)
         ws.cell(row=row, column=2, value=address)
@@ -92,6 +108,11 @@ def create_comparable_sales_sheet(wb):
         ws.cell(row=row, column=6, value=ppu)
         ws.cell(row=row, column=7, value=cap_rate)
         ws.cell(row=row, column=8, value=grm)
+        ws.cell(row=row, column=9, value=adjust(comp)["months_ago"])
+        ws.cell(row=row, column=10, value=f"=I{row}*{time_cell}")
+        ws.cell(row=row, column=11, value=f"=(C{row}-{units_cell})*{size_cell}")
+        ws.cell(row=row, column=12, value=f"=F{row}*(1+J{row}+K{row})")
+        ws.cell(row=row, column=13, value=round(miles, 1))
 
         # Style all cells in this row
         for c in range(1, len(headers) + 1):
@@ -103,10 +124,14 @@ def create_comparable_sales_sheet(wb):
         ws.cell(row=row, column=6).number_format = CURRENCY_FMT
         ws.cell(row=row, column=7).number_format = PCT_FMT
         ws.cell(row=row, column=8).number_format = GRM_FMT
+        ws.cell(row=row, column=10).number_format = PCT_FMT
+        ws.cell(row=row, column=11).number_format = PCT_FMT
+        ws.cell(row=row, column=12).number_format = CURRENCY_FMT
+        ws.cell(row=row, column=13).number_format = '0.0'
         ws.cell(row=row, column=3).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=9).alignment = Alignment(horizontal="center")
 
     # Averages row (row 7)
-    avg_row = len(COMPS) + 2
     ws.cell(row=avg_row, column=1, value="")
     ws.cell(row=avg_row, column=2, value="Averages")
 
@@ -133,6 +158,10 @@ def create_comparable_sales_sheet(wb):
     ws.cell(row=avg_row, column=8, value=f"=AVERAGE(H2:H{avg_row - 1})")
     ws.cell(row=avg_row, column=8).number_format = GRM_FMT
 
+    # Adjusted Price/Unit average
+    ws.cell(row=avg_row, column=12, value=f"=AVERAGE(L2:L{avg_row - 1})")
+    ws.cell(row=avg_row, column=12).number_format = CURRENCY_FMT
+
     # Style averages row as bold
     for c in range(1, len(headers) + 1):
         cell = ws.cell(row=avg_row, column=c)
@@ -142,9 +171,62 @@ def create_comparable_sales_sheet(wb):
     for c, w in enumerate(col_widths, 1):
         ws.column_dimensions[get_column_letter(c)].width = w
 
+    # -----------------------------------------------------------------------
+    # Adjustment grid inputs (comps.ADJUSTMENTS)
+    # -----------------------------------------------------------------------
+    style_section_label(ws.cell(row=grid_row, column=2), "Adjustment Grid")
+    grid_inputs = [
+        ("Time (per month since sale)", ADJUSTMENTS["time"], '0.00%'),
+        ("Size (per unit larger than subject)", ADJUSTMENTS["size"], '0.00%'),
+        ("Subject Units", SUBJECT["units"], '0'),
+    ]
+    for offset, (label, value, fmt) in enumerate(grid_inputs, 1):
+        ws.cell(row=grid_row + offset, column=2, value=label)
+        style_body_cell(ws.cell(row=grid_row + offset, column=2), bold=True)
+        cell = ws.cell(row=grid_row + offset, column=3, value=value)
+        style_body_cell(cell, input_cell=True)
+        cell.number_format = fmt
+
+    # -----------------------------------------------------------------------
+    # Regression: price/unit and cap rate on months since sale and size
+    # -----------------------------------------------------------------------
+    value = indicated_value(comps)
+    reg_row = grid_row + len(grid_inputs) + 2
+    style_section_label(ws.cell(row=reg_row, column=2), "Regression Indicated Value")
+    reg_hdr = reg_row + 1
+    for c, text in enumerate(["Model", "Estimate", "Low (95%)", "High (95%)", "R-Squared"], 2):
+        cell = ws.cell(row=reg_hdr, column=c, value=text)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = THIN_BORDER
+
+    models = [
+        ("Price/Unit", value["price_per_unit"], CURRENCY_FMT),
+        ("Value (Price/Unit x Units)", dict(value["value_ppu"], r2=None), CURRENCY_FMT),
+        ("Cap Rate", value["cap_rate"], PCT_FMT),
+        ("Value (NOI / Cap Rate)", dict(value["value_cap"], r2=None), CURRENCY_FMT),
+    ]
+    for offset, (label, fit, fmt) in enumerate(models, 1):
+        r = reg_hdr + offset
+        ws.cell(row=r, column=2, value=label)
+        for c, key in enumerate(("estimate", "low", "high"), 3):
+            ws.cell(row=r, column=c, value=fit[key]).number_format = fmt
+        if fit.get("r2") is not None:
+            ws.cell(row=r, column=6, value=fit["r2"]).number_format = '0.00'
+        for c in range(2, 7):
+            style_body_cell(ws.cell(row=r, column=c), bold=label.startswith("Value"))
+
+    note_row = reg_hdr + len(models) + 1
+    features = ", ".join(f.replace("_", " ") for f in value["price_per_unit"]["features"])
+    ws.cell(row=note_row, column=2,
+            value=f"OLS on {features}; {value['price_per_unit']['n']} comps. "
+                  f"Bands are 95% prediction intervals.")
+    ws.cell(row=note_row, column=2).font = Font(name="Arial", size=9, italic=True)
+
     # Freeze top row & auto-filter
     ws.freeze_panes = "A2"
-    ws.auto_filter.ref = f"A1:H{avg_row}"
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{avg_row}"
 
     return ws
 
@@ -376,6 +458,62 @@ def create_valuation_scenarios_sheet(wb):
     style_body_cell(ws.cell(row=r, column=2), bold=True)
     ws.cell(row=r, column=2).number_format = PCT_FMT_2
 
+    # -----------------------------------------------------------------------
+    # Section 5: Valuation Range (row 27+) -- summary and chart
+    # -----------------------------------------------------------------------
+    r = 27
+    style_section_label(ws.cell(row=r, column=1), "Valuation Range")
+    ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=5)
+    style_header_row(ws, r, 5)
+
+    r = 28
+    for c, header in enumerate(["Approach", "Low", "Mid", "High", "List Price"], 1):
+        ws.cell(row=r, column=c, value=header)
+    style_header_row(ws, r, 5)
+    ws.column_dimensions["E"].width = 18
+
+    approaches = [("Income (Cap Rate)", 5), ("GRM", 11), ("Price Per Unit", 17)]
+    first_range_row = 29
+    for i, (label, value_row) in enumerate(approaches):
+        r = first_range_row + i
+        ws.cell(row=r, column=1, value=label)
+        style_body_cell(ws.cell(row=r, column=1), bold=True)
+        for c, letter in enumerate("BCD", 2):
+            ws.cell(row=r, column=c, value=f"={letter}{value_row}")
+            style_body_cell(ws.cell(row=r, column=c))
+            ws.cell(row=r, column=c).number_format = CURRENCY_FMT
+        ws.cell(row=r, column=5, value="=$B$21")
+        style_body_cell(ws.cell(row=r, column=5))
+        ws.cell(row=r, column=5).number_format = CURRENCY_FMT
+    last_range_row = first_range_row + len(approaches) - 1
+
+    chart = BarChart()
+    chart.type = "col"
+    chart.grouping = "clustered"
+    chart.title = "Indicated Value by Approach"
+    chart.y_axis.numFmt = CURRENCY_FMT
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    chart.add_data(Reference(ws, min_col=2, max_col=4, min_row=28, max_row=last_range_row),
+                   titles_from_data=True)
+    categories = Reference(ws, min_col=1, min_row=first_range_row, max_row=last_range_row)
+    chart.set_categories(categories)
+    for series, color in zip(chart.series, ("A6B8CC", "5B7699", NAVY)):
+        series.graphicalProperties.solidFill = color
+
+    # Asking price as a flat line across the approaches
+    list_price = LineChart()
+    list_price.add_data(Reference(ws, min_col=5, min_row=28, max_row=last_range_row),
+                        titles_from_data=True)
+    list_price.set_categories(categories)
+    list_price.series[0].graphicalProperties.line.solidFill = "C59A2C"
+    list_price.series[0].graphicalProperties.line.dashStyle = "dash"
+    chart += list_price
+
+    chart.legend.position = "b"
+    chart.width, chart.height = 18, 9
+    ws.add_chart(chart, f"A{last_range_row + 2}")
+
     # Freeze top area
     ws.freeze_panes = "A2"
 
@@ -430,7 +568,7 @@ def create_buyer_underwriting_sheet(wb):
     ws.cell(row=r, column=1, value="Down Payment %")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c in range(2, 5):
-        ws.cell(row=r, column=c, value=0.25)
+        ws.cell(row=r, column=c, value=DOWN_PCT)
         style_body_cell(ws.cell(row=r, column=c), input_cell=True)
         ws.cell(row=r, column=c).number_format = PCT_FMT_2
 
@@ -457,7 +595,7 @@ def create_buyer_underwriting_sheet(wb):
     ws.cell(row=r, column=1, value="Interest Rate")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c in range(2, 5):
-        ws.cell(row=r, column=c, value=0.0725)
+        ws.cell(row=r, column=c, value=LOAN_RATE)
         style_body_cell(ws.cell(row=r, column=c), input_cell=True)
         ws.cell(row=r, column=c).number_format = PCT_FMT_2
 
@@ -466,15 +604,14 @@ def create_buyer_underwriting_sheet(wb):
     ws.cell(row=r, column=1, value="Loan Term (Years)")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c in range(2, 5):
-        ws.cell(row=r, column=c, value=30)
+        ws.cell(row=r, column=c, value=LOAN_TERM)
         style_body_cell(ws.cell(row=r, column=c), input_cell=True)
 
     # NOI (row 10)
     r = 10
     ws.cell(row=r, column=1, value="Net Operating Income (NOI)")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
-    noi_values = [NOI_ACTUAL, 154000, NOI_PROFORMA]
-    for c_idx, noi_val in enumerate(noi_values, 2):
+    for c_idx, noi_val in enumerate(UNDERWRITING_NOI, 2):
         ws.cell(row=r, column=c_idx, value=noi_val)
         style_body_cell(ws.cell(row=r, column=c_idx), input_cell=True)
         ws.cell(row=r, column=c_idx).number_format = CURRENCY_FMT
@@ -542,7 +679,7 @@ def create_buyer_underwriting_sheet(wb):
     ws.cell(row=r, column=1, value="Exit Cap Rate")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c in range(2, 5):
-        ws.cell(row=r, column=c, value=0.07)
+        ws.cell(row=r, column=c, value=EXIT_CAP)
         style_body_cell(ws.cell(row=r, column=c), input_cell=True)
         ws.cell(row=r, column=c).number_format = PCT_FMT_2
 
@@ -551,7 +688,7 @@ def create_buyer_underwriting_sheet(wb):
     ws.cell(row=r, column=1, value="Annual NOI Growth")
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c in range(2, 5):
-        ws.cell(row=r, column=c, value=0.03)
+        ws.cell(row=r, column=c, value=NOI_GROWTH)
         style_body_cell(ws.cell(row=r, column=c), input_cell=True)
         ws.cell(row=r, column=c).number_format = PCT_FMT_2
 
@@ -585,7 +722,8 @@ def create_buyer_underwriting_sheet(wb):
     style_body_cell(ws.cell(row=r, column=1), bold=True)
     for c_idx, col_letter in enumerate(["B", "C", "D"], 2):
         # FV of loan after 60 payments
-        formula = f"=FV({col_letter}8/12,60,-PMT({col_letter}8/12,{col_letter}9*12,{col_letter}7),{col_letter}7)"
+        # (pv is the negated loan so the balance comes out positive)
+        formula = f"=FV({col_letter}8/12,60,-PMT({col_letter}8/12,{col_letter}9*12,{col_letter}7),-{col_letter}7)"
         ws.cell(row=r, column=c_idx, value=formula)
         style_body_cell(ws.cell(row=r, column=c_idx))
         ws.cell(row=r, column=c_idx).number_format = CURRENCY_FMT
@@ -683,12 +821,127 @@ def create_buyer_underwriting_sheet(wb):
     for c in range(2, 5):
         ws.cell(row=r, column=c).border = THIN_BORDER
 
+    # -----------------------------------------------------------------------
+    # Returns (rows 35-39): unlevered IRR from returns.py, NPV and multiple
+    # as formulas on the cash flow detail. The levered IRR is row 26.
+    # The unlevered IRR is a value for the inputs above and does not
+    # follow edits to them.
+    # -----------------------------------------------------------------------
+    solved = underwriting_returns()
+    cf_first, cf_last = r_cf_start, r_cf_start + 5
+
+    r = 35
+    style_section_label(ws.cell(row=r, column=1), "Returns Summary")
+    ws.cell(row=r, column=1).border = THIN_BORDER
+    for c in range(2, 5):
+        ws.cell(row=r, column=c).border = THIN_BORDER
+
+    returns_rows = [
+        ("Unlevered IRR (static)", lambda i, col: solved["unlevered_irr"][i], PCT_FMT_2, False),
+        ("Discount Rate", lambda i, col: DISCOUNT_RATE, PCT_FMT_2, True),
+        ("NPV @ Discount Rate",
+         lambda i, col: f"=NPV({col}37,{col}{cf_first + 1}:{col}{cf_last})+{col}{cf_first}",
+         CURRENCY_FMT, False),
+        ("Equity Multiple",
+         lambda i, col: f"=SUM({col}{cf_first + 1}:{col}{cf_last})/-{col}{cf_first}",
+         '0.00"x"', False),
+    ]
+    for offset, (label, value, fmt, is_input) in enumerate(returns_rows):
+        r = 36 + offset
+        ws.cell(row=r, column=1, value=label)
+        style_body_cell(ws.cell(row=r, column=1), bold=True)
+        for i, col_letter in enumerate(["B", "C", "D"]):
+            cell = ws.cell(row=r, column=i + 2, value=value(i, col_letter))
+            style_body_cell(cell, bold=not is_input, input_cell=is_input)
+            cell.number_format = fmt
+
+    # -----------------------------------------------------------------------
+    # Levered IRR sensitivity, Base column (rows 42-48)
+    # -----------------------------------------------------------------------
+    r = 42
+    style_section_label(ws.cell(row=r, column=1),
+                        "Levered IRR Sensitivity - Base (Exit Cap x NOI Growth)")
+    ws.column_dimensions["E"].width = 18
+    ws.column_dimensions["F"].width = 18
+
+    r = 43
+    ws.cell(row=r, column=1, value="Exit Cap / NOI Growth")
+    for c_idx, growth in enumerate(SENS_GROWTH, 2):
+        ws.cell(row=r, column=c_idx, value=growth).number_format = PCT_FMT_2
+    style_header_row(ws, r, len(SENS_GROWTH) + 1)
+
+    for row_idx, (cap, rates) in enumerate(zip(SENS_EXIT_CAPS, solved["sensitivity"]), 44):
+        cell = ws.cell(row=row_idx, column=1, value=cap)
+        style_body_cell(cell, bold=True)
+        cell.number_format = PCT_FMT_2
+        for c_idx, rate in enumerate(rates, 2):
+            cell = ws.cell(row=row_idx, column=c_idx, value=rate)
+            base_case = cap == EXIT_CAP and SENS_GROWTH[c_idx - 2] == NOI_GROWTH
+            style_body_cell(cell, bold=base_case)
+            cell.number_format = PCT_FMT_2
+
     # Freeze top rows
     ws.freeze_panes = "A3"
 
     return ws
 
 
+# ---------------------------------------------------------------------------
+# Underwriting cash flows (mirror the IRR Cash Flow Detail formulas)
+# ---------------------------------------------------------------------------
+UNDERWRITING_NOI = [NOI_ACTUAL, 154000, NOI_PROFORMA]   # Conservative/Base/Aggressive
+DOWN_PCT, LOAN_RATE, LOAN_TERM = 0.25, 0.0725, 30
+EXIT_CAP, NOI_GROWTH = 0.07, 0.03
+DISCOUNT_RATE = 0.08
+
+# Levered IRR sensitivity grid on the Base column
+SENS_EXIT_CAPS = [0.060, 0.065, 0.070, 0.075, 0.080]
+SENS_GROWTH = [0.01, 0.02, 0.03, 0.04, 0.05]
+
+
+def underwriting_flows(noi, growth=NOI_GROWTH, exit_cap=EXIT_CAP, price=ASKING_PRICE,
+                       down_pct=DOWN_PCT, rate=LOAN_RATE, term=LOAN_TERM):
+    """(levered, unlevered) Year 0-5 flows for one underwriting column.
+    Levered matches rows 28-33: down payment out, NOI less debt service
+    (NOI grows from Year 2), Year 5 adds exit price less the remaining
+    balance. Unlevered is the all-cash equivalent.
+    """
+    loan = price * (1 - down_pct)
+    i, n = rate / 12, term * 12
+    payment = loan * i / (1 - (1 + i) ** -n)
+    balance = loan * (1 + i) ** 60 - payment * ((1 + i) ** 60 - 1) / i
+    exit_price = noi * (1 + growth) ** 5 / exit_cap
+
+    operating = [noi * (1 + growth) ** (t - 1) for t in range(1, 6)]
+    levered = [-price * down_pct] + [cf - payment * 12 for cf in operating]
+    levered[-1] += exit_price - balance
+    unlevered = [-price] + operating
+    unlevered[-1] += exit_price
+    return levered, unlevered
+
+
+def underwriting_returns():
+    """Levered/unlevered IRRs for the three columns and the Base
+    sensitivity grid, solved in one irr_many() batch.
+    """
+    series = []
+    for noi in UNDERWRITING_NOI:
+        series.extend(underwriting_flows(noi))
+    base = UNDERWRITING_NOI[1]
+    for cap in SENS_EXIT_CAPS:
+        series.extend(underwriting_flows(base, g, cap)[0] for g in SENS_GROWTH)
+
+    rates = irr_many(series)
+    n = len(UNDERWRITING_NOI)
+    grid = rates[2 * n:]
+    return {
+        "levered_irr": rates[0:2 * n:2],
+        "unlevered_irr": rates[1:2 * n:2],
+        "sensitivity": [grid[i:i + len(SENS_GROWTH)]
+                        for i in range(0, len(grid), len(SENS_GROWTH))],
+    }
+
+
 # ===========================================================================
 # Main
 # ===========================================================================
@@ -699,9 +952,40 @@ def main():
     create_valuation_scenarios_sheet(wb)
     create_buyer_underwriting_sheet(wb)
 
+    solved = underwriting_returns()
+    comp_value = indicated_value(from_data())
+
     filepath = output_path("06_valuation_comps.xlsx")
     wb.save(filepath)
+    normalize(filepath)
     print(f"Created 06_valuation_comps.xlsx at {filepath}")
+
+    write_sidecar(
+        "06_valuation_comps.xlsx", "Valuation & Comparable Sales",
+        sections_from_workbook(wb),
+        key_figures={
+            "asking_price": ASKING_PRICE,
+            "price_per_unit": round(ASKING_PRICE / TOTAL_UNITS),
+            "cap_rate_actual": round(CAP_RATE_ACTUAL, 4),
+            "cap_rate_proforma": round(CAP_RATE_PROFORMA, 4),
+            "comp_count": len(COMPS),
+            "comp_avg_price_per_unit": round(sum(c[5] for c in COMPS) / len(COMPS)),
+            "comp_avg_cap_rate": round(sum(c[6] for c in COMPS) / len(COMPS), 4),
+            "comp_regression_value": round(comp_value["value_ppu"]["estimate"]),
+            "comp_regression_band": [round(comp_value["value_ppu"]["low"]),
+                                     round(comp_value["value_ppu"]["high"])],
+            "levered_irr_base": round(solved["levered_irr"][1], 4),
+            "unlevered_irr_base": round(solved["unlevered_irr"][1], 4),
+        },
+        evidence={
+            "6-2": f"{len(COMPS)} comps, avg ${round(sum(c[5] for c in COMPS) / len(COMPS)):,}/unit, "
+                   f"avg cap {sum(c[6] for c in COMPS) / len(COMPS):.2%}",
+            "6-3": f"Indicated value ${round(comp_value['value_ppu']['estimate']):,} (price/unit), "
+                   f"${round(comp_value['value_cap']['estimate']):,} (cap rate)",
+            "6-5": f"{len(SENS_EXIT_CAPS)} exit cap scenarios, base levered IRR "
+                   f"{solved['levered_irr'][1]:.1%}",
+        },
+    )
     print(f"Sheets: {wb.sheetnames}")
 
 
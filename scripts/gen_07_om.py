@@ -1,48 +1,39 @@
 """
 Generate 07_offering_memorandum.pptx for Palm Bay Palms Apartments case study.
-10-slide institutional-quality Offering Memorandum in 16:9 widescreen.
+11-slide institutional-quality Offering Memorandum in 16:9 widescreen, with
+optional appendix slides (full rent roll, sale comparables).
+
+Usage:
+    python gen_07_om.py [--appendix] [--parallel] [--workers N]
 """
+import argparse
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
-
-from pptx import Presentation
+from sidecar import write_sidecar, sections_from_presentation
+from reproducible import normalize
+from comps import from_data, nearest
+from rollover import ladder, rollover_risk
+from unit_mix import group_by, totals
+from projection import project
+from om_template import (
+    CLR_NAVY, CLR_WHITE, CLR_BLACK, CLR_LIGHT_GRAY, CLR_MED_GRAY, CLR_GOLD,
+    CLR_DARK_TEXT, FONT_NAME,
+    new_deck, add_cover_slide, add_content_slide, write_table, add_bar_chart,
+)
+
+from pptx.oxml import parse_xml
 from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.enum.text import PP_ALIGN
 from pptx.enum.shapes import MSO_SHAPE
 
-# ---------------------------------------------------------------------------
-# Color palette
-# ---------------------------------------------------------------------------
-CLR_NAVY = RGBColor(0x1E, 0x3A, 0x5F)
-CLR_WHITE = RGBColor(0xFF, 0xFF, 0xFF)
-CLR_BLACK = RGBColor(0x00, 0x00, 0x00)
-CLR_LIGHT_GRAY = RGBColor(0xF2, 0xF2, 0xF2)
-CLR_MED_GRAY = RGBColor(0xD9, 0xD9, 0xD9)
-CLR_GOLD = RGBColor(0xC5, 0x9A, 0x2C)
-CLR_DARK_TEXT = RGBColor(0x33, 0x33, 0x33)
-
-FONT_NAME = "Calibri"
-
-# Slide dimensions (16:9)
-SLIDE_WIDTH = Inches(13.333)
-SLIDE_HEIGHT = Inches(7.5)
-
 
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
-def set_slide_bg(slide, color):
-    """Set solid background color for a slide."""
-    background = slide.background
-    fill = background.fill
-    fill.solid()
-    fill.fore_color.rgb = color
-
-
 def add_textbox(slide, left, top, width, height, text, font_size=18,
                 bold=False, color=CLR_BLACK, alignment=PP_ALIGN.LEFT,
                 font_name=FONT_NAME):
@@ -80,212 +71,24 @@ def add_paragraph(text_frame, text, font_size=14, bold=False,
     return p
 
 
-def add_slide_number(slide, slide_num, total=10):
-    """Add slide number in bottom-right footer area."""
-    add_textbox(
-        slide,
-        left=SLIDE_WIDTH - Inches(1.5),
-        top=SLIDE_HEIGHT - Inches(0.4),
-        width=Inches(1.3),
-        height=Inches(0.3),
-        text=f"{slide_num} / {total}",
-        font_size=9,
-        color=CLR_MED_GRAY,
-        alignment=PP_ALIGN.RIGHT,
-    )
-
-
-def add_title_bar(slide, title_text, slide_num):
-    """Add a navy title bar across the top of a content slide."""
-    # Navy rectangle at top
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(0), Inches(0),
-        SLIDE_WIDTH, Inches(1.1),
-    )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = CLR_NAVY
-    shape.line.fill.background()
-
-    # Title text
-    add_textbox(
-        slide,
-        left=Inches(0.6), top=Inches(0.15),
-        width=Inches(11), height=Inches(0.8),
-        text=title_text,
-        font_size=28, bold=True, color=CLR_WHITE,
-    )
-
-    # Slide number
-    add_slide_number(slide, slide_num)
-
-
-def add_table(slide, rows, cols, left, top, width, height):
-    """Add a table shape and return the table object."""
-    table_shape = slide.shapes.add_table(rows, cols, left, top, width, height)
-    return table_shape.table
-
-
-def style_table_header(table, col_count, font_size=11):
-    """Style the first row of a table as navy header."""
-    for col_idx in range(col_count):
-        cell = table.cell(0, col_idx)
-        cell.fill.solid()
-        cell.fill.fore_color.rgb = CLR_NAVY
-        for paragraph in cell.text_frame.paragraphs:
-            paragraph.font.size = Pt(font_size)
-            paragraph.font.bold = True
-            paragraph.font.color.rgb = CLR_WHITE
-            paragraph.font.name = FONT_NAME
-            paragraph.alignment = PP_ALIGN.CENTER
-        cell.vertical_anchor = MSO_ANCHOR.MIDDLE
-
-
-def style_table_body(table, row_count, col_count, font_size=10):
-    """Style body rows with alternating shading."""
-    for row_idx in range(1, row_count):
-        for col_idx in range(col_count):
-            cell = table.cell(row_idx, col_idx)
-            # Alternating row fill
-            if row_idx % 2 == 0:
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = CLR_LIGHT_GRAY
-            else:
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = CLR_WHITE
-            for paragraph in cell.text_frame.paragraphs:
-                paragraph.font.size = Pt(font_size)
-                paragraph.font.color.rgb = CLR_DARK_TEXT
-                paragraph.font.name = FONT_NAME
-            cell.vertical_anchor = MSO_ANCHOR.MIDDLE
-
-
-def style_total_row(table, row_idx, col_count, font_size=10):
-    """Style a totals row with bold text and navy-ish background."""
-    for col_idx in range(col_count):
-        cell = table.cell(row_idx, col_idx)
-        cell.fill.solid()
-        cell.fill.fore_color.rgb = CLR_MED_GRAY
-        for paragraph in cell.text_frame.paragraphs:
-            paragraph.font.size = Pt(font_size)
-            paragraph.font.bold = True
-            paragraph.font.color.rgb = CLR_NAVY
-            paragraph.font.name = FONT_NAME
-        cell.vertical_anchor = MSO_ANCHOR.MIDDLE
-
-
-def set_cell_text(table, row, col, text, alignment=PP_ALIGN.CENTER):
-    """Set text for a table cell."""
-    cell = table.cell(row, col)
-    cell.text_frame.clear()
-    p = cell.text_frame.paragraphs[0]
-    p.text = str(text)
-    p.alignment = alignment
-    return cell
-
-
-def set_col_widths(table, widths_inches):
-    """Set column widths from a list of inch values."""
-    for i, w in enumerate(widths_inches):
-        table.columns[i].width = Inches(w)
-
-
 # ===========================================================================
 # Slide builders
 # ===========================================================================
 
 def build_slide_01_cover(prs):
     """Slide 1 -- Cover."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])  # blank layout
-    set_slide_bg(slide, CLR_NAVY)
-
-    # Gold accent line at top
-    line_shape = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(2), Inches(1.2),
-        Inches(9.333), Inches(0.04),
-    )
-    line_shape.fill.solid()
-    line_shape.fill.fore_color.rgb = CLR_GOLD
-    line_shape.line.fill.background()
-
-    # Property name
-    add_textbox(
-        slide,
-        left=Inches(2), top=Inches(1.5),
-        width=Inches(9.333), height=Inches(1.0),
-        text=PROPERTY["name"],
-        font_size=40, bold=True, color=CLR_WHITE,
-        alignment=PP_ALIGN.CENTER,
-    )
-
-    # Subtitle
-    add_textbox(
-        slide,
-        left=Inches(2), top=Inches(2.5),
-        width=Inches(9.333), height=Inches(0.6),
-        text="18-Unit Value-Add Multifamily Investment Opportunity",
-        font_size=20, bold=False, color=CLR_GOLD,
-        alignment=PP_ALIGN.CENTER,
-    )
-
-    # Price
-    add_textbox(
-        slide,
-        left=Inches(2), top=Inches(3.4),
-        width=Inches(9.333), height=Inches(0.8),
-        text=f"${ASKING_PRICE:,.0f}",
-        font_size=36, bold=True, color=CLR_WHITE,
-        alignment=PP_ALIGN.CENTER,
-    )
-
-    # Gold accent line below price
-    line_shape2 = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE,
-        Inches(4), Inches(4.3),
-        Inches(5.333), Inches(0.04),
-    )
-    line_shape2.fill.solid()
-    line_shape2.fill.fore_color.rgb = CLR_GOLD
-    line_shape2.line.fill.background()
-
-    # Location
-    add_textbox(
-        slide,
-        left=Inches(2), top=Inches(4.6),
-        width=Inches(9.333), height=Inches(0.5),
-        text="Palm Bay, Florida",
-        font_size=18, bold=False, color=CLR_WHITE,
-        alignment=PP_ALIGN.CENTER,
-    )
-
-    # Branding
-    add_textbox(
-        slide,
-        left=Inches(2), top=Inches(5.5),
-        width=Inches(9.333), height=Inches(0.5),
-        text="Presented by Property360 Real Estate",
-        font_size=16, bold=False, color=CLR_MED_GRAY,
-        alignment=PP_ALIGN.CENTER,
-    )
-
-    # Slide number
-    add_textbox(
-        slide,
-        left=SLIDE_WIDTH - Inches(1.5),
-        top=SLIDE_HEIGHT - Inches(0.4),
-        width=Inches(1.3), height=Inches(0.3),
-        text="1 / 10",
-        font_size=9, color=CLR_MED_GRAY,
-        alignment=PP_ALIGN.RIGHT,
+    add_cover_slide(
+        prs,
+        name=PROPERTY["name"],
+        subtitle="18-Unit Value-Add Multifamily Investment Opportunity",
+        price=f"${ASKING_PRICE:,.0f}",
+        location="Palm Bay, Florida",
     )
 
 
 def build_slide_02_highlights(prs):
     """Slide 2 -- Investment Highlights."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Investment Highlights", 2)
+    slide = add_content_slide(prs, "Investment Highlights")
 
     highlights = [
         f"Below-market rents with $3,800/month ($45,600/yr) upside through lease renewals",
@@ -327,9 +130,7 @@ def build_slide_02_highlights(prs):
 
 def build_slide_03_overview(prs):
     """Slide 3 -- Property Overview (two-column table layout)."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Property Overview", 3)
+    slide = add_content_slide(prs, "Property Overview")
 
     # Left column data
     left_data = [
@@ -347,55 +148,13 @@ def build_slide_03_overview(prs):
         ("Parking", "Surface lot, 36 spaces"),
     ]
 
-    # Left table
-    tbl_left = add_table(slide, len(left_data), 2,
-                         Inches(0.6), Inches(1.5),
-                         Inches(5.8), Inches(3.5))
-    set_col_widths(tbl_left, [2.0, 3.8])
-
-    for r, (label, value) in enumerate(left_data):
-        set_cell_text(tbl_left, r, 0, label, PP_ALIGN.LEFT)
-        set_cell_text(tbl_left, r, 1, value, PP_ALIGN.LEFT)
-        # Style label column
-        for p in tbl_left.cell(r, 0).text_frame.paragraphs:
-            p.font.bold = True
-            p.font.size = Pt(14)
-            p.font.color.rgb = CLR_NAVY
-            p.font.name = FONT_NAME
-        for p in tbl_left.cell(r, 1).text_frame.paragraphs:
-            p.font.size = Pt(14)
-            p.font.color.rgb = CLR_DARK_TEXT
-            p.font.name = FONT_NAME
-        # Alternating fill
-        fill_color = CLR_LIGHT_GRAY if r % 2 == 0 else CLR_WHITE
-        tbl_left.cell(r, 0).fill.solid()
-        tbl_left.cell(r, 0).fill.fore_color.rgb = fill_color
-        tbl_left.cell(r, 1).fill.solid()
-        tbl_left.cell(r, 1).fill.fore_color.rgb = fill_color
-
-    # Right table
-    tbl_right = add_table(slide, len(right_data), 2,
-                          Inches(6.9), Inches(1.5),
-                          Inches(5.8), Inches(3.5))
-    set_col_widths(tbl_right, [2.0, 3.8])
-
-    for r, (label, value) in enumerate(right_data):
-        set_cell_text(tbl_right, r, 0, label, PP_ALIGN.LEFT)
-        set_cell_text(tbl_right, r, 1, value, PP_ALIGN.LEFT)
-        for p in tbl_right.cell(r, 0).text_frame.paragraphs:
-            p.font.bold = True
-            p.font.size = Pt(14)
-            p.font.color.rgb = CLR_NAVY
-            p.font.name = FONT_NAME
-        for p in tbl_right.cell(r, 1).text_frame.paragraphs:
-            p.font.size = Pt(14)
-            p.font.color.rgb = CLR_DARK_TEXT
-            p.font.name = FONT_NAME
-        fill_color = CLR_LIGHT_GRAY if r % 2 == 0 else CLR_WHITE
-        tbl_right.cell(r, 0).fill.solid()
-        tbl_right.cell(r, 0).fill.fore_color.rgb = fill_color
-        tbl_right.cell(r, 1).fill.solid()
-        tbl_right.cell(r, 1).fill.fore_color.rgb = fill_color
+    # Two key/value tables, label column bold navy
+    kv_style = dict(header=False, font_size=14, label_col=True, anchor=None,
+                    align=["l", "l"])
+    write_table(slide, left_data, Inches(0.6), Inches(1.5), Inches(3.5),
+                [2.0, 3.8], **kv_style)
+    write_table(slide, right_data, Inches(6.9), Inches(1.5), Inches(3.5),
+                [2.0, 3.8], **kv_style)
 
     # Owner info note
     add_textbox(
@@ -409,75 +168,32 @@ def build_slide_03_overview(prs):
 
 def build_slide_04_unit_mix(prs):
     """Slide 4 -- Unit Mix & Rent Schedule."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Unit Mix & Rent Schedule", 4)
-
-    # Compute unit mix stats from data
-    unit_types = {}
-    for u in UNITS:
-        utype = u[U_TYPE]
-        if utype not in unit_types:
-            unit_types[utype] = {"count": 0, "sf": u[U_SF], "rents": [],
-                                 "market": u[U_MARKET]}
-        unit_types[utype]["count"] += 1
-        if u[U_STATUS] == "Occupied":
-            unit_types[utype]["rents"].append(u[U_RENT])
+    slide = add_content_slide(prs, "Unit Mix & Rent Schedule")
 
     headers = ["Type", "Count", "Avg SF", "Current Avg Rent", "Market Rent",
                "Monthly Upside"]
     rows_data = []
-    total_upside = 0
-
-    for utype in ["1BR/1BA", "2BR/1BA", "3BR/2BA"]:
-        info = unit_types[utype]
-        avg_rent = (sum(info["rents"]) / len(info["rents"])
-                    if info["rents"] else 0)
-        monthly_upside = info["market"] * info["count"] - sum(info["rents"])
-        # Account for vacant units: their upside is included as market rent
-        vacant_count = info["count"] - len(info["rents"])
-        total_upside += monthly_upside
-
-        rent_display = f"${avg_rent:,.0f}*" if vacant_count > 0 else f"${avg_rent:,.0f}"
+    for utype, mix in group_by("type").items():
+        # Vacant units count toward upside at market rent
+        rent_display = f"${mix['avg_rent']:,.0f}" + ("*" if mix["vacant"] else "")
         rows_data.append([
             utype,
-            str(info["count"]),
-            f"{info['sf']:,}",
+            str(mix["count"]),
+            f"{mix['avg_sf']:,.0f}",
             rent_display,
-            f"${info['market']:,.0f}",
-            f"${monthly_upside:,.0f}",
+            f"${mix['avg_market']:,.0f}",
+            f"${mix['upside']:,.0f}",
         ])
 
     # Total row
+    total = totals()
     rows_data.append([
-        "Total", str(TOTAL_UNITS), "", "", "",
-        f"${total_upside:,.0f}",
+        "Total", str(total["count"]), "", "", "",
+        f"${total['upside']:,.0f}",
     ])
 
-    num_rows = len(rows_data) + 1  # +1 for header
-    num_cols = len(headers)
-
-    tbl = add_table(slide, num_rows, num_cols,
-                    Inches(0.8), Inches(1.5),
-                    Inches(11.7), Inches(3.5))
-
-    col_widths = [1.6, 1.0, 1.2, 2.4, 2.0, 2.2]
-    set_col_widths(tbl, col_widths)
-
-    # Header
-    for c, h in enumerate(headers):
-        set_cell_text(tbl, 0, c, h, PP_ALIGN.CENTER)
-    style_table_header(tbl, num_cols, font_size=12)
-
-    # Body rows
-    for r, row_data in enumerate(rows_data):
-        for c, val in enumerate(row_data):
-            set_cell_text(tbl, r + 1, c, val, PP_ALIGN.CENTER)
-
-    style_table_body(tbl, num_rows, num_cols, font_size=12)
-
-    # Style total row
-    style_total_row(tbl, num_rows - 1, num_cols, font_size=12)
+    write_table(slide, [headers] + rows_data, Inches(0.8), Inches(1.5),
+                Inches(3.5), [1.6, 1.0, 1.2, 2.4, 2.0, 2.2], total=True)
 
     # Footnote
     add_textbox(
@@ -489,11 +205,47 @@ def build_slide_04_unit_mix(prs):
     )
 
 
+def build_slide_04b_lease_expirations(prs):
+    """Slide 5 -- Lease Expiration Schedule (quarterly ladder from AS_OF)."""
+    slide = add_content_slide(prs, "Lease Expiration Schedule")
+
+    buckets = ladder(UNITS, AS_OF, horizon=12, step=3)
+    headers = ["Period", "Leases", "Rent at Risk", "% of Rent", "Mark-to-Market"]
+    rows_data = [
+        [b["label"], str(b["leases"]), f"${b['rent_at_risk']:,.0f}",
+         f"{b['pct_of_rent']:.1%}", f"${b['mark_to_market']:,.0f}"]
+        for b in buckets
+    ]
+    rows_data.append([
+        "Total", str(sum(b["leases"] for b in buckets)),
+        f"${sum(b['rent_at_risk'] for b in buckets):,.0f}", "100.0%",
+        f"${sum(b['mark_to_market'] for b in buckets):,.0f}",
+    ])
+    write_table(slide, [headers] + rows_data, Inches(0.6), Inches(1.5),
+                Inches(3.8), [2.4, 1.0, 1.4, 1.2, 1.5],
+                align=["l", "ctr", "ctr", "ctr", "ctr"], total=True)
+
+    add_bar_chart(slide, [b["label"] for b in buckets],
+                  [("Monthly Rent at Risk", [b["rent_at_risk"] for b in buckets]),
+                   ("Mark-to-Market", [b["mark_to_market"] for b in buckets])],
+                  Inches(8.3), Inches(1.3), Inches(4.5), Inches(4.0),
+                  title="Rent Rolling by Period")
+
+    risk = rollover_risk(UNITS, AS_OF)
+    add_textbox(
+        slide,
+        left=Inches(0.6), top=Inches(5.6),
+        width=Inches(12), height=Inches(0.8),
+        text=(f"As of {AS_OF}: {risk['pct_of_rent']:.0%} of in-place rent can roll within "
+              f"12 months ({risk['mtm_leases']} month-to-month leases)  |  "
+              f"WALT {risk['walt_months']} months  |  Peak expiration: {risk['peak_month']}"),
+        font_size=12, color=CLR_DARK_TEXT, alignment=PP_ALIGN.LEFT,
+    )
+
+
 def build_slide_05_financial(prs):
-    """Slide 5 -- Financial Performance."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Financial Performance", 5)
+    """Slide 6 -- Financial Performance."""
+    slide = add_content_slide(prs, "Financial Performance")
 
     # Metrics in 2x3 card layout
     metrics = [
@@ -563,55 +315,34 @@ def build_slide_05_financial(prs):
 
 
 def build_slide_06_rent_comps(prs):
-    """Slide 6 -- Market Rent Analysis."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Market Rent Analysis", 6)
+    """Slide 7 -- Market Rent Analysis."""
+    slide = add_content_slide(prs, "Market Rent Analysis")
 
     headers = ["Unit Type", "Current Avg Rent", "Market Rent", "Upside/Unit",
                "Upside/Month (All)"]
 
-    # Recompute from data
-    unit_types_info = {}
-    for u in UNITS:
-        utype = u[U_TYPE]
-        if utype not in unit_types_info:
-            unit_types_info[utype] = {"count": 0, "occ_rents": [],
-                                      "market": u[U_MARKET]}
-        unit_types_info[utype]["count"] += 1
-        if u[U_STATUS] == "Occupied":
-            unit_types_info[utype]["occ_rents"].append(u[U_RENT])
-
     rows_data = []
-    for utype in ["1BR/1BA", "2BR/1BA", "3BR/2BA"]:
-        info = unit_types_info[utype]
-        avg_rent = (sum(info["occ_rents"]) / len(info["occ_rents"])
-                    if info["occ_rents"] else 0)
-        upside_per_unit = info["market"] - avg_rent
-        total_upside = upside_per_unit * len(info["occ_rents"])
+    chart_types, chart_current, chart_market = [], [], []
+    for utype, mix in group_by("type").items():
+        upside_per_unit = mix["avg_market"] - mix["avg_rent"]
+        chart_types.append(utype)
+        chart_current.append(round(mix["avg_rent"]))
+        chart_market.append(round(mix["avg_market"]))
         rows_data.append([
             utype,
-            f"${avg_rent:,.0f}",
-            f"${info['market']:,.0f}",
+            f"${mix['avg_rent']:,.0f}",
+            f"${mix['avg_market']:,.0f}",
             f"${upside_per_unit:,.0f}",
-            f"${total_upside:,.0f}",
+            f"${mix['upside_occupied']:,.0f}",
         ])
 
-    num_rows = len(rows_data) + 1
-    num_cols = len(headers)
-    tbl = add_table(slide, num_rows, num_cols,
-                    Inches(0.8), Inches(1.5),
-                    Inches(11.7), Inches(2.5))
-    set_col_widths(tbl, [2.0, 2.5, 2.2, 2.2, 2.8])
-
-    for c, h in enumerate(headers):
-        set_cell_text(tbl, 0, c, h, PP_ALIGN.CENTER)
-    style_table_header(tbl, num_cols, font_size=12)
+    write_table(slide, [headers] + rows_data, Inches(0.6), Inches(1.5),
+                Inches(2.5), [1.4, 1.6, 1.4, 1.3, 1.7])
 
-    for r, row_data in enumerate(rows_data):
-        for c, val in enumerate(row_data):
-            set_cell_text(tbl, r + 1, c, val, PP_ALIGN.CENTER)
-    style_table_body(tbl, num_rows, num_cols, font_size=12)
+    add_bar_chart(slide, chart_types,
+                  [("Current Avg Rent", chart_current), ("Market Rent", chart_market)],
+                  Inches(8.3), Inches(1.3), Inches(4.5), Inches(3.0),
+                  title="Rent vs. Market by Unit Type")
 
     # Market context note
     txBox = add_textbox(
@@ -637,13 +368,14 @@ def build_slide_06_rent_comps(prs):
         "Recent renovated comps in the area achieving $1,450 - $1,550 for 2BR units",
         font_size=12, color=CLR_DARK_TEXT,
     )
+    closest = "; ".join(f"{comp[C_ADDRESS].split(',')[0]} ({miles:.1f} mi, ${comp[C_PPU]:,}/unit)"
+                        for comp, miles in nearest(from_data(), 3))
+    add_paragraph(tf, f"Nearest sales: {closest}", font_size=12, color=CLR_DARK_TEXT)
 
 
 def build_slide_07_capex(prs):
-    """Slide 7 -- Capital Expenditure Plan."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Capital Expenditure Plan", 7)
+    """Slide 8 -- Capital Expenditure Plan."""
+    slide = add_content_slide(prs, "Capital Expenditure Plan")
 
     headers = ["Item", "Priority", "Cost", "Timeline"]
 
@@ -657,41 +389,16 @@ def build_slide_07_capex(prs):
         ("Parking lot reseal", "Low", "$6,000", "1 year"),
     ]
 
-    num_rows = len(capex_display) + 2  # header + body + total
-    num_cols = len(headers)
-    tbl = add_table(slide, num_rows, num_cols,
-                    Inches(1.5), Inches(1.5),
-                    Inches(10.3), Inches(4.5))
-    set_col_widths(tbl, [3.5, 1.8, 2.0, 3.0])
-
-    # Header
-    for c, h in enumerate(headers):
-        set_cell_text(tbl, 0, c, h, PP_ALIGN.CENTER)
-    style_table_header(tbl, num_cols, font_size=12)
-
-    # Body
-    for r, (item, priority, cost, timeline) in enumerate(capex_display):
-        set_cell_text(tbl, r + 1, 0, item, PP_ALIGN.LEFT)
-        set_cell_text(tbl, r + 1, 1, priority, PP_ALIGN.CENTER)
-        set_cell_text(tbl, r + 1, 2, cost, PP_ALIGN.CENTER)
-        set_cell_text(tbl, r + 1, 3, timeline, PP_ALIGN.CENTER)
-
-    # Total row
-    total_row_idx = num_rows - 1
-    set_cell_text(tbl, total_row_idx, 0, "Total", PP_ALIGN.LEFT)
-    set_cell_text(tbl, total_row_idx, 1, "", PP_ALIGN.CENTER)
-    set_cell_text(tbl, total_row_idx, 2, f"${TOTAL_CAPEX:,.0f}", PP_ALIGN.CENTER)
-    set_cell_text(tbl, total_row_idx, 3, "", PP_ALIGN.CENTER)
-
-    style_table_body(tbl, num_rows, num_cols, font_size=12)
-    style_total_row(tbl, total_row_idx, num_cols, font_size=12)
+    rows = [headers] + [list(r) for r in capex_display]
+    rows.append(["Total", "", f"${TOTAL_CAPEX:,.0f}", ""])
+    write_table(slide, rows, Inches(1.5), Inches(1.5), Inches(4.5),
+                [3.5, 1.8, 2.0, 3.0], total=True,
+                align=["l", "ctr", "ctr", "ctr"])
 
 
 def build_slide_08_demographics(prs):
-    """Slide 8 -- Palm Bay, FL Market Overview."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Palm Bay, FL \u2014 Market Overview", 8)
+    """Slide 9 -- Palm Bay, FL Market Overview."""
+    slide = add_content_slide(prs, "Palm Bay, FL \u2014 Market Overview")
 
     stats = [
         ("Population", "~125,000 (10% growth 2020-2025)"),
@@ -738,102 +445,53 @@ def build_slide_08_demographics(prs):
 
 
 def build_slide_09_proforma(prs):
-    """Slide 9 -- 3-Year Pro Forma Projections."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "3-Year Pro Forma", 9)
+    """Slide 10 -- 3-Year Pro Forma Projections (projection.py, as in 11_proforma)."""
+    slide = add_content_slide(prs, "3-Year Pro Forma")
+    result = project(3)
+    a = result["assumptions"]
 
     # Assumptions
     add_textbox(
         slide,
         left=Inches(0.6), top=Inches(1.2),
         width=Inches(12), height=Inches(0.4),
-        text="Assumptions: 3% annual rent growth  |  2% annual expense growth  |  Vacancy: 11.1% (Y1) \u2192 7% (Y2) \u2192 5% (Y3)",
+        text=(f"Assumptions: {a['rent_growth']:.0%} annual rent growth  |  "
+              f"{a['expense_growth']:.0%} annual expense growth  |  "
+              f"Vacancy: {a['vacancy_y1']:.1%} (Y1) \u2192 {a['vacancy']:.0%} (Y2+)"),
         font_size=11, bold=False, color=CLR_MED_GRAY,
     )
 
-    # Year 1: current performance (T12 actuals)
-    # Year 2: partial stabilization (rent growth + lower vacancy)
-    # Year 3: stabilized (market rents + 5% vacancy)
-
-    # Year 1 numbers (T12 actuals)
-    y1_revenue = TOTAL_REVENUE_ACTUAL   # $258,000
-    y1_expenses = TOTAL_EXPENSES_ACTUAL  # $123,750
-    y1_noi = NOI_ACTUAL                  # $134,250
-
-    # Year 2: GPR grows 3%, vacancy drops to 7%, expenses grow 2%
-    y2_gpr = GPR_ACTUAL * 1.03           # $290,460
-    y2_vacancy = y2_gpr * 0.07           # ~$20,332
-    y2_egi = y2_gpr - y2_vacancy
-    y2_other = (LAUNDRY_INCOME_ACTUAL + LATE_FEES_ACTUAL) * 1.03
-    y2_revenue = y2_egi + y2_other
-    y2_expenses_base = sum(
-        e[1] for e in EXPENSES_ACTUAL if e[1] is not None
-    ) * 1.02
-    y2_mgmt = y2_revenue * MGMT_FEE_PCT
-    y2_expenses = y2_expenses_base + y2_mgmt
-    y2_noi = y2_revenue - y2_expenses
-
-    # Year 3: GPR grows another 3% from Y2, vacancy 5%, expenses grow 2%
-    y3_gpr = y2_gpr * 1.03
-    y3_vacancy = y3_gpr * 0.05
-    y3_egi = y3_gpr - y3_vacancy
-    y3_other = y2_other * 1.03
-    y3_revenue = y3_egi + y3_other
-    y3_expenses_base = y2_expenses_base * 1.02
-    y3_mgmt = y3_revenue * MGMT_FEE_PCT
-    y3_expenses = y3_expenses_base + y3_mgmt
-    y3_noi = y3_revenue - y3_expenses
-
-    headers = ["", "Year 1 (T12)", "Year 2", "Year 3"]
+    def money(values, negative=False):
+        return [f"$({abs(v):,.0f})" if negative else f"${v:,.0f}" for v in values]
+
+    headers = ["", "Year 1", "Year 2", "Year 3"]
     rows_data = [
-        ("Gross Potential Rent", f"${GPR_ACTUAL:,.0f}",
-         f"${y2_gpr:,.0f}", f"${y3_gpr:,.0f}"),
-        ("Less: Vacancy", f"$({VACANCY_LOSS_ACTUAL_PRD:,.0f})",
-         f"$({y2_vacancy:,.0f})", f"$({y3_vacancy:,.0f})"),
-        ("Total Revenue", f"${y1_revenue:,.0f}",
-         f"${y2_revenue:,.0f}", f"${y3_revenue:,.0f}"),
-        ("Total Expenses", f"$({y1_expenses:,.0f})",
-         f"$({y2_expenses:,.0f})", f"$({y3_expenses:,.0f})"),
-        ("Net Operating Income", f"${y1_noi:,.0f}",
-         f"${y2_noi:,.0f}", f"${y3_noi:,.0f}"),
-        ("Cash Flow After DS", f"${y1_noi - ANNUAL_DEBT_SERVICE:,.0f}",
-         f"${y2_noi - ANNUAL_DEBT_SERVICE:,.0f}",
-         f"${y3_noi - ANNUAL_DEBT_SERVICE:,.0f}"),
+        ["Gross Potential Rent"] + money(result["gpr"]),
+        ["Less: Vacancy"] + money(result["vacancy"], negative=True),
+        ["Total Revenue"] + money(result["total_revenue"]),
+        ["Total Expenses"] + money(result["total_expenses"], negative=True),
+        ["Net Operating Income"] + money(result["noi"]),
+        ["Cash Flow After DS & CapEx"] + money(result["cash_flow"]),
     ]
 
+    # Bold navy NOI and Cash Flow rows (last two)
     num_rows = len(rows_data) + 1
-    num_cols = len(headers)
-    tbl = add_table(slide, num_rows, num_cols,
-                    Inches(1.0), Inches(1.8),
-                    Inches(11.3), Inches(4.5))
-    set_col_widths(tbl, [3.5, 2.6, 2.6, 2.6])
-
-    for c, h in enumerate(headers):
-        set_cell_text(tbl, 0, c, h, PP_ALIGN.CENTER)
-    style_table_header(tbl, num_cols, font_size=12)
-
-    for r, row_data in enumerate(rows_data):
-        set_cell_text(tbl, r + 1, 0, row_data[0], PP_ALIGN.LEFT)
-        for c in range(1, num_cols):
-            set_cell_text(tbl, r + 1, c, row_data[c], PP_ALIGN.CENTER)
+    write_table(slide, [headers] + rows_data,
+                Inches(0.6), Inches(1.8), Inches(4.5), [2.6, 1.45, 1.45, 1.45],
+                align=["l", "ctr", "ctr", "ctr"],
+                emphasis_rows=(num_rows - 2, num_rows - 1))
 
-    style_table_body(tbl, num_rows, num_cols, font_size=12)
-
-    # Bold the NOI and Cash Flow rows
-    for highlight_row in [num_rows - 2, num_rows - 1]:  # NOI and CF rows
-        for c in range(num_cols):
-            cell = tbl.cell(highlight_row, c)
-            for p in cell.text_frame.paragraphs:
-                p.font.bold = True
-                p.font.color.rgb = CLR_NAVY
+    # NOI / cash flow trend from the same arrays as the table
+    add_bar_chart(slide, headers[1:],
+                  [("Net Operating Income", [round(v) for v in result["noi"]]),
+                   ("Cash Flow After DS & CapEx", [round(v) for v in result["cash_flow"]])],
+                  Inches(7.9), Inches(1.8), Inches(4.9), Inches(4.5),
+                  title="NOI & Cash Flow Trend")
 
 
 def build_slide_10_terms(prs):
-    """Slide 10 -- Transaction Summary / Offer Terms."""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    set_slide_bg(slide, CLR_WHITE)
-    add_title_bar(slide, "Transaction Summary", 10)
+    """Slide 11 -- Transaction Summary / Offer Terms."""
+    slide = add_content_slide(prs, "Transaction Summary")
 
     terms = [
         ("Asking Price", f"${ASKING_PRICE:,.0f}"),
@@ -912,33 +570,182 @@ def build_slide_10_terms(prs):
 # ===========================================================================
 # Main
 # ===========================================================================
+def build_appendix_rent_roll(prs, start, stop, page, pages):
+    """Appendix -- Rent Roll, one page of units."""
+    slide = add_content_slide(prs, f"Appendix A \u2014 Rent Roll ({page} of {pages})")
+
+    headers = ["Unit", "Type", "SF", "Tenant", "Lease End", "Rent", "Market",
+               "Deposit", "Status"]
+    rows = [headers]
+    for u in UNITS[start:stop]:
+        rows.append([
+            u[U_NUM], u[U_TYPE], f"{u[U_SF]:,}", u[U_TENANT] or "\u2014",
+            u[U_LEASE_END] or "\u2014", f"${u[U_RENT]:,}" if u[U_RENT] else "\u2014",
+            f"${u[U_MARKET]:,}", f"${u[U_DEPOSIT]:,}" if u[U_DEPOSIT] else "\u2014",
+            u[U_STATUS],
+        ])
+    if stop >= len(UNITS):
+        rows.append(["Total", f"{TOTAL_UNITS} units", "", "", "",
+                     f"${sum(u[U_RENT] for u in UNITS):,}",
+                     f"${sum(u[U_MARKET] for u in UNITS):,}",
+                     f"${sum(u[U_DEPOSIT] for u in UNITS):,}", ""])
+
+    write_table(slide, rows, Inches(0.5), Inches(1.3), Inches(0.27) * len(rows),
+                [0.8, 1.2, 0.8, 2.6, 1.4, 1.2, 1.2, 1.2, 1.4],
+                font_size=10, total=stop >= len(UNITS),
+                align=["ctr", "ctr", "ctr", "l", "ctr", "r", "r", "r", "ctr"])
+
+
+def build_appendix_comps(prs):
+    """Appendix -- Sale Comparables."""
+    slide = add_content_slide(prs, "Appendix B \u2014 Sale Comparables")
+
+    rows = [["#", "Address", "Miles", "Units", "Sale Date", "Price", "$/Unit", "Cap Rate", "GRM"]]
+    for comp, miles in nearest(from_data(), len(COMPS)):
+        num, address, units, sale_date, price, ppu, cap, grm = comp[:C_LAT]
+        rows.append([str(num), address, f"{miles:.1f}", str(units), sale_date, f"${price:,}",
+                     f"${ppu:,}", f"{cap:.2%}", f"{grm:.1f}"])
+    rows.append(["S", PROPERTY["name"] + " (subject)", "\u2014", str(TOTAL_UNITS), "Asking",
+                 f"${ASKING_PRICE:,}", f"${ASKING_PRICE // TOTAL_UNITS:,}",
+                 f"{CAP_RATE_ACTUAL:.2%}", f"{ASKING_PRICE / GPR_ACTUAL:.1f}"])
+
+    write_table(slide, rows, Inches(0.6), Inches(1.5), Inches(0.4) * len(rows),
+                [0.5, 3.4, 0.7, 0.8, 1.2, 1.6, 1.4, 1.2, 1.1],
+                font_size=11, emphasis_rows=(len(rows) - 1,),
+                align=["ctr", "l", "ctr", "ctr", "ctr", "r", "r", "ctr", "ctr"])
+
+
+SLIDE_BUILDERS = [
+    build_slide_01_cover,
+    build_slide_02_highlights,
+    build_slide_03_overview,
+    build_slide_04_unit_mix,
+    build_slide_04b_lease_expirations,
+    build_slide_05_financial,
+    build_slide_06_rent_comps,
+    build_slide_07_capex,
+    build_slide_08_demographics,
+    build_slide_09_proforma,
+    build_slide_10_terms,
+]
+
+APPENDIX_ROWS_PER_PAGE = 18
+
+
+# ===========================================================================
+# Deck assembly
+# ===========================================================================
+# Chart slides own chart and embedded-workbook parts reached through slide
+# relationships, which a shape-tree fragment cannot carry; build them in the
+# parent deck even in parallel mode.
+SERIAL_BUILDERS = {build_slide_04b_lease_expirations, build_slide_06_rent_comps,
+                   build_slide_09_proforma}
+
+
+def slide_plan(appendix=False):
+    """Ordered (builder, args) for every slide in the deck."""
+    plan = [(build, ()) for build in SLIDE_BUILDERS]
+    if appendix:
+        pages = -(-len(UNITS) // APPENDIX_ROWS_PER_PAGE)
+        for page in range(pages):
+            start = page * APPENDIX_ROWS_PER_PAGE
+            stop = min(start + APPENDIX_ROWS_PER_PAGE, len(UNITS))
+            plan.append((build_appendix_rent_roll, (start, stop, page + 1, pages)))
+        plan.append((build_appendix_comps, ()))
+    return plan
+
+
+def render_slide(index, total, appendix):
+    """Worker: build one slide on a scratch deck from the data model and
+    return (layout name, shape tree XML). Slides only reference their
+    layout, so the fragment drops into any deck on the same template.
+    """
+    build, args = slide_plan(appendix)[index]
+    prs = new_deck(total)
+    build(prs, *args)
+    slide = prs.slides[0]
+    return slide.slide_layout.name, slide.shapes._spTree.xml
+
+
+def assemble(prs, layout_name, xml):
+    """Append one pre-rendered slide to prs."""
+    slide = prs.slides.add_slide(prs.slide_layouts.get_by_name(layout_name))
+    # Swap children in place: slide.shapes keeps a reference to spTree
+    sp_tree = slide.shapes._spTree
+    for child in list(sp_tree):
+        sp_tree.remove(child)
+    sp_tree.extend(list(parse_xml(xml)))
+
+
+def build_deck(appendix=False, workers=1):
+    """Build the OM serially, or with workers > 1 render each slide in a
+    worker process and assemble the fragments into one package. Chart
+    slides (SERIAL_BUILDERS) are built in place, in order.
+    """
+    plan = slide_plan(appendix)
+    total = len(plan)
+    # Layouts, backgrounds, title bars and slide numbers come from the
+    # cached template; builders only fill placeholders and add content.
+    prs = new_deck(total)
+    if workers <= 1:
+        for build, args in plan:
+            build(prs, *args)
+        return prs
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            index: pool.submit(render_slide, index, total, appendix)
+            for index, (build, _) in enumerate(plan) if build not in SERIAL_BUILDERS
+        }
+        for index, (build, args) in enumerate(plan):
+            if index in futures:
+                assemble(prs, *futures[index].result())
+            else:
+                build(prs, *args)
+    return prs
+
+
 def main():
-    prs = Presentation()
-
-    # Set 16:9 widescreen dimensions
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
-
-    build_slide_01_cover(prs)
-    build_slide_02_highlights(prs)
-    build_slide_03_overview(prs)
-    build_slide_04_unit_mix(prs)
-    build_slide_05_financial(prs)
-    build_slide_06_rent_comps(prs)
-    build_slide_07_capex(prs)
-    build_slide_08_demographics(prs)
-    build_slide_09_proforma(prs)
-    build_slide_10_terms(prs)
+    parser = argparse.ArgumentParser(description="Generate the offering memorandum.")
+    parser.add_argument("--appendix", action="store_true",
+                        help="add rent roll and sale comparable appendix slides")
+    parser.add_argument("--parallel", action="store_true",
+                        help="render slides in worker processes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --parallel (default: CPU count)")
+    args = parser.parse_args()
+
+    workers = (args.workers or os.cpu_count() or 1) if args.parallel else 1
+    expected = len(slide_plan(args.appendix))
+    prs = build_deck(args.appendix, workers)
 
     filepath = output_path("07_offering_memorandum.pptx")
     prs.save(filepath)
+    normalize(filepath)
 
     slide_count = len(prs.slides)
     print(f"Created 07_offering_memorandum.pptx at {filepath}")
     print(f"Total slides: {slide_count}")
 
-    if slide_count != 10:
-        print(f"WARNING: Expected 10 slides, got {slide_count}")
+    write_sidecar(
+        "07_offering_memorandum.pptx", "Offering Memorandum",
+        sections_from_presentation(prs),
+        key_figures={
+            "asking_price": ASKING_PRICE,
+            "price_per_unit": round(ASKING_PRICE / TOTAL_UNITS),
+            "noi_actual": NOI_ACTUAL,
+            "noi_proforma": NOI_PROFORMA,
+            "cap_rate_actual": round(CAP_RATE_ACTUAL, 4),
+            "cap_rate_proforma": round(CAP_RATE_PROFORMA, 4),
+            "slide_count": slide_count,
+        },
+        evidence={
+            "7-1": f"{slide_count}-slide Offering Memorandum",
+        },
+    )
+
+    if slide_count != expected:
+        print(f"WARNING: Expected {expected} slides, got {slide_count}")
         sys.exit(1)
 
 
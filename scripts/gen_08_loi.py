@@ -9,6 +9,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_docx
+from reproducible import normalize
 
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
@@ -375,8 +377,19 @@ def main():
     doc = build_loi()
     filepath = output_path("08_loi_template.docx")
     doc.save(filepath)
+    normalize(filepath)
     size_kb = os.path.getsize(filepath) / 1024
     print(f"Created 08_loi_template.docx at {filepath}")
+
+    write_sidecar(
+        "08_loi_template.docx", "Letter of Intent",
+        sections_from_docx(doc, r"Section \d+ \u2014"),
+        key_figures={
+            "property": PROPERTY["address"],
+            "seller": PROPERTY["owner_entity"],
+            "asking_price": ASKING_PRICE,
+        },
+    )
     print(f"File size: {size_kb:.1f} KB")
 
 
@@ -1,13 +1,25 @@
 """
 Generate 09_due_diligence_tracker.xlsx for Palm Bay Palms Apartments case study.
-Tracks all due diligence items with status, dates, and conditional formatting.
+Tracks all due diligence items with status, dates, and conditional formatting,
+plus a summary sheet of aging rollups from dd.py.
+
+Days Outstanding is a formula on the summary sheet's As Of date (no
+TODAY(), so the workbook does not recalculate on open); --static writes
+the computed values instead, for large trackers.
+
+Usage:
+    python gen_09_dd.py [--static] [--as-of 2026-02-20]
 """
+import argparse
 import sys
 import os
 from datetime import date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_workbook
+from reproducible import normalize
+from dd import aging, response_days, rollup, summary
 
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -45,10 +57,10 @@ STATUS_FILLS = {
 }
 
 
-def style_header_row(ws, num_cols):
-    """Apply navy background, white bold font to row 1."""
+def style_header_row(ws, num_cols, row=1):
+    """Apply navy background, white bold font to a header row (default row 1)."""
     for col in range(1, num_cols + 1):
-        cell = ws.cell(row=1, column=col)
+        cell = ws.cell(row=row, column=col)
         cell.font = HEADER_FONT
         cell.fill = HEADER_FILL
         cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
@@ -98,34 +110,14 @@ NOTES_MAP = {
 }
 
 
-# ---------------------------------------------------------------------------
-# Date generation helpers
-# ---------------------------------------------------------------------------
-def get_dates_for_item(status, index):
-    """Return (date_requested, date_received) based on status."""
-    if status in ("Received", "Cleared"):
-        date_requested = date(2026, 2, 1)
-        # Spread received dates from Feb 5 to Feb 10
-        day_offset = 5 + (index % 6)  # cycles through 5-10
-        date_received = date(2026, 2, day_offset)
-        return date_requested, date_received
-    elif status == "Reviewed":
-        date_requested = date(2026, 2, 1)
-        day_offset = 5 + (index % 6)
-        date_received = date(2026, 2, day_offset)
-        return date_requested, date_received
-    elif status == "Requested":
-        date_requested = date(2026, 2, 1)
-        return date_requested, None
-    else:  # Pending
-        return None, None
-
-
 # ===========================================================================
-# Main
+# Sheet 1: Tracker
 # ===========================================================================
-def main():
-    wb = Workbook()
+SUMMARY_TITLE = "DD Summary"
+AS_OF_CELL = f"'{SUMMARY_TITLE}'!$B$2"
+
+
+def create_tracker_sheet(wb, rows, static=False):
     ws = wb.active
     ws.title = "Due Diligence Tracker"
 
@@ -140,8 +132,10 @@ def main():
         "Days Outstanding",
         "Notes",
         "Critical?",
+        "Due Date",
+        "Overdue?",
     ]
-    col_widths = [30, 14, 12, 14, 14, 14, 16, 30, 10]
+    col_widths = [30, 14, 12, 14, 14, 14, 16, 30, 10, 14, 10]
 
     for c, header in enumerate(headers, 1):
         ws.cell(row=1, column=c, value=header)
@@ -149,50 +143,55 @@ def main():
     style_header_row(ws, len(headers))
 
     # -- Data rows -------------------------------------------------------------
-    for i, item in enumerate(DD_ITEMS):
-        name, category, status, responsible, critical = item
+    for i, (item, aged) in enumerate(zip(DD_ITEMS, rows)):
+        name, category, status, responsible, critical = item[:D_REQUESTED]
         row = i + 2
 
-        # Column A: DD Item
+        # Columns A-D: item, category, status, responsible party
         ws.cell(row=row, column=1, value=name)
-
-        # Column B: Category
         ws.cell(row=row, column=2, value=category)
-
-        # Column C: Status
         ws.cell(row=row, column=3, value=status)
-
-        # Column D: Responsible Party
         ws.cell(row=row, column=4, value=responsible)
 
-        # Column E & F: Dates
-        date_req, date_rec = get_dates_for_item(status, i)
-
-        if date_req is not None:
-            cell_e = ws.cell(row=row, column=5, value=date_req)
-            cell_e.number_format = DATE_FMT
+        # Columns E & F: request / receipt dates
+        for col, iso in ((5, item[D_REQUESTED]), (6, item[D_RECEIVED])):
+            if iso:
+                ws.cell(row=row, column=col, value=date.fromisoformat(iso)).number_format = DATE_FMT
+            else:
+                ws.cell(row=row, column=col, value="")
+
+        # Column G: Days Outstanding (open items age to the As Of date)
+        if static:
+            days = aged["days_outstanding"]
+            ws.cell(row=row, column=7, value=days if days is not None else "")
         else:
-            ws.cell(row=row, column=5, value="")
-
-        if date_rec is not None:
-            cell_f = ws.cell(row=row, column=6, value=date_rec)
-            cell_f.number_format = DATE_FMT
-        else:
-            ws.cell(row=row, column=6, value="")
-
-        # Column G: Days Outstanding (FORMULA)
-        ws.cell(
-            row=row, column=7,
-            value=f'=IF(F{row}="",TODAY()-E{row},F{row}-E{row})'
-        )
+            ws.cell(
+                row=row, column=7,
+                value=f'=IF(E{row}="","",IF(F{row}="",{AS_OF_CELL}-E{row},F{row}-E{row}))'
+            )
 
         # Column H: Notes
-        note = NOTES_MAP.get(name, "")
-        ws.cell(row=row, column=8, value=note)
+        ws.cell(row=row, column=8, value=NOTES_MAP.get(name, ""))
 
         # Column I: Critical?
-        crit_text = "Yes" if critical else "No"
-        ws.cell(row=row, column=9, value=crit_text)
+        ws.cell(row=row, column=9, value="Yes" if critical else "No")
+
+        # Column J: Due Date (request + response window)
+        if aged["due"]:
+            ws.cell(row=row, column=10,
+                    value=date.fromisoformat(aged["due"])).number_format = DATE_FMT
+        else:
+            ws.cell(row=row, column=10, value="")
+
+        # Column K: Overdue? (open past its response window)
+        if static:
+            ws.cell(row=row, column=11, value="Yes" if aged["overdue"] else "No")
+        else:
+            ws.cell(
+                row=row, column=11,
+                value=f'=IF(AND(F{row}="",E{row}<>""),'
+                      f'IF(G{row}>{response_days(critical)},"Yes","No"),"No")'
+            )
 
         # -- Style all cells in this row ---------------------------------------
         for c in range(1, len(headers) + 1):
@@ -204,11 +203,11 @@ def main():
         if status in STATUS_FILLS:
             status_cell.fill = STATUS_FILLS[status]
 
-        # -- Critical column styling -------------------------------------------
-        crit_cell = ws.cell(row=row, column=9)
+        # -- Critical / overdue styling ----------------------------------------
         if critical:
-            crit_cell.font = BOLD_RED_FONT
-            crit_cell.border = THIN_BORDER
+            ws.cell(row=row, column=9).font = BOLD_RED_FONT
+        if aged["overdue"]:
+            ws.cell(row=row, column=11).font = BOLD_RED_FONT
 
     # -- Column widths ---------------------------------------------------------
     for c, w in enumerate(col_widths, 1):
@@ -219,13 +218,141 @@ def main():
 
     # -- Auto-filter -----------------------------------------------------------
     last_row = len(DD_ITEMS) + 1
-    ws.auto_filter.ref = f"A1:I{last_row}"
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{last_row}"
+
+    return ws
+
+
+# ===========================================================================
+# Sheet 2: Summary
+# ===========================================================================
+ROLLUP_COLUMNS = [
+    ("Items", "items", "0"),
+    ("Open", "open", "0"),
+    ("Not Requested", "not_requested", "0"),
+    ("Overdue", "overdue", "0"),
+    ("Critical Open", "critical_open", "0"),
+    ("Avg Days Open", "avg_days_open", "0.0"),
+    ("Max Days Open", "max_days_open", "0"),
+    ("Avg Turnaround", "avg_turnaround", "0.0"),
+    ("% Complete", "pct_complete", "0%"),
+]
+
+
+def create_summary_sheet(wb, rows, as_of):
+    ws = wb.create_sheet(SUMMARY_TITLE)
+    totals = summary(DD_ITEMS, as_of)
+
+    ws.cell(row=1, column=1, value="Due Diligence Summary")
+    style_header_row(ws, len(ROLLUP_COLUMNS) + 1)
+
+    # Row 2: snapshot date (tracker formulas age open items to this cell)
+    ws.cell(row=2, column=1, value="As Of")
+    cell = ws.cell(row=2, column=2, value=date.fromisoformat(as_of))
+    cell.number_format = DATE_FMT
+    cell.font = Font(name="Arial", size=10, color="0000FF")
+    headline = [
+        ("Total Items", totals["items"], "0"),
+        ("Open", totals["open"], "0"),
+        ("Overdue", totals["overdue"], "0"),
+        ("Critical Open", totals["critical_open"], "0"),
+        ("Critical Overdue", totals["critical_overdue"], "0"),
+        ("% Complete", totals["pct_complete"], "0%"),
+    ]
+    for r, (label, value, fmt) in enumerate(headline, 3):
+        ws.cell(row=r, column=1, value=label)
+        ws.cell(row=r, column=2, value=value).number_format = fmt
+    for r in range(2, 3 + len(headline)):
+        for c in (1, 2):
+            style_body_cell(ws.cell(row=r, column=c))
+        ws.cell(row=r, column=1).font = Font(name="Arial", size=10, bold=True)
+
+    # Rollup tables by category and by responsible party
+    r = 4 + len(headline)
+    for title, key in (("Category", "category"), ("Responsible Party", "responsible")):
+        for c, text in enumerate([title] + [h for h, _, _ in ROLLUP_COLUMNS], 1):
+            ws.cell(row=r, column=c, value=text)
+        style_header_row(ws, len(ROLLUP_COLUMNS) + 1, row=r)
+        r += 1
+        for group, metrics in rollup(rows, key).items():
+            ws.cell(row=r, column=1, value=group)
+            for c, (_, field, fmt) in enumerate(ROLLUP_COLUMNS, 2):
+                ws.cell(row=r, column=c, value=metrics[field]).number_format = fmt
+            for c in range(1, len(ROLLUP_COLUMNS) + 2):
+                style_body_cell(ws.cell(row=r, column=c))
+            if metrics["overdue"]:
+                ws.cell(row=r, column=5).font = BOLD_RED_FONT
+            r += 1
+        r += 1
+
+    # Overdue items, most days late first
+    late = sorted((a for a in rows if a["overdue"]), key=lambda a: -a["days_overdue"])
+    for c, text in enumerate(["Overdue Item", "Responsible", "Requested", "Due",
+                              "Days Overdue", "Critical?"], 1):
+        ws.cell(row=r, column=c, value=text)
+    style_header_row(ws, 6, row=r)
+    r += 1
+    for a in late:
+        values = [a["item"], a["responsible"], date.fromisoformat(a["requested"]),
+                  date.fromisoformat(a["due"]), a["days_overdue"],
+                  "Yes" if a["critical"] else "No"]
+        for c, value in enumerate(values, 1):
+            cell = ws.cell(row=r, column=c, value=value)
+            style_body_cell(cell)
+            if c in (3, 4):
+                cell.number_format = DATE_FMT
+        if a["critical"]:
+            ws.cell(row=r, column=6).font = BOLD_RED_FONT
+        r += 1
+
+    ws.column_dimensions["A"].width = 30
+    for c in range(2, len(ROLLUP_COLUMNS) + 2):
+        ws.column_dimensions[get_column_letter(c)].width = 14
+    return ws, totals
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Generate the due diligence tracker.")
+    parser.add_argument("--static", action="store_true",
+                        help="write computed aging values instead of formulas")
+    parser.add_argument("--as-of", default=DD_AS_OF, help="snapshot date, YYYY-MM-DD")
+    args = parser.parse_args()
+
+    rows = aging(DD_ITEMS, args.as_of)
+    wb = Workbook()
+    create_tracker_sheet(wb, rows, static=args.static)
+    _, totals = create_summary_sheet(wb, rows, args.as_of)
 
     # -- Save ------------------------------------------------------------------
     filepath = output_path("09_due_diligence_tracker.xlsx")
     wb.save(filepath)
+    normalize(filepath)
     print(f"Created 09_due_diligence_tracker.xlsx at {filepath}")
-    print(f"Total DD items: {len(DD_ITEMS)} data rows")
+    print(f"Total DD items: {len(DD_ITEMS)} data rows; "
+          f"{totals['overdue']} overdue as of {args.as_of}")
+
+    status_counts = {}
+    for item in DD_ITEMS:
+        status_counts[item[D_STATUS]] = status_counts.get(item[D_STATUS], 0) + 1
+    write_sidecar(
+        "09_due_diligence_tracker.xlsx", "Due Diligence Tracker",
+        sections_from_workbook(wb),
+        key_figures={
+            "total_items": len(DD_ITEMS),
+            "status_counts": status_counts,
+            "as_of": args.as_of,
+            "critical_outstanding": totals["critical_outstanding"],
+            "overdue_items": totals["overdue_items"],
+            "pct_complete": round(totals["pct_complete"], 4),
+        },
+        evidence={
+            "9-4": f"{len(DD_ITEMS)} items tracked as of {args.as_of}, "
+                   f"{len(totals['overdue_items'])} overdue",
+        },
+    )
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_workbook
+from reproducible import normalize
 
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -550,8 +552,25 @@ def main():
 
     filepath = output_path("10_closing_worksheet.xlsx")
     wb.save(filepath)
+    normalize(filepath)
     print(f"Created 10_closing_worksheet.xlsx at {filepath}")
 
+    write_sidecar(
+        "10_closing_worksheet.xlsx", "Closing Worksheet",
+        sections_from_workbook(wb),
+        key_figures={
+            "closing_date": CLOSING_DATE,
+            "sale_price": ASKING_PRICE,
+            "mortgage_payoff": PROPERTY["current_mortgage"],
+            "security_deposits_transferred": TOTAL_SECURITY_DEPOSITS,
+            "tenants_notified": len(OCCUPIED_UNITS),
+        },
+        evidence={
+            "1-1": f"${PROPERTY['current_mortgage']:,} mortgage payoff",
+            "10-5": f"Tax and rent prorations through {CLOSING_DATE}",
+        },
+    )
+
     # Quick verification
     from openpyxl import load_workbook
     verify_wb = load_workbook(filepath)
@@ -1,14 +1,23 @@
 """
 Generate 11_proforma_3yr.xlsx for Palm Bay Palms Apartments case study.
-Three-year pro forma with assumptions section and Excel formula-driven projections.
+N-year pro forma (3 by default, up to 30) with assumptions section, Excel
+formula-driven projections, exit and levered returns, from projection.py.
+
+Usage:
+    python gen_11_proforma.py [--years N] [--values]
 """
+import argparse
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_workbook
+from reproducible import normalize
+from projection import MAX_YEARS, project, project_scenarios
 
 from openpyxl import Workbook
+from openpyxl.chart import BarChart, Reference
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
@@ -57,20 +66,103 @@ def apply_cell_style(cell, bold=False, blue=False):
 
 
 # ===========================================================================
-# Build the 3-Year Pro Forma worksheet
+# Debt Schedule worksheet
 # ===========================================================================
-def build_proforma(wb):
+def build_debt_schedule(wb, proforma_title, years):
+    """Monthly amortization of the assumed loan, and of the refinance loan
+    after an optional refinance at the end of Refinance Year, as formulas on
+    the pro forma's assumption cells. Matches projection.amortize_year:
+    payments stop once the loan is paid off.
+
+    Returns {"sheet", "ws", "pf", "year_rows": [(first, last) month row per
+    year]}. The refinance block is B2 active, B3 new loan, B4 payoff, B5
+    proceeds, B6 new annual debt service; B3 prices the refinance off the
+    pro forma NOI row, so build_proforma fills it in once that row exists.
+    """
+    ws = wb.create_sheet("Debt Schedule")
+    pf = "'" + proforma_title + "'"
+    ws.column_dimensions["A"].width = 30
+    for c in range(2, 9):
+        ws.column_dimensions[get_column_letter(c)].width = 16
+
+    title = ws.cell(row=1, column=1, value="DEBT SCHEDULE")
+    title.font = Font(name="Arial", size=11, bold=True, color="1565C0")
+
+    refi_rows = [
+        (2, "Refinance Active", f"=AND({pf}!$B$17>0,{pf}!$B$17<{years})", None),
+        (3, "New Loan", None, CURRENCY_FMT),   # set by build_proforma
+        (4, "Loan Payoff at Refinance", None, CURRENCY_FMT),
+        (5, "Refinance Proceeds", "=B3-B4", CURRENCY_FMT),
+        (6, "New Annual Debt Service", f"=IF(B2,PMT({pf}!$B$19/12,{pf}!$B$20*12,-B3)*12,0)",
+         CURRENCY_FMT),
+    ]
+    for r, label, formula, fmt in refi_rows:
+        apply_cell_style(ws.cell(row=r, column=1, value=label), bold=True)
+        cell = ws.cell(row=r, column=2, value=formula)
+        apply_cell_style(cell)
+        if fmt:
+            cell.number_format = fmt
+
+    hdr = 8
+    headers = ["Month", "Year", "Opening Balance", "Rate", "Payment", "Paid",
+               "Balance Before Refi", "Closing Balance"]
+    for c, text in enumerate(headers, 1):
+        ws.cell(row=hdr, column=c, value=text)
+    style_header_row(ws, hdr, len(headers))
+
+    first = hdr + 1
+    last = first + 12 * years - 1
+    refinanced = f"AND($B$2,B{{r}}>{pf}!$B$17)"
+    for m in range(1, 12 * years + 1):
+        r = first + m - 1
+        after = refinanced.format(r=r)
+        cells = [
+            (m, '0'),
+            ((m - 1) // 12 + 1, '0'),
+            (f"={pf}!$B$12" if m == 1 else f"=H{r - 1}", CURRENCY_FMT),
+            (f"=IF({after},{pf}!$B$19,{pf}!$B$13)", '0.00%'),
+            (f"=IF({after},$B$6/12,{pf}!$B$9/12)", CURRENCY_FMT),
+            (f"=MIN(E{r},C{r}*(1+D{r}/12))", CURRENCY_FMT),
+            (f"=C{r}*(1+D{r}/12)-F{r}", CURRENCY_FMT),
+            (f"=IF(AND($B$2,A{r}=12*{pf}!$B$17),$B$3,G{r})", CURRENCY_FMT),
+        ]
+        for c, (value, fmt) in enumerate(cells, 1):
+            cell = ws.cell(row=r, column=c, value=value)
+            apply_cell_style(cell)
+            cell.number_format = fmt
+    ws.cell(row=4, column=2).value = f"=IF(B2,INDEX(G{first}:G{last},12*{pf}!$B$17),0)"
+    ws.freeze_panes = f"A{hdr + 1}"
+    return {"sheet": "'Debt Schedule'", "ws": ws, "pf": pf,
+            "year_rows": [(first + 12 * y, first + 12 * y + 11) for y in range(years)]}
+
+
+# ===========================================================================
+# Build the N-Year Pro Forma worksheet
+# ===========================================================================
+def build_proforma(wb, years=3, values=False):
+    """Write the pro forma from projection.project(years).
+
+    By default the operating lines, debt, exit and returns are Excel
+    formulas on the assumption cells, with the loan amortized month by month
+    on a Debt Schedule sheet (the engine's arrays are the reference values);
+    values=True writes the engine's numbers directly. The scenario table is
+    engine output in both modes.
+    """
+    result = project(years)
+    a = result["assumptions"]
+    last_col = years + 1
+    cols = [get_column_letter(c) for c in range(2, last_col + 1)]
+
     ws = wb.active
-    ws.title = "3-Year Pro Forma"
+    ws.title = f"{years}-Year Pro Forma"
 
     # Column widths
-    ws.column_dimensions["A"].width = 28
-    ws.column_dimensions["B"].width = 16
-    ws.column_dimensions["C"].width = 16
-    ws.column_dimensions["D"].width = 16
+    ws.column_dimensions["A"].width = 32
+    for c in range(2, max(last_col, 6) + 2):
+        ws.column_dimensions[get_column_letter(c)].width = 16
 
     # -----------------------------------------------------------------------
-    # ASSUMPTIONS SECTION  (rows 1-10, light yellow background)
+    # ASSUMPTIONS SECTION  (rows 1-22, light yellow background)
     # -----------------------------------------------------------------------
     # Row 1: title
     ws.cell(row=1, column=1, value="ASSUMPTIONS")
@@ -80,16 +172,31 @@ def build_proforma(wb):
 
     # Assumption input cells  (labels in A, values in B)
     # B2=rent_growth, B3=expense_growth, B4=Y1_vacancy, B5=Y2+_vacancy,
-    # B6=Y1_capex, B7=Y2+_capex, B8=mgmt_fee%, B9=debt_service
+    # B6=Y1_capex, B7=Y2+_capex, B8=mgmt_fee%, B9=debt_service,
+    # B10-B15 acquisition and exit inputs, B16=discount rate for NPV,
+    # B17-B21 refinance at the end of a year (year 0 = hold existing debt)
     assumptions = [
-        (2,  "Rent Growth Rate",      0.03,                PCT_FMT),
-        (3,  "Expense Growth Rate",   0.02,                PCT_FMT),
-        (4,  "Year 1 Vacancy Rate",   0.111,               PCT_FMT),
-        (5,  "Year 2+ Vacancy Rate",  0.05,                PCT_FMT),
-        (6,  "Year 1 CapEx",          TOTAL_CAPEX,         CURRENCY_FMT),   # 87300
-        (7,  "Year 2+ CapEx",         10000,               CURRENCY_FMT),
-        (8,  "Management Fee",        MGMT_FEE_PCT,        PCT_FMT),        # 0.08
-        (9,  "Annual Debt Service",   ANNUAL_DEBT_SERVICE,  CURRENCY_FMT),  # 73800
+        (2,  "Rent Growth Rate",      a["rent_growth"],     PCT_FMT),
+        (3,  "Expense Growth Rate",   a["expense_growth"],  PCT_FMT),
+        # Year 1 vacancy is physical vacancy on the current rent roll (2 of 18)
+        (4,  "Year 1 Vacancy Rate",   a["vacancy_y1"],      PCT_FMT),
+        (5,  "Year 2+ Vacancy Rate",  a["vacancy"],         PCT_FMT),
+        (6,  "Year 1 CapEx",          a["capex_y1"],        CURRENCY_FMT),   # 87300
+        (7,  "Year 2+ CapEx",         a["capex"],           CURRENCY_FMT),
+        (8,  "Management Fee",        a["mgmt_fee"],        PCT_FMT),        # 0.08
+        (9,  "Annual Debt Service",   a["debt_service"],    CURRENCY_FMT),   # 73800
+        (10, "Purchase Price",        a["purchase_price"],  CURRENCY_FMT),
+        (11, "Closing Costs",         a["closing_costs"],   PCT_FMT),
+        (12, "Assumed Loan Balance",  a["loan_balance"],    CURRENCY_FMT),
+        (13, "Loan Rate",             a["loan_rate"],       '0.00%'),
+        (14, "Exit Cap Rate",         a["exit_cap"],        '0.00%'),
+        (15, "Sale Costs",            a["sale_costs"],      PCT_FMT),
+        (16, "Discount Rate",         a["discount_rate"],   PCT_FMT),
+        (17, "Refinance Year (0 = none)", a["refi_year"] or 0, '0'),
+        (18, "Refinance LTV",         a["refi_ltv"],        PCT_FMT),
+        (19, "Refinance Rate",        a["refi_rate"],       '0.00%'),
+        (20, "Refinance Amortization (Years)", a["refi_amort"], '0'),
+        (21, "Refinance Cap Rate",    a["refi_cap"],        '0.00%'),
     ]
 
     for row_num, label, value, fmt in assumptions:
@@ -107,30 +214,37 @@ def build_proforma(wb):
             c = ws.cell(row=row_num, column=col)
             c.fill = ASSUMPTION_FILL
 
-    # Row 10: blank spacer with assumption fill
+    # Row 22: blank spacer with assumption fill
     for col in range(1, 5):
-        ws.cell(row=10, column=col).fill = ASSUMPTION_FILL
+        ws.cell(row=22, column=col).fill = ASSUMPTION_FILL
+
+    # Monthly loan schedule the debt rows read from (formula mode only)
+    debt = None if values else build_debt_schedule(wb, ws.title, years)
 
     # -----------------------------------------------------------------------
-    # PRO FORMA TABLE  (starts at row 12)
+    # PRO FORMA TABLE  (starts at row 23)
     # -----------------------------------------------------------------------
-    HDR_ROW = 12
-    for c, text in enumerate(["", "Year 1", "Year 2", "Year 3"], 1):
+    HDR_ROW = 23
+    for c, text in enumerate([""] + [f"Year {y}" for y in range(1, years + 1)], 1):
         ws.cell(row=HDR_ROW, column=c, value=text)
-    style_header_row(ws, HDR_ROW, 4)
+    style_header_row(ws, HDR_ROW, last_col)
 
     # Mutable row counter
     row = [HDR_ROW + 1]   # list so nested functions can mutate
 
     # --- helper: write one data row ---
-    def put(label, y1, y2, y3, fmt=CURRENCY_FMT, bold=False, indent=False):
+    # formula(col, prev) returns the cell formula for a year column given
+    # its letter and the previous year's letter (None in Year 1).
+    def put(label, engine, formula=None, fmt=CURRENCY_FMT, bold=False, indent=False):
         r = row[0]
         lbl = ("  " + label) if indent else label
         lc = ws.cell(row=r, column=1, value=lbl)
         apply_cell_style(lc, bold=bold)
 
-        for col, val in [(2, y1), (3, y2), (4, y3)]:
-            cell = ws.cell(row=r, column=col, value=val)
+        for i, col in enumerate(cols):
+            prev = cols[i - 1] if i else None
+            val = engine[i] if values or formula is None else formula(col, prev, r)
+            cell = ws.cell(row=r, column=i + 2, value=val)
             apply_cell_style(cell, bold=bold)
             cell.number_format = fmt
 
@@ -143,7 +257,7 @@ def build_proforma(wb):
         cell = ws.cell(row=r, column=1, value=label)
         cell.font = Font(name="Arial", size=10, bold=True, underline="single")
         cell.border = THIN_BORDER
-        for col in range(2, 5):
+        for col in range(2, last_col + 1):
             ws.cell(row=r, column=col).border = THIN_BORDER
         row[0] += 1
         return r
@@ -151,55 +265,36 @@ def build_proforma(wb):
     # --- helper: blank separator row ---
     def blank():
         r = row[0]
-        for col in range(1, 5):
+        for col in range(1, last_col + 1):
             ws.cell(row=r, column=col).border = THIN_BORDER
         row[0] += 1
 
-    # --- helper: write an expense line that grows at expense_growth ---
-    def expense_line(label, base_val):
-        """Write an expense item: Y1=base, Y2=Y1*(1+B3), Y3=Y2*(1+B3)."""
-        r = put(label, base_val, None, None, indent=True)
-        ws.cell(row=r, column=3).value = f"=B{r}*(1+$B$3)"
-        ws.cell(row=r, column=4).value = f"=C{r}*(1+$B$3)"
-        return r
+    # --- helper: a line that starts at base and grows at a rate cell ---
+    def growing(base, rate_cell):
+        return lambda col, prev, r: base if prev is None else f"={prev}{r}*(1+{rate_cell})"
 
     # ========================= INCOME ========================= #
     section("INCOME")
 
-    # Gross Potential Rent:  Y1=$298,800  Y2=Y1*(1+rent_growth)  Y3=Y2*(1+rent_growth)
-    gpr = put("Gross Potential Rent", GPR_PROFORMA, None, None, indent=True)
-    ws.cell(row=gpr, column=3).value = f"=B{gpr}*(1+$B$2)"
-    ws.cell(row=gpr, column=4).value = f"=C{gpr}*(1+$B$2)"
+    # Gross Potential Rent:  Y1=$298,800, then grows at rent_growth (B2)
+    gpr = put("Gross Potential Rent", result["gpr"], growing(a["gpr"], "$B$2"), indent=True)
 
-    # Less: Vacancy:  Y1=-GPR*B4   Y2=-GPR*B5   Y3=-GPR*B5
-    vac = put("Less: Vacancy",
-              f"=-B{gpr}*$B$4",
-              f"=-C{gpr}*$B$5",
-              f"=-D{gpr}*$B$5",
+    # Less: Vacancy:  Y1=-GPR*B4, Y2+=-GPR*B5
+    vac = put("Less: Vacancy", result["vacancy"],
+              lambda col, prev, r: f"=-{col}{gpr}*{'$B$4' if prev is None else '$B$5'}",
               indent=True)
 
     # Effective Gross Income = GPR + Vacancy  (vacancy is negative)
-    egi = put("Effective Gross Income",
-              f"=B{gpr}+B{vac}",
-              f"=C{gpr}+C{vac}",
-              f"=D{gpr}+D{vac}",
-              indent=True)
-
-    # Laundry Income:  $6,000 base, grows at rent_growth
-    laun = put("Laundry Income", 6000, None, None, indent=True)
-    ws.cell(row=laun, column=3).value = f"=B{laun}*(1+$B$2)"
-    ws.cell(row=laun, column=4).value = f"=C{laun}*(1+$B$2)"
+    egi = put("Effective Gross Income", result["egi"],
+              lambda col, prev, r: f"={col}{gpr}+{col}{vac}", indent=True)
 
-    # Late Fees/Other:  $3,000 base, grows at rent_growth
-    late = put("Late Fees/Other", 3000, None, None, indent=True)
-    ws.cell(row=late, column=3).value = f"=B{late}*(1+$B$2)"
-    ws.cell(row=late, column=4).value = f"=C{late}*(1+$B$2)"
+    # Other income (laundry, late fees) grows at rent_growth
+    other = [put(label, result["other_income"][label], growing(base, "$B$2"), indent=True)
+             for label, base in a["other_income"]]
 
     # Total Revenue  (BOLD subtotal)
-    trev = put("Total Revenue",
-               f"=B{egi}+B{laun}+B{late}",
-               f"=C{egi}+C{laun}+C{late}",
-               f"=D{egi}+D{laun}+D{late}",
+    trev = put("Total Revenue", result["total_revenue"],
+               lambda col, prev, r: "=" + "+".join(f"{col}{x}" for x in [egi] + other),
                bold=True)
 
     blank()
@@ -207,33 +302,19 @@ def build_proforma(wb):
     # ========================= EXPENSES ========================= #
     section("EXPENSES")
 
-    # Each standard expense: base value in Y1, grows at expense_growth (B3)
-    tax  = expense_line("Property Taxes",        18750)
-    ins  = expense_line("Insurance",             32400)
-    rm   = expense_line("Repairs & Maintenance", 22000)
-
-    # Property Management:  =B8 * Total_Revenue  (not expense-growth based)
-    mgmt = put("Property Management",
-               f"=$B$8*B{trev}",
-               f"=$B$8*C{trev}",
-               f"=$B$8*D{trev}",
-               indent=True)
-
-    util = expense_line("Utilities",              8400)
-    land = expense_line("Landscaping",            4800)
-    pest = expense_line("Pest Control",           2160)
-    lgl  = expense_line("Legal/Admin",            2400)
-    rsv  = expense_line("Reserves",               4500)
+    # Each standard expense: base value in Y1, grows at expense_growth (B3);
+    # Property Management is =B8 * Total Revenue
+    all_exp = []
+    for label, base in a["expenses"]:
+        if base is None:
+            formula = lambda col, prev, r: f"=$B$8*{col}{trev}"
+        else:
+            formula = growing(base, "$B$3")
+        all_exp.append(put(label, result["expenses"][label], formula, indent=True))
 
     # Total Expenses  (SUM of all expense rows, BOLD)
-    all_exp = [tax, ins, rm, mgmt, util, land, pest, lgl, rsv]
-
-    def sum_exp(col):
-        refs = ",".join(f"{col}{er}" for er in all_exp)
-        return f"=SUM({refs})"
-
-    texp = put("Total Expenses",
-               sum_exp("B"), sum_exp("C"), sum_exp("D"),
+    texp = put("Total Expenses", result["total_expenses"],
+               lambda col, prev, r: "=SUM(" + ",".join(f"{col}{er}" for er in all_exp) + ")",
                bold=True)
 
     blank()
@@ -242,48 +323,248 @@ def build_proforma(wb):
     section("BOTTOM LINE")
 
     # NOI = Total Revenue - Total Expenses  (BOLD)
-    noi = put("Net Operating Income (NOI)",
-              f"=B{trev}-B{texp}",
-              f"=C{trev}-C{texp}",
-              f"=D{trev}-D{texp}",
-              bold=True)
-
-    # Less: Capital Expenditures  (negative: Y1=-B6, Y2/3=-B7)
-    capex = put("Less: Capital Expenditures",
-                f"=-$B$6", f"=-$B$7", f"=-$B$7",
-                indent=True)
-
-    # Less: Debt Service  (negative: =-B9 each year)
-    ds = put("Less: Debt Service",
-             f"=-$B$9", f"=-$B$9", f"=-$B$9",
+    noi = put("Net Operating Income (NOI)", result["noi"],
+              lambda col, prev, r: f"={col}{trev}-{col}{texp}", bold=True)
+
+    if debt:
+        # Refinance at NOI of the year after Refinance Year / refinance cap x LTV
+        debt["ws"].cell(row=3, column=2).value = (
+            "=IF(B2,INDEX({pf}!$B${noi}:${last}${noi},{pf}!$B$17+1)/{pf}!$B$21*{pf}!$B$18,0)"
+            .format(pf=debt["pf"], noi=noi, last=cols[-1]))
+
+    # Less: Capital Expenditures  (negative: Y1=-B6, Y2+=-B7)
+    capex = put("Less: Capital Expenditures", result["capex"],
+                lambda col, prev, r: "=-$B$6" if prev is None else "=-$B$7", indent=True)
+
+    # Less: Debt Service  (the year's twelve payments on the Debt Schedule)
+    ds = put("Less: Debt Service", result["debt_service"],
+             lambda col, prev, r: "=-SUM({0}!F{1}:F{2})".format(
+                 debt["sheet"], *debt["year_rows"][cols.index(col)]),
              indent=True)
 
     # Cash Flow After Debt Service & CapEx  (BOLD)
     # = NOI + CapEx_row + DS_row   (CapEx and DS are already negative)
-    cf = put("Cash Flow After DS & CapEx",
-             f"=B{noi}+B{capex}+B{ds}",
-             f"=C{noi}+C{capex}+C{ds}",
-             f"=D{noi}+D{capex}+D{ds}",
-             bold=True)
+    cf = put("Cash Flow After DS & CapEx", result["cash_flow"],
+             lambda col, prev, r: f"={col}{noi}+{col}{capex}+{col}{ds}", bold=True)
+
+    # Refinance Proceeds  (new loan less payoff, in the refinance year)
+    refi = put("Refinance Proceeds", result["refi_proceeds"],
+               lambda col, prev, r: "=IF(AND({0}!$B$2,$B$17={1}),{0}!$B$5,0)".format(
+                   debt["sheet"], cols.index(col) + 1),
+               indent=True)
+
+    bal = put("Loan Balance (End of Year)", result["loan_balance"],
+              lambda col, prev, r: "={0}!H{1}".format(debt["sheet"],
+                                                      debt["year_rows"][cols.index(col)][1]))
+
+    blank()
+
+    # ========================= EXIT & RETURNS ========================= #
+    section(f"EXIT (END OF YEAR {years})")
+    exit_ = result["exit"]
+    exit_col = years + 1
+    x, r0 = cols[-1], row[0]
+    # Year N+1 NOI: last year's lines grown one more year, at Year 2+ vacancy
+    other_sum = "+".join(f"{x}{o}" for o in other) or "0"
+    fixed_sum = "+".join(f"{x}{er}" for (_, base), er in zip(a["expenses"], all_exp)
+                         if base is not None) or "0"
+    fwd_revenue = f"({x}{gpr}*(1+$B$2)*(1-$B$5)+({other_sum})*(1+$B$2))"
+    if any(base is None for _, base in a["expenses"]):
+        fwd_revenue += "*(1-$B$8)"
+    exit_rows = [
+        (f"Year {years + 1} NOI", exit_["forward_noi"],
+         f"={fwd_revenue}-({fixed_sum})*(1+$B$3)", False),
+        ("Sale Price (NOI / Exit Cap)", exit_["sale_price"], f"={x}{r0}/$B$14", False),
+        ("Less: Sale Costs", -exit_["sale_costs"], f"=-{x}{r0 + 1}*$B$15", False),
+        ("Less: Loan Payoff", -exit_["loan_payoff"], f"=-{x}{bal}", False),
+        ("Net Sale Proceeds", exit_["net_proceeds"], f"=SUM({x}{r0 + 1}:{x}{r0 + 3})", True),
+    ]
+    for label, value, formula, bold in exit_rows:
+        r = row[0]
+        apply_cell_style(ws.cell(row=r, column=1, value=("  " + label) if not bold else label),
+                         bold=bold)
+        cell = ws.cell(row=r, column=exit_col, value=value if values else formula)
+        apply_cell_style(cell, bold=bold)
+        cell.number_format = CURRENCY_FMT
+        row[0] += 1
+    net_sale_row = row[0] - 1
+
+    blank()
+
+    # Levered and unlevered cash flows on their own Year 0..N header
+    section("RETURNS")
+    flow_hdr = row[0]
+    for c, text in enumerate([""] + [f"Year {y}" for y in range(years + 1)], 1):
+        ws.cell(row=flow_hdr, column=c, value=text)
+    style_header_row(ws, flow_hdr, years + 2)
+    row[0] += 1
+
+    flows_row = row[0]
+    apply_cell_style(ws.cell(row=flows_row, column=1, value="Levered Cash Flow"), bold=True)
+    for t, value in enumerate(result["levered_flows"]):
+        if not values:
+            if t == 0:
+                value = "=-($B$10*(1+$B$11)-$B$12)"
+            else:
+                col = cols[t - 1]
+                value = f"={col}{cf}+{col}{refi}" + (f"+{col}{net_sale_row}" if t == years else "")
+        cell = ws.cell(row=flows_row, column=t + 2, value=value)
+        apply_cell_style(cell, bold=True)
+        cell.number_format = CURRENCY_FMT
+    row[0] += 1
+
+    # Unlevered: all-cash purchase, NOI less capex, sale net of costs
+    unlev_row = row[0]
+    apply_cell_style(ws.cell(row=unlev_row, column=1, value="Unlevered Cash Flow"), bold=True)
+    for t, value in enumerate(result["unlevered_flows"]):
+        if not values:
+            if t == 0:
+                value = "=-$B$10*(1+$B$11)"
+            else:
+                col = cols[t - 1]
+                value = f"={col}{noi}+{col}{capex}"
+                if t == years:
+                    value += f"+{col}{r0 + 1}+{col}{r0 + 2}"
+        cell = ws.cell(row=unlev_row, column=t + 2, value=value)
+        apply_cell_style(cell, bold=True)
+        cell.number_format = CURRENCY_FMT
+    row[0] += 1
+
+    first, last = get_column_letter(2), get_column_letter(years + 2)
+    second = get_column_letter(3)
+    returns_rows = [
+        ("Levered IRR", result["irr"], f"=IRR({first}{flows_row}:{last}{flows_row})", '0.0%'),
+        ("Unlevered IRR", result["unlevered_irr"],
+         f"=IRR({first}{unlev_row}:{last}{unlev_row})", '0.0%'),
+        ("Levered NPV @ Discount Rate", result["npv"],
+         f"=NPV($B$16,{second}{flows_row}:{last}{flows_row})+{first}{flows_row}", CURRENCY_FMT),
+        ("Equity Multiple", result["equity_multiple"],
+         f"=SUM({second}{flows_row}:{last}{flows_row})/-{first}{flows_row}", '0.00"x"'),
+    ]
+    for label, value, formula, fmt in returns_rows:
+        r = row[0]
+        apply_cell_style(ws.cell(row=r, column=1, value=label), bold=True)
+        cell = ws.cell(row=r, column=2, value=value if values else formula)
+        apply_cell_style(cell, bold=True)
+        cell.number_format = fmt
+        row[0] += 1
+
+    blank()
+
+    # Scenario returns: every projection.SCENARIOS case over the same hold,
+    # IRRs solved together by returns.irr_many (values, not formulas)
+    section("SCENARIO RETURNS")
+    scenario_hdr = row[0]
+    headers = ["Scenario", "Exit Value", "Net Sale Proceeds", "Levered IRR",
+               "Unlevered IRR", "Levered NPV", "Equity Multiple"]
+    for c, text in enumerate(headers, 1):
+        ws.cell(row=scenario_hdr, column=c, value=text)
+    style_header_row(ws, scenario_hdr, len(headers))
+    row[0] += 1
+
+    scenarios = project_scenarios(years)
+    for name, s in scenarios.items():
+        r = row[0]
+        cells = [
+            (name, None),
+            (s["exit"]["sale_price"], CURRENCY_FMT),
+            (s["exit"]["net_proceeds"], CURRENCY_FMT),
+            (s["irr"], '0.0%'),
+            (s["unlevered_irr"], '0.0%'),
+            (s["npv"], CURRENCY_FMT),
+            (s["equity_multiple"], '0.00"x"'),
+        ]
+        for c, (value, fmt) in enumerate(cells, 1):
+            cell = ws.cell(row=r, column=c, value=value)
+            apply_cell_style(cell, bold=(c == 1))
+            if fmt:
+                cell.number_format = fmt
+        row[0] += 1
+    note = ws.cell(row=row[0], column=1,
+                   value="Scenario rows are projection.py output at the default assumptions; "
+                         "they do not recalculate when the inputs above change.")
+    note.font = Font(name="Arial", size=9, italic=True)
+    if values:
+        note = ws.cell(row=row[0] + 1, column=1,
+                       value="Values mode: every figure on this sheet is projection.py output "
+                             "and does not recalculate.")
+        note.font = Font(name="Arial", size=9, italic=True)
+
+    # -----------------------------------------------------------------------
+    # NOI / cash flow chart, fed by the rows above
+    # -----------------------------------------------------------------------
+    chart = BarChart()
+    chart.type = "col"
+    chart.grouping = "clustered"
+    chart.title = "NOI & Cash Flow by Year"
+    chart.y_axis.numFmt = '"$"#,##0'
+    chart.x_axis.delete = False
+    chart.y_axis.delete = False
+    for r in (noi, cf):
+        chart.add_data(Reference(ws, min_col=1, max_col=last_col, min_row=r),
+                       titles_from_data=True, from_rows=True)
+    chart.set_categories(Reference(ws, min_col=2, max_col=last_col, min_row=HDR_ROW))
+    for series, color in zip(chart.series, (NAVY, "C59A2C")):
+        series.graphicalProperties.solidFill = color
+    chart.legend.position = "b"
+    chart.width, chart.height = max(16, 2 * years), 8
+    ws.add_chart(chart, f"{get_column_letter(max(last_col, years + 2) + 2)}{HDR_ROW}")
 
     # -----------------------------------------------------------------------
     # Freeze panes below the table header
     # -----------------------------------------------------------------------
-    ws.freeze_panes = f"A{HDR_ROW + 1}"
+    ws.freeze_panes = f"B{HDR_ROW + 1}"
 
-    return ws
+    result["scenarios"] = scenarios
+    return ws, result
 
 
 # ===========================================================================
 # Main
 # ===========================================================================
 def main():
+    parser = argparse.ArgumentParser(description="Generate the pro forma workbook.")
+    parser.add_argument("--years", type=int, default=3,
+                        help=f"projection horizon, 1-{MAX_YEARS} (default 3)")
+    parser.add_argument("--values", action="store_true",
+                        help="write computed values instead of Excel formulas")
+    args = parser.parse_args()
+    if not 1 <= args.years <= MAX_YEARS:
+        parser.error(f"--years must be between 1 and {MAX_YEARS}")
+
     wb = Workbook()
-    build_proforma(wb)
+    ws, result = build_proforma(wb, args.years, args.values)
 
     filepath = output_path("11_proforma_3yr.xlsx")
     wb.save(filepath)
-    print(f"Created 11_proforma_3yr.xlsx at {filepath}")
+    normalize(filepath)
+    print(f"Created 11_proforma_3yr.xlsx ({ws.title}) at {filepath}")
+
+    write_sidecar(
+        "11_proforma_3yr.xlsx", ws.title,
+        sections_from_workbook(wb),
+        key_figures={
+            "gross_potential_rent_y1": GPR_PROFORMA,
+            "noi_y1": result["noi"][0],
+            "year_1_capex": TOTAL_CAPEX,
+            "annual_debt_service": ANNUAL_DEBT_SERVICE,
+            "management_fee_pct": MGMT_FEE_PCT,
+            "hold_years": args.years,
+            "exit_value": result["exit"]["sale_price"],
+            "levered_irr": round(result["irr"], 4) if result["irr"] is not None else None,
+            "equity_multiple": round(result["equity_multiple"], 2),
+            "unlevered_irr": (round(result["unlevered_irr"], 4)
+                              if result["unlevered_irr"] is not None else None),
+            "levered_npv": round(result["npv"]),
+            "scenario_irr": {name: round(s["irr"], 4) if s["irr"] is not None else None
+                             for name, s in result["scenarios"].items()},
+        },
+        evidence={
+            "4-6": f"${result['noi'][0]:,.0f} Year 1 NOI",
+            "7-3": f"{args.years}-year proforma"
+                   + (f", levered IRR {result['irr']:.1%}" if result["irr"] is not None else ""),
+        },
+    )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from data import *
+from sidecar import write_sidecar, sections_from_docx
+from reproducible import normalize
 
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor, Cm
@@ -435,8 +437,21 @@ def main():
     doc = build_entity_summary()
     filepath = output_path("12_entity_summary.docx")
     doc.save(filepath)
+    normalize(filepath)
     size_kb = os.path.getsize(filepath) / 1024
     print(f"Created 12_entity_summary.docx at {filepath}")
+
+    write_sidecar(
+        "12_entity_summary.docx", "Entity Summary",
+        sections_from_docx(doc, r"Section \d+ \u2014"),
+        key_figures={
+            "owner_entity": PROPERTY["owner_entity"],
+            "parcel_id": PROPERTY["parcel_id"],
+        },
+        evidence={
+            "5-3": PROPERTY["owner_entity"],
+        },
+    )
     print(f"File size: {size_kb:.1f} KB")
 
 
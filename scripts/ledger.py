@@ -0,0 +1,212 @@
+"""
+Collections ledger for the trailing 12 months: per-unit, per-month rent
+charges and receipts built from the rent roll (UNITS), tenancies that ended
+during the period (PRIOR_TENANCIES) and unpaid months (ARREARS). Vacancy,
+delinquency, aging, collection rate and bad debt are all read off the same
+two arrays, so the rent roll workbook and the T12 P&L agree.
+
+Usage:
+    python ledger.py [--json]
+"""
+import argparse
+import json
+import sys
+import os
+from datetime import datetime
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+# "Mar 2025" -> "2025-03", one per MONTHS entry
+PERIODS = [datetime.strptime(m, "%b %Y").strftime("%Y-%m") for m in MONTHS]
+
+AGING_BUCKETS = ["0-30", "31-60", "61-90", "90+"]
+BAD_DEBT_DAYS = 90  # receivables older than this are reserved as bad debt
+
+
+def _month_index(period):
+    return int(period[:4]) * 12 + int(period[5:7]) - 1
+
+
+# ---------------------------------------------------------------------------
+# Ledger
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=8)
+def _build(units, prior, arrears, periods):
+    prior_by_unit = {num: (rent, _month_index(vacant_from)) for num, rent, vacant_from in prior}
+    unpaid = {(num, period) for num, period in arrears}
+    month_idx = [_month_index(p) for p in periods]
+
+    ledger = {}
+    for u in units:
+        num = u[U_NUM]
+        if u[U_STATUS] == "Occupied":
+            charges = [u[U_RENT]] * len(periods)
+        elif num in prior_by_unit:
+            rent, vacant_from = prior_by_unit[num]
+            charges = [rent if m < vacant_from else 0 for m in month_idx]
+        else:
+            charges = [0] * len(periods)
+        receipts = [0 if (num, p) in unpaid else c for c, p in zip(charges, periods)]
+        ledger[num] = {
+            "charges": tuple(charges),
+            "receipts": tuple(receipts),
+            "market": u[U_MARKET],
+            "tenant": u[U_TENANT],
+        }
+    return ledger
+
+
+def build_ledger(units=UNITS, prior=PRIOR_TENANCIES, arrears=ARREARS, periods=PERIODS):
+    """{unit_num: {"charges", "receipts", "market", "tenant"}} with one entry
+    per period. Occupied units are charged their current rent every month;
+    units vacated during the period are charged their prior rent until the
+    move-out month. Cached per input set; treat the result as read-only.
+    """
+    return _build(tuple(units), tuple(prior), tuple(arrears), tuple(periods))
+
+
+def _column_sums(ledger, field):
+    return [sum(col) for col in zip(*(entry[field] for entry in ledger.values()))]
+
+
+# ---------------------------------------------------------------------------
+# Monthly series
+# ---------------------------------------------------------------------------
+def monthly_collections(ledger=None):
+    """unit_num -> list of monthly receipts (the Monthly Collections grid)."""
+    ledger = ledger or build_ledger()
+    return {num: list(entry["receipts"]) for num, entry in ledger.items()}
+
+
+def monthly_charges(ledger=None):
+    return _column_sums(ledger or build_ledger(), "charges")
+
+
+def monthly_receipts(ledger=None):
+    return _column_sums(ledger or build_ledger(), "receipts")
+
+
+def vacancy_loss(ledger=None):
+    """Market rent on units with no rent charged, per month."""
+    ledger = ledger or build_ledger()
+    return [sum(e["market"] for e in ledger.values() if e["charges"][m] == 0)
+            for m in range(len(PERIODS))]
+
+
+def delinquency_loss(ledger=None):
+    """Rent charged but not received, per month."""
+    ledger = ledger or build_ledger()
+    return [c - r for c, r in zip(monthly_charges(ledger), monthly_receipts(ledger))]
+
+
+def economic_loss(ledger=None):
+    """Market rent on every unit less rent received, per month: vacancy,
+    delinquency and loss-to-lease together.
+    """
+    ledger = ledger or build_ledger()
+    gpr = sum(e["market"] for e in ledger.values())
+    return [gpr - r for r in monthly_receipts(ledger)]
+
+
+def collection_rate(ledger=None):
+    """(monthly rates, trailing-12 rate) of receipts over charges."""
+    ledger = ledger or build_ledger()
+    charges, receipts = monthly_charges(ledger), monthly_receipts(ledger)
+    monthly = [r / c if c else 0.0 for c, r in zip(charges, receipts)]
+    total = sum(charges)
+    return monthly, (sum(receipts) / total if total else 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Receivables
+# ---------------------------------------------------------------------------
+def _age_bucket(days):
+    if days <= 30:
+        return "0-30"
+    if days <= 60:
+        return "31-60"
+    if days <= 90:
+        return "61-90"
+    return "90+"
+
+
+def aging(ledger=None, as_of=AS_OF):
+    """Open receivables by unit and age as of the rent roll date. Rent is
+    due on the 1st; a month unpaid at as_of is 30 days past due, the month
+    before 60, and so on.
+
+    Returns {unit_num: {"tenant", "0-30", "31-60", "61-90", "90+",
+    "total", "days_past_due", "bad_debt"}} for units with a balance, where
+    bad_debt is the part older than BAD_DEBT_DAYS.
+    """
+    ledger = ledger or build_ledger()
+    as_of_idx = _month_index(as_of)
+    result = {}
+    for num, entry in ledger.items():
+        row = {"tenant": entry["tenant"], **{b: 0 for b in AGING_BUCKETS},
+               "total": 0, "days_past_due": 0, "bad_debt": 0}
+        for period, charge, receipt in zip(PERIODS, entry["charges"], entry["receipts"]):
+            owed = charge - receipt
+            if owed <= 0:
+                continue
+            days = 30 * (as_of_idx - _month_index(period))
+            row[_age_bucket(days)] += owed
+            row["total"] += owed
+            row["days_past_due"] = max(row["days_past_due"], days)
+            if days > BAD_DEBT_DAYS:
+                row["bad_debt"] += owed
+        if row["total"]:
+            result[num] = row
+    return result
+
+
+def collections_summary(ledger=None, as_of=AS_OF):
+    """Trailing-12 headline figures for the ledger."""
+    ledger = ledger or build_ledger()
+    receivables = aging(ledger, as_of)
+    _, rate = collection_rate(ledger)
+    return {
+        "periods": [PERIODS[0], PERIODS[-1]],
+        "charges": sum(monthly_charges(ledger)),
+        "receipts": sum(monthly_receipts(ledger)),
+        "collection_rate": round(rate, 4),
+        "vacancy_loss": sum(vacancy_loss(ledger)),
+        "delinquency_loss": sum(delinquency_loss(ledger)),
+        "receivables": sum(row["total"] for row in receivables.values()),
+        "aging": {b: sum(row[b] for row in receivables.values()) for b in AGING_BUCKETS},
+        "bad_debt_reserve": sum(row["bad_debt"] for row in receivables.values()),
+        "delinquent_units": sorted(receivables),
+    }
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Trailing-12 collections ledger.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    ledger = build_ledger()
+    summary = collections_summary(ledger)
+    if args.json:
+        print(json.dumps({"summary": summary, "aging": aging(ledger)}, indent=2))
+        return
+
+    rates, _ = collection_rate(ledger)
+    print(f"{'Month':<9} {'Charged':>9} {'Received':>9} {'Rate':>7} {'Vacancy':>8} {'Delinq':>7}")
+    rows = zip(MONTHS, monthly_charges(ledger), monthly_receipts(ledger), rates,
+               vacancy_loss(ledger), delinquency_loss(ledger))
+    for month, charged, received, rate, vac, delinq in rows:
+        print(f"{month:<9} {charged:>9,} {received:>9,} {rate:>7.1%} {vac:>8,} {delinq:>7,}")
+    print(f"T12 collection rate {summary['collection_rate']:.2%}; receivables "
+          f"${summary['receivables']:,} as of {AS_OF}")
+    for num, row in aging(ledger).items():
+        buckets = "  ".join(f"{b}: ${row[b]:,}" for b in AGING_BUCKETS if row[b])
+        print(f"  {num} {row['tenant']:<20} {row['days_past_due']:>3} days  {buckets}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Offering memorandum template with real slide layouts and placeholders.
+The master carries two layouts:
+    OM Cover    navy background, gold rules, branding, and placeholders for
+                property name, subtitle, price and location
+    OM Content  white background, navy title bar with a title placeholder
+Both layouts draw the slide number as a slidenum field ("n / total"), so
+slides take their number from deck position. The template is built once per
+slide total and reused from bytes; each new deck only fills placeholders.
+"""
+import io
+from xml.sax.saxutils import escape
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Inches, Pt
+
+# ---------------------------------------------------------------------------
+# Theme
+# ---------------------------------------------------------------------------
+CLR_NAVY = RGBColor(0x1E, 0x3A, 0x5F)
+CLR_WHITE = RGBColor(0xFF, 0xFF, 0xFF)
+CLR_BLACK = RGBColor(0x00, 0x00, 0x00)
+CLR_LIGHT_GRAY = RGBColor(0xF2, 0xF2, 0xF2)
+CLR_MED_GRAY = RGBColor(0xD9, 0xD9, 0xD9)
+CLR_GOLD = RGBColor(0xC5, 0x9A, 0x2C)
+CLR_DARK_TEXT = RGBColor(0x33, 0x33, 0x33)
+
+FONT_NAME = "Calibri"
+
+# Slide dimensions (16:9)
+SLIDE_WIDTH = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+
+LAYOUT_COVER = "OM Cover"
+LAYOUT_CONTENT = "OM Content"
+
+# Cover placeholder idx values (0 is the title placeholder)
+COVER_SUBTITLE = 1
+COVER_PRICE = 2
+COVER_LOCATION = 3
+
+BRANDING = "Presented by Property360 Real Estate"
+TEMPLATE_VERSION = 1
+
+_TEMPLATES = {}
+
+# Default spec for write_table(); pass overrides as keyword arguments.
+TABLE_STYLE = {
+    "font_size": 12,
+    "header": True,                              # first row is a header
+    "header_fill": CLR_NAVY,
+    "header_color": CLR_WHITE,
+    "body_color": CLR_DARK_TEXT,
+    "band_fills": (CLR_LIGHT_GRAY, CLR_WHITE),   # even / odd table rows
+    "total": False,                              # last row is a totals row
+    "total_fill": CLR_MED_GRAY,
+    "total_color": CLR_NAVY,
+    "emphasis_rows": (),                         # bold navy text, fill unchanged
+    "label_col": False,                          # first column bold navy
+    "anchor": "ctr",
+    "align": None,                               # per-column "l"/"ctr"/"r"
+}
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"  # python-pptx default
+
+
+# ---------------------------------------------------------------------------
+# Shape XML
+# ---------------------------------------------------------------------------
+def _xfrm(left, top, width, height):
+    return (f'<a:xfrm><a:off x="{int(left)}" y="{int(top)}"/>'
+            f'<a:ext cx="{int(width)}" cy="{int(height)}"/></a:xfrm>')
+
+
+def _rpr(size, color, bold=False, tag="a:rPr"):
+    return (f'<{tag} lang="en-US" sz="{int(size * 100)}" b="{1 if bold else 0}" dirty="0">'
+            f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+            f'<a:latin typeface="{FONT_NAME}"/></{tag}>')
+
+
+def _rect(shape_id, name, left, top, width, height, color, geometry="rect"):
+    return parse_xml(
+        f'<p:sp {nsdecls("p", "a")}>'
+        f'<p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/><p:cNvSpPr/>'
+        f'<p:nvPr userDrawn="1"/></p:nvSpPr>'
+        f'<p:spPr>{_xfrm(left, top, width, height)}'
+        f'<a:prstGeom prst="{geometry}"><a:avLst/></a:prstGeom>'
+        f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill><a:ln><a:noFill/></a:ln></p:spPr>'
+        f'</p:sp>'
+    )
+
+
+def _text(shape_id, name, left, top, width, height, runs, align="l"):
+    return parse_xml(
+        f'<p:sp {nsdecls("p", "a")}>'
+        f'<p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/><p:cNvSpPr txBox="1"/>'
+        f'<p:nvPr userDrawn="1"/></p:nvSpPr>'
+        f'<p:spPr>{_xfrm(left, top, width, height)}'
+        f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+        f'<p:txBody><a:bodyPr wrap="square" rtlCol="0"><a:noAutofit/></a:bodyPr><a:lstStyle/>'
+        f'<a:p><a:pPr algn="{align}"/>{runs}</a:p></p:txBody>'
+        f'</p:sp>'
+    )
+
+
+def _slide_number(shape_id, total):
+    """'n / total' where n is a slidenum field evaluated per slide."""
+    rpr = _rpr(9, str(CLR_MED_GRAY))
+    runs = (f'<a:fld id="{{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}}" type="slidenum">'
+            f'{rpr}<a:t>‹#›</a:t></a:fld>'
+            f'<a:r>{rpr}<a:t> / {total}</a:t></a:r>')
+    return _text(shape_id, "Slide Number", SLIDE_WIDTH - Inches(1.5), SLIDE_HEIGHT - Inches(0.4),
+                 Inches(1.3), Inches(0.3), runs, align="r")
+
+
+def _placeholder(shape_id, name, ph, left, top, width, height, size, color,
+                 bold=False, align="l", prompt=""):
+    """Placeholder whose text style lives in its lstStyle, so filled slides
+    only carry text runs.
+    """
+    return parse_xml(
+        f'<p:sp {nsdecls("p", "a")}>'
+        f'<p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f'<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+        f'<p:spPr>{_xfrm(left, top, width, height)}</p:spPr>'
+        f'<p:txBody><a:bodyPr wrap="square" anchor="t"><a:noAutofit/></a:bodyPr>'
+        f'<a:lstStyle><a:lvl1pPr marL="0" indent="0" algn="{align}">'
+        f'<a:spcBef><a:spcPts val="0"/></a:spcBef><a:buNone/>'
+        f'{_rpr(size, color, bold, "a:defRPr")}</a:lvl1pPr></a:lstStyle>'
+        f'<a:p><a:r><a:rPr lang="en-US"/><a:t>{escape(prompt)}</a:t></a:r></a:p></p:txBody>'
+        f'</p:sp>'
+    )
+
+
+# ---------------------------------------------------------------------------
+# Layouts
+# ---------------------------------------------------------------------------
+def _reset_layout(layout, name, background):
+    """Rename a layout, set its background and empty its shape tree."""
+    layout._element.cSld.set("name", name)
+    fill = layout.background.fill
+    fill.solid()
+    fill.fore_color.rgb = background
+    sp_tree = layout.shapes._spTree
+    for shape in list(sp_tree)[2:]:  # keep nvGrpSpPr and grpSpPr
+        sp_tree.remove(shape)
+    return sp_tree
+
+
+def _build_cover(layout, total):
+    sp_tree = _reset_layout(layout, LAYOUT_COVER, CLR_NAVY)
+    center_left, center_width = Inches(2), Inches(9.333)
+    gold, white = str(CLR_GOLD), str(CLR_WHITE)
+    for shape in (
+        _rect(2, "Top Rule", center_left, Inches(1.2), center_width, Inches(0.04), gold),
+        _placeholder(3, "Property Name", '<p:ph type="title"/>',
+                     center_left, Inches(1.5), center_width, Inches(1.0),
+                     40, white, bold=True, align="ctr", prompt="Property name"),
+        _placeholder(4, "Subtitle", f'<p:ph type="body" idx="{COVER_SUBTITLE}"/>',
+                     center_left, Inches(2.5), center_width, Inches(0.6),
+                     20, gold, align="ctr", prompt="Offering subtitle"),
+        _placeholder(5, "Price", f'<p:ph type="body" idx="{COVER_PRICE}"/>',
+                     center_left, Inches(3.4), center_width, Inches(0.8),
+                     36, white, bold=True, align="ctr", prompt="Asking price"),
+        _rect(6, "Price Rule", Inches(4), Inches(4.3), Inches(5.333), Inches(0.04), gold),
+        _placeholder(7, "Location", f'<p:ph type="body" idx="{COVER_LOCATION}"/>',
+                     center_left, Inches(4.6), center_width, Inches(0.5),
+                     18, white, align="ctr", prompt="City, State"),
+        _text(8, "Branding", center_left, Inches(5.5), center_width, Inches(0.5),
+              f'<a:r>{_rpr(16, str(CLR_MED_GRAY))}<a:t>{BRANDING}</a:t></a:r>', align="ctr"),
+        _slide_number(9, total),
+    ):
+        sp_tree.append(shape)
+
+
+def _build_content(layout, total):
+    sp_tree = _reset_layout(layout, LAYOUT_CONTENT, CLR_WHITE)
+    for shape in (
+        _rect(2, "Title Bar", 0, 0, SLIDE_WIDTH, Inches(1.1), str(CLR_NAVY)),
+        _placeholder(3, "Title", '<p:ph type="title"/>',
+                     Inches(0.6), Inches(0.15), Inches(11), Inches(0.8),
+                     28, str(CLR_WHITE), bold=True, prompt="Slide title"),
+        _slide_number(4, total),
+    ):
+        sp_tree.append(shape)
+
+
+def build_template(total):
+    """A fresh Presentation holding only the two OM layouts."""
+    prs = Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+
+    layouts = prs.slide_layouts
+    cover = layouts.get_by_name("Title Slide")
+    content = layouts.get_by_name("Title Only")
+    for layout in list(layouts):
+        if layout not in (cover, content):
+            layouts.remove(layout)
+
+    _build_cover(cover, total)
+    _build_content(content, total)
+    return prs
+
+
+def template_bytes(total):
+    """Serialized template for a deck of `total` slides, built once."""
+    key = (total, TEMPLATE_VERSION)
+    if key not in _TEMPLATES:
+        buffer = io.BytesIO()
+        build_template(total).save(buffer)
+        _TEMPLATES[key] = buffer.getvalue()
+    return _TEMPLATES[key]
+
+
+def new_deck(total):
+    """Empty deck on the cached template."""
+    return Presentation(io.BytesIO(template_bytes(total)))
+
+
+# ---------------------------------------------------------------------------
+# Slides
+# ---------------------------------------------------------------------------
+def add_cover_slide(prs, name, subtitle, price, location):
+    slide = prs.slides.add_slide(prs.slide_layouts.get_by_name(LAYOUT_COVER))
+    slide.shapes.title.text = name
+    slide.placeholders[COVER_SUBTITLE].text = subtitle
+    slide.placeholders[COVER_PRICE].text = price
+    slide.placeholders[COVER_LOCATION].text = location
+    return slide
+
+
+def add_content_slide(prs, title):
+    slide = prs.slides.add_slide(prs.slide_layouts.get_by_name(LAYOUT_CONTENT))
+    slide.shapes.title.text = title
+    return slide
+
+
+# ---------------------------------------------------------------------------
+# Tables
+# ---------------------------------------------------------------------------
+def _cell_xml(text, size, color, bold, align, fill, anchor):
+    rpr = _rpr(size, color, bold)
+    run = f"<a:r>{rpr}<a:t>{escape(text)}</a:t></a:r>" if text else ""
+    end = _rpr(size, color, bold, "a:endParaRPr")
+    anchor_attr = f' anchor="{anchor}"' if anchor else ""
+    return (f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>'
+            f'<a:p><a:pPr algn="{align}"/>{run}{end}</a:p></a:txBody>'
+            f'<a:tcPr{anchor_attr}><a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr></a:tc>')
+
+
+def table_xml(rows, left, top, height, col_widths, shape_id, **style):
+    """p:graphicFrame XML for a styled table, built in one pass.
+
+    rows is a 2-D array of cell values (str() is applied); col_widths are
+    inches and set the table width. Row height is height split evenly, as
+    with python-pptx add_table. style keys override TABLE_STYLE.
+    """
+    spec = dict(TABLE_STYLE, **style)
+    n_rows, n_cols = len(rows), len(col_widths)
+    size = spec["font_size"]
+    align = spec["align"] or ["ctr"] * n_cols
+    band = [str(c) for c in spec["band_fills"]]
+    body_color, anchor = str(spec["body_color"]), spec["anchor"]
+    emphasis = set(spec["emphasis_rows"])
+    header = spec["header"]
+    total_row = n_rows - 1 if spec["total"] else None
+    widths = [int(Inches(w)) for w in col_widths]
+    row_h = int(height) // n_rows
+
+    out = []
+    for r, row in enumerate(rows):
+        cells = []
+        if header and r == 0:
+            fill, color, bold = str(spec["header_fill"]), str(spec["header_color"]), True
+        elif r == total_row:
+            fill, color, bold = str(spec["total_fill"]), str(spec["total_color"]), True
+        else:
+            fill, color, bold = band[r % 2], body_color, False
+            if r in emphasis:
+                color, bold = str(CLR_NAVY), True
+        for c in range(n_cols):
+            value = row[c] if c < len(row) else ""
+            cell_color, cell_bold = color, bold
+            if spec["label_col"] and c == 0 and not (header and r == 0):
+                cell_color, cell_bold = str(CLR_NAVY), True
+            cells.append(_cell_xml(
+                "" if value is None else str(value), size, cell_color, cell_bold,
+                "ctr" if header and r == 0 else align[c], fill, anchor,
+            ))
+        out.append(f'<a:tr h="{row_h}">{"".join(cells)}</a:tr>')
+
+    grid = "".join(f'<a:gridCol w="{w}"/>' for w in widths)
+    return (
+        f'<p:graphicFrame {nsdecls("p", "a")}>'
+        f'<p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="Table {shape_id - 1}"/>'
+        f'<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/>'
+        f'</p:nvGraphicFramePr>'
+        f'<p:xfrm><a:off x="{int(left)}" y="{int(top)}"/><a:ext cx="{sum(widths)}" cy="{int(height)}"/></p:xfrm>'
+        f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+        f'<a:tbl><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr>'
+        f'<a:tblGrid>{grid}</a:tblGrid>{"".join(out)}</a:tbl>'
+        f'</a:graphicData></a:graphic></p:graphicFrame>'
+    )
+
+
+def write_table(slide, rows, left, top, height, col_widths, **style):
+    """Add a styled table to slide from a 2-D array in one XML insert.
+    Returns the new graphic frame shape.
+    """
+    shape_id = slide.shapes._next_shape_id
+    slide.shapes._spTree.append(parse_xml(
+        table_xml(rows, left, top, height, col_widths, shape_id, **style)
+    ))
+    return slide.shapes[-1]
+
+
+# ---------------------------------------------------------------------------
+# Charts
+# ---------------------------------------------------------------------------
+CHART_COLORS = (CLR_NAVY, CLR_GOLD, CLR_MED_GRAY)
+CURRENCY_AXIS_FMT = '"$"#,##0'
+
+
+def add_bar_chart(slide, categories, series, left, top, width, height,
+                  title=None, number_format=CURRENCY_AXIS_FMT, horizontal=False):
+    """Native clustered column (or bar) chart in the deck palette.
+
+    series is a list of (name, values). The chart is vector data backed by
+    an embedded workbook, so it stays editable and adds a few KB per slide.
+    """
+    data = CategoryChartData(number_format=number_format)
+    data.categories = categories
+    for name, values in series:
+        data.add_series(name, values)
+    kind = XL_CHART_TYPE.BAR_CLUSTERED if horizontal else XL_CHART_TYPE.COLUMN_CLUSTERED
+    chart = slide.shapes.add_chart(kind, left, top, width, height, data).chart
+
+    chart.font.name = FONT_NAME
+    chart.font.size = Pt(10)
+    chart.font.color.rgb = CLR_DARK_TEXT
+
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+        font = chart.chart_title.text_frame.paragraphs[0].font
+        font.size = Pt(12)
+        font.bold = True
+        font.color.rgb = CLR_NAVY
+
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+    value_axis = chart.value_axis
+    value_axis.tick_labels.number_format = number_format
+    value_axis.tick_labels.number_format_is_linked = False
+    value_axis.has_major_gridlines = True
+    value_axis.major_gridlines.format.line.color.rgb = CLR_LIGHT_GRAY
+    value_axis.format.line.fill.background()
+
+    for i, plot_series in enumerate(chart.plots[0].series):
+        plot_series.format.fill.solid()
+        plot_series.format.fill.fore_color.rgb = CHART_COLORS[i % len(CHART_COLORS)]
+    chart.plots[0].gap_width = 80
+    return chart
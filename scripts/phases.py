@@ -0,0 +1,136 @@
+"""
+Read the seller checklist from lib/phases.ts so Python tools score documents
+against the same phases and item ids the app uses.
+
+--export writes the parsed checklist to lib/phases.json, stamped with the
+hash of the phases.ts it came from; load_checklist() prefers that JSON
+while it matches phases.ts and falls back to parsing the source.
+
+Usage:
+    python phases.py [--export]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import REPO_ROOT
+
+
+PHASES_TS = os.path.join(REPO_ROOT, "lib", "phases.ts")
+PHASES_JSON = os.path.join(REPO_ROOT, "lib", "phases.json")
+
+PHASE_RE = re.compile(
+    r'\{\s*id:\s*(\d+),\s*title:\s*"([^"]*)",\s*description:\s*"([^"]*)",'
+    r'\s*icon:\s*"([^"]*)",\s*items:\s*\[(.*?)\]\s*,?\s*\}',
+    re.DOTALL,
+)
+ITEM_RE = re.compile(
+    r'\{\s*id:\s*"([^"]+)",\s*text:\s*"((?:[^"\\]|\\.)*)",\s*critical:\s*(true|false)\s*\}'
+)
+
+_CACHE = {}
+
+
+def load_phases(path=PHASES_TS):
+    """Parse PHASES from lib/phases.ts into a list of dicts:
+    {"id", "title", "description", "icon", "items": [{"id", "text", "critical"}]}.
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    key = (path, hashlib.sha256(source.encode("utf-8")).hexdigest())
+    if key in _CACHE:
+        return _CACHE[key]
+
+    phases = []
+    for m in PHASE_RE.finditer(source):
+        items = [
+            {"id": item_id, "text": json.loads(f'"{text}"'), "critical": critical == "true"}
+            for item_id, text, critical in ITEM_RE.findall(m.group(5))
+        ]
+        phases.append({
+            "id": int(m.group(1)),
+            "title": m.group(2),
+            "description": m.group(3),
+            "icon": m.group(4),
+            "items": items,
+        })
+    if not phases:
+        raise ValueError(f"No phases found in {path}")
+    _CACHE[key] = phases
+    return phases
+
+
+def all_items(phases=None):
+    """Flat item list with phase context, like ALL_ITEMS in app/api/analyze."""
+    phases = phases if phases is not None else load_phases()
+    return [
+        dict(item, phase=phase["id"], phase_title=phase["title"])
+        for phase in phases for item in phase["items"]
+    ]
+
+
+def checklist_version(phases=None):
+    """Short hash of the checklist; changes whenever an item is edited."""
+    phases = phases if phases is not None else load_phases()
+    blob = json.dumps(phases, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:12]
+
+
+def _source_hash(path=PHASES_TS):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def export_phases(path=PHASES_JSON, source=PHASES_TS):
+    """Write the checklist parsed from source to path as JSON."""
+    phases = load_phases(source)
+    payload = {
+        "version": checklist_version(phases),
+        "source_sha256": _source_hash(source),
+        "phases": phases,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return payload
+
+
+def load_checklist(path=PHASES_JSON, source=PHASES_TS):
+    """Phases from the exported JSON, or from phases.ts when the export is
+    missing or was made from a different phases.ts. Without phases.ts
+    (e.g. a deployed worker) the JSON is used as-is.
+    """
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        if not os.path.exists(source) or payload.get("source_sha256") == _source_hash(source):
+            return payload["phases"]
+    return load_phases(source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse the seller checklist from lib/phases.ts.")
+    parser.add_argument("--export", nargs="?", const=PHASES_JSON, default=None, metavar="PATH",
+                        help="write the checklist as JSON (default lib/phases.json)")
+    args = parser.parse_args()
+
+    if args.export:
+        payload = export_phases(args.export)
+        print(f"Wrote {args.export} (version {payload['version']})")
+        return
+
+    phases = load_phases()
+    items = all_items(phases)
+    critical = sum(1 for item in items if item["critical"])
+    print(f"{len(phases)} phases, {len(items)} items ({critical} critical), "
+          f"version {checklist_version(phases)}")
+    for phase in phases:
+        print(f"  {phase['id']:>2}. {phase['title']} ({len(phase['items'])} items)")
+
+
+if __name__ == "__main__":
+    main()
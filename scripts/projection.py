@@ -0,0 +1,253 @@
+"""
+N-year pro forma projection (1-30 years) with refinance and sale at exit.
+Every line is computed as a per-year array from one assumption set, and
+scenarios are assumption overrides run through the same engine, so the
+workbook, OM and returns figures come from identical numbers.
+
+Year 1 is the stabilized pro forma year (GPR_PROFORMA, EXPENSES_PROFORMA);
+revenue grows at rent_growth and expenses at expense_growth from Year 2.
+Vacancy is the current rent roll's in Year 1 and `vacancy` thereafter.
+The buyer assumes the existing loan (PROPERTY["current_mortgage"]) and pays
+the existing debt service unless a refinance is scheduled.
+
+Usage:
+    python projection.py [--years 10] [--json]
+"""
+import argparse
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from unit_mix import totals
+from returns import irr, irr_many, npv, equity_multiple
+
+MAX_YEARS = 30
+
+_mix = totals()
+DEFAULTS = {
+    "gpr": GPR_PROFORMA,
+    "rent_growth": 0.03,
+    "expense_growth": 0.02,
+    "vacancy_y1": round(_mix["vacant"] / _mix["count"], 4),
+    "vacancy": VACANCY_PROFORMA_PCT,
+    "other_income": (("Laundry Income", LAUNDRY_INCOME_PROFORMA),
+                     ("Late Fees/Other", LATE_FEES_PROFORMA)),
+    "expenses": tuple(EXPENSES_PROFORMA),   # None = management fee line
+    "mgmt_fee": MGMT_FEE_PCT,
+    "capex_y1": TOTAL_CAPEX,
+    "capex": 10000,
+    "debt_service": ANNUAL_DEBT_SERVICE,
+    # Acquisition and exit
+    "purchase_price": ASKING_PRICE,
+    "closing_costs": 0.02,
+    "loan_balance": PROPERTY["current_mortgage"],
+    "loan_rate": PROPERTY["mortgage_rate"],
+    "exit_cap": 0.07,
+    "sale_costs": 0.03,
+    # Refinance at the end of refi_year (None = hold existing debt)
+    "refi_year": None,
+    "refi_ltv": 0.70,
+    "refi_rate": 0.0625,
+    "refi_amort": 30,
+    "refi_cap": 0.07,
+    # Discount rate for NPV of the levered flows
+    "discount_rate": 0.08,
+}
+
+SCENARIOS = {
+    "Base": {},
+    "Downside": {"rent_growth": 0.01, "vacancy": 0.08, "exit_cap": 0.075},
+    "Upside": {"rent_growth": 0.04, "vacancy": 0.04, "exit_cap": 0.0675},
+    "Refi Year 2": {"refi_year": 2},
+}
+
+
+# ---------------------------------------------------------------------------
+# Debt
+# ---------------------------------------------------------------------------
+def annual_payment(principal, rate, years):
+    """Level monthly payment on a fully amortizing loan, times 12."""
+    if principal <= 0:
+        return 0.0
+    i, n = rate / 12, years * 12
+    if i == 0:
+        return principal / years
+    return principal * i / (1 - (1 + i) ** -n) * 12
+
+
+def amortize_year(balance, rate, annual_debt_service):
+    """Apply 12 monthly payments; returns (ending balance, amount paid).
+    Payments stop once the loan is paid off.
+    """
+    i, payment, paid = rate / 12, annual_debt_service / 12, 0.0
+    for _ in range(12):
+        if balance <= 0:
+            break
+        due = balance * (1 + i)
+        pay = min(payment, due)
+        balance, paid = due - pay, paid + pay
+    return balance, paid
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+def assumptions(**overrides):
+    unknown = set(overrides) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown assumption(s): {', '.join(sorted(unknown))}")
+    return dict(DEFAULTS, **overrides)
+
+
+def project(years=3, solve=True, **overrides):
+    """Project `years` years of operations plus a sale at the end of the
+    last year. Returns per-year lists (index 0 = Year 1) for every line and
+    the exit and return figures. solve=False skips the IRRs so a batch of
+    projections can be solved together (see project_scenarios).
+    """
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_YEARS}")
+    a = assumptions(**overrides)
+    n = years + 1  # one extra year of NOI prices the sale
+    span = range(n)
+
+    rent_index = [(1 + a["rent_growth"]) ** t for t in span]
+    expense_index = [(1 + a["expense_growth"]) ** t for t in span]
+
+    gpr = [a["gpr"] * g for g in rent_index]
+    vacancy = [-v * (a["vacancy_y1"] if t == 0 else a["vacancy"]) for t, v in enumerate(gpr)]
+    egi = [g + v for g, v in zip(gpr, vacancy)]
+    other = {label: [base * g for g in rent_index] for label, base in a["other_income"]}
+    revenue = [e + sum(col) for e, *col in zip(egi, *other.values())]
+
+    expenses = {}
+    for label, base in a["expenses"]:
+        if base is None:
+            expenses[label] = [a["mgmt_fee"] * r for r in revenue]
+        else:
+            expenses[label] = [base * g for g in expense_index]
+    total_expenses = [sum(col) for col in zip(*expenses.values())]
+    noi = [r - e for r, e in zip(revenue, total_expenses)]
+    capex = [-(a["capex_y1"] if t == 0 else a["capex"]) for t in span]
+
+    # Debt: existing loan until an optional refinance at the end of refi_year
+    debt_service, balance, refi_proceeds = [], [], [0.0] * n
+    loan, rate, payment = a["loan_balance"], a["loan_rate"], a["debt_service"]
+    refi = None
+    for t in range(years):
+        loan, paid = amortize_year(loan, rate, payment)
+        debt_service.append(-paid)
+        if a["refi_year"] == t + 1 and t + 1 < years:
+            value = noi[t + 1] / a["refi_cap"]
+            new_loan = value * a["refi_ltv"]
+            refi_proceeds[t] = new_loan - loan
+            refi = {"year": t + 1, "value": value, "loan": new_loan,
+                    "payoff": loan, "proceeds": new_loan - loan}
+            loan, rate = new_loan, a["refi_rate"]
+            payment = annual_payment(new_loan, rate, a["refi_amort"])
+        balance.append(loan)
+
+    cash_flow = [noi[t] + capex[t] + debt_service[t] for t in range(years)]
+
+    sale_price = noi[years] / a["exit_cap"]
+    sale_costs = sale_price * a["sale_costs"]
+    net_sale = sale_price - sale_costs - balance[-1]
+
+    equity = a["purchase_price"] * (1 + a["closing_costs"]) - a["loan_balance"]
+    flows = [-equity] + [
+        cash_flow[t] + refi_proceeds[t] + (net_sale if t == years - 1 else 0)
+        for t in range(years)
+    ]
+    # Unlevered: all-cash purchase, NOI less capex, sale net of costs only
+    unlevered = [-a["purchase_price"] * (1 + a["closing_costs"])] + [
+        noi[t] + capex[t] + (sale_price - sale_costs if t == years - 1 else 0)
+        for t in range(years)
+    ]
+
+    def cut(values):
+        return [round(v, 2) for v in values[:years]]
+
+    return {
+        "years": years,
+        "assumptions": a,
+        "gpr": cut(gpr),
+        "vacancy": cut(vacancy),
+        "egi": cut(egi),
+        "other_income": {k: cut(v) for k, v in other.items()},
+        "total_revenue": cut(revenue),
+        "expenses": {k: cut(v) for k, v in expenses.items()},
+        "total_expenses": cut(total_expenses),
+        "noi": cut(noi),
+        "capex": cut(capex),
+        "debt_service": cut(debt_service),
+        "cash_flow": cut(cash_flow),
+        "refi_proceeds": cut(refi_proceeds),
+        "loan_balance": cut(balance),
+        "refinance": refi,
+        "exit": {
+            "forward_noi": round(noi[years], 2),
+            "sale_price": round(sale_price, 2),
+            "sale_costs": round(sale_costs, 2),
+            "loan_payoff": round(balance[-1], 2),
+            "net_proceeds": round(net_sale, 2),
+        },
+        "equity": round(equity, 2),
+        "levered_flows": [round(f, 2) for f in flows],
+        "unlevered_flows": [round(f, 2) for f in unlevered],
+        "irr": irr(flows) if solve else None,
+        "unlevered_irr": irr(unlevered) if solve else None,
+        "npv": npv(a["discount_rate"], flows),
+        "equity_multiple": equity_multiple(flows),
+    }
+
+
+def project_scenarios(years=3, scenarios=None):
+    """{scenario name: project() result} over the same horizon. Levered and
+    unlevered IRRs for every scenario are solved in one irr_many() batch.
+    """
+    scenarios = SCENARIOS if scenarios is None else scenarios
+    results = {name: project(years, solve=False, **overrides)
+               for name, overrides in scenarios.items()}
+    rates = irr_many([r[key] for r in results.values()
+                      for key in ("levered_flows", "unlevered_flows")])
+    for i, r in enumerate(results.values()):
+        r["irr"], r["unlevered_irr"] = rates[2 * i], rates[2 * i + 1]
+    return results
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="N-year pro forma projection.")
+    parser.add_argument("--years", type=int, default=3, help=f"hold period, 1-{MAX_YEARS}")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = project_scenarios(args.years)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    base = results["Base"]
+    print(f"{'Year':<6} {'NOI':>10} {'Cash Flow':>10} {'Loan Bal':>11}")
+    for t in range(args.years):
+        print(f"{t + 1:<6} {base['noi'][t]:>10,.0f} {base['cash_flow'][t]:>10,.0f} "
+              f"{base['loan_balance'][t]:>11,.0f}")
+    print()
+    print(f"{'Scenario':<14} {'Exit Value':>11} {'Net Sale':>11} {'IRR':>7} {'Unlev':>7} "
+          f"{'NPV':>10} {'Multiple':>9}")
+
+    def pct(rate):
+        return f"{rate:.1%}" if rate is not None else "n/a"
+
+    for name, r in results.items():
+        print(f"{name:<14} {r['exit']['sale_price']:>11,.0f} {r['exit']['net_proceeds']:>11,.0f} "
+              f"{pct(r['irr']):>7} {pct(r['unlevered_irr']):>7} {r['npv']:>10,.0f} "
+              f"{r['equity_multiple']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
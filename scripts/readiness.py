@@ -0,0 +1,299 @@
+"""
+Sale Readiness Score, computed the way the app's ScoreCard does
+(components/SaleAdvisor.tsx) from the lib/phases.ts checklist: overall and
+critical completion percentages, and READY TO LIST / NEARLY READY /
+NOT READY from the critical percentage.
+
+An item counts as done when it is checked in the app, when a generated
+document that evidences it exists, or when the DD tracker item that
+evidences it has been received (DD_EVIDENCE). Which items a document
+evidences is read from the .evidence.json manifests the generators write
+(evidence.py), by doc_type; FALLBACK_DOCUMENT_EVIDENCE covers doc types
+with no manifest in the output folder. Each property's done items become
+one bitmask over the checklist, so scoring a portfolio is a pass of
+AND/popcount over the masks against the critical and per-phase masks
+built once per checklist.
+
+Usage:
+    python readiness.py [--file portfolio.json] [--demo 1000] [--json]
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from dd import DONE_STATUSES
+from evidence import load_manifests
+from phases import all_items, checklist_version, load_checklist
+
+READINESS_LEVELS = ((90, "READY TO LIST"), (70, "NEARLY READY"), (0, "NOT READY"))
+
+# Fallback only: doc_type (data.DOCUMENTS / p360_documents.doc_type) ->
+# checklist items, used for doc types with no evidence manifest on disk.
+# The manifests the generators write are the source of truth.
+FALLBACK_DOCUMENT_EVIDENCE = {
+    "rent_roll":    ["3-1", "3-2", "3-3", "3-6"],
+    "pnl":          ["4-5"],
+    "inspection":   ["2-1"],
+    "title_search": ["5-1"],
+    "appraisal":    ["6-2", "6-3", "6-5"],
+    "om":           ["7-1"],
+    "dd_tracker":   ["9-4"],
+    "closing":      ["1-1", "10-5"],
+    "proforma":     ["4-6", "7-3"],
+    "entity_docs":  ["5-3"],
+}
+
+# DD_ITEMS name -> checklist items completed once the item is received
+DD_EVIDENCE = {
+    "Loan Payoff Letter":            ["1-1"],
+    "Inspection Report":             ["2-1"],
+    "Building Permits (history)":    ["2-5"],
+    "Phase I Environmental":         ["2-6"],
+    "All Lease Agreements (16)":     ["3-1"],
+    "Security Deposit Ledger":       ["3-5"],
+    "Current Rent Roll":             ["3-6"],
+    "Title Commitment":              ["5-1"],
+    "LLC Operating Agreement":       ["5-3"],
+    "Property Tax Bills (3 years)":  ["5-5"],
+    "Appraisal":                     ["6-1"],
+}
+
+_DOC_TYPES = {filename: doc_type for filename, doc_type, _ in DOCUMENTS}
+_INDEX = {}
+
+
+def _js_round(x):
+    """Math.round: halves round up, as in the ScoreCard percentages."""
+    return math.floor(x + 0.5)
+
+
+def readiness_label(critical_pct):
+    for threshold, label in READINESS_LEVELS:
+        if critical_pct >= threshold:
+            return label
+    return READINESS_LEVELS[-1][1]
+
+
+# ---------------------------------------------------------------------------
+# Checklist index
+# ---------------------------------------------------------------------------
+def build_index(phases=None):
+    """Bit positions and masks for a checklist (cached per version):
+    {"ids", "bits", "critical", "phases": [(phase id, title, mask)], "version"}.
+    """
+    phases = phases if phases is not None else load_checklist()
+    version = checklist_version(phases)
+    if version in _INDEX:
+        return _INDEX[version]
+    items = all_items(phases)
+    bits = {item["id"]: 1 << i for i, item in enumerate(items)}
+    critical = 0
+    for item in items:
+        if item["critical"]:
+            critical |= bits[item["id"]]
+    phase_masks = []
+    for phase in phases:
+        mask = 0
+        for item in phase["items"]:
+            mask |= bits[item["id"]]
+        phase_masks.append((phase["id"], phase["title"], mask))
+    index = {"ids": [item["id"] for item in items], "bits": bits, "critical": critical,
+             "phases": phase_masks, "version": version}
+    _INDEX[version] = index
+    return index
+
+
+def _ids(mask, index):
+    ids, i = [], 0
+    while mask:
+        if mask & 1:
+            ids.append(index["ids"][i])
+        mask >>= 1
+        i += 1
+    return ids
+
+
+# ---------------------------------------------------------------------------
+# Evidence
+# ---------------------------------------------------------------------------
+def document_evidence(folder=OUTPUT_DIR):
+    """doc_type -> checklist items, from the evidence manifests in folder,
+    falling back to FALLBACK_DOCUMENT_EVIDENCE for doc types without one.
+    """
+    items = dict(FALLBACK_DOCUMENT_EVIDENCE)
+    for manifest in load_manifests(folder):
+        if manifest and manifest.get("doc_type"):
+            items[manifest["doc_type"]] = [item["id"] for item in manifest["items"]]
+    return items
+
+
+def evidence(prop, doc_evidence=None):
+    """{item id: [sources]} for one property. prop keys (all optional):
+    "checked" item ids, "documents" filenames or doc_types, "dd_items"
+    DD_ITEMS-shaped tuples. doc_evidence maps doc_type to items and
+    defaults to document_evidence() for OUTPUT_DIR.
+    """
+    if doc_evidence is None:
+        doc_evidence = document_evidence()
+    found = {}
+    for item_id in prop.get("checked", ()):
+        found.setdefault(item_id, []).append("checked")
+    for doc in prop.get("documents", ()):
+        doc_type = _DOC_TYPES.get(os.path.basename(doc), doc)
+        for item_id in doc_evidence.get(doc_type, ()):
+            found.setdefault(item_id, []).append(f"document:{doc_type}")
+    for item in prop.get("dd_items", ()):
+        if item[D_STATUS] in DONE_STATUSES or item[D_RECEIVED]:
+            for item_id in DD_EVIDENCE.get(item[D_ITEM], ()):
+                found.setdefault(item_id, []).append(f"dd:{item[D_ITEM]}")
+    return found
+
+
+def done_mask(prop, index, doc_evidence=None):
+    """Bitmask of the property's done items; ids not on the checklist are
+    ignored. doc_evidence as for evidence().
+    """
+    mask = 0
+    bits = index["bits"]
+    for item_id in evidence(prop, doc_evidence):
+        mask |= bits.get(item_id, 0)
+    return mask
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+def score_many(props, phases=None, doc_evidence=None):
+    """Readiness for each property, in order. Each result: {"name", "done",
+    "total", "pct", "critical_done", "critical_total", "critical_pct",
+    "readiness", "docs", "phases": {id: [done, total]}, "missing_critical"}.
+    doc_evidence defaults to the manifests in OUTPUT_DIR.
+    """
+    index = build_index(phases)
+    if doc_evidence is None:
+        doc_evidence = document_evidence()
+    masks = [done_mask(p, index, doc_evidence) for p in props]
+    critical = index["critical"]
+    total = len(index["ids"])
+    critical_total = critical.bit_count()
+    phase_totals = [(pid, m, m.bit_count()) for pid, _, m in index["phases"]]
+
+    done = [m.bit_count() for m in masks]
+    critical_done = [(m & critical).bit_count() for m in masks]
+    results = []
+    for prop, mask, n, c in zip(props, masks, done, critical_done):
+        critical_pct = _js_round(c / critical_total * 100) if critical_total else 0
+        results.append({
+            "name": prop.get("name", ""),
+            "done": n,
+            "total": total,
+            "pct": _js_round(n / total * 100) if total else 0,
+            "critical_done": c,
+            "critical_total": critical_total,
+            "critical_pct": critical_pct,
+            "readiness": readiness_label(critical_pct),
+            "docs": len(prop.get("documents", ())),
+            "phases": {pid: [(mask & m).bit_count(), t] for pid, m, t in phase_totals},
+            "missing_critical": _ids(critical & ~mask, index),
+        })
+    return results
+
+
+def score(prop, phases=None, doc_evidence=None):
+    return score_many([prop], phases, doc_evidence)[0]
+
+
+def portfolio_summary(results):
+    """Counts by readiness label and the average scores."""
+    n = len(results)
+    by_label = {label: 0 for _, label in READINESS_LEVELS}
+    for r in results:
+        by_label[r["readiness"]] += 1
+    return {
+        "properties": n,
+        "by_readiness": by_label,
+        "avg_pct": sum(r["pct"] for r in results) / n if n else 0.0,
+        "avg_critical_pct": sum(r["critical_pct"] for r in results) / n if n else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+def case_study(folder=OUTPUT_DIR):
+    """The case-study property: its generated documents and DD tracker."""
+    present = [name for name, _, _ in DOCUMENTS if os.path.exists(os.path.join(folder, name))]
+    return {"name": PROPERTY["name"], "documents": present, "dd_items": DD_ITEMS}
+
+
+def load_portfolio(path):
+    """Properties from a JSON list of {"name", "checked", "documents", "dd_items"}."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def demo_portfolio(n, seed=42):
+    """n synthetic properties with random checked items, documents and DD status."""
+    from dd_portfolio import demo_deals
+
+    ids = build_index()["ids"]
+    doc_names = [name for name, _, _ in DOCUMENTS]
+    props = []
+    for i, (name, items) in enumerate(demo_deals(n, seed=seed)):
+        rng = random.Random(seed * 7919 + i)
+        props.append({
+            "name": name,
+            "checked": rng.sample(ids, rng.randint(0, len(ids))),
+            "documents": rng.sample(doc_names, rng.randint(0, len(doc_names))),
+            "dd_items": items,
+        })
+    return props
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Sale readiness scoring.")
+    parser.add_argument("--file", help="portfolio JSON (default: the case-study property)")
+    parser.add_argument("--demo", type=int, default=0, help="score N synthetic properties")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.file:
+        props = load_portfolio(args.file)
+    elif args.demo:
+        props = demo_portfolio(args.demo)
+    else:
+        props = [case_study()]
+
+    start = time.perf_counter()
+    results = score_many(props)
+    elapsed = time.perf_counter() - start
+    summary = portfolio_summary(results)
+
+    if args.json:
+        print(json.dumps({"summary": summary, "properties": results}, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{'Property':<28} {'Overall':>9} {'Critical':>9}  Readiness")
+    for r in results[:20]:
+        print(f"{r['name'][:28]:<28} {r['pct']:>4}% {r['done']:>2}/{r['total']:<2}"
+              f"{r['critical_pct']:>4}% {r['critical_done']:>2}/{r['critical_total']:<2} "
+              f"{r['readiness']}")
+    if len(results) > 20:
+        print(f"... {len(results) - 20:,} more")
+    if len(results) == 1:
+        print(f"Missing critical: {', '.join(results[0]['missing_critical']) or 'none'}")
+    counts = ", ".join(f"{label} {n:,}" for label, n in summary["by_readiness"].items())
+    print(f"{summary['properties']:,} properties scored in {elapsed * 1000:.1f} ms: {counts}")
+
+
+if __name__ == "__main__":
+    main()
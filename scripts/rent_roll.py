@@ -0,0 +1,473 @@
+"""
+Rent roll pattern detector for extracted workbooks.
+Finds the header row of a rent-roll sheet (Unit / Tenant / Rent columns and
+friends) by fuzzy-matching header text, confirms each column with type
+inference over the first data rows, and streams the sheet into unit tuples
+laid out like data.UNITS (U_NUM .. U_NOTES) plus a running summary.
+
+Usage:
+    python rent_roll.py FILE.xlsx [--sheet NAME] [--json]
+    python rent_roll.py --bench [--rows 100000]
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from extract import iter_sheet_rows, sheet_names
+
+
+# ---------------------------------------------------------------------------
+# Field definitions (order matches the U_* column indices in data.py)
+# ---------------------------------------------------------------------------
+FIELDS = [
+    ("unit",        ["unit", "unit #", "unit no", "unit number", "apt", "apartment", "suite"], "text"),
+    ("type",        ["unit type", "type", "bed bath", "bd ba", "floor plan", "layout"],         "text"),
+    ("sf",          ["sf", "sq ft", "sqft", "square feet", "size", "area"],                     "number"),
+    ("tenant",      ["tenant", "tenant name", "resident", "lessee", "occupant", "name"],        "text"),
+    ("lease_start", ["lease start", "move in", "start date", "lease from", "commencement"],     "date"),
+    ("lease_end",   ["lease end", "lease expiration", "expiration", "lease to", "end date",
+                     "expires"],                                                              "date"),
+    ("rent",        ["monthly rent", "rent", "current rent", "contract rent", "actual rent"],   "number"),
+    ("market",      ["market rent", "market", "asking rent", "pro forma rent"],                "number"),
+    ("deposit",     ["security deposit", "deposit", "sec dep"],                                "number"),
+    ("status",      ["status", "occupancy", "occupied vacant"],                                "text"),
+    ("delinquent",  ["delinquent", "past due", "balance due", "arrears"],                      "text"),
+    ("notes",       ["notes", "comments", "remarks"],                                          "text"),
+]
+FIELD_NAMES = [name for name, _, _ in FIELDS]
+REQUIRED = ("unit", "rent")
+
+MATCH_THRESHOLD = 0.8    # minimum header similarity for a column to map
+HEADER_SCAN_ROWS = 25    # rows searched for the header
+SAMPLE_ROWS = 50         # data rows used for type inference
+TYPE_AGREEMENT = 0.8     # share of sampled values that must fit the field type
+
+NUMBER_RE = re.compile(r"^\(?-?\$?\s*[\d,]*\.?\d+\)?$")
+DATE_PATTERNS = [
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})"), (0, 1, 2)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$"), (2, 0, 1)),
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{2})$"), (2, 0, 1)),
+]
+MTM_VALUES = {"mtm", "month to month", "month-to-month", "m2m"}
+TOTAL_RE = re.compile(r"^(grand\s+)?totals?\b|^subtotal", re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Value parsing
+# ---------------------------------------------------------------------------
+def normalize_header(text):
+    text = str(text).lower().replace("#", " # ").replace("/", " ")
+    text = re.sub(r"[^a-z0-9# ]+", " ", text)
+    return " ".join(text.split())
+
+
+def parse_number(value):
+    """Numbers and currency strings ('$1,050.00', '(250)') -> float, else None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text or not NUMBER_RE.match(text):
+        return None
+    negative = text.startswith("(") or "-" in text
+    text = re.sub(r"[()$,\s-]", "", text)
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return -number if negative else number
+
+
+def parse_date(value):
+    """Dates, datetimes and common date strings -> 'YYYY-MM-DD'; 'MTM' kept."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    if text.lower() in MTM_VALUES:
+        return "MTM"
+    for pattern, order in DATE_PATTERNS:
+        m = pattern.match(text)
+        if m:
+            parts = [int(g) for g in m.groups()]
+            y, mo, d = (parts[i] for i in order)
+            if y < 100:
+                y += 2000
+            try:
+                return date(y, mo, d).isoformat()
+            except ValueError:
+                return None
+    return None
+
+
+def value_kind(value):
+    """Classify one cell for type inference."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.startswith("="):
+        return "formula"
+    if parse_date(value) is not None and not isinstance(value, (int, float)):
+        return "date"
+    if parse_number(value) is not None:
+        return "number"
+    return "text"
+
+
+# ---------------------------------------------------------------------------
+# Header matching
+# ---------------------------------------------------------------------------
+def header_score(header, synonyms):
+    """Best similarity between a header cell and a field's synonyms."""
+    text = normalize_header(header)
+    if not text:
+        return 0.0
+    best = 0.0
+    words = f" {text} "
+    for syn in synonyms:
+        if text == syn:
+            return 1.0
+        score = SequenceMatcher(None, text, syn).ratio()
+        if f" {syn} " in words:
+            score = max(score, 0.75 + 0.25 * len(syn) / len(text))
+        best = max(best, score)
+    return best
+
+
+def match_header(row):
+    """Map field -> column index for one candidate header row.
+    Greedy on descending score so 'Monthly Rent' wins rent before
+    'Rent Delta' is considered.
+    """
+    candidates = []
+    for col, cell in enumerate(row):
+        if not isinstance(cell, str):
+            continue
+        for name, synonyms, _ in FIELDS:
+            score = header_score(cell, synonyms)
+            if score >= MATCH_THRESHOLD:
+                candidates.append((score, col, name))
+    mapping, used = {}, set()
+    for score, col, name in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        if name in mapping or col in used:
+            continue
+        mapping[name] = (col, row[col], round(score, 3))
+        used.add(col)
+    return mapping
+
+
+def infer_kinds(rows, mapping):
+    """Dominant cell kind per mapped column across sample rows."""
+    kinds = {}
+    for name, (col, _, _) in mapping.items():
+        counts = {}
+        for row in rows:
+            kind = value_kind(row[col]) if col < len(row) else None
+            if kind:
+                counts[kind] = counts.get(kind, 0) + 1
+        total = sum(counts.values())
+        kinds[name] = (max(counts, key=counts.get), counts, total) if total else (None, {}, 0)
+    return kinds
+
+
+def _fits(expected, counts, total):
+    """Text columns accept anything; number/date columns need most sampled
+    values to parse as that type ('MTM' already parses as a date).
+    """
+    if total == 0 or expected == "text":
+        return True
+    return counts.get(expected, 0) / total >= TYPE_AGREEMENT
+
+
+def detect_columns(rows):
+    """Find the header row in rows (a list) and validate its mapping.
+
+    Returns (header_index, columns) or (None, None) when no row looks like
+    a rent roll header. columns maps field -> {"index", "header", "score",
+    "kind"}.
+    """
+    best = None
+    for index, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+        mapping = match_header(row)
+        if all(f in mapping for f in REQUIRED) and len(mapping) >= 3:
+            if best is None or len(mapping) > len(best[1]):
+                best = (index, mapping)
+    if best is None:
+        return None, None
+
+    index, mapping = best
+    sample = [r for r in rows[index + 1:index + 1 + SAMPLE_ROWS] if any(v not in (None, "") for v in r)]
+    kinds = infer_kinds(sample, mapping)
+    expected = {name: kind for name, _, kind in FIELDS}
+
+    columns = {}
+    for name, (col, header, score) in mapping.items():
+        kind, counts, total = kinds[name]
+        if not _fits(expected[name], counts, total):
+            continue  # header looked right but the data does not
+        columns[name] = {"index": col, "header": header, "score": score, "kind": kind}
+
+    if not all(f in columns for f in REQUIRED):
+        return None, None
+    return index, columns
+
+
+# ---------------------------------------------------------------------------
+# Row normalization
+# ---------------------------------------------------------------------------
+def _cell(row, columns, name):
+    spec = columns.get(name)
+    if spec is None or spec["index"] >= len(row):
+        return None
+    return row[spec["index"]]
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _money(value):
+    number = parse_number(value)
+    if number is None:
+        return 0
+    return int(number) if number.is_integer() else round(number, 2)
+
+
+def normalize_row(row, columns):
+    """One sheet row -> a UNITS-style tuple, or None for blank/total rows."""
+    unit = _text(_cell(row, columns, "unit"))
+    if not unit or TOTAL_RE.match(unit):
+        return None
+
+    tenant = _text(_cell(row, columns, "tenant"))
+    rent = _money(_cell(row, columns, "rent"))
+    status = _text(_cell(row, columns, "status"))
+    if status.lower() in ("o", "occ", "occupied", "leased"):
+        status = "Occupied"
+    elif status.lower() in ("v", "vac", "vacant", "vacant-ready", "down"):
+        status = "Vacant"
+    elif not status:
+        status = "Occupied" if tenant or rent else "Vacant"
+
+    delinquent = _text(_cell(row, columns, "delinquent")) or "No"
+    sf = parse_number(_cell(row, columns, "sf"))
+
+    return (
+        unit,
+        _text(_cell(row, columns, "type")),
+        int(sf) if sf else 0,
+        tenant,
+        parse_date(_cell(row, columns, "lease_start")) or "",
+        parse_date(_cell(row, columns, "lease_end")) or "",
+        rent,
+        _money(_cell(row, columns, "market")),
+        _money(_cell(row, columns, "deposit")),
+        status,
+        delinquent,
+        _text(_cell(row, columns, "notes")),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming summary
+# ---------------------------------------------------------------------------
+def new_summary():
+    return {
+        "units": 0, "occupied": 0, "vacant": 0, "occupancy": 0.0,
+        "monthly_rent": 0, "monthly_market_rent": 0, "loss_to_lease": 0,
+        "security_deposits": 0, "delinquent_units": 0, "mtm_leases": 0,
+        "units_by_type": {},
+    }
+
+
+def add_to_summary(summary, unit):
+    summary["units"] += 1
+    if unit[U_STATUS] == "Occupied":
+        summary["occupied"] += 1
+        summary["loss_to_lease"] += max(unit[U_MARKET] - unit[U_RENT], 0)
+        summary["security_deposits"] += unit[U_DEPOSIT]
+    else:
+        summary["vacant"] += 1
+    summary["monthly_rent"] += unit[U_RENT]
+    summary["monthly_market_rent"] += unit[U_MARKET]
+    if unit[U_DELINQ].lower().startswith(("yes", "y ")) or unit[U_DELINQ].lower() == "y":
+        summary["delinquent_units"] += 1
+    if unit[U_LEASE_END] == "MTM":
+        summary["mtm_leases"] += 1
+    key = unit[U_TYPE] or "Unknown"
+    summary["units_by_type"][key] = summary["units_by_type"].get(key, 0) + 1
+
+
+def finish_summary(summary):
+    if summary["units"]:
+        summary["occupancy"] = round(summary["occupied"] / summary["units"], 4)
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def detect_rows(rows):
+    """Detect a rent roll in an iterable of rows.
+
+    Only the header window (HEADER_SCAN_ROWS + SAMPLE_ROWS rows) is
+    buffered; the rest of the sheet is consumed lazily. Returns
+    (header_index, columns, unit_iterator) or (None, None, None).
+    """
+    rows = iter(rows)
+    window = []
+    for row in rows:
+        window.append(row)
+        if len(window) >= HEADER_SCAN_ROWS + SAMPLE_ROWS:
+            break
+
+    header_index, columns = detect_columns(window)
+    if columns is None:
+        return None, None, None
+
+    def units():
+        for row in window[header_index + 1:]:
+            unit = normalize_row(row, columns)
+            if unit:
+                yield unit
+        for row in rows:
+            unit = normalize_row(row, columns)
+            if unit:
+                yield unit
+
+    return header_index, columns, units()
+
+
+def detect_rent_roll(path, sheet=None, keep_units=True):
+    """Scan an xlsx for a rent roll sheet and stream it.
+
+    Tries the named sheet, or each sheet in workbook order until one
+    matches. Returns None if no sheet looks like a rent roll, else
+    {"sheet", "header_row" (1-based), "columns", "summary", "units"}.
+    With keep_units=False the unit list is omitted and memory stays
+    bounded regardless of sheet size.
+    """
+    names = [sheet] if sheet is not None else [name for name, _ in sheet_names(path)]
+    for name in names:
+        header_index, columns, units = detect_rows(iter_sheet_rows(path, name))
+        if columns is None:
+            continue
+        summary = new_summary()
+        kept = []
+        for unit in units:
+            add_to_summary(summary, unit)
+            if keep_units:
+                kept.append(unit)
+        result = {
+            "sheet": name,
+            "header_row": header_index + 1,
+            "columns": columns,
+            "summary": finish_summary(summary),
+        }
+        if keep_units:
+            result["units"] = kept
+        return result
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+def write_bench_workbook(path, rows):
+    """Write a rent roll of `rows` units shaped like gen_01's Rent Roll sheet,
+    using a write-only workbook so the generator itself stays small.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Rent Roll")
+    ws.append(["Unit #", "Unit Type", "SF", "Tenant Name", "Lease Start",
+               "Lease Expiration", "Monthly Rent", "Market Rent", "Rent Delta",
+               "Security Deposit", "Status", "Delinquent?", "Notes"])
+    for i in range(rows):
+        u = UNITS[i % len(UNITS)]
+        r = i + 2
+        ws.append([f"{i // len(UNITS) + 1}-{u[U_NUM]}", u[U_TYPE], u[U_SF], u[U_TENANT],
+                   u[U_LEASE_START], u[U_LEASE_END], u[U_RENT], u[U_MARKET],
+                   f"=H{r}-G{r}", u[U_DEPOSIT], u[U_STATUS], u[U_DELINQ], u[U_NOTES]])
+    wb.save(path)
+
+
+def benchmark(rows=100000):
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        write_bench_workbook(path, rows)
+        print(f"Wrote {rows:,}-row rent roll in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+        # ru_maxrss is the process high-water mark (KB on Linux), so the
+        # workbook writer above is included; streaming should not raise it.
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        result = detect_rent_roll(path, keep_units=False)
+        elapsed = time.perf_counter() - start
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        summary = result["summary"]
+        print(f"Detected '{result['sheet']}' header row {result['header_row']}, "
+              f"{len(result['columns'])} columns mapped")
+        print(f"Streamed {summary['units']:,} units in {elapsed:.2f}s "
+              f"({summary['units'] / elapsed:,.0f} rows/s)")
+        print(f"Peak RSS {rss_after / 1024:.0f} MB (+{(rss_after - rss_before) / 1024:.1f} MB while streaming)")
+    finally:
+        os.remove(path)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Detect and summarize a rent roll sheet.")
+    parser.add_argument("path", nargs="?", default=output_path("01_rent_roll_2025.xlsx"))
+    parser.add_argument("--sheet", default=None, help="sheet name (default: auto-detect)")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    parser.add_argument("--bench", action="store_true", help="benchmark on a synthetic sheet")
+    parser.add_argument("--rows", type=int, default=100000, help="benchmark row count")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.rows)
+        return
+
+    result = detect_rent_roll(args.path, args.sheet)
+    if result is None:
+        print(f"No rent roll pattern found in {args.path}")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+        return
+
+    print(f"Sheet: {result['sheet']} (header row {result['header_row']})")
+    for name in FIELD_NAMES:
+        spec = result["columns"].get(name)
+        if spec:
+            print(f"  {name:<12} <- {spec['header']!r} (score {spec['score']}, {spec['kind']})")
+    for key, value in result["summary"].items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Reproducible output for the generators. When SOURCE_DATE_EPOCH is set (the
+reproducible-builds convention) or P360_DETERMINISTIC=1, identical inputs
+produce byte-identical documents, so content-hash caches (analysis_cache,
+upload ledger) hit on a regenerated case study.
+
+    PDF         importing this module sets reportlab's invariant flag, so
+                documents built afterwards get a fixed /CreationDate and a
+                content-derived /ID
+    XLSX/DOCX/  normalize() rewrites the package after saving: entries in
+    PPTX        sorted order with a fixed timestamp and permissions,
+                dcterms:created/modified pinned to the epoch, and embedded
+                packages (chart workbooks in the OM) normalized the same way
+
+Every generator calls normalize(path) after saving; it is a no-op unless
+deterministic mode is on.
+
+Usage:
+    SOURCE_DATE_EPOCH=1771545600 python gen_07_om.py
+    python reproducible.py [PATH ...]     # check a build is reproducible
+"""
+import hashlib
+import io
+import os
+import re
+import subprocess
+import sys
+import zipfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+DEFAULT_EPOCH = int(datetime(2026, 2, 20, tzinfo=timezone.utc).timestamp())
+OOXML_EXTENSIONS = (".xlsx", ".docx", ".pptx")
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)   # earliest date a zip entry can hold
+CORE_DATE_RE = re.compile(rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*(</dcterms:)")
+
+
+def enabled():
+    return bool(os.environ.get("SOURCE_DATE_EPOCH")) or os.environ.get("P360_DETERMINISTIC") == "1"
+
+
+def epoch():
+    """The pinned document timestamp (seconds, UTC)."""
+    return int(os.environ.get("SOURCE_DATE_EPOCH") or DEFAULT_EPOCH)
+
+
+if enabled():
+    # reportlab stamps invariant PDFs with SOURCE_DATE_EPOCH when it is set
+    os.environ.setdefault("SOURCE_DATE_EPOCH", str(DEFAULT_EPOCH))
+    from reportlab import rl_config
+
+    rl_config.invariant = 1
+
+
+# ---------------------------------------------------------------------------
+# OOXML packages
+# ---------------------------------------------------------------------------
+def _entry_order(name):
+    # [Content_Types].xml first, as Office writes it; everything else sorted
+    return (name != "[Content_Types].xml", name)
+
+
+def normalize_package(data):
+    """Bytes of an OOXML package rewritten deterministically."""
+    stamp = datetime.fromtimestamp(epoch(), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ").encode()
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, \
+            zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for name in sorted(src.namelist(), key=_entry_order):
+            body = src.read(name)
+            if name == "docProps/core.xml":
+                body = CORE_DATE_RE.sub(rb"\g<1>" + stamp + rb"\g<2>", body)
+            elif name.lower().endswith(OOXML_EXTENSIONS):
+                body = normalize_package(body)
+            info = zipfile.ZipInfo(name, date_time=ZIP_EPOCH)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            info.create_system = 0
+            dst.writestr(info, body, compresslevel=6)
+    return out.getvalue()
+
+
+def normalize(path):
+    """Make a saved document reproducible in place (deterministic mode only)."""
+    if not enabled() or not path.lower().endswith(OOXML_EXTENSIONS):
+        return path
+    with open(path, "rb") as f:
+        data = f.read()
+    fixed = normalize_package(data)
+    if fixed != data:
+        with open(path, "wb") as f:
+            f.write(fixed)
+    return path
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def _digests(paths):
+    result = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            result[os.path.basename(path)] = hashlib.sha256(f.read()).hexdigest()
+    return result
+
+
+def main():
+    """Run every generator twice in deterministic mode and compare hashes."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    generators = sorted(n for n in os.listdir(here) if re.match(r"gen_\d+_.*\.py$", n))
+    paths = sys.argv[1:] or [output_path(name) for name, _, _ in DOCUMENTS]
+    env = dict(os.environ, SOURCE_DATE_EPOCH=str(epoch()))
+
+    runs = []
+    for _ in range(2):
+        for gen in generators:
+            subprocess.run([sys.executable, os.path.join(here, gen)], env=env, check=True,
+                           stdout=subprocess.DEVNULL)
+        runs.append(_digests(paths))
+
+    differing = [name for name in runs[0] if runs[0][name] != runs[1][name]]
+    for name in runs[0]:
+        print(f"{'DIFF' if name in differing else 'same'}  {runs[1][name][:16]}  {name}")
+    print(f"{len(runs[0]) - len(differing)}/{len(runs[0])} documents reproducible")
+    if differing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+NPV / IRR / XIRR for exit analysis. irr_many() solves a batch of cash-flow
+series together: every unconverged series takes a Newton step per pass
+(value and derivative from one Horner sweep), and series where Newton
+stalls, overflows or leaves the valid range fall back to bisection on a
+bracketed interval. A sensitivity grid of thousands of exit scenarios is
+one call.
+
+Conventions follow Excel: flows[0] is at t=0 (undiscounted), rates are
+periodic, and XIRR uses actual/365 day counts from the first date.
+
+Usage:
+    python returns.py [--bench 5000] [--years 10]
+"""
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RATE_FLOOR = -0.9999
+RATE_CEILING = 10.0
+TOL = 1e-10
+NEWTON_ITER = 50
+BISECT_ITER = 200
+
+
+# ---------------------------------------------------------------------------
+# NPV
+# ---------------------------------------------------------------------------
+def npv(rate, flows):
+    """Net present value with flows[0] at t=0."""
+    total = 0.0
+    for cf in reversed(flows):
+        total = total / (1 + rate) + cf
+    return total
+
+
+def npv_many(rate, series):
+    return [npv(rate, flows) for flows in series]
+
+
+def _npv_and_derivative(rate, flows):
+    """(NPV, dNPV/drate) in one pass, in powers of v = 1 / (1 + rate)."""
+    v = 1.0 / (1 + rate)
+    value = deriv = 0.0
+    n = len(flows) - 1
+    for t in range(n, -1, -1):
+        value = value * v + flows[t]
+        # d/dr of cf * v^t = -t * cf * v^(t+1); Horner leaves sum(t * cf * v^t)
+        deriv = deriv * v + t * flows[t]
+    return value, -deriv * v if n else 0.0
+
+
+# ---------------------------------------------------------------------------
+# IRR
+# ---------------------------------------------------------------------------
+def _has_sign_change(flows):
+    signs = {cf > 0 for cf in flows if cf}
+    return len(signs) == 2
+
+
+def _bisect(f, low=RATE_FLOOR, high=RATE_CEILING):
+    """Root of f on [low, high] scanning for a bracket first; None if none."""
+    grid = [low, -0.5, -0.2, 0.0, 0.05, 0.1, 0.2, 0.35, 0.5, 1.0, 2.0, 5.0, high]
+    f_prev, x_prev = f(grid[0]), grid[0]
+    for x in grid[1:]:
+        fx = f(x)
+        if f_prev == 0:
+            return x_prev
+        if f_prev * fx < 0:
+            a, b, fa = x_prev, x, f_prev
+            for _ in range(BISECT_ITER):
+                mid = (a + b) / 2
+                fm = f(mid)
+                if abs(fm) < TOL or b - a < TOL:
+                    return mid
+                if fa * fm < 0:
+                    b = mid
+                else:
+                    a, fa = mid, fm
+            return (a + b) / 2
+        f_prev, x_prev = fx, x
+    return None
+
+
+def irr_many(series, guess=0.1):
+    """IRR for each cash-flow series (None where no IRR exists).
+
+    Newton iterations run over the whole batch in lockstep; series that
+    fail to converge are finished by bisection.
+    """
+    rates = [guess] * len(series)
+    active = []
+    for i, flows in enumerate(series):
+        if _has_sign_change(flows):
+            active.append(i)
+        else:
+            rates[i] = None
+    fallback = []
+
+    for _ in range(NEWTON_ITER):
+        if not active:
+            break
+        still = []
+        for i in active:
+            value, deriv = _npv_and_derivative(rates[i], series[i])
+            if deriv == 0 or value != value:
+                fallback.append(i)
+                continue
+            step = value / deriv
+            rate = rates[i] - step
+            if not RATE_FLOOR < rate < RATE_CEILING:
+                fallback.append(i)
+                continue
+            rates[i] = rate
+            if abs(step) < TOL:
+                continue
+            still.append(i)
+        active = still
+    fallback.extend(active)
+
+    for i in fallback:
+        flows = series[i]
+        rates[i] = _bisect(lambda r: npv(r, flows))
+    return rates
+
+
+def irr(flows, guess=0.1):
+    """IRR of one series; None when the flows never change sign."""
+    return irr_many([flows], guess)[0]
+
+
+# ---------------------------------------------------------------------------
+# XIRR
+# ---------------------------------------------------------------------------
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _year_fractions(dates):
+    days = [_as_date(d) for d in dates]
+    return [(d - days[0]).days / 365.0 for d in days]
+
+
+def xnpv(rate, flows, dates):
+    """NPV of dated flows, discounted to the first date (actual/365)."""
+    return sum(cf / (1 + rate) ** t for cf, t in zip(flows, _year_fractions(dates)))
+
+
+def xirr_many(series, guess=0.1):
+    """XIRR for each (flows, dates) pair; None where no rate exists."""
+    results = []
+    for flows, dates in series:
+        if not _has_sign_change(flows):
+            results.append(None)
+            continue
+        years = _year_fractions(dates)
+
+        def f(rate):
+            return sum(cf / (1 + rate) ** t for cf, t in zip(flows, years))
+
+        rate, solved = guess, False
+        for _ in range(NEWTON_ITER):
+            value = f(rate)
+            deriv = sum(-t * cf / (1 + rate) ** (t + 1) for cf, t in zip(flows, years))
+            if deriv == 0:
+                break
+            step = value / deriv
+            rate -= step
+            if not RATE_FLOOR < rate < RATE_CEILING:
+                break
+            if abs(step) < TOL:
+                solved = True
+                break
+        results.append(rate if solved else _bisect(f))
+    return results
+
+
+def xirr(flows, dates, guess=0.1):
+    return xirr_many([(flows, dates)], guess)[0]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def equity_multiple(flows):
+    """Net cash returned after Year 0 over the Year 0 equity, matching the
+    workbook formula SUM(flows[1:]) / -flows[0].
+    """
+    return sum(flows[1:]) / -flows[0] if flows and flows[0] else None
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def _random_series(n, years, seed=7):
+    rng = random.Random(seed)
+    series = []
+    for _ in range(n):
+        equity = rng.uniform(5e5, 2e6)
+        cash = [equity * rng.uniform(-0.05, 0.12) for _ in range(years)]
+        cash[-1] += equity * rng.uniform(0.6, 3.0)
+        series.append([-equity] + cash)
+    return series
+
+
+def _derivative_error(series, rates=(-0.5, 0.0, 0.15, 1.0, 3.0), h=1e-6):
+    """Worst relative error of the analytic dNPV/drate against a central
+    finite difference over series and rates.
+    """
+    worst = 0.0
+    for flows in series:
+        for rate in rates:
+            _, deriv = _npv_and_derivative(rate, flows)
+            numeric = (npv(rate + h, flows) - npv(rate - h, flows)) / (2 * h)
+            worst = max(worst, abs(deriv - numeric) / max(abs(numeric), 1.0))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch IRR solver benchmark.")
+    parser.add_argument("--bench", type=int, default=5000, help="series to solve")
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    series = _random_series(args.bench, args.years)
+    start = time.perf_counter()
+    batch = irr_many(series)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bisected = [_bisect(lambda r, f=flows: npv(r, f)) for flows in series]
+    t_bisect = time.perf_counter() - start
+
+    worst = max(abs(a - b) for a, b in zip(batch, bisected) if a is not None and b is not None)
+    mismatched = sum(1 for a, b in zip(batch, bisected) if (a is None) != (b is None))
+    deriv_error = _derivative_error(series[:200])
+    solved = sum(1 for r in batch if r is not None)
+    print(f"{args.bench:,} series x {args.years + 1} flows: {solved:,} solved")
+    print(f"  irr_many        {t_batch * 1000:8.1f} ms")
+    print(f"  bisection only  {t_bisect * 1000:8.1f} ms  ({t_bisect / t_batch:.1f}x slower)")
+    print(f"  max difference  {worst:.2e} vs bisection, {mismatched} solved by only one")
+    print(f"  dNPV/drate      {deriv_error:.2e} max relative error vs finite difference")
+    if worst > 1e-6 or mismatched or deriv_error > 1e-5:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
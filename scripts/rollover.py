@@ -0,0 +1,184 @@
+"""
+Lease expiration ladder and rollover risk. Bins lease expirations into
+calendar buckets from the rent roll date (AS_OF), with the monthly rent
+expiring in each bucket (rent at risk), its share of in-place rent, and the
+mark-to-market upside if the unit re-leases at market. Month-to-month and
+holdover leases are their own bucket: they can roll on 30 days' notice.
+
+Expiry binning comes from unit_mix.group_by("expiry_month"), so a property
+is aggregated once and every ladder (monthly, quarterly, portfolio) reads
+the same cached rollup.
+
+Usage:
+    python rollover.py [--horizon 12] [--step 1] [--json]
+"""
+import argparse
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from unit_mix import KEYS, group_by
+
+MONTH_ABBR = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+MTM_BUCKET = "MTM / Holdover"
+
+
+def month_index(iso):
+    """'2026-08-31' or '2026-08' -> months since year 0."""
+    return int(iso[:4]) * 12 + int(iso[5:7]) - 1
+
+
+def month_label(index):
+    return f"{MONTH_ABBR[index % 12]} {index // 12}"
+
+
+def _bucket_label(start, step):
+    if step == 1:
+        return month_label(start)
+    end = start + step - 1
+    if start // 12 == end // 12:
+        return f"{MONTH_ABBR[start % 12]}-{MONTH_ABBR[end % 12]} {start // 12}"
+    return f"{month_label(start)} - {month_label(end)}"
+
+
+def _new_bucket(label):
+    return {"label": label, "leases": 0, "units": [], "rent_at_risk": 0,
+            "market_rent": 0, "mark_to_market": 0}
+
+
+# ---------------------------------------------------------------------------
+# Ladder
+# ---------------------------------------------------------------------------
+def ladder(units=UNITS, as_of=AS_OF, horizon=12, step=1):
+    """Expiration buckets for one property, in order:
+    MTM/holdover, horizon // step calendar buckets, then leases beyond the
+    horizon. Each bucket: label, leases, units, rent_at_risk (monthly),
+    market_rent, mark_to_market, pct_of_rent, cumulative_pct.
+    """
+    if step < 1 or horizon < step:
+        raise ValueError("step must be >= 1 and no larger than horizon")
+    units = tuple(units)
+    start = month_index(as_of)
+    mtm = _new_bucket(MTM_BUCKET)
+    calendar = [_new_bucket(_bucket_label(start + i, step)) for i in range(0, horizon, step)]
+    beyond = _new_bucket(f"Beyond {horizon} Months")
+
+    def target(key):
+        if key == "MTM":
+            return mtm
+        offset = month_index(key) - start
+        if offset < 0:
+            return mtm  # lease ended before the rent roll date: holdover
+        if offset >= horizon:
+            return beyond
+        return calendar[offset // step]
+
+    for key, mix in group_by("expiry_month", units).items():
+        if key == "Vacant":
+            continue
+        bucket = target(key)
+        bucket["leases"] += mix["occupied"]
+        bucket["rent_at_risk"] += mix["rent_total"]
+        bucket["market_rent"] += mix["rent_total"] + mix["upside_occupied"]
+        bucket["mark_to_market"] += mix["upside_occupied"]
+
+    expiry = KEYS["expiry_month"]
+    for unit in units:
+        key = expiry(unit)
+        if key != "Vacant":
+            target(key)["units"].append(unit[U_NUM])
+
+    buckets = [mtm] + calendar + [beyond]
+    in_place = sum(b["rent_at_risk"] for b in buckets)
+    cumulative = 0
+    for b in buckets:
+        cumulative += b["rent_at_risk"]
+        b["pct_of_rent"] = b["rent_at_risk"] / in_place if in_place else 0.0
+        b["cumulative_pct"] = cumulative / in_place if in_place else 0.0
+    return buckets
+
+
+def walt(units=UNITS, as_of=AS_OF):
+    """Rent-weighted average remaining lease term in months. MTM and
+    holdover leases count as zero.
+    """
+    start = month_index(as_of)
+    weighted = rent = 0
+    for key, mix in group_by("expiry_month", tuple(units)).items():
+        if key == "Vacant":
+            continue
+        remaining = 0 if key == "MTM" else max(0, month_index(key) - start + 1)
+        weighted += remaining * mix["rent_total"]
+        rent += mix["rent_total"]
+    return weighted / rent if rent else 0.0
+
+
+def rollover_risk(units=UNITS, as_of=AS_OF, horizon=12):
+    """Headline figures: share of in-place rent that can roll within the
+    horizon (MTM included), peak month and WALT.
+    """
+    buckets = ladder(units, as_of, horizon)
+    within = buckets[:-1]
+    peak = max(buckets[1:-1], key=lambda b: b["rent_at_risk"])
+    return {
+        "as_of": as_of,
+        "horizon_months": horizon,
+        "rent_at_risk": sum(b["rent_at_risk"] for b in within),
+        "pct_of_rent": buckets[-2]["cumulative_pct"],
+        "mtm_leases": buckets[0]["leases"],
+        "peak_month": peak["label"],
+        "peak_rent_at_risk": peak["rent_at_risk"],
+        "mark_to_market": sum(b["mark_to_market"] for b in within),
+        "walt_months": round(walt(units, as_of), 1),
+    }
+
+
+def portfolio_ladder(portfolio, as_of=AS_OF, horizon=12, step=1):
+    """Ladders for several properties on a shared calendar.
+
+    portfolio maps property name -> unit rows. Returns {"labels": [...],
+    "rent_at_risk": {name: [...]}, "total": [...]} with one value per
+    bucket, so columns line up across properties.
+    """
+    labels, by_property = None, {}
+    for name, units in portfolio.items():
+        buckets = ladder(units, as_of, horizon, step)
+        labels = labels or [b["label"] for b in buckets]
+        by_property[name] = [b["rent_at_risk"] for b in buckets]
+    total = [sum(col) for col in zip(*by_property.values())] if by_property else []
+    return {"labels": labels or [], "rent_at_risk": by_property, "total": total}
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Lease expiration ladder.")
+    parser.add_argument("--horizon", type=int, default=12, help="months from AS_OF")
+    parser.add_argument("--step", type=int, default=1, help="months per bucket")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    buckets = ladder(horizon=args.horizon, step=args.step)
+    if args.json:
+        print(json.dumps({"ladder": buckets, "risk": rollover_risk(horizon=args.horizon)},
+                         indent=2))
+        return
+
+    print(f"Lease expirations as of {AS_OF}")
+    print(f"{'Period':<20} {'Leases':>6} {'Rent at Risk':>13} {'% Rent':>7} {'Cum %':>6} "
+          f"{'Mark-to-Mkt':>11}  Units")
+    for b in buckets:
+        print(f"{b['label']:<20} {b['leases']:>6} {b['rent_at_risk']:>13,} "
+              f"{b['pct_of_rent']:>7.1%} {b['cumulative_pct']:>6.1%} "
+              f"{b['mark_to_market']:>11,}  {', '.join(b['units'])}")
+    risk = rollover_risk(horizon=args.horizon)
+    print(f"WALT {risk['walt_months']} months; {risk['pct_of_rent']:.0%} of rent can roll "
+          f"within {args.horizon} months; peak {risk['peak_month']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Seed p360_properties, p360_documents and p360_checklists for a portfolio
+straight into Postgres (Supabase or a local database with
+supabase/migrations/001_p360_schema.sql applied).
+
+Properties are written in batches, one transaction per batch on a pooled
+connection: each table's rows are COPYed into a temp table and merged
+with INSERT ... SELECT ... ON CONFLICT. Properties that already exist are
+left as they are; documents and checklist rows are updated in place but
+keep their owner. Document ids are derived from (property id, filename),
+so re-running the seed updates rows instead of duplicating them; older
+seeded rows of the same name (same user, no stored file) are replaced.
+Checklist rows come from the generators' evidence manifests
+(evidence.py), and documents with a manifest are seeded as analysed.
+
+Needs psycopg 3 (pip install "psycopg[binary,pool]"); without psycopg_pool
+batches run one after another on a single connection.
+
+Usage:
+    python seed.py --dsn postgresql://... [--user-id UUID] [--demo 500]
+                   [--batch-size 200] [--workers 4]
+    python seed.py --dry-run [--demo 500]
+"""
+import argparse
+import json
+import re
+import sys
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from evidence import ROW_FIELDS, as_analysis, checklist_rows, load_manifest
+
+CASE_STUDY_PROPERTY_ID = "a1b2c3d4-e5f6-7890-abcd-ef1234567890"
+FALLBACK_USER_ID = "00000000-0000-0000-0000-000000000001"
+ID_NAMESPACE = uuid.UUID(CASE_STUDY_PROPERTY_ID)
+BATCH_SIZE = 200
+WORKERS = 4
+UNIT_TYPE_RE = re.compile(r"(\d+)BR/(\d+(?:\.\d+)?)BA")
+
+PROPERTY_COLUMNS = (
+    "id", "user_id", "address", "city", "state", "zip", "parcel_id", "property_type",
+    "beds", "baths", "sqft", "year_built", "lot_size_sqft", "estimated_value",
+    "mortgage_payoff", "monthly_rent", "occupancy_status", "notes", "metadata",
+)
+DOCUMENT_COLUMNS = (
+    "id", "user_id", "property_id", "filename", "file_type", "file_size", "storage_path",
+    "status", "analysis", "doc_type", "summary", "completed_items",
+)
+CHECKLIST_COLUMNS = ("user_id", "property_id") + ROW_FIELDS
+
+# table -> (columns, conflict key), in foreign-key order
+TABLES = (
+    ("p360_properties", PROPERTY_COLUMNS, ("id",)),
+    ("p360_documents", DOCUMENT_COLUMNS, ("id",)),
+    ("p360_checklists", CHECKLIST_COLUMNS, ("user_id", "property_id", "item_id")),
+)
+# Existing properties are left alone (owner and user edits win), and no
+# re-seed moves an existing row to another owner
+INSERT_ONLY = {"p360_properties"}
+OWNER_COLUMNS = {"user_id", "storage_path"}
+JSON_COLUMNS = {"metadata", "analysis", "completed_items"}
+# p360_documents has no unique key besides id; rows seeded before the ids
+# were derived (e.g. by the old REST workflow) are replaced on these columns.
+# Only the seeding user's rows with no stored file are replaced, so user
+# uploads and other owners' documents of the same name are left alone.
+NATURAL_KEYS = {"p360_documents": ("property_id", "filename")}
+REPLACEABLE = "t.user_id = s.user_id AND t.storage_path IS NULL"
+
+
+# ---------------------------------------------------------------------------
+# Rows
+# ---------------------------------------------------------------------------
+def derived_id(*parts):
+    """Stable UUID for seeded rows that have no natural key."""
+    return str(uuid.uuid5(ID_NAMESPACE, "/".join(str(p) for p in parts)))
+
+
+def storage_path(user_id, property_id, filename):
+    """Object key in the p360-documents bucket; the bucket policies require
+    the user id as the first folder.
+    """
+    return f"{user_id}/{property_id}/{filename}"
+
+
+def case_study_property(user_id):
+    beds = baths = 0
+    mix = {}
+    for u in UNITS:
+        m = UNIT_TYPE_RE.match(u[U_TYPE])
+        beds += int(m.group(1))
+        baths += float(m.group(2))
+        mix[m.group(1)] = mix.get(m.group(1), 0) + 1
+    return {
+        "id": CASE_STUDY_PROPERTY_ID,
+        "user_id": user_id,
+        "address": PROPERTY["address"].split(",")[0],
+        "city": PROPERTY["city"],
+        "state": PROPERTY["state"],
+        "zip": PROPERTY["zip"],
+        "parcel_id": PROPERTY["parcel_id"],
+        "property_type": "multi_family",
+        "beds": beds,
+        "baths": baths,
+        "sqft": PROPERTY["total_sqft"],
+        "year_built": PROPERTY["year_built"],
+        "lot_size_sqft": PROPERTY["lot_sqft"],
+        "estimated_value": ASKING_PRICE,
+        "mortgage_payoff": PROPERTY["current_mortgage"],
+        "monthly_rent": ACTUAL_MONTHLY_RENT,
+        "occupancy_status": "partial" if VACANT_UNITS else "occupied",
+        "notes": f"{TOTAL_UNITS}-unit case study for system validation",
+        "metadata": {
+            "units": TOTAL_UNITS,
+            "unit_mix": "+".join(f"{n}x{br}BR" for br, n in sorted(mix.items())),
+            "case_study": True,
+        },
+    }
+
+
+def folder_documents(folder=OUTPUT_DIR):
+    """(filename, doc_type, size, manifest) for each registry document
+    present in folder; manifest is None when it has no evidence.
+    """
+    docs = []
+    for filename, doc_type, _ in DOCUMENTS:
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            docs.append((filename, doc_type, os.path.getsize(path), load_manifest(path)))
+    return docs
+
+
+def property_bundle(prop, docs, checklist):
+    """{table: rows} for one property: its documents and the checklist rows
+    (evidence.checklist_rows output) stamped with its ids.
+    """
+    documents = []
+    for filename, doc_type, size, manifest in docs:
+        analysis = as_analysis(manifest) if manifest else None
+        documents.append({
+            "id": derived_id(prop["id"], filename),
+            "user_id": prop["user_id"],
+            "property_id": prop["id"],
+            "filename": filename,
+            "file_type": os.path.splitext(filename)[1][1:],
+            "file_size": size,
+            "storage_path": storage_path(prop["user_id"], prop["id"], filename),
+            "status": "done" if analysis else "uploaded",
+            "analysis": analysis,
+            "doc_type": doc_type,
+            "summary": analysis["summary"] if analysis else None,
+            "completed_items": analysis["completedItems"] if analysis else [],
+        })
+    return {
+        "p360_properties": [prop],
+        "p360_documents": documents,
+        "p360_checklists": [dict(r, user_id=prop["user_id"], property_id=prop["id"])
+                            for r in checklist],
+    }
+
+
+def portfolio(user_id, demo=0, folder=OUTPUT_DIR):
+    """Bundles for the case study plus demo copies of it, one at a time."""
+    docs = folder_documents(folder)
+    checklist = checklist_rows([m for _, _, _, m in docs if m])
+    base = case_study_property(user_id)
+    yield property_bundle(base, docs, checklist)
+    for i in range(demo):
+        prop = dict(base, id=derived_id("demo", i), address=f"{100 + i} Demo Way",
+                    parcel_id=None, notes=f"Demo property {i + 1}",
+                    metadata=dict(base["metadata"], case_study=False, demo=i + 1))
+        yield property_bundle(prop, docs, checklist)
+
+
+def batches(bundles, size):
+    batch = {table: [] for table, _, _ in TABLES}
+    n = 0
+    for bundle in bundles:
+        for table, rows in bundle.items():
+            batch[table].extend(rows)
+        n += 1
+        if n == size:
+            yield batch
+            batch = {table: [] for table, _, _ in TABLES}
+            n = 0
+    if n:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+def _copy_value(column, value):
+    if column in JSON_COLUMNS and value is not None:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def upsert_batch(conn, batch):
+    """COPY each table's rows into a temp table and merge them in one
+    transaction. Returns {table: rows written}.
+    """
+    written = {}
+    with conn.transaction(), conn.cursor() as cur:
+        for table, columns, key in TABLES:
+            rows = batch[table]
+            if not rows:
+                written[table] = 0
+                continue
+            temp = f"seed_{table}"
+            cols = ", ".join(columns)
+            cur.execute(f"CREATE TEMP TABLE {temp} (LIKE {table} INCLUDING DEFAULTS) "
+                        f"ON COMMIT DROP")
+            with cur.copy(f"COPY {temp} ({cols}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row([_copy_value(c, row[c]) for c in columns])
+            if table in NATURAL_KEYS:
+                match = " AND ".join(f"t.{c} = s.{c}" for c in NATURAL_KEYS[table])
+                cur.execute(f"DELETE FROM {table} t USING {temp} s "
+                            f"WHERE {match} AND t.id <> s.id AND {REPLACEABLE}")
+            if table in INSERT_ONLY:
+                action = "DO NOTHING"
+            else:
+                action = "DO UPDATE SET " + ", ".join(
+                    f"{c} = EXCLUDED.{c}" for c in columns if c not in key and c not in OWNER_COLUMNS)
+            cur.execute(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {temp} "
+                        f"ON CONFLICT ({', '.join(key)}) {action}")
+            written[table] = cur.rowcount
+    return written
+
+
+def first_user(conn):
+    """First p360_profiles id, as the curl workflow used; None if no users."""
+    row = conn.execute("SELECT id FROM p360_profiles ORDER BY created_at LIMIT 1").fetchone()
+    # End the read transaction: left open, every later conn.transaction()
+    # would become a savepoint and the ON COMMIT DROP temp tables would pile up
+    conn.commit()
+    return str(row[0]) if row else None
+
+
+def resolve_user(dsn, user_id=None):
+    """The owner seed() would use: user_id, else the first p360_profiles
+    user at dsn, else FALLBACK_USER_ID. Shared with upload.py so objects
+    land under the same <user_id>/ prefix as the seeded rows.
+    """
+    if user_id:
+        return user_id
+    if not dsn:
+        return FALLBACK_USER_ID
+    import psycopg
+
+    with psycopg.connect(dsn) as conn:
+        return first_user(conn) or FALLBACK_USER_ID
+
+
+def seed(dsn, user_id=None, demo=0, batch_size=BATCH_SIZE, workers=WORKERS, folder=OUTPUT_DIR):
+    """Seed the portfolio. Returns {"user_id", "batches", table: rows written}."""
+    import psycopg
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError:
+        ConnectionPool = None
+
+    totals = {table: 0 for table, _, _ in TABLES}
+    n_batches = 0
+    if ConnectionPool is None:
+        with psycopg.connect(dsn) as conn:
+            user_id = user_id or first_user(conn) or FALLBACK_USER_ID
+            for batch in batches(portfolio(user_id, demo, folder), batch_size):
+                for table, n in upsert_batch(conn, batch).items():
+                    totals[table] += n
+                n_batches += 1
+        return dict(totals, user_id=user_id, batches=n_batches)
+
+    def run(batch):
+        with pool.connection() as conn:
+            return upsert_batch(conn, batch)
+
+    with ConnectionPool(dsn, min_size=1, max_size=workers, open=True) as pool:
+        if not user_id:
+            with pool.connection() as conn:
+                user_id = first_user(conn) or FALLBACK_USER_ID
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Keep at most two batches per worker in flight so the
+            # portfolio is never built in memory all at once.
+            pending = []
+            for batch in batches(portfolio(user_id, demo, folder), batch_size):
+                pending.append(executor.submit(run, batch))
+                if len(pending) >= workers * 2:
+                    for table, n in pending.pop(0).result().items():
+                        totals[table] += n
+                    n_batches += 1
+            for future in pending:
+                for table, n in future.result().items():
+                    totals[table] += n
+                n_batches += 1
+    return dict(totals, user_id=user_id, batches=n_batches)
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Seed the P360 tables in Postgres.")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"),
+                        help="Postgres connection string (default $DATABASE_URL)")
+    parser.add_argument("--user-id", default=None,
+                        help="owner of the seeded rows (default: first p360_profiles user)")
+    parser.add_argument("--demo", type=int, default=0, help="add N demo copies of the case study")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="properties per transaction")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="pooled connections")
+    parser.add_argument("--folder", default=OUTPUT_DIR, help="generated documents to seed")
+    parser.add_argument("--dry-run", action="store_true", help="build the rows, do not connect")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.dry_run:
+        totals = {table: 0 for table, _, _ in TABLES}
+        n_batches = 0
+        for batch in batches(portfolio(args.user_id or FALLBACK_USER_ID, args.demo, args.folder),
+                             args.batch_size):
+            for table, rows in batch.items():
+                totals[table] += len(rows)
+            n_batches += 1
+        result = dict(totals, user_id=args.user_id or FALLBACK_USER_ID, batches=n_batches)
+    else:
+        if not args.dsn:
+            parser.error("--dsn or $DATABASE_URL is required (or use --dry-run)")
+        result = seed(args.dsn, args.user_id, args.demo, args.batch_size, args.workers, args.folder)
+    elapsed = time.perf_counter() - start
+
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"{verb} {result['p360_properties']:,} properties, {result['p360_documents']:,} documents, "
+          f"{result['p360_checklists']:,} checklist rows in {result['batches']} batches "
+          f"({elapsed:.2f}s, user {result['user_id']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Structured text sidecars for the generated case-study documents.
+Each generator writes <filename>.json and <filename>.md next to its output
+holding the sections, tables and key figures it rendered, so consumers can
+read document content without parsing PDF/DOCX/XLSX/PPTX.
+
+Generators that prove checklist items also pass evidence={item id: value};
+that is written to <filename>.evidence.json for evidence.py to load into
+p360_checklists, with the sha256 of the document it was written for.
+"""
+import html
+import json
+import os
+import re
+
+from data import DOCUMENTS, PROPERTY, output_path
+from evidence import file_sha256
+from formula_eval import workbook_values
+from phases import all_items, checklist_version, load_checklist
+
+
+TAG_RE = re.compile(r"<[^>]+>")
+BREAK_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def clean_text(text):
+    """Strip reportlab markup and entities, normalize whitespace."""
+    text = BREAK_RE.sub("\n", str(text))
+    text = html.unescape(TAG_RE.sub("", text))
+    lines = [SPACE_RE.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def new_section(title, level=1):
+    return {"title": title, "level": level, "paragraphs": [], "tables": []}
+
+
+def trim_row(values):
+    """Drop trailing empty cells from a table row."""
+    row = list(values)
+    while row and row[-1] in (None, ""):
+        row.pop()
+    return row
+
+
+def trim_table(rows):
+    """Drop empty rows and trailing empty cells; None becomes ''."""
+    table = []
+    for values in rows:
+        row = trim_row(values)
+        if row:
+            table.append(["" if v is None else v for v in row])
+    return table
+
+
+# ---------------------------------------------------------------------------
+# reportlab story -> sections
+# ---------------------------------------------------------------------------
+def _flowable_text(flowable):
+    """Text of a Paragraph, a string, or a list of flowables (table cells)."""
+    if flowable is None:
+        return ""
+    if isinstance(flowable, str):
+        return clean_text(flowable)
+    if isinstance(flowable, (list, tuple)):
+        return "\n".join(t for t in (_flowable_text(f) for f in flowable) if t)
+    if hasattr(flowable, "text"):
+        bullet = getattr(flowable, "bulletText", None)
+        text = clean_text(flowable.text)
+        return f"{clean_text(bullet)} {text}" if bullet else text
+    return ""
+
+
+def sections_from_story(story, headings, title=""):
+    """Split a reportlab story into sections.
+
+    headings maps ParagraphStyle names to section levels, e.g.
+    {"PageTitle": 1, "SectionHeader": 2}.
+    """
+    sections = [new_section(title, 0)]
+
+    def walk(flowables):
+        for f in flowables:
+            if hasattr(f, "_cellvalues"):
+                rows = [[_flowable_text(c) for c in row] for row in f._cellvalues]
+                table = trim_table(rows)
+                if table:
+                    sections[-1]["tables"].append(table)
+            elif hasattr(f, "_content"):
+                walk(f._content)
+            elif hasattr(f, "text") and hasattr(f, "style"):
+                text = _flowable_text(f)
+                if not text:
+                    continue
+                level = headings.get(f.style.name)
+                if level:
+                    sections.append(new_section(text, level))
+                else:
+                    sections[-1]["paragraphs"].append(text)
+
+    walk(story)
+    return [s for s in sections if s["title"] or s["paragraphs"] or s["tables"]]
+
+
+# ---------------------------------------------------------------------------
+# python-docx Document -> sections
+# ---------------------------------------------------------------------------
+def sections_from_docx(doc, heading_pattern, title=""):
+    """Split a python-docx Document into sections at paragraphs whose text
+    matches heading_pattern, keeping paragraphs and tables in body order.
+    """
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    heading_re = re.compile(heading_pattern)
+    sections = [new_section(title, 0)]
+
+    for child in doc.element.body.iterchildren():
+        tag = child.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            text = Paragraph(child, doc).text.strip()
+            if not text:
+                continue
+            if heading_re.match(text):
+                sections.append(new_section(text, 1))
+            else:
+                sections[-1]["paragraphs"].append(text)
+        elif tag == "tbl":
+            table = Table(child, doc)
+            rows = [[cell.text.strip() for cell in row.cells] for row in table.rows]
+            rows = trim_table(rows)
+            if rows:
+                sections[-1]["tables"].append(rows)
+
+    return [s for s in sections if s["title"] or s["paragraphs"] or s["tables"]]
+
+
+# ---------------------------------------------------------------------------
+# python-pptx Presentation -> sections (one per slide)
+# ---------------------------------------------------------------------------
+def sections_from_presentation(prs):
+    """One section per slide; the first text line on the slide is its title."""
+    sections = []
+    for num, slide in enumerate(prs.slides, 1):
+        texts = []
+        tables = []
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                for para in shape.text_frame.paragraphs:
+                    text = "".join(r.text for r in para.runs).strip()
+                    if text:
+                        texts.append(text)
+            elif getattr(shape, "has_table", False) and shape.has_table:
+                rows = [[cell.text.strip() for cell in row.cells]
+                        for row in shape.table.rows]
+                tables.append(trim_table(rows))
+        section = new_section(texts[0] if texts else f"Slide {num}", 1)
+        section["slide"] = num
+        section["paragraphs"] = texts[1:]
+        section["tables"] = tables
+        sections.append(section)
+    return sections
+
+
+# ---------------------------------------------------------------------------
+# openpyxl Workbook -> sections (one per sheet)
+# ---------------------------------------------------------------------------
+def sections_from_workbook(wb):
+    """One section per sheet holding its used range as a single table.
+    Formula cells hold the value the formula computes (formula_eval.py),
+    as Excel would show it.
+    """
+    grid = workbook_values(wb)
+    sections = []
+    for ws in wb.worksheets:
+        section = new_section(ws.title, 1)
+        table = trim_table(grid[ws.title])
+        if table:
+            section["tables"].append(table)
+        sections.append(section)
+    return sections
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+def _md_cell(value):
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, float):
+        value = f"{value:,.4g}" if abs(value) < 1 else f"{value:,.2f}"
+    return str(value).replace("|", "\\|").replace("\n", "<br>")
+
+
+def render_markdown(sidecar):
+    """Render a sidecar dict as Markdown."""
+    lines = [f"# {sidecar['title']}", ""]
+    lines.append(f"- **Document:** {sidecar['document']}")
+    lines.append(f"- **Property:** {sidecar['property']}")
+    if sidecar["phases"]:
+        lines.append(f"- **Phase(s):** {', '.join(str(p) for p in sidecar['phases'])}")
+    lines.append("")
+
+    if sidecar["key_figures"]:
+        lines += ["## Key Figures", "", "| Figure | Value |", "|---|---|"]
+        for key, value in sidecar["key_figures"].items():
+            lines.append(f"| {key} | {_md_cell(value)} |")
+        lines.append("")
+
+    for section in sidecar["sections"]:
+        if section["title"]:
+            depth = min(section["level"], 4) + 1
+            lines += ["#" * depth + " " + section["title"], ""]
+        for para in section["paragraphs"]:
+            lines += [para, ""]
+        for table in section["tables"]:
+            width = max(len(r) for r in table)
+            rows = [list(r) + [""] * (width - len(r)) for r in table]
+            lines.append("| " + " | ".join(_md_cell(v) for v in rows[0]) + " |")
+            lines.append("|" + "---|" * width)
+            for r in rows[1:]:
+                lines.append("| " + " | ".join(_md_cell(v) for v in r) + " |")
+            lines.append("")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def build_sidecar(filename, title, sections, key_figures=None):
+    doc_type, phases = None, []
+    for name, dtype, doc_phases in DOCUMENTS:
+        if name == filename:
+            doc_type, phases = dtype, doc_phases
+            break
+    return {
+        "document": filename,
+        "doc_type": doc_type,
+        "phases": phases,
+        "property": PROPERTY["name"],
+        "title": title,
+        "key_figures": key_figures or {},
+        "sections": sections,
+    }
+
+
+def build_evidence(filename, evidence, sha256=None):
+    """Evidence manifest for a document: the checklist items it proves, each
+    with the value the generator rendered and confidence 1.0. sha256 is the
+    document's, so readers can tell the manifest still describes the file.
+    """
+    phases = load_checklist()
+    item_phase = {item["id"]: item["phase"] for item in all_items(phases)}
+    unknown = [item_id for item_id in evidence if item_id not in item_phase]
+    if unknown:
+        raise ValueError(f"{filename}: unknown checklist items {', '.join(unknown)}")
+    doc_type = next((dtype for name, dtype, _ in DOCUMENTS if name == filename), None)
+    return {
+        "document": filename,
+        "doc_type": doc_type,
+        "property": PROPERTY["name"],
+        "checklist_version": checklist_version(phases),
+        "sha256": sha256,
+        "items": [
+            {"id": item_id, "phase": item_phase[item_id], "value": str(value), "confidence": 1.0}
+            for item_id, value in evidence.items()
+        ],
+    }
+
+
+def write_sidecar(filename, title, sections, key_figures=None, evidence=None):
+    """Write <filename>.json and <filename>.md next to the document, and
+    <filename>.evidence.json when evidence is given. Returns the JSON path.
+    """
+    sidecar = build_sidecar(filename, title, sections, key_figures)
+
+    json_path = output_path(filename + ".json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, indent=2, ensure_ascii=False, default=str)
+        f.write("\n")
+
+    with open(output_path(filename + ".md"), "w", encoding="utf-8") as f:
+        f.write(render_markdown(sidecar))
+
+    if evidence:
+        doc_path = output_path(filename)
+        sha256 = file_sha256(doc_path) if os.path.exists(doc_path) else None
+        with open(output_path(filename + ".evidence.json"), "w", encoding="utf-8") as f:
+            json.dump(build_evidence(filename, evidence, sha256), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    return json_path
+
+
+def load_sidecar(path):
+    """Load the sidecar for a document path, or None if it has none."""
+    json_path = path if path.endswith(".json") else path + ".json"
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,313 @@
+"""
+Section-aware summarizer that fits generated documents into the analysis
+budget. app/api/analyze/route.ts keeps only the first 12,000 characters of
+text content, so long inspection reports and leases lose their tail. This
+splits a document into sections (sidecar sections written by the generators
+when present, otherwise extract.py), ranks each chunk by overlap with the
+checklist in lib/phases.ts, and packs the best chunks into a fixed budget
+in document order. Results are cached on the document hash.
+
+Usage:
+    python summarize.py [PATH ...] [--budget 12000] [--json] [--no-cache]
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from extract import extract, list_documents
+from phases import all_items, checklist_version, load_phases
+from sidecar import load_sidecar
+
+
+DEFAULT_BUDGET = 12000      # matches the text slice in app/api/analyze
+CHUNK_CHARS = 2000          # sections longer than this are split
+PHASE_BOOST = 1.0           # extra weight for items in the document's own phases
+CRITICAL_WEIGHT = 1.5
+MIN_COVERAGE = 0.25         # share of an item's terms a chunk must contain
+SUMMARY_VERSION = 1         # bump when packing output changes
+SUMMARY_CACHE = os.path.join(CACHE_DIR, "summaries")
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "any", "all", "are", "as", "at", "be", "by", "for", "from",
+    "in", "into", "is", "it", "of", "on", "or", "per", "the", "to", "vs", "with",
+    "your", "before", "after", "within", "each", "this", "that",
+}
+
+
+# ---------------------------------------------------------------------------
+# Terms
+# ---------------------------------------------------------------------------
+def stem(word):
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text):
+    return {stem(w) for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS}
+
+
+def item_index(phases=None):
+    """Checklist items with their term sets and IDF weights."""
+    items = all_items(phases)
+    for item in items:
+        item["terms"] = terms(item["text"])
+
+    df = {}
+    for item in items:
+        for term in item["terms"]:
+            df[term] = df.get(term, 0) + 1
+    idf = {term: math.log(1 + len(items) / count) for term, count in df.items()}
+
+    for item in items:
+        item["weight_total"] = sum(idf[t] for t in item["terms"]) or 1.0
+    return items, idf
+
+
+# ---------------------------------------------------------------------------
+# Sections -> chunks
+# ---------------------------------------------------------------------------
+def _table_lines(table):
+    return [" | ".join("" if v is None else str(v) for v in row) for row in table]
+
+
+def section_blocks(section):
+    """A section's paragraphs and table rows as text blocks."""
+    blocks = list(section.get("paragraphs", []))
+    for table in section.get("tables", []):
+        blocks.extend(_table_lines(table))
+    return blocks
+
+
+def chunk_sections(sections, chunk_chars=CHUNK_CHARS):
+    """Turn sections into chunks of at most ~chunk_chars, split at block
+    boundaries. Continuation chunks repeat the section title; sub-sections
+    carry their parent heading as scoring context ("HVAC" for "Units
+    Requiring Immediate Attention").
+    """
+    chunks = []
+    ancestors = {}  # level -> title of the latest heading at that level
+    for number, section in enumerate(sections):
+        title = section.get("title") or ""
+        level = section.get("level", 1)
+        context = " ".join(t for lvl, t in sorted(ancestors.items()) if 0 < lvl < level)
+        ancestors = {lvl: t for lvl, t in ancestors.items() if lvl < level}
+        ancestors[level] = title
+        blocks = section_blocks(section)
+        if not blocks and not title:
+            continue
+        part, size = [], 0
+        parts = []
+        for block in blocks:
+            if part and size + len(block) + 1 > chunk_chars:
+                parts.append(part)
+                part, size = [], 0
+            part.append(block)
+            size += len(block) + 1
+        if part or not parts:
+            parts.append(part)
+        for i, body in enumerate(parts):
+            heading = title if i == 0 else f"{title} (cont.)"
+            text = "\n".join(([f"## {heading}"] if heading else []) + body)
+            chunks.append({"section": number, "title": heading, "text": text, "context": context})
+    return chunks
+
+
+# ---------------------------------------------------------------------------
+# Ranking and packing
+# ---------------------------------------------------------------------------
+def score_chunk(chunk, items, idf, doc_phases):
+    """Sum of weighted item coverage; returns (score, top item ids)."""
+    chunk_terms = terms(chunk["text"] + " " + chunk.get("context", ""))
+    matches = []
+    for item in items:
+        hit = sum(idf[t] for t in item["terms"] if t in chunk_terms)
+        coverage = hit / item["weight_total"]
+        if coverage < MIN_COVERAGE:
+            continue
+        weight = CRITICAL_WEIGHT if item["critical"] else 1.0
+        if item["phase"] in doc_phases:
+            weight += PHASE_BOOST
+        matches.append((coverage * weight, item["id"]))
+    matches.sort(reverse=True)
+    return round(sum(s for s, _ in matches), 4), [item_id for _, item_id in matches[:5]]
+
+
+def pack(chunks, budget):
+    """Keep the highest-scoring chunks that fit, then restore document order.
+    The first chunk (document title / header block) is always kept when it
+    fits so the analyst sees what the document is.
+    """
+    order = sorted(range(len(chunks)), key=lambda i: (-chunks[i]["score"], i))
+    if chunks:
+        order.remove(0)
+        order.insert(0, 0)
+
+    kept, used = set(), 0
+    for i in order:
+        size = len(chunks[i]["text"]) + 2
+        if used + size <= budget:
+            kept.add(i)
+            used += size
+    return kept
+
+
+def render(chunks, kept, key_figures=None):
+    out = []
+    if key_figures:
+        out.append("## Key Figures\n" + json.dumps(key_figures, ensure_ascii=False, default=str))
+    skipped = []
+    for i, chunk in enumerate(chunks):
+        if i in kept:
+            if skipped:
+                out.append(f"[... {len(skipped)} section(s) omitted: {', '.join(skipped)} ...]")
+                skipped = []
+            out.append(chunk["text"])
+        else:
+            skipped.append(chunk["title"] or f"part {i + 1}")
+    if skipped:
+        out.append(f"[... {len(skipped)} section(s) omitted: {', '.join(skipped)} ...]")
+    return "\n\n".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+def _doc_phases(path):
+    name = os.path.basename(path)
+    for filename, _, doc_phases in DOCUMENTS:
+        if filename == name:
+            return set(doc_phases)
+    return set()
+
+
+def document_sections(path):
+    """(sections, key_figures, source) preferring the generator's sidecar."""
+    sidecar = load_sidecar(path)
+    if sidecar is not None:
+        return sidecar["sections"], sidecar.get("key_figures") or {}, "sidecar"
+    return extract(path)["sections"], {}, "extract"
+
+
+def document_hash(path):
+    """SHA-256 over the document and its sidecar (if any)."""
+    h = hashlib.sha256()
+    for part in (path, path + ".json"):
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+    return h.hexdigest()
+
+
+def summarize(path, budget=DEFAULT_BUDGET, phases=None):
+    """Pack one document into budget characters.
+
+    Returns {"document", "source", "budget", "chars", "chunks", "kept",
+    "text"} where chunks carry their score and matched checklist items.
+    """
+    phases = phases if phases is not None else load_phases()
+    items, idf = item_index(phases)
+    sections, key_figures, source = document_sections(path)
+    doc_phases = _doc_phases(path)
+
+    figures_text = json.dumps(key_figures, ensure_ascii=False, default=str) if key_figures else ""
+    reserve = len(figures_text) + 20 if figures_text else 0
+    if reserve > budget // 4:
+        key_figures, reserve = {}, 0  # figures alone would crowd out the body
+
+    chunks = chunk_sections(sections)
+    for chunk in chunks:
+        chunk["score"], chunk["items"] = score_chunk(chunk, items, idf, doc_phases)
+
+    # Omission markers cost space too; shrink the target until it fits.
+    target = budget - reserve
+    while True:
+        kept = pack(chunks, target)
+        text = render(chunks, kept, key_figures)
+        if len(text) <= budget or target <= 0:
+            break
+        target -= len(text) - budget
+
+    return {
+        "document": os.path.basename(path),
+        "source": source,
+        "budget": budget,
+        "chars": len(text),
+        "chunks": [
+            {"title": c["title"], "chars": len(c["text"]), "score": c["score"],
+             "items": c["items"], "kept": i in kept}
+            for i, c in enumerate(chunks)
+        ],
+        "kept": len(kept),
+        "text": text,
+    }
+
+
+def cached_summary(path, budget=DEFAULT_BUDGET, use_cache=True):
+    """summarize() behind a cache keyed on document hash, budget and
+    checklist version.
+    """
+    phases = load_phases()
+    key = hashlib.sha256(
+        f"{document_hash(path)}:{budget}:{checklist_version(phases)}:{SUMMARY_VERSION}".encode()
+    ).hexdigest()
+    cache_path = os.path.join(SUMMARY_CACHE, key + ".json")
+
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            result = json.load(f)
+        result["cached"] = True
+        return result
+
+    result = summarize(path, budget, phases)
+    if use_cache:
+        os.makedirs(SUMMARY_CACHE, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+    result["cached"] = False
+    return result
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Pack documents into an analysis budget.")
+    parser.add_argument("paths", nargs="*", default=[OUTPUT_DIR])
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="characters per document")
+    parser.add_argument("--json", action="store_true", help="print full results as JSON")
+    parser.add_argument("--text", action="store_true", help="print the packed text")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    paths = []
+    for p in args.paths:
+        paths.extend(list_documents(p) if os.path.isdir(p) else [p])
+
+    results = [cached_summary(p, args.budget, not args.no_cache) for p in paths]
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    for r in results:
+        total = sum(c["chars"] for c in r["chunks"])
+        print(f"{r['document']:<34} {r['source']:<8} {r['kept']:>3}/{len(r['chunks']):<3} chunks "
+              f"{r['chars']:>6,}/{total:>7,} chars{'  (cached)' if r['cached'] else ''}")
+        if args.text:
+            print(r["text"])
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Unit-mix aggregation over the unit table. The OM, rent roll summary and
+pro forma all need the same rollups (counts, average rents, market rent,
+upside) by unit type and other keys; this computes them once per unit table
+and caches the result, so every generator reads the same numbers.
+
+Units are the UNITS tuples from data.py (or rent_roll.normalize_row output).
+The table is transposed into columns once, then each group-by is a single
+pass over the column arrays.
+
+Usage:
+    python unit_mix.py [--by type|status|floor|expiry_month] [--json]
+"""
+import argparse
+import json
+import sys
+import os
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+
+
+def _floor(unit):
+    num = unit[U_NUM]
+    return int(num) // 100 if num.isdigit() else None
+
+
+def _expiry_month(unit):
+    if unit[U_STATUS] == "Vacant" or not unit[U_LEASE_END]:
+        return "Vacant"
+    if unit[U_LEASE_END] == "MTM":
+        return "MTM"
+    return unit[U_LEASE_END][:7]
+
+
+# Group keys: name -> function(unit) -> group value
+KEYS = {
+    "type": lambda u: u[U_TYPE],
+    "status": lambda u: u[U_STATUS],
+    "floor": _floor,
+    "expiry_month": _expiry_month,
+}
+
+
+# ---------------------------------------------------------------------------
+# Columns
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=32)
+def columns(units):
+    """The unit table as column tuples. units must be a tuple of unit
+    tuples (hashable, so results are cached per property).
+    """
+    occupied = tuple(u[U_STATUS] == "Occupied" for u in units)
+    return {
+        "sf": tuple(u[U_SF] for u in units),
+        "rent": tuple(u[U_RENT] for u in units),
+        "market": tuple(u[U_MARKET] for u in units),
+        "deposit": tuple(u[U_DEPOSIT] for u in units),
+        "occupied": occupied,
+        "delinquent": tuple(u[U_DELINQ].startswith("Yes") for u in units),
+        # Loss-to-lease on occupied units only; vacant units carry no rent
+        "gap": tuple(u[U_MARKET] - u[U_RENT] if occ else 0 for u, occ in zip(units, occupied)),
+    }
+
+
+def _metrics(cols, idx):
+    """Rollup of the rows at positions idx."""
+    count = len(idx)
+    occ = [i for i in idx if cols["occupied"][i]]
+    n_occ = len(occ)
+    sf_total = sum(cols["sf"][i] for i in idx)
+    rent_total = sum(cols["rent"][i] for i in idx)
+    market_total = sum(cols["market"][i] for i in idx)
+    occ_sf = sum(cols["sf"][i] for i in occ)
+    return {
+        "count": count,
+        "occupied": n_occ,
+        "vacant": count - n_occ,
+        "occupancy": n_occ / count if count else 0.0,
+        "sf_total": sf_total,
+        "avg_sf": sf_total / count if count else 0.0,
+        "rent_total": rent_total,
+        "avg_rent": rent_total / n_occ if n_occ else 0.0,
+        "rent_per_sf": rent_total / occ_sf if occ_sf else 0.0,
+        "market_total": market_total,
+        "avg_market": market_total / count if count else 0.0,
+        # Full upside: every unit at market (vacant units lease up)
+        "upside": market_total - rent_total,
+        # Loss-to-lease on occupied units only
+        "upside_occupied": sum(cols["gap"][i] for i in occ),
+        "below_market": sum(1 for i in occ if cols["gap"][i] > 0),
+        "deposits": sum(cols["deposit"][i] for i in occ),
+        "delinquent": sum(1 for i in idx if cols["delinquent"][i]),
+    }
+
+
+@lru_cache(maxsize=128)
+def _group_by(units, key):
+    cols = columns(units)
+    keyfn = KEYS[key]
+    groups = {}
+    for i, unit in enumerate(units):
+        groups.setdefault(keyfn(unit), []).append(i)
+    ordered = sorted(groups, key=lambda g: (g is None, str(g)))
+    return tuple((g, _metrics(cols, groups[g])) for g in ordered)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def group_by(key, units=UNITS):
+    """{group value: metrics} for key in KEYS, in sorted group order.
+
+    Metrics: count, occupied, vacant, occupancy, sf_total, avg_sf,
+    rent_total, avg_rent (occupied), rent_per_sf (occupied), market_total,
+    avg_market, upside, upside_occupied, below_market, deposits, delinquent.
+    """
+    if key not in KEYS:
+        raise ValueError(f"Unknown group key {key!r}; expected one of {', '.join(KEYS)}")
+    return {g: dict(m) for g, m in _group_by(tuple(units), key)}
+
+
+def totals(units=UNITS):
+    """Metrics over the whole unit table."""
+    units = tuple(units)
+    return dict(_totals(units))
+
+
+@lru_cache(maxsize=32)
+def _totals(units):
+    return _metrics(columns(units), range(len(units)))
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Unit-mix rollups for the case-study property.")
+    parser.add_argument("--by", choices=sorted(KEYS), default="type")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    groups = group_by(args.by)
+    if args.json:
+        print(json.dumps({"by": args.by, "groups": {str(g): m for g, m in groups.items()},
+                          "totals": totals()}, indent=2))
+        return
+
+    print(f"{args.by:<14} {'Units':>5} {'Occ':>4} {'Avg SF':>7} {'Avg Rent':>9} "
+          f"{'Market':>8} {'Upside/Mo':>10}")
+    rows = list(groups.items()) + [("Total", totals())]
+    for g, m in rows:
+        print(f"{str(g):<14} {m['count']:>5} {m['occupied']:>4} {m['avg_sf']:>7,.0f} "
+              f"{m['avg_rent']:>9,.0f} {m['avg_market']:>8,.0f} {m['upside']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Upload generated documents to object storage. Files go up concurrently on
+an asyncio loop (blocking I/O in worker threads) with at most --jobs
+transfers in flight, and each object is keyed
+<user_id>/<property_id>/<filename>, the layout the p360-documents bucket
+policies expect.
+
+A SQLite ledger in .cache/ records the SHA-256 of every object uploaded
+per backend, so unchanged files are skipped and a failed or interrupted
+run picks up where it stopped. Transfers retry with backoff; the
+filesystem backend also resumes a partial copy of the same content.
+
+Backends:
+    dir       a local directory standing in for the bucket (--dest)
+    supabase  Supabase Storage REST API (P360_STORAGE_URL or
+              NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+Usage:
+    python upload.py --dest /tmp/bucket [--demo 50] [--jobs 8] [--force]
+    python upload.py --backend supabase [--user-id UUID | --dsn postgresql://...] [--property-id UUID]
+
+For the supabase backend the owner is --user-id or, as in seed.py, the
+first p360_profiles user at --dsn ($DATABASE_URL); one of them is required.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from data import *
+from seed import CASE_STUDY_PROPERTY_ID, FALLBACK_USER_ID, derived_id, resolve_user, storage_path
+
+LEDGER_PATH = os.path.join(CACHE_DIR, "uploads.sqlite3")
+BUCKET = "p360-documents"
+STORAGE_URL = os.environ.get("P360_STORAGE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "")
+SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+JOBS = 8
+RETRIES = 3
+BACKOFF = 0.5
+CHUNK = 1 << 20
+API_TIMEOUT = 120
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".json": "application/json",
+    ".md": "text/markdown",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    target      TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    sha256      TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    PRIMARY KEY (target, key)
+);
+"""
+
+
+@lru_cache(maxsize=1024)
+def _file_sha256(path, size, mtime_ns):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_sha256(path):
+    """SHA-256 of a file, cached on (path, size, mtime) so a file shared by
+    many properties is read once per run.
+    """
+    st = os.stat(path)
+    return _file_sha256(path, st.st_size, st.st_mtime_ns)
+
+
+def content_type(path):
+    return CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+# Each backend has a target string (the ledger namespace) and a blocking
+# put(path, key, sha256) that stores the file under key or raises.
+class DirBackend:
+    """A directory standing in for the bucket. Content is copied to
+    <key>.<sha>.part and renamed into place, so an interrupted copy of the
+    same content resumes from the bytes already written.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.target = f"dir:{self.root}"
+
+    def put(self, path, key, sha256):
+        dest = os.path.join(self.root, *key.split("/"))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        part = f"{dest}.{sha256[:12]}.part"
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        with open(path, "rb") as src, open(part, "ab") as out:
+            src.seek(offset)
+            shutil.copyfileobj(src, out, CHUNK)
+        os.replace(part, dest)
+
+
+class SupabaseBackend:
+    """Supabase Storage: one upserting POST per object, body streamed from disk."""
+
+    def __init__(self, url=STORAGE_URL, key=SERVICE_KEY, bucket=BUCKET):
+        if not url or not key:
+            raise RuntimeError("Supabase storage needs P360_STORAGE_URL (or "
+                               "NEXT_PUBLIC_SUPABASE_URL) and SUPABASE_SERVICE_ROLE_KEY")
+        self.base = f"{url.rstrip('/')}/storage/v1/object/{bucket}"
+        self.key = key
+        self.target = f"supabase:{url.rstrip('/')}/{bucket}"
+
+    def put(self, path, key, sha256):
+        with open(path, "rb") as f:
+            request = urllib.request.Request(
+                f"{self.base}/{urllib.parse.quote(key)}", data=f, method="POST",
+                headers={
+                    "Authorization": f"Bearer {self.key}",
+                    "apikey": self.key,
+                    "Content-Type": content_type(path),
+                    "Content-Length": str(os.path.getsize(path)),
+                    "x-upsert": "true",
+                },
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=API_TIMEOUT) as response:
+                    response.read()
+            except urllib.error.HTTPError as e:
+                detail = e.read()[:200].decode("utf-8", "replace")
+                raise RuntimeError(f"HTTP {e.code}: {detail}") from None
+            except urllib.error.URLError as e:
+                raise RuntimeError(f"{self.base} unreachable ({e.reason})") from None
+
+
+# ---------------------------------------------------------------------------
+# Ledger
+# ---------------------------------------------------------------------------
+def connect(db_path=LEDGER_PATH):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def uploaded(conn, target):
+    """{key: sha256} already stored on target."""
+    rows = conn.execute("SELECT key, sha256 FROM uploads WHERE target = ?", (target,))
+    return dict(rows.fetchall())
+
+
+# ---------------------------------------------------------------------------
+# Upload
+# ---------------------------------------------------------------------------
+def jobs_for(folder=OUTPUT_DIR, user_id=FALLBACK_USER_ID, property_ids=(CASE_STUDY_PROPERTY_ID,)):
+    """(path, key) for every registry document in folder, per property."""
+    paths = [os.path.join(folder, name) for name, _, _ in DOCUMENTS
+             if os.path.exists(os.path.join(folder, name))]
+    return [(path, storage_path(user_id, pid, os.path.basename(path)))
+            for pid in property_ids for path in paths]
+
+
+async def _upload_one(backend, path, key, sha256, limit):
+    """(path, key, sha256, error or None) after up to RETRIES attempts."""
+    async with limit:
+        for attempt in range(RETRIES):
+            try:
+                await asyncio.to_thread(backend.put, path, key, sha256)
+                return path, key, sha256, None
+            except Exception as e:
+                if attempt == RETRIES - 1:
+                    return path, key, sha256, f"{type(e).__name__}: {e}"
+                await asyncio.sleep(BACKOFF * 2 ** attempt)
+
+
+async def upload_all(backend, jobs, conn, concurrency=JOBS, force=False):
+    """Upload (path, key) jobs, skipping keys whose ledger hash matches.
+    Returns {"uploaded", "skipped", "bytes", "failed": {key: error}}.
+    """
+    done = {} if force else uploaded(conn, backend.target)
+    limit = asyncio.Semaphore(concurrency)
+    result = {"uploaded": 0, "skipped": 0, "bytes": 0, "failed": {}}
+
+    tasks = []
+    for path, key in jobs:
+        sha256 = await asyncio.to_thread(file_sha256, path)
+        if done.get(key) == sha256:
+            result["skipped"] += 1
+            continue
+        tasks.append(_upload_one(backend, path, key, sha256, limit))
+
+    # Record each object as it lands, so an interrupted run resumes after it.
+    for task in asyncio.as_completed(tasks):
+        path, key, sha256, error = await task
+        if error:
+            result["failed"][key] = error
+            continue
+        size = os.path.getsize(path)
+        conn.execute(
+            "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?)",
+            (backend.target, key, sha256, size,
+             datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        )
+        conn.commit()
+        result["uploaded"] += 1
+        result["bytes"] += size
+    return result
+
+
+# ===========================================================================
+# Main
+# ===========================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Upload generated documents to storage.")
+    parser.add_argument("--backend", choices=("dir", "supabase"), default="dir")
+    parser.add_argument("--dest", default=os.path.join(CACHE_DIR, "bucket"),
+                        help="bucket directory for the dir backend")
+    parser.add_argument("--folder", default=OUTPUT_DIR, help="generated documents to upload")
+    parser.add_argument("--user-id", default=None,
+                        help="owner prefix (default: seed.py's user, looked up at --dsn)")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"),
+                        help="Postgres connection string for the user lookup (default $DATABASE_URL)")
+    parser.add_argument("--property-id", default=CASE_STUDY_PROPERTY_ID)
+    parser.add_argument("--demo", type=int, default=0,
+                        help="also upload under N demo property ids (as seed.py --demo)")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="concurrent transfers")
+    parser.add_argument("--force", action="store_true", help="ignore the ledger")
+    args = parser.parse_args()
+
+    if args.backend == "supabase" and not (args.user_id or args.dsn):
+        parser.error("--backend supabase needs --user-id or --dsn to find the owner of the rows")
+    user_id = resolve_user(args.dsn, args.user_id) if args.backend == "supabase" \
+        else args.user_id or FALLBACK_USER_ID
+
+    backend = DirBackend(args.dest) if args.backend == "dir" else SupabaseBackend()
+    property_ids = [args.property_id] + [derived_id("demo", i) for i in range(args.demo)]
+    jobs = jobs_for(args.folder, user_id, property_ids)
+
+    conn = connect()
+    start = time.perf_counter()
+    try:
+        result = asyncio.run(upload_all(backend, jobs, conn, args.jobs, args.force))
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - start
+
+    for key, error in sorted(result["failed"].items()):
+        print(f"FAILED {key}: {error}")
+    print(f"{backend.target}: {result['uploaded']} uploaded ({result['bytes'] / 1024 / 1024:.1f} MB), "
+          f"{result['skipped']} unchanged, {len(result['failed'])} failed in {elapsed:.2f}s")
+    if result["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()